@@ -4,7 +4,12 @@ Admin configuration for the analytics application.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import SpendingAnalytics, BudgetUtilization
+from .models import (
+    AnalyticsRebuildCheckpoint,
+    SpendingAnalytics,
+    BudgetUtilization,
+    TagSpending,
+)
 
 
 @admin.register(SpendingAnalytics)
@@ -17,16 +22,17 @@ class SpendingAnalyticsAdmin(admin.ModelAdmin):
         "user",
         "date",
         "category",
+        "currency",
         "total_amount",
         "transaction_count",
         "average_amount",
     )
-    list_filter = ("date", "category", "user")
+    list_filter = ("date", "category", "currency", "user")
     search_fields = ("user__username", "category")
     date_hierarchy = "date"
     readonly_fields = ("created_at", "updated_at")
     fieldsets = (
-        (None, {"fields": ("user", "date", "category")}),
+        (None, {"fields": ("user", "date", "category", "currency")}),
         (
             _("Metrics"),
             {"fields": ("total_amount", "transaction_count", "average_amount")},
@@ -38,6 +44,34 @@ class SpendingAnalyticsAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(TagSpending)
+class TagSpendingAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for TagSpending model.
+    """
+
+    list_display = (
+        "user",
+        "month",
+        "tag",
+        "currency",
+        "total_amount",
+        "transaction_count",
+    )
+    list_filter = ("month", "currency", "user")
+    search_fields = ("user__username", "tag")
+    date_hierarchy = "month"
+    readonly_fields = ("created_at", "updated_at")
+    fieldsets = (
+        (None, {"fields": ("user", "month", "tag", "currency")}),
+        (_("Metrics"), {"fields": ("total_amount", "transaction_count")}),
+        (
+            _("Timestamps"),
+            {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
+        ),
+    )
+
+
 @admin.register(BudgetUtilization)
 class BudgetUtilizationAdmin(admin.ModelAdmin):
     """
@@ -47,17 +81,18 @@ class BudgetUtilizationAdmin(admin.ModelAdmin):
     list_display = (
         "user",
         "category",
+        "currency",
         "month",
         "budget_amount",
         "spent_amount",
         "utilization_percentage",
     )
-    list_filter = ("month", "category", "user")
+    list_filter = ("month", "category", "currency", "user")
     search_fields = ("user__username", "category")
     date_hierarchy = "month"
     readonly_fields = ("created_at", "updated_at")
     fieldsets = (
-        (None, {"fields": ("user", "category", "month")}),
+        (None, {"fields": ("user", "category", "currency", "month")}),
         (
             _("Budget Information"),
             {"fields": ("budget_amount", "spent_amount", "utilization_percentage")},
@@ -67,3 +102,22 @@ class BudgetUtilizationAdmin(admin.ModelAdmin):
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
+
+
+@admin.register(AnalyticsRebuildCheckpoint)
+class AnalyticsRebuildCheckpointAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for AnalyticsRebuildCheckpoint model.
+    """
+
+    list_display = (
+        "run_id",
+        "user_start",
+        "user_end",
+        "source_rows",
+        "rollup_rows",
+        "duration_seconds",
+        "completed_at",
+    )
+    list_filter = ("run_id",)
+    readonly_fields = ("created_at", "completed_at")
@@ -9,6 +9,7 @@ from .views import (
     BudgetUtilizationViewSet,
     SpendingTrendsView,
     SpendingInsightsView,
+    SpendingHeatmapView,
 )
 
 router = DefaultRouter()
@@ -19,4 +20,5 @@ urlpatterns = [
     path("", include(router.urls)),
     path("trends/", SpendingTrendsView.as_view(), name="spending-trends"),
     path("insights/", SpendingInsightsView.as_view(), name="spending-insights"),
+    path("heatmap/", SpendingHeatmapView.as_view(), name="spending-heatmap"),
 ]
@@ -2,7 +2,7 @@
 API views for the analytics application.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -10,17 +10,31 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.utils import timezone
+from apps.users.services.context_service import UserContextService
+from core.throttling import (
+    AnalyticsRateThrottle,
+    BurstRateThrottle,
+    CustomUserRateThrottle,
+)
 
 from ..models import SpendingAnalytics, BudgetUtilization
 from ..serializers.analytics_serializer import (
     SpendingAnalyticsSerializer,
     BudgetUtilizationSerializer,
     SpendingTrendSerializer,
+    SpendingDistributionSerializer,
     SpendingInsightsSerializer,
+    TagSpendingSerializer,
 )
 from ..services.analytics_service import AnalyticsService
 
 
+def _report_currency(request: Request) -> str:
+    """Currency analytics are reported in, the user's default currency."""
+    return UserContextService.get(request.user).profile.default_currency
+
+
 class SpendingAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing spending analytics.
@@ -28,6 +42,11 @@ class SpendingAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = SpendingAnalyticsSerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [
+        CustomUserRateThrottle,
+        BurstRateThrottle,
+        AnalyticsRateThrottle,
+    ]
 
     def get_queryset(self):
         """
@@ -53,7 +72,10 @@ class SpendingAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         analytics = AnalyticsService.calculate_spending_analytics(
-            user_id=request.user.id, start_date=start_date, end_date=end_date
+            user_id=request.user.id,
+            start_date=start_date,
+            end_date=end_date,
+            currency=_report_currency(request),
         )
 
         if not analytics:
@@ -76,6 +98,87 @@ class SpendingAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
 
         return Response(analytics)
 
+    @action(detail=False, methods=["get"])
+    def distribution(self, request: Request) -> Response:
+        """
+        Get approximate amount percentiles and distinct locations by category.
+
+        Query params: ``start_date`` and ``end_date`` (YYYY-MM-DD), optional
+        ``category`` and ``percentiles`` (comma separated, e.g. ``50,90,99``).
+        """
+        try:
+            start_date = datetime.strptime(
+                request.query_params.get("start_date"), "%Y-%m-%d"
+            ).date()
+            end_date = datetime.strptime(
+                request.query_params.get("end_date"), "%Y-%m-%d"
+            ).date()
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "Invalid date format. Use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            quantiles = [
+                float(value) / 100
+                for value in request.query_params.get("percentiles", "50,90").split(",")
+            ]
+        except ValueError:
+            quantiles = []
+        if not quantiles or any(not 0 <= q <= 1 for q in quantiles):
+            return Response(
+                {"error": "Percentiles must be comma separated values between 0 and 100"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        distribution = AnalyticsService.get_spending_distribution(
+            user_id=request.user.id,
+            start_date=start_date,
+            end_date=end_date,
+            category=request.query_params.get("category"),
+            quantiles=quantiles,
+        )
+        serializer = SpendingDistributionSerializer(distribution, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def by_tag(self, request: Request) -> Response:
+        """
+        Get spending totals per expense tag, highest first.
+
+        Query params: ``start_month`` and ``end_month`` (YYYY-MM) and
+        optional ``tags`` (comma separated). An expense counts towards each
+        of its tags, so the totals of different tags overlap.
+        """
+        try:
+            start_month = datetime.strptime(
+                request.query_params.get("start_month"), "%Y-%m"
+            ).date()
+            end_month = datetime.strptime(
+                request.query_params.get("end_month"), "%Y-%m"
+            ).date()
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "Invalid month format. Use YYYY-MM"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        tags = [
+            tag.strip()
+            for tag in request.query_params.get("tags", "").split(",")
+            if tag.strip()
+        ]
+        tag_spending = AnalyticsService.get_tag_spending(
+            user_id=request.user.id,
+            start_month=start_month,
+            end_month=end_month,
+            tags=tags,
+            currency=_report_currency(request),
+        )
+        serializer = TagSpendingSerializer(tag_spending, many=True)
+        return Response(serializer.data)
+
 
 class BudgetUtilizationViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -84,6 +187,11 @@ class BudgetUtilizationViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = BudgetUtilizationSerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [
+        CustomUserRateThrottle,
+        BurstRateThrottle,
+        AnalyticsRateThrottle,
+    ]
 
     def get_queryset(self):
         """
@@ -139,6 +247,11 @@ class SpendingTrendsView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_classes = [
+        CustomUserRateThrottle,
+        BurstRateThrottle,
+        AnalyticsRateThrottle,
+    ]
 
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """
@@ -162,7 +275,10 @@ class SpendingTrendsView(APIView):
             )
 
         trends = AnalyticsService.get_category_trends(
-            user_id=request.user.id, category=category, months=months
+            user_id=request.user.id,
+            category=category,
+            months=months,
+            currency=_report_currency(request),
         )
 
         if not trends:
@@ -181,12 +297,19 @@ class SpendingInsightsView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_classes = [
+        CustomUserRateThrottle,
+        BurstRateThrottle,
+        AnalyticsRateThrottle,
+    ]
 
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """
         Get spending insights for the user.
         """
-        insights = AnalyticsService.get_spending_insights(user_id=request.user.id)
+        insights = AnalyticsService.get_spending_insights(
+            user_id=request.user.id, currency=_report_currency(request)
+        )
 
         if not insights.get("top_categories") and not insights.get("utilization_summary"):
             return Response(
@@ -196,3 +319,46 @@ class SpendingInsightsView(APIView):
 
         serializer = SpendingInsightsSerializer(insights)
         return Response(serializer.data)
+
+
+class SpendingHeatmapView(APIView):
+    """
+    View for calendar heatmaps and day-of-week spending patterns.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [
+        CustomUserRateThrottle,
+        BurstRateThrottle,
+        AnalyticsRateThrottle,
+    ]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Get a year of daily totals and weekday x category matrices.
+
+        Query params: ``year`` (defaults to the trailing 365 days) and
+        optional ``category``.
+        """
+        year = request.query_params.get("year")
+        if year:
+            try:
+                start_date = datetime(int(year), 1, 1).date()
+            except (ValueError, TypeError):
+                return Response(
+                    {"error": "Invalid year parameter"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            end_date = start_date.replace(month=12, day=31)
+        else:
+            end_date = timezone.now().date()
+            start_date = end_date - timedelta(days=364)
+
+        heatmap = AnalyticsService.get_spending_heatmap(
+            user_id=request.user.id,
+            start_date=start_date,
+            end_date=end_date,
+            category=request.query_params.get("category"),
+            currency=_report_currency(request),
+        )
+        return Response(heatmap)
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:20
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+def backfill_sketches(apps, schema_editor):
+    """Build sketches for existing daily rows from their expenses."""
+    from apps.analytics.sketches import build_daily_sketches
+
+    SpendingAnalytics = apps.get_model("analytics", "SpendingAnalytics")
+    Expense = apps.get_model("expenses", "Expense")
+
+    rows = (
+        Expense.objects.order_by("user_id", "date", "category")
+        .values_list("user_id", "date", "category", "amount", "location")
+        .iterator(chunk_size=5000)
+    )
+    for (user_id, date, category), group in groupby(rows, key=lambda r: r[:3]):
+        amount_sketch, location_sketch = build_daily_sketches(
+            (amount, location) for *_, amount, location in group
+        )
+        SpendingAnalytics.objects.filter(
+            user_id=user_id, date=date, category=category
+        ).update(amount_sketch=amount_sketch, location_sketch=location_sketch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0002_initial"),
+        ("expenses", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="spendinganalytics",
+            name="amount_sketch",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Serialized t-digest of the day's transaction amounts",
+                verbose_name="Amount Sketch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="spendinganalytics",
+            name="location_sketch",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Serialized HyperLogLog of the day's distinct locations",
+                verbose_name="Location Sketch",
+            ),
+        ),
+        migrations.RunPython(backfill_sketches, migrations.RunPython.noop),
+    ]
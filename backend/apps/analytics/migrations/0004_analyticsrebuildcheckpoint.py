@@ -0,0 +1,71 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0003_spendinganalytics_sketches"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalyticsRebuildCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("run_id", models.CharField(max_length=64, verbose_name="Run ID")),
+                ("user_start", models.BigIntegerField(verbose_name="First User ID")),
+                ("user_end", models.BigIntegerField(verbose_name="Last User ID")),
+                (
+                    "start_date",
+                    models.DateField(blank=True, null=True, verbose_name="Start Date"),
+                ),
+                (
+                    "end_date",
+                    models.DateField(blank=True, null=True, verbose_name="End Date"),
+                ),
+                (
+                    "source_rows",
+                    models.PositiveIntegerField(default=0, verbose_name="Source Rows"),
+                ),
+                (
+                    "rollup_rows",
+                    models.PositiveIntegerField(default=0, verbose_name="Rollup Rows"),
+                ),
+                (
+                    "duration_seconds",
+                    models.FloatField(default=0, verbose_name="Duration (seconds)"),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Completed At"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Analytics Rebuild Checkpoint",
+                "verbose_name_plural": "Analytics Rebuild Checkpoints",
+                "ordering": ["run_id", "user_start"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="analyticsrebuildcheckpoint",
+            constraint=models.UniqueConstraint(
+                fields=("run_id", "user_start", "user_end"),
+                name="analytics_checkpoint_unique_shard",
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Same statement as RollupService.rebuild_tag_spending, for every user
+BACKFILL_TAG_SPENDING = """
+INSERT INTO analytics_tagspending (
+    user_id, month, tag, total_amount, transaction_count, created_at, updated_at
+)
+SELECT user_id, CAST(DATE_TRUNC('month', date) AS date), tag,
+       SUM(amount), COUNT(*), NOW(), NOW()
+FROM expenses_expense
+CROSS JOIN LATERAL (
+    SELECT DISTINCT value #>> '{}' AS tag
+    FROM jsonb_array_elements(
+        CASE WHEN jsonb_typeof(tags) = 'array'
+             THEN tags ELSE CAST('[]' AS jsonb) END
+    )
+    WHERE jsonb_typeof(value) = 'string'
+) AS expense_tags
+GROUP BY 1, 2, 3
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0004_analyticsrebuildcheckpoint"),
+        ("expenses", "0006_expense_tags_gin"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagSpending",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Month")),
+                ("tag", models.CharField(max_length=50, verbose_name="Tag")),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=12, verbose_name="Total Amount"
+                    ),
+                ),
+                (
+                    "transaction_count",
+                    models.PositiveIntegerField(verbose_name="Transaction Count"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_spending",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tag Spending",
+                "verbose_name_plural": "Tag Spending",
+                "unique_together": {("user", "month", "tag")},
+            },
+        ),
+        migrations.RunSQL(BACKFILL_TAG_SPENDING, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0006_tagspending"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="budgetutilization",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="spendinganalytics",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="tagspending",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="budgetutilization",
+            name="currency",
+            field=models.CharField(
+                choices=[
+                    ("USD", "US Dollar"),
+                    ("EUR", "Euro"),
+                    ("GBP", "British Pound"),
+                    ("JPY", "Japanese Yen"),
+                    ("AUD", "Australian Dollar"),
+                    ("CAD", "Canadian Dollar"),
+                    ("CHF", "Swiss Franc"),
+                    ("CNY", "Chinese Yuan"),
+                    ("INR", "Indian Rupee"),
+                ],
+                default="USD",
+                max_length=3,
+                verbose_name="Currency",
+            ),
+        ),
+        migrations.AddField(
+            model_name="spendinganalytics",
+            name="currency",
+            field=models.CharField(
+                choices=[
+                    ("USD", "US Dollar"),
+                    ("EUR", "Euro"),
+                    ("GBP", "British Pound"),
+                    ("JPY", "Japanese Yen"),
+                    ("AUD", "Australian Dollar"),
+                    ("CAD", "Canadian Dollar"),
+                    ("CHF", "Swiss Franc"),
+                    ("CNY", "Chinese Yuan"),
+                    ("INR", "Indian Rupee"),
+                ],
+                default="USD",
+                max_length=3,
+                verbose_name="Currency",
+            ),
+        ),
+        migrations.AddField(
+            model_name="tagspending",
+            name="currency",
+            field=models.CharField(
+                choices=[
+                    ("USD", "US Dollar"),
+                    ("EUR", "Euro"),
+                    ("GBP", "British Pound"),
+                    ("JPY", "Japanese Yen"),
+                    ("AUD", "Australian Dollar"),
+                    ("CAD", "Canadian Dollar"),
+                    ("CHF", "Swiss Franc"),
+                    ("CNY", "Chinese Yuan"),
+                    ("INR", "Indian Rupee"),
+                ],
+                default="USD",
+                max_length=3,
+                verbose_name="Currency",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="budgetutilization",
+            unique_together={("user", "category", "currency", "month")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="spendinganalytics",
+            unique_together={("user", "date", "category", "currency")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="tagspending",
+            unique_together={("user", "month", "tag", "currency")},
+        ),
+    ]
@@ -5,11 +5,16 @@ Models for the analytics application.
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from apps.users.models import Profile
+from utils.constants import MAX_TAG_LENGTH
 
 
 class SpendingAnalytics(models.Model):
     """
     Model to store aggregated spending analytics data.
+
+    Expenses are aggregated per currency, so every row's amounts are in the
+    row's ``currency``.
     """
 
     user = models.ForeignKey(
@@ -19,6 +24,12 @@ class SpendingAnalytics(models.Model):
     )
     date = models.DateField(_("Date"))
     category = models.CharField(_("Category"), max_length=100)
+    currency = models.CharField(
+        _("Currency"),
+        max_length=3,
+        choices=Profile.CurrencyChoices.choices,
+        default=Profile.CurrencyChoices.USD,
+    )
     total_amount = models.DecimalField(
         _("Total Amount"), max_digits=12, decimal_places=2
     )
@@ -26,6 +37,18 @@ class SpendingAnalytics(models.Model):
     average_amount = models.DecimalField(
         _("Average Amount"), max_digits=12, decimal_places=2
     )
+    amount_sketch = models.JSONField(
+        _("Amount Sketch"),
+        default=dict,
+        blank=True,
+        help_text=_("Serialized t-digest of the day's transaction amounts"),
+    )
+    location_sketch = models.JSONField(
+        _("Location Sketch"),
+        default=dict,
+        blank=True,
+        help_text=_("Serialized HyperLogLog of the day's distinct locations"),
+    )
     created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
 
@@ -36,7 +59,7 @@ class SpendingAnalytics(models.Model):
 
         verbose_name = _("Spending Analytics")
         verbose_name_plural = _("Spending Analytics")
-        unique_together = ("user", "date", "category")
+        unique_together = ("user", "date", "category", "currency")
         indexes = [
             models.Index(fields=["user", "date"]),
             models.Index(fields=["category"]),
@@ -47,9 +70,56 @@ class SpendingAnalytics(models.Model):
         return f"{self.user.username} - {self.category} - {self.date}"
 
 
+class TagSpending(models.Model):
+    """
+    Model to store monthly spending per expense tag.
+
+    An expense with several tags counts in full towards each of them, so
+    totals of different tags overlap and do not add up to the spending.
+    Expenses are aggregated per currency.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="tag_spending",
+    )
+    month = models.DateField(_("Month"))
+    tag = models.CharField(_("Tag"), max_length=MAX_TAG_LENGTH)
+    currency = models.CharField(
+        _("Currency"),
+        max_length=3,
+        choices=Profile.CurrencyChoices.choices,
+        default=Profile.CurrencyChoices.USD,
+    )
+    total_amount = models.DecimalField(
+        _("Total Amount"), max_digits=12, decimal_places=2
+    )
+    transaction_count = models.PositiveIntegerField(_("Transaction Count"))
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+
+    class Meta:
+        """
+        Meta options for TagSpending model.
+        """
+
+        verbose_name = _("Tag Spending")
+        verbose_name_plural = _("Tag Spending")
+        # Its index also serves per-user month range queries
+        unique_together = ("user", "month", "tag", "currency")
+
+    def __str__(self) -> str:
+        """String representation of the tag spending."""
+        return f"{self.user.username} - {self.tag} - {self.month}"
+
+
 class BudgetUtilization(models.Model):
     """
     Model to track budget utilization metrics.
+
+    Budgets only count spending in their own currency, as in the budget
+    ledger, so there is a row per category and currency.
     """
 
     user = models.ForeignKey(
@@ -58,6 +128,12 @@ class BudgetUtilization(models.Model):
         related_name="budget_utilization",
     )
     category = models.CharField(_("Category"), max_length=100)
+    currency = models.CharField(
+        _("Currency"),
+        max_length=3,
+        choices=Profile.CurrencyChoices.choices,
+        default=Profile.CurrencyChoices.USD,
+    )
     month = models.DateField(_("Month"))
     budget_amount = models.DecimalField(
         _("Budget Amount"), max_digits=12, decimal_places=2
@@ -78,7 +154,7 @@ class BudgetUtilization(models.Model):
 
         verbose_name = _("Budget Utilization")
         verbose_name_plural = _("Budget Utilizations")
-        unique_together = ("user", "category", "month")
+        unique_together = ("user", "category", "currency", "month")
         indexes = [
             models.Index(fields=["user", "month"]),
             models.Index(fields=["category"]),
@@ -87,3 +163,43 @@ class BudgetUtilization(models.Model):
     def __str__(self) -> str:
         """String representation of the budget utilization."""
         return f"{self.user.username} - {self.category} - {self.month}"
+
+
+class AnalyticsRebuildCheckpoint(models.Model):
+    """
+    Model to track completed shards of an analytics rebuild run.
+
+    A shard covers an inclusive user-id range. Shards are marked completed in
+    the same transaction that rewrites their rollups, so an interrupted run
+    can be resumed without redoing finished work.
+    """
+
+    run_id = models.CharField(_("Run ID"), max_length=64)
+    user_start = models.BigIntegerField(_("First User ID"))
+    user_end = models.BigIntegerField(_("Last User ID"))
+    start_date = models.DateField(_("Start Date"), null=True, blank=True)
+    end_date = models.DateField(_("End Date"), null=True, blank=True)
+    source_rows = models.PositiveIntegerField(_("Source Rows"), default=0)
+    rollup_rows = models.PositiveIntegerField(_("Rollup Rows"), default=0)
+    duration_seconds = models.FloatField(_("Duration (seconds)"), default=0)
+    completed_at = models.DateTimeField(_("Completed At"), null=True, blank=True)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        """
+        Meta options for AnalyticsRebuildCheckpoint model.
+        """
+
+        verbose_name = _("Analytics Rebuild Checkpoint")
+        verbose_name_plural = _("Analytics Rebuild Checkpoints")
+        ordering = ["run_id", "user_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["run_id", "user_start", "user_end"],
+                name="analytics_checkpoint_unique_shard",
+            )
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the checkpoint."""
+        return f"{self.run_id} [{self.user_start}-{self.user_end}]"
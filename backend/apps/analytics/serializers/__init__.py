@@ -6,5 +6,6 @@ from .analytics_serializer import (  # noqa: F401
     SpendingAnalyticsSerializer,
     BudgetUtilizationSerializer,
     SpendingTrendSerializer,
+    SpendingDistributionSerializer,
     SpendingInsightsSerializer,
 )
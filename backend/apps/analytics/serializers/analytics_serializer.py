@@ -21,6 +21,7 @@ class SpendingAnalyticsSerializer(serializers.ModelSerializer):
             "id",
             "date",
             "category",
+            "currency",
             "total_amount",
             "transaction_count",
             "average_amount",
@@ -44,6 +45,7 @@ class BudgetUtilizationSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "category",
+            "currency",
             "month",
             "budget_amount",
             "spent_amount",
@@ -65,6 +67,31 @@ class SpendingTrendSerializer(serializers.Serializer):
     average_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
 
 
+class TagSpendingSerializer(serializers.Serializer):
+    """
+    Serializer for per-tag spending totals.
+    """
+
+    tag = serializers.CharField()
+    total_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    transaction_count = serializers.IntegerField()
+    average_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class SpendingDistributionSerializer(serializers.Serializer):
+    """
+    Serializer for approximate spending distribution data.
+    """
+
+    category = serializers.CharField()
+    currency = serializers.CharField()
+    transaction_count = serializers.IntegerField()
+    percentiles = serializers.DictField(
+        child=serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
+    )
+    distinct_locations = serializers.IntegerField()
+
+
 class CategoryInsightSerializer(serializers.Serializer):
     """
     Serializer for category insight data.
@@ -3,3 +3,4 @@ Analytics services initialization.
 """
 
 from .analytics_service import AnalyticsService  # noqa: F401
+from .rollup_service import RollupService  # noqa: F401
@@ -2,24 +2,98 @@
 Service layer for analytics operations.
 """
 
-from datetime import datetime
+import operator
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
-from django.db.models import Sum, Avg, Count
-from django.db.models.functions import TruncMonth
+from functools import reduce
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db.models import Sum, Avg, Count, DecimalField, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from apps.currencies.services import CurrencyService
 from apps.expenses.models import Expense
 from apps.budgets.models import Budget
-from ..models import SpendingAnalytics, BudgetUtilization
+from apps.users.models import Profile
+from utils.constants import DEFAULT_CURRENCY
+from utils.exceptions.custom_exceptions import InvalidCurrency
+from utils.helpers.calendar_helpers import bucket_daily_totals, period_bounds
+from utils.helpers.money import (
+    basis_points_many,
+    from_minor,
+    minor_units,
+    percentage_from_basis_points,
+    to_minor,
+)
+from ..models import SpendingAnalytics, BudgetUtilization, TagSpending
+from ..sketches import (
+    DistinctCountSketch,
+    QuantileSketch,
+    build_daily_sketches,
+    percentile_label,
+)
+
+MAX_UTILIZATION = Decimal("999.99")
+
+MONEY_FIELD = DecimalField(max_digits=12, decimal_places=2)
 
 
 class AnalyticsService:
     """
     Service class for handling analytics operations.
+
+    Rollups hold amounts per currency. Reports convert them to one
+    currency, by default the user's, at the rates of each row's day.
     """
 
+    @staticmethod
+    def get_report_currency(user_id: int) -> str:
+        """
+        Get the currency a user's analytics are reported in.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            str: The user's default currency
+        """
+        currency = (
+            Profile.objects.filter(user_id=user_id)
+            .values_list("default_currency", flat=True)
+            .first()
+        )
+        return currency or DEFAULT_CURRENCY
+
+    @staticmethod
+    def _in_currency(
+        currency: str, amount_field: str = "total_amount", day_field: str = "date"
+    ):
+        """SQL expression converting a rollup amount, NULL without a rate."""
+        return CurrencyService.converted_amount(
+            currency, amount_field=amount_field, day_field=day_field
+        )
+
+    @staticmethod
+    def _check_converted(unconverted: int, currency: str) -> None:
+        """
+        Reject reports that would silently leave out unconvertible amounts.
+
+        Raises:
+            InvalidCurrency: If any amount has no exchange rate to ``currency``
+        """
+        if unconverted:
+            raise InvalidCurrency(
+                _("Some expenses have no exchange rate to %(currency)s")
+                % {"currency": currency}
+            )
+
     @staticmethod
     def calculate_spending_analytics(
-        user_id: int, start_date: datetime, end_date: datetime
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        currency: Optional[str] = None,
     ) -> List[Dict]:
         """
         Calculate spending analytics for a given date range.
@@ -28,23 +102,186 @@ class AnalyticsService:
             user_id: The ID of the user
             start_date: Start date for analysis
             end_date: End date for analysis
+            currency: Currency to report in, the user's by default
 
         Returns:
             List of spending analytics data
+
+        Raises:
+            InvalidCurrency: If a day's spending has no exchange rate
         """
-        analytics = (
+        currency = currency or AnalyticsService.get_report_currency(user_id)
+        analytics = list(
             SpendingAnalytics.objects.filter(
                 user_id=user_id, date__range=(start_date, end_date)
             )
+            .alias(
+                converted_total=AnalyticsService._in_currency(currency),
+                converted_average=AnalyticsService._in_currency(
+                    currency, "average_amount"
+                ),
+            )
             .values("category")
             .annotate(
-                total_amount=Sum("total_amount"),
-                avg_amount=Avg("average_amount"),
+                total_amount=Cast(Sum("converted_total"), MONEY_FIELD),
+                avg_amount=Cast(Avg("converted_average"), MONEY_FIELD),
                 total_transactions=Sum("transaction_count"),
+                unconverted_count=Count("id", filter=Q(converted_total__isnull=True)),
+            )
+        )
+        AnalyticsService._check_converted(
+            sum(row.pop("unconverted_count") for row in analytics), currency
+        )
+        return analytics
+
+    @staticmethod
+    def get_spending_distribution(
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None,
+        quantiles: Iterable[float] = (0.5, 0.9),
+    ) -> List[Dict]:
+        """
+        Get approximate amount percentiles and distinct location counts.
+
+        Merges the daily sketches stored on ``SpendingAnalytics`` rows, so the
+        cost depends on the number of days in range, not on transactions.
+        Sketches of different currencies cannot be merged, so there is an
+        entry per category and currency.
+
+        Args:
+            user_id: The ID of the user
+            start_date: Start date for analysis
+            end_date: End date for analysis
+            category: Optional category to restrict the result to
+            quantiles: Quantiles to report, each between 0 and 1
+
+        Returns:
+            List of per-category and currency distribution data
+        """
+        rows = SpendingAnalytics.objects.filter(
+            user_id=user_id, date__range=(start_date, end_date)
+        )
+        if category:
+            rows = rows.filter(category=category)
+
+        merged: Dict[Tuple[str, str], Dict] = {}
+        for (
+            row_category,
+            row_currency,
+            count,
+            amount_sketch,
+            location_sketch,
+        ) in rows.values_list(
+            "category",
+            "currency",
+            "transaction_count",
+            "amount_sketch",
+            "location_sketch",
+        ).iterator():
+            entry = merged.setdefault(
+                (row_category, row_currency),
+                {
+                    "transaction_count": 0,
+                    "amounts": QuantileSketch(),
+                    "locations": DistinctCountSketch(),
+                },
+            )
+            entry["transaction_count"] += count
+            entry["amounts"].merge(QuantileSketch.from_dict(amount_sketch))
+            entry["locations"].merge(DistinctCountSketch.from_dict(location_sketch))
+
+        distribution = []
+        for (row_category, row_currency), entry in sorted(merged.items()):
+            percentiles = {}
+            for q in quantiles:
+                value = entry["amounts"].quantile(q)
+                percentiles[percentile_label(q)] = (
+                    Decimal(str(value)).quantize(Decimal("0.01"))
+                    if value is not None
+                    else None
+                )
+            distribution.append(
+                {
+                    "category": row_category,
+                    "currency": row_currency,
+                    "transaction_count": entry["transaction_count"],
+                    "percentiles": percentiles,
+                    "distinct_locations": entry["locations"].estimate(),
+                }
             )
+        return distribution
+
+    @staticmethod
+    def get_spending_heatmap(
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        category: Optional[str] = None,
+        currency: Optional[str] = None,
+    ) -> Dict:
+        """
+        Get dense daily totals and weekday x category matrices.
+
+        Built from one indexed range read of the daily SpendingAnalytics
+        rows, converted to one currency at each day's rates. Amounts are
+        integer minor units of that currency and series are dense arrays:
+        index ``i`` of ``daily_totals`` is ``start_date + i days`` and index
+        ``w`` of a weekday row is ISO weekday ``w + 1`` (0 = Monday).
+
+        Args:
+            user_id: The ID of the user
+            start_date: First day of the heatmap
+            end_date: Last day of the heatmap
+            category: Optional category to restrict the result to
+            currency: Currency to report in, the user's by default
+
+        Returns:
+            Dictionary with compact heatmap data
+
+        Raises:
+            InvalidCurrency: If a day's spending has no exchange rate
+        """
+        currency = currency or AnalyticsService.get_report_currency(user_id)
+        rows = SpendingAnalytics.objects.filter(
+            user_id=user_id, date__range=(start_date, end_date)
         )
+        if category:
+            rows = rows.filter(category=category)
+
+        days = (end_date - start_date).days + 1
+        first_weekday = start_date.weekday()
+        daily_totals = [0] * days
+        daily_counts = [0] * days
+        weekday_totals: Dict[str, List[int]] = {}
+        weekday_counts: Dict[str, List[int]] = {}
 
-        return list(analytics)
+        for day, row_category, total, count in (
+            rows.annotate(converted_total=AnalyticsService._in_currency(currency))
+            .values_list("date", "category", "converted_total", "transaction_count")
+            .iterator()
+        ):
+            AnalyticsService._check_converted(total is None, currency)
+            offset = (day - start_date).days
+            units = CurrencyService.to_minor(total, currency)
+            weekday = (first_weekday + offset) % 7
+            daily_totals[offset] += units
+            daily_counts[offset] += count
+            weekday_totals.setdefault(row_category, [0] * 7)[weekday] += units
+            weekday_counts.setdefault(row_category, [0] * 7)[weekday] += count
+
+        categories = sorted(weekday_totals)
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "currency": currency,
+            "daily_totals": daily_totals,
+            "daily_counts": daily_counts,
+            "categories": categories,
+            "weekday_totals": [weekday_totals[name] for name in categories],
+            "weekday_counts": [weekday_counts[name] for name in categories],
+        }
 
     @staticmethod
     def update_budget_utilization(user_id: int, month: datetime) -> None:
@@ -61,10 +298,11 @@ class AnalyticsService:
         )
 
         for budget in budgets:
-            # Calculate spent amount
+            # Calculate spent amount, in the budget's currency only
             spent_amount = Expense.objects.filter(
                 user_id=user_id,
                 category=budget.category,
+                currency=budget.currency,
                 date__year=month.year,
                 date__month=month.month,
             ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
@@ -80,6 +318,7 @@ class AnalyticsService:
             BudgetUtilization.objects.update_or_create(
                 user_id=user_id,
                 category=budget.category,
+                currency=budget.currency,
                 month=month,
                 defaults={
                     "budget_amount": budget.amount,
@@ -89,48 +328,413 @@ class AnalyticsService:
             )
 
     @staticmethod
-    def get_category_trends(user_id: int, category: str, months: int = 6) -> List[Dict]:
+    def refresh_daily_rollups(keys: Iterable[Tuple[int, date, str, str]]) -> None:
+        """
+        Recompute SpendingAnalytics rows for a batch of days.
+
+        Reads the affected expenses in one query and upserts every row in
+        another, regardless of how many keys are refreshed. Rows whose day
+        no longer has expenses are removed.
+
+        Args:
+            keys: ``(user_id, date, category, currency)`` tuples to refresh
+        """
+        keys = set(keys)
+        if not keys:
+            return
+
+        rows = (
+            Expense.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(
+                            user_id=user_id,
+                            date=day,
+                            category=category,
+                            currency=currency,
+                        )
+                        for user_id, day, category, currency in keys
+                    ),
+                )
+            )
+            .order_by("user_id", "date", "category", "currency")
+            .values_list(
+                "user_id", "date", "category", "currency", "amount", "location"
+            )
+        )
+
+        analytics = []
+        for key, group in groupby(rows, key=lambda row: row[:4]):
+            group = [(amount, location) for *_, amount, location in group]
+            total_amount = sum((amount for amount, _ in group), Decimal("0"))
+            amount_sketch, location_sketch = build_daily_sketches(group)
+            analytics.append(
+                SpendingAnalytics(
+                    user_id=key[0],
+                    date=key[1],
+                    category=key[2],
+                    currency=key[3],
+                    total_amount=total_amount,
+                    transaction_count=len(group),
+                    average_amount=total_amount / len(group),
+                    amount_sketch=amount_sketch,
+                    location_sketch=location_sketch,
+                )
+            )
+
+        if analytics:
+            SpendingAnalytics.objects.bulk_create(
+                analytics,
+                update_conflicts=True,
+                unique_fields=["user", "date", "category", "currency"],
+                update_fields=[
+                    "total_amount",
+                    "transaction_count",
+                    "average_amount",
+                    "amount_sketch",
+                    "location_sketch",
+                    "updated_at",
+                ],
+            )
+
+        empty = keys - {
+            (row.user_id, row.date, row.category, row.currency) for row in analytics
+        }
+        if empty:
+            SpendingAnalytics.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(
+                            user_id=user_id,
+                            date=day,
+                            category=category,
+                            currency=currency,
+                        )
+                        for user_id, day, category, currency in empty
+                    ),
+                )
+            ).delete()
+
+    @staticmethod
+    def refresh_tag_rollups(keys: Iterable[Tuple[int, date, str, str]]) -> None:
+        """
+        Recompute TagSpending rows for a batch of user months and tags.
+
+        Reads the affected expenses, found through the tags index, in one
+        query and upserts every row in another. Rows whose tag no longer has
+        expenses in their month are removed.
+
+        Args:
+            keys: ``(user_id, first_day_of_month, currency, tag)`` tuples to
+                refresh
+        """
+        keys = set(keys)
+        if not keys:
+            return
+
+        totals: Dict[Tuple[int, date, str, str], List] = {}
+        for user_id, day, currency, amount, tags in Expense.objects.filter(
+            reduce(
+                operator.or_,
+                (
+                    Q(
+                        user_id=user_id,
+                        date__range=period_bounds(month, "month"),
+                        currency=currency,
+                        tags__contains=[tag],
+                    )
+                    for user_id, month, currency, tag in keys
+                ),
+            )
+        ).values_list("user_id", "date", "currency", "amount", "tags"):
+            for tag in set(tags):
+                key = (user_id, day.replace(day=1), currency, tag)
+                if key in keys:
+                    entry = totals.setdefault(key, [Decimal("0"), 0])
+                    entry[0] += amount
+                    entry[1] += 1
+
+        if totals:
+            TagSpending.objects.bulk_create(
+                [
+                    TagSpending(
+                        user_id=user_id,
+                        month=month,
+                        currency=currency,
+                        tag=tag,
+                        total_amount=entry[0],
+                        transaction_count=entry[1],
+                    )
+                    for (user_id, month, currency, tag), entry in totals.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["user", "month", "tag", "currency"],
+                update_fields=["total_amount", "transaction_count", "updated_at"],
+            )
+
+        empty = keys - totals.keys()
+        if empty:
+            TagSpending.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(user_id=user_id, month=month, currency=currency, tag=tag)
+                        for user_id, month, currency, tag in empty
+                    ),
+                )
+            ).delete()
+
+    @staticmethod
+    def refresh_budget_utilization(user_months: Iterable[Tuple[int, date]]) -> None:
+        """
+        Recompute BudgetUtilization rows for a batch of user months.
+
+        Batch equivalent of ``update_budget_utilization``: one query for the
+        budgets active on the first of each month, one for the spending and
+        one upsert. Budgets only count spending in their own currency.
+
+        Args:
+            user_months: ``(user_id, first_day_of_month)`` tuples to refresh
+        """
+        user_months = set(user_months)
+        if not user_months:
+            return
+
+        budgets = list(
+            Budget.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(user_id=user_id, start_date__lte=month, end_date__gte=month)
+                        for user_id, month in user_months
+                    ),
+                )
+            )
+            .order_by("id")
+            .values_list(
+                "user_id", "category", "currency", "amount", "start_date", "end_date"
+            )
+        )
+        if not budgets:
+            return
+
+        # Spending is accumulated in minor units and converted back at the end
+        spent: Dict[Tuple[int, str, str, date], int] = {}
+        for user_id, category, currency, day, total in (
+            Expense.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(user_id=user_id, date__range=period_bounds(month, "month"))
+                        for user_id, month in user_months
+                    ),
+                ),
+                category__in={budget[1] for budget in budgets},
+            )
+            .values_list("user_id", "category", "currency", "date")
+            .annotate(total=minor_units(Sum("amount")))
+            .order_by()
+        ):
+            key = (user_id, category, currency, day.replace(day=1))
+            spent[key] = spent.get(key, 0) + total
+
+        # Later budgets win, as in update_budget_utilization
+        latest: Dict[Tuple[int, str, str, date], Decimal] = {}
+        for user_id, month in user_months:
+            for (
+                budget_user,
+                category,
+                currency,
+                amount,
+                start_date,
+                end_date,
+            ) in budgets:
+                if budget_user == user_id and start_date <= month <= end_date:
+                    latest[(user_id, category, currency, month)] = amount
+
+        keys = list(latest)
+        spent_units = [spent.get(key, 0) for key in keys]
+        used_points = basis_points_many(
+            spent_units, [to_minor(latest[key]) for key in keys]
+        )
+        max_points = to_minor(MAX_UTILIZATION)
+        utilization = [
+            BudgetUtilization(
+                user_id=user_id,
+                category=category,
+                currency=currency,
+                month=month,
+                budget_amount=latest[(user_id, category, currency, month)],
+                spent_amount=from_minor(units),
+                utilization_percentage=percentage_from_basis_points(
+                    min(points, max_points)
+                ),
+            )
+            for (user_id, category, currency, month), units, points in zip(
+                keys, spent_units, used_points
+            )
+        ]
+
+        if utilization:
+            BudgetUtilization.objects.bulk_create(
+                utilization,
+                update_conflicts=True,
+                unique_fields=["user", "category", "currency", "month"],
+                update_fields=[
+                    "budget_amount",
+                    "spent_amount",
+                    "utilization_percentage",
+                    "updated_at",
+                ],
+            )
+
+    @staticmethod
+    def get_tag_spending(
+        user_id: int,
+        start_month: date,
+        end_month: date,
+        tags: Optional[Iterable[str]] = None,
+        currency: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get spending per tag for a range of months, highest first.
+
+        Reads the monthly ``TagSpending`` rollup, so the cost depends on the
+        number of months and tags in range, not on transactions. Monthly
+        totals are converted at the rates of the first day of their month.
+
+        Args:
+            user_id: The ID of the user
+            start_month: First month for analysis
+            end_month: Last month for analysis
+            tags: Optional tags to restrict the result to
+            currency: Currency to report in, the user's by default
+
+        Returns:
+            List of per-tag totals
+
+        Raises:
+            InvalidCurrency: If a month's spending has no exchange rate
+        """
+        currency = currency or AnalyticsService.get_report_currency(user_id)
+        rows = TagSpending.objects.filter(
+            user_id=user_id,
+            month__range=(start_month.replace(day=1), end_month.replace(day=1)),
+        )
+        if tags:
+            rows = rows.filter(tag__in=list(tags))
+
+        totals = list(
+            rows.alias(
+                converted_total=AnalyticsService._in_currency(
+                    currency, day_field="month"
+                )
+            )
+            .values_list("tag")
+            .annotate(
+                total_amount=Cast(Sum("converted_total"), MONEY_FIELD),
+                count=Sum("transaction_count"),
+                unconverted_count=Count("id", filter=Q(converted_total__isnull=True)),
+            )
+            .order_by("-total_amount", "tag")
+        )
+        AnalyticsService._check_converted(
+            sum(unconverted for *_, unconverted in totals), currency
+        )
+        return [
+            {
+                "tag": tag,
+                "total_amount": total_amount,
+                "transaction_count": count,
+                "average_amount": (total_amount / count).quantize(Decimal("0.01")),
+            }
+            for tag, total_amount, count, unconverted in totals
+        ]
+
+    @staticmethod
+    def get_category_trends(
+        user_id: int,
+        category: str,
+        months: int = 6,
+        today: Optional[date] = None,
+        currency: Optional[str] = None,
+    ) -> List[Dict]:
         """
         Get spending trends for a specific category.
 
         Args:
             user_id: The ID of the user
             category: The category to analyze
-            months: Number of months to analyze
+            months: Number of months to analyze, up to the current one
+            today: Date the months end at, today by default
+            currency: Currency to report in, the user's by default; each
+                expense is converted at the rate of its date
 
         Returns:
-            List of monthly spending data
+            List of monthly spending data, newest first
+
+        Raises:
+            InvalidCurrency: If an expense has no exchange rate
         """
-        trends = (
-            Expense.objects.filter(user_id=user_id, category=category)
-            .annotate(month=TruncMonth("date"))
-            .values("month")
+        if months < 1:
+            return []
+        today = today or timezone.now().date()
+        first_month = max(today.year * 12 + today.month - months, 12)
+        since = date(first_month // 12, first_month % 12 + 1, 1)
+
+        currency = currency or AnalyticsService.get_report_currency(user_id)
+
+        # Aggregate per day in SQL, then bucket days into months by lookup
+        daily = list(
+            Expense.objects.filter(user_id=user_id, category=category, date__gte=since)
+            .alias(converted_amount=CurrencyService.converted_amount(currency))
+            .values("date")
             .annotate(
-                total_amount=Sum("amount"),
+                total_amount=Cast(Sum("converted_amount"), MONEY_FIELD),
                 transaction_count=Count("id"),
-                average_amount=Avg("amount"),
+                unconverted_count=Count("id", filter=Q(converted_amount__isnull=True)),
             )
-            .order_by("-month")[:months]
+            .order_by()
         )
-
-        return list(trends)
+        AnalyticsService._check_converted(
+            sum(row["unconverted_count"] for row in daily), currency
+        )
+        trends = bucket_daily_totals(daily, "month", label="month")
+        return trends[::-1][:months]
 
     @staticmethod
-    def get_spending_insights(user_id: int) -> Dict:
+    def get_spending_insights(user_id: int, currency: Optional[str] = None) -> Dict:
         """
         Get spending insights for the user.
 
         Args:
             user_id: The ID of the user
+            currency: Currency to report in, the user's by default
 
         Returns:
             Dictionary containing spending insights
+
+        Raises:
+            InvalidCurrency: If a day's spending has no exchange rate
         """
-        return {
-            "top_categories": SpendingAnalytics.objects.filter(user_id=user_id)
+        currency = currency or AnalyticsService.get_report_currency(user_id)
+        top_categories = list(
+            SpendingAnalytics.objects.filter(user_id=user_id)
+            .alias(converted_total=AnalyticsService._in_currency(currency))
             .values("category")
-            .annotate(total=Sum("total_amount"))
-            .order_by("-total")[:5],
+            .annotate(
+                total=Cast(Sum("converted_total"), MONEY_FIELD),
+                unconverted_count=Count("id", filter=Q(converted_total__isnull=True)),
+            )
+            .order_by("-total")
+        )
+        AnalyticsService._check_converted(
+            sum(row.pop("unconverted_count") for row in top_categories), currency
+        )
+        return {
+            "top_categories": top_categories[:5],
             "utilization_summary": BudgetUtilization.objects.filter(user_id=user_id)
             .values("category")
             .annotate(avg_utilization=Avg("utilization_percentage"))
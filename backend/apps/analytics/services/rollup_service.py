@@ -0,0 +1,481 @@
+"""
+Service layer for rebuilding analytics rollups in bulk.
+"""
+
+import calendar
+import json
+import time
+from datetime import date
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from apps.budgets.models import Budget
+from apps.expenses.models import Expense
+from ..models import (
+    AnalyticsRebuildCheckpoint,
+    BudgetUtilization,
+    SpendingAnalytics,
+    TagSpending,
+)
+from ..sketches import build_daily_sketches
+
+
+def _month_start(value: date) -> date:
+    """Return the first day of the month containing ``value``."""
+    return value.replace(day=1)
+
+
+def _month_end(value: date) -> date:
+    """Return the last day of the month containing ``value``."""
+    return value.replace(day=calendar.monthrange(value.year, value.month)[1])
+
+
+class RollupService:
+    """
+    Service class for rebuilding SpendingAnalytics, TagSpending and
+    BudgetUtilization.
+
+    Rollups are rewritten with set-based ``INSERT ... SELECT ... GROUP BY``
+    statements per user-id shard instead of re-saving expenses, so no model
+    signals fire and each shard costs a handful of statements. Amounts are
+    only summed within a currency.
+    """
+
+    SKETCH_BATCH_SIZE = 1000
+
+    @staticmethod
+    def get_user_bounds(
+        start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the lowest and highest user ID owning expenses in a date range.
+
+        Args:
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Tuple of the minimum and maximum user IDs, or ``(None, None)``
+        """
+        expenses = Expense.objects.all()
+        if start_date:
+            expenses = expenses.filter(date__gte=start_date)
+        if end_date:
+            expenses = expenses.filter(date__lte=end_date)
+        bounds = expenses.aggregate(low=Min("user_id"), high=Max("user_id"))
+        return bounds["low"], bounds["high"]
+
+    @staticmethod
+    def plan_shards(
+        user_start: int, user_end: int, shard_size: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Split an inclusive user-id range into shards.
+
+        Args:
+            user_start: First user ID
+            user_end: Last user ID
+            shard_size: Number of user IDs per shard
+
+        Returns:
+            List of inclusive ``(first, last)`` user-id ranges
+        """
+        return [
+            (low, min(low + shard_size - 1, user_end))
+            for low in range(user_start, user_end + 1, shard_size)
+        ]
+
+    @staticmethod
+    def create_checkpoints(
+        run_id: str,
+        shards: List[Tuple[int, int]],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Register the shards of a run and return those still pending.
+
+        Args:
+            run_id: Identifier of the rebuild run
+            shards: Inclusive user-id ranges
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Shards that have not been completed yet
+        """
+        AnalyticsRebuildCheckpoint.objects.bulk_create(
+            [
+                AnalyticsRebuildCheckpoint(
+                    run_id=run_id,
+                    user_start=low,
+                    user_end=high,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+                for low, high in shards
+            ],
+            ignore_conflicts=True,
+        )
+        completed = set(
+            AnalyticsRebuildCheckpoint.objects.filter(
+                run_id=run_id, completed_at__isnull=False
+            ).values_list("user_start", "user_end")
+        )
+        return [shard for shard in shards if shard not in completed]
+
+    @staticmethod
+    def rebuild_shard(
+        run_id: str,
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        sketches: bool = True,
+    ) -> Dict:
+        """
+        Rebuild all rollups for one user-id shard and mark it completed.
+
+        Args:
+            run_id: Identifier of the rebuild run
+            user_start: First user ID of the shard
+            user_end: Last user ID of the shard
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+            sketches: Whether to rebuild the amount/location sketches too
+
+        Returns:
+            Dictionary with row counts and duration of the shard
+        """
+        started = time.monotonic()
+        with transaction.atomic():
+            source_rows, spending_rows = RollupService.rebuild_spending_analytics(
+                user_start, user_end, start_date, end_date
+            )
+            if sketches:
+                RollupService.rebuild_sketches(
+                    user_start, user_end, start_date, end_date
+                )
+            tag_rows = RollupService.rebuild_tag_spending(
+                user_start, user_end, start_date, end_date
+            )
+            utilization_rows = RollupService.rebuild_budget_utilization(
+                user_start, user_end, start_date, end_date
+            )
+            duration = time.monotonic() - started
+            AnalyticsRebuildCheckpoint.objects.filter(
+                run_id=run_id, user_start=user_start, user_end=user_end
+            ).update(
+                source_rows=source_rows,
+                rollup_rows=spending_rows + tag_rows + utilization_rows,
+                duration_seconds=duration,
+                completed_at=timezone.now(),
+            )
+
+        return {
+            "user_start": user_start,
+            "user_end": user_end,
+            "source_rows": source_rows,
+            "spending_rows": spending_rows,
+            "tag_rows": tag_rows,
+            "utilization_rows": utilization_rows,
+            "duration": duration,
+        }
+
+    @staticmethod
+    def rebuild_spending_analytics(
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Tuple[int, int]:
+        """
+        Rewrite daily SpendingAnalytics rows for a shard with one INSERT SELECT.
+
+        Args:
+            user_start: First user ID of the shard
+            user_end: Last user ID of the shard
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Tuple of the number of expenses aggregated and rows written
+        """
+        analytics = SpendingAnalytics.objects.filter(
+            user_id__gte=user_start, user_id__lte=user_end
+        )
+        if start_date:
+            analytics = analytics.filter(date__gte=start_date)
+        if end_date:
+            analytics = analytics.filter(date__lte=end_date)
+        analytics.delete()
+
+        where, params = RollupService._expense_filter(
+            user_start, user_end, start_date, end_date
+        )
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {SpendingAnalytics._meta.db_table} (
+                    user_id, date, category, currency, total_amount,
+                    transaction_count, average_amount, amount_sketch,
+                    location_sketch, created_at, updated_at
+                )
+                SELECT user_id, date, category, currency, SUM(amount), COUNT(*),
+                       ROUND(AVG(amount), 2), CAST('{{}}' AS jsonb),
+                       CAST('{{}}' AS jsonb), %s, %s
+                FROM {Expense._meta.db_table}
+                WHERE {where}
+                GROUP BY user_id, date, category, currency
+                """,
+                [now, now, *params],
+            )
+            spending_rows = cursor.rowcount
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {Expense._meta.db_table} WHERE {where}", params
+            )
+            source_rows = cursor.fetchone()[0]
+        return source_rows, spending_rows
+
+    @staticmethod
+    def rebuild_sketches(
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """
+        Rebuild amount/location sketches for a shard's daily rows.
+
+        Streams the shard's expenses once in rollup order and writes the
+        sketches back in batches.
+
+        Args:
+            user_start: First user ID of the shard
+            user_end: Last user ID of the shard
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Number of rows updated
+        """
+        analytics = SpendingAnalytics.objects.filter(
+            user_id__gte=user_start, user_id__lte=user_end
+        )
+        expenses = Expense.objects.filter(
+            user_id__gte=user_start, user_id__lte=user_end
+        )
+        if start_date:
+            analytics = analytics.filter(date__gte=start_date)
+            expenses = expenses.filter(date__gte=start_date)
+        if end_date:
+            analytics = analytics.filter(date__lte=end_date)
+            expenses = expenses.filter(date__lte=end_date)
+
+        row_ids = {
+            (user_id, day, category, currency): pk
+            for pk, user_id, day, category, currency in analytics.values_list(
+                "id", "user_id", "date", "category", "currency"
+            ).iterator()
+        }
+        rows = (
+            expenses.order_by("user_id", "date", "category", "currency")
+            .values_list(
+                "user_id", "date", "category", "currency", "amount", "location"
+            )
+            .iterator(chunk_size=5000)
+        )
+
+        updated = 0
+        batch = []
+        for key, group in groupby(rows, key=lambda row: row[:4]):
+            amount_sketch, location_sketch = build_daily_sketches(
+                (amount, location) for *_, amount, location in group
+            )
+            batch.append({"id": row_ids[key], "a": amount_sketch, "l": location_sketch})
+            if len(batch) >= RollupService.SKETCH_BATCH_SIZE:
+                updated += RollupService._write_sketches(batch)
+                batch = []
+        if batch:
+            updated += RollupService._write_sketches(batch)
+        return updated
+
+    @staticmethod
+    def _write_sketches(batch: List[Dict]) -> int:
+        """Write a batch of sketches with a single UPDATE ... FROM statement."""
+        table = SpendingAnalytics._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table}
+                SET amount_sketch = batch.a, location_sketch = batch.l
+                FROM jsonb_to_recordset(CAST(%s AS jsonb))
+                     AS batch(id bigint, a jsonb, l jsonb)
+                WHERE {table}.id = batch.id
+                """,
+                [json.dumps(batch)],
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def rebuild_tag_spending(
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """
+        Rewrite monthly TagSpending rows for a shard with one INSERT SELECT.
+
+        Each expense is unnested into its distinct tags, so an expense
+        counts once towards every tag it carries. Months partially covered
+        by the date range are recomputed in full.
+
+        Args:
+            user_start: First user ID of the shard
+            user_end: Last user ID of the shard
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Number of rows written
+        """
+        month_from = _month_start(start_date) if start_date else None
+        month_to = _month_end(end_date) if end_date else None
+
+        tag_spending = TagSpending.objects.filter(
+            user_id__gte=user_start, user_id__lte=user_end
+        )
+        if month_from:
+            tag_spending = tag_spending.filter(month__gte=month_from)
+        if month_to:
+            tag_spending = tag_spending.filter(month__lte=month_to)
+        tag_spending.delete()
+
+        where, params = RollupService._expense_filter(
+            user_start, user_end, month_from, month_to
+        )
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {TagSpending._meta.db_table} (
+                    user_id, month, currency, tag, total_amount,
+                    transaction_count, created_at, updated_at
+                )
+                SELECT user_id, CAST(DATE_TRUNC('month', date) AS date), currency,
+                       tag, SUM(amount), COUNT(*), %s, %s
+                FROM {Expense._meta.db_table}
+                CROSS JOIN LATERAL (
+                    SELECT DISTINCT value #>> '{{}}' AS tag
+                    FROM jsonb_array_elements(
+                        CASE WHEN jsonb_typeof(tags) = 'array'
+                             THEN tags ELSE CAST('[]' AS jsonb) END
+                    )
+                    WHERE jsonb_typeof(value) = 'string'
+                ) AS expense_tags
+                WHERE {where}
+                GROUP BY 1, 2, 3, 4
+                """,
+                [now, now, *params],
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def rebuild_budget_utilization(
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """
+        Rewrite monthly BudgetUtilization rows for a shard with one INSERT SELECT.
+
+        Mirrors ``AnalyticsService.update_budget_utilization``: a row exists
+        for every month with spending and every budget active on the first
+        day of that month, counting spending in the budget's currency.
+        Months partially covered by the date range are recomputed in full.
+
+        Args:
+            user_start: First user ID of the shard
+            user_end: Last user ID of the shard
+            start_date: Optional start of the date range
+            end_date: Optional end of the date range
+
+        Returns:
+            Number of rows written
+        """
+        month_from = _month_start(start_date) if start_date else None
+        month_to = _month_end(end_date) if end_date else None
+
+        utilization = BudgetUtilization.objects.filter(
+            user_id__gte=user_start, user_id__lte=user_end
+        )
+        if month_from:
+            utilization = utilization.filter(month__gte=month_from)
+        if month_to:
+            utilization = utilization.filter(month__lte=month_to)
+        utilization.delete()
+
+        where, params = RollupService._expense_filter(
+            user_start, user_end, month_from, month_to
+        )
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH spent AS (
+                    SELECT user_id, category, currency,
+                           CAST(DATE_TRUNC('month', date) AS date) AS month,
+                           SUM(amount) AS amount
+                    FROM {Expense._meta.db_table}
+                    WHERE {where}
+                    GROUP BY 1, 2, 3, 4
+                ), months AS (
+                    SELECT DISTINCT user_id, month FROM spent
+                )
+                INSERT INTO {BudgetUtilization._meta.db_table} (
+                    user_id, category, currency, month, budget_amount,
+                    spent_amount, utilization_percentage, created_at, updated_at
+                )
+                SELECT DISTINCT ON (b.user_id, b.category, b.currency, m.month)
+                       b.user_id, b.category, b.currency, m.month, b.amount,
+                       COALESCE(s.amount, 0),
+                       LEAST(ROUND(COALESCE(s.amount, 0) * 100 / b.amount, 2), 999.99),
+                       %s, %s
+                FROM months m
+                JOIN {Budget._meta.db_table} b
+                  ON b.user_id = m.user_id
+                 AND b.start_date <= m.month
+                 AND b.end_date >= m.month
+                LEFT JOIN spent s
+                  ON s.user_id = b.user_id
+                 AND s.category = b.category
+                 AND s.currency = b.currency
+                 AND s.month = m.month
+                ORDER BY b.user_id, b.category, b.currency, m.month, b.id DESC
+                """,
+                [*params, now, now],
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _expense_filter(
+        user_start: int,
+        user_end: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Tuple[str, List]:
+        """Build the WHERE clause selecting a shard's expenses."""
+        clauses = ["user_id BETWEEN %s AND %s"]
+        params: List = [user_start, user_end]
+        if start_date:
+            clauses.append("date >= %s")
+            params.append(start_date)
+        if end_date:
+            clauses.append("date <= %s")
+            params.append(end_date)
+        return " AND ".join(clauses), params
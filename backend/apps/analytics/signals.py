@@ -2,61 +2,52 @@
 Signal handlers for analytics app.
 """
 
-from decimal import Decimal
-from django.db.models.signals import post_save
-from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.utils import timezone
 from apps.expenses.models import Expense
-from .models import SpendingAnalytics, BudgetUtilization
 from .services.analytics_service import AnalyticsService
 
 
 @receiver(post_save, sender=Expense)
-def update_analytics_on_expense(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=Expense)
+def update_analytics_on_expense(sender, instance, **kwargs):
     """
-    Update analytics when an expense is created or updated.
+    Update the daily rollups and budget utilization an expense left or joined.
+
+    Both the loaded and the saved day, category and currency are refreshed,
+    so edits that move, recategorize or delete an expense leave no stale
+    rows.
+
+    Args:
+        sender: The model class (Expense)
+        instance: The actual expense instance
+        **kwargs: Additional keyword arguments
+    """
+    entries = {instance.ledger_entry}
+    if hasattr(instance, "_loaded_ledger_entry"):
+        entries.add(instance._loaded_ledger_entry)
+    entries = [dict(zip(Expense.LEDGER_FIELDS, entry)) for entry in entries]
+    AnalyticsService.refresh_daily_rollups(
+        (entry["user_id"], entry["date"], entry["category"], entry["currency"])
+        for entry in entries
+    )
+    AnalyticsService.refresh_budget_utilization(
+        (entry["user_id"], entry["date"].replace(day=1)) for entry in entries
+    )
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def update_tag_spending_on_expense(sender, instance, **kwargs):
+    """
+    Update the tag rollups an expense left or joined.
 
     Args:
         sender: The model class (Expense)
         instance: The actual expense instance
-        created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if created or instance.amount != instance.amount:  # Check if amount changed
-        # Get or create analytics for the day
-        analytics, _ = SpendingAnalytics.objects.get_or_create(
-            user=instance.user,
-            date=instance.date,
-            category=instance.category,
-            defaults={
-                "total_amount": Decimal("0"),
-                "transaction_count": 0,
-                "average_amount": Decimal("0"),
-            },
-        )
-
-        # Calculate new totals
-        expenses_for_day = Expense.objects.filter(
-            user=instance.user, date=instance.date, category=instance.category
-        )
-
-        total_amount = expenses_for_day.aggregate(total=models.Sum("amount"))[
-            "total"
-        ] or Decimal("0")
-
-        transaction_count = expenses_for_day.count()
-        average_amount = (
-            total_amount / transaction_count if transaction_count > 0 else Decimal("0")
-        )
-
-        # Update analytics
-        analytics.total_amount = total_amount
-        analytics.transaction_count = transaction_count
-        analytics.average_amount = average_amount
-        analytics.save()
-
-        # Update budget utilization
-        AnalyticsService.update_budget_utilization(
-            user_id=instance.user.id, month=instance.date.replace(day=1)
-        )
+    keys = set(getattr(instance, "_loaded_tag_keys", ()))
+    if kwargs["signal"] is post_save:
+        keys |= instance.tag_keys
+    AnalyticsService.refresh_tag_rollups(keys)
@@ -0,0 +1,304 @@
+"""
+Mergeable summary sketches for spending analytics.
+
+Daily ``SpendingAnalytics`` rows keep a compact, JSON-serializable sketch of
+the transaction amounts (a merging t-digest) and of the distinct locations
+(a HyperLogLog). Sketches from any number of days can be merged, so range
+queries cost O(days x sketch size) instead of O(transactions).
+"""
+
+import base64
+import hashlib
+import math
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class QuantileSketch:
+    """
+    Merging t-digest for approximate quantiles of transaction amounts.
+
+    Centroids are kept sorted by mean. Small inputs stay exact because every
+    value keeps its own centroid until the digest grows past its compression.
+    """
+
+    VERSION = 1
+    DEFAULT_COMPRESSION = 100
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        centroids: Optional[List[Tuple[float, float]]] = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ):
+        self.compression = compression
+        self._centroids: List[Tuple[float, float]] = sorted(centroids or [])
+        self._buffer: List[Tuple[float, float]] = []
+        self.min = minimum
+        self.max = maximum
+
+    @property
+    def count(self) -> float:
+        """Total weight (number of values) added to the sketch."""
+        return sum(w for _, w in self._centroids) + sum(w for _, w in self._buffer)
+
+    def add(self, value, weight: float = 1) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: Numeric value (Decimal, int or float)
+            weight: Weight of the value
+        """
+        value = float(value)
+        self._buffer.append((value, weight))
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            QuantileSketch: This sketch, for chaining
+        """
+        if other.min is None:
+            return self
+        self._buffer.extend(other._centroids)
+        self._buffer.extend(other._buffer)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the value at quantile ``q``.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Estimated value or None for an empty sketch
+        """
+        self._compress()
+        if not self._centroids:
+            return None
+        if len(self._centroids) == 1 or q <= 0:
+            return self.min if q <= 0 else self._centroids[0][0]
+        if q >= 1:
+            return self.max
+
+        total = self.count
+        target = q * total
+        cumulative = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                if center == previous_center:
+                    return mean
+                fraction = (target - previous_center) / (center - previous_center)
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+            previous_mean, previous_center = mean, center
+
+        if total == previous_center:
+            return self.max
+        fraction = (target - previous_center) / (total - previous_center)
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def _k(self, q: float) -> float:
+        """Scale function mapping a quantile to centroid index space."""
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k: float) -> float:
+        """Inverse of the scale function."""
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        """Fold buffered values into the centroid list."""
+        if not self._buffer:
+            return
+        points = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in points)
+
+        merged: List[Tuple[float, float]] = []
+        current_mean, current_weight = points[0]
+        weight_so_far = 0.0
+        q_limit = self._q(self._k(0) + 1)
+        for mean, weight in points[1:]:
+            if (weight_so_far + current_weight + weight) / total <= q_limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                merged.append((current_mean, current_weight))
+                weight_so_far += current_weight
+                q_limit = self._q(self._k(min(weight_so_far / total, 1)) + 1)
+                current_mean, current_weight = mean, weight
+        merged.append((current_mean, current_weight))
+        self._centroids = merged
+
+    def to_dict(self) -> Dict:
+        """Serialize the sketch into a JSON-compatible dict."""
+        self._compress()
+        if not self._centroids:
+            return {}
+        return {
+            "v": self.VERSION,
+            "k": self.compression,
+            "c": [[round(mean, 4), weight] for mean, weight in self._centroids],
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "QuantileSketch":
+        """Rebuild a sketch from its serialized form."""
+        if not data:
+            return cls()
+        return cls(
+            compression=data.get("k", cls.DEFAULT_COMPRESSION),
+            centroids=[(mean, weight) for mean, weight in data.get("c", [])],
+            minimum=data.get("min"),
+            maximum=data.get("max"),
+        )
+
+
+class DistinctCountSketch:
+    """
+    HyperLogLog sketch for approximate distinct counts.
+
+    Registers are stored sparsely while few of them are set, which keeps the
+    per-day payload tiny, and switch to a dense base64 encoding once the
+    sparse form would be larger.
+    """
+
+    VERSION = 1
+    DEFAULT_PRECISION = 10
+
+    def __init__(
+        self,
+        precision: int = DEFAULT_PRECISION,
+        registers: Optional[Dict[int, int]] = None,
+    ):
+        self.precision = precision
+        self.size = 1 << precision
+        self._registers: Dict[int, int] = dict(registers or {})
+
+    @staticmethod
+    def normalize(value) -> str:
+        """Normalize a raw value so trivial variants count once."""
+        return " ".join(str(value).split()).casefold()
+
+    def add(self, value) -> None:
+        """
+        Add a value to the sketch. Blank values are ignored.
+
+        Args:
+            value: Value to count
+        """
+        value = self.normalize(value)
+        if not value:
+            return
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        remainder_bits = 64 - self.precision
+        remainder = hashed & ((1 << remainder_bits) - 1)
+        rank = remainder_bits - remainder.bit_length() + 1
+        if rank > self._registers.get(index, 0):
+            self._registers[index] = rank
+
+    def merge(self, other: "DistinctCountSketch") -> "DistinctCountSketch":
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            DistinctCountSketch: This sketch, for chaining
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision.")
+        for index, rank in other._registers.items():
+            if rank > self._registers.get(index, 0):
+                self._registers[index] = rank
+        return self
+
+    def estimate(self) -> int:
+        """
+        Estimate the number of distinct values.
+
+        Returns:
+            int: Approximate distinct count
+        """
+        if not self._registers:
+            return 0
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        zeros = m - len(self._registers)
+        harmonic = zeros + sum(2.0**-rank for rank in self._registers.values())
+        raw = alpha * m * m / harmonic
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict:
+        """Serialize the sketch into a JSON-compatible dict."""
+        if not self._registers:
+            return {}
+        data = {"v": self.VERSION, "p": self.precision}
+        if len(self._registers) * 8 < self.size:
+            data["s"] = {str(index): rank for index, rank in self._registers.items()}
+        else:
+            dense = bytearray(self.size)
+            for index, rank in self._registers.items():
+                dense[index] = rank
+            data["d"] = base64.b64encode(bytes(dense)).decode("ascii")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "DistinctCountSketch":
+        """Rebuild a sketch from its serialized form."""
+        if not data:
+            return cls()
+        if "d" in data:
+            dense = base64.b64decode(data["d"])
+            registers = {index: rank for index, rank in enumerate(dense) if rank}
+        else:
+            registers = {int(index): rank for index, rank in data.get("s", {}).items()}
+        return cls(precision=data.get("p", cls.DEFAULT_PRECISION), registers=registers)
+
+
+def build_daily_sketches(rows: Iterable[Tuple[Decimal, str]]) -> Tuple[Dict, Dict]:
+    """
+    Build the serialized amount and location sketches for one day.
+
+    Args:
+        rows: Iterable of ``(amount, location)`` pairs
+
+    Returns:
+        Tuple[Dict, Dict]: Serialized amount and location sketches
+    """
+    amounts = QuantileSketch()
+    locations = DistinctCountSketch()
+    for amount, location in rows:
+        amounts.add(amount)
+        if location:
+            locations.add(location)
+    return amounts.to_dict(), locations.to_dict()
+
+
+def percentile_label(q: float) -> str:
+    """Format a quantile as a response key, e.g. ``0.9`` -> ``p90``."""
+    return f"p{round(q * 100, 2):g}"
@@ -0,0 +1,68 @@
+"""
+Celery tasks for the analytics application.
+"""
+
+from datetime import date
+from typing import Optional
+from celery import group, shared_task
+from django.utils import timezone
+from .services.rollup_service import RollupService
+
+
+def _parse(value: Optional[str]) -> Optional[date]:
+    """Parse an ISO date passed through the JSON task serializer."""
+    return date.fromisoformat(value) if value else None
+
+
+@shared_task
+def rebuild_analytics_shard(
+    run_id: str,
+    user_start: int,
+    user_end: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sketches: bool = True,
+) -> dict:
+    """Rebuild analytics rollups for one user-id shard."""
+    result = RollupService.rebuild_shard(
+        run_id=run_id,
+        user_start=user_start,
+        user_end=user_end,
+        start_date=_parse(start_date),
+        end_date=_parse(end_date),
+        sketches=sketches,
+    )
+    result["duration"] = round(result["duration"], 3)
+    return result
+
+
+@shared_task
+def rebuild_analytics(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user_from: Optional[int] = None,
+    user_to: Optional[int] = None,
+    shard_size: int = 500,
+    run_id: Optional[str] = None,
+) -> str:
+    """
+    Fan out an analytics rebuild across workers, one task per pending shard.
+
+    Re-running with the same ``run_id`` only dispatches unfinished shards.
+    """
+    low, high = RollupService.get_user_bounds(_parse(start_date), _parse(end_date))
+    user_from = user_from if user_from is not None else low
+    user_to = user_to if user_to is not None else high
+    run_id = run_id or timezone.now().strftime("rebuild-%Y%m%d%H%M%S")
+    if user_from is None or user_to is None:
+        return run_id
+
+    shards = RollupService.plan_shards(user_from, user_to, shard_size)
+    pending = RollupService.create_checkpoints(
+        run_id, shards, _parse(start_date), _parse(end_date)
+    )
+    group(
+        rebuild_analytics_shard.s(run_id, low, high, start_date, end_date)
+        for low, high in pending
+    ).apply_async()
+    return run_id
@@ -0,0 +1,71 @@
+"""
+Tests for the calendar helpers.
+"""
+
+from datetime import date
+from django.test import SimpleTestCase
+from utils.helpers.calendar_helpers import (
+    add_periods,
+    expand_recurrence,
+    next_period_end,
+    period_bounds,
+)
+from utils.helpers.date_helpers import get_date_periods
+
+
+class CalendarHelperTests(SimpleTestCase):
+    """Test cases for calendar helpers."""
+
+    def test_add_periods_clamps_to_month_end(self):
+        """Test month steps keep the anchor day and clamp at month end."""
+        self.assertEqual(
+            add_periods(date(2024, 1, 31), 1, "MONTHLY"), date(2024, 2, 29)
+        )
+        self.assertEqual(add_periods(date(2024, 1, 31), 2, "month"), date(2024, 3, 31))
+        self.assertEqual(
+            add_periods(date(2024, 2, 29), 1, "month", anchor_day=31), date(2024, 3, 31)
+        )
+        self.assertEqual(add_periods(date(2024, 2, 29), 1, "YEARLY"), date(2025, 2, 28))
+        self.assertEqual(
+            add_periods(date(2024, 3, 31), -1, "quarter"), date(2023, 12, 31)
+        )
+
+    def test_expand_recurrence(self):
+        """Test recurrences expand without month-end drift."""
+        self.assertEqual(
+            expand_recurrence(date(2023, 11, 30), date(2024, 3, 1), "MONTHLY"),
+            [
+                date(2023, 11, 30),
+                date(2023, 12, 30),
+                date(2024, 1, 30),
+                date(2024, 2, 29),
+            ],
+        )
+        self.assertEqual(
+            len(expand_recurrence(date(2024, 1, 1), date(2024, 1, 29), "WEEKLY")), 5
+        )
+
+    def test_period_bounds(self):
+        """Test period bounds and recurring period ends."""
+        self.assertEqual(
+            period_bounds(date(2024, 8, 15), "quarter"),
+            (date(2024, 7, 1), date(2024, 9, 30)),
+        )
+        self.assertEqual(
+            period_bounds(date(2024, 1, 3), "week"),
+            (date(2024, 1, 1), date(2024, 1, 7)),
+        )
+        self.assertEqual(
+            next_period_end(date(2024, 2, 1), "MONTHLY"), date(2024, 2, 29)
+        )
+
+    def test_get_date_periods_clamped_to_range(self):
+        """Test date periods start at the requested start date."""
+        self.assertEqual(
+            get_date_periods(date(2024, 1, 15), date(2024, 3, 3)),
+            [
+                (date(2024, 1, 15), date(2024, 1, 31)),
+                (date(2024, 2, 1), date(2024, 2, 29)),
+                (date(2024, 3, 1), date(2024, 3, 3)),
+            ],
+        )
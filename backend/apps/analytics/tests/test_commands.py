@@ -0,0 +1,50 @@
+"""
+Tests for analytics management commands.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from apps.expenses.models import Expense
+from ..models import AnalyticsRebuildCheckpoint, SpendingAnalytics
+
+User = get_user_model()
+
+
+class RebuildAnalyticsCommandTests(TestCase):
+    """Test cases for the rebuild_analytics command."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="cmduser", email="cmd@example.com", password="testpass123"
+        )
+        self.today = datetime.now().date()
+        Expense.objects.create(
+            user=self.user,
+            title="Lunch",
+            category="FOOD",
+            amount=Decimal("12.00"),
+            date=self.today,
+        )
+
+    def test_rebuild_and_resume(self):
+        """Test rebuilding rollups and resuming a finished run."""
+        SpendingAnalytics.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_analytics", "--run-id", "cmd-run", stdout=out)
+
+        self.assertIn("rows/sec", out.getvalue())
+        self.assertEqual(
+            SpendingAnalytics.objects.get(user=self.user).total_amount, Decimal("12.00")
+        )
+        self.assertTrue(
+            AnalyticsRebuildCheckpoint.objects.get(run_id="cmd-run").completed_at
+        )
+
+        out = StringIO()
+        call_command("rebuild_analytics", "--run-id", "cmd-run", stdout=out)
+        self.assertIn("0 of 1 shards pending", out.getvalue())
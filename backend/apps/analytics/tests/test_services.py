@@ -7,9 +7,19 @@ from decimal import Decimal
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from apps.budgets.models import Budget
+from apps.currencies.models import ExchangeRate
 from apps.expenses.models import Expense
-from ..models import SpendingAnalytics, BudgetUtilization
+from apps.expenses.services import ExpenseWriteService
+from utils.exceptions.custom_exceptions import InvalidCurrency
+from utils.helpers.calendar_helpers import add_periods
+from ..models import (
+    AnalyticsRebuildCheckpoint,
+    SpendingAnalytics,
+    BudgetUtilization,
+    TagSpending,
+)
 from ..services.analytics_service import AnalyticsService
+from ..services.rollup_service import RollupService
 
 User = get_user_model()
 
@@ -58,3 +68,428 @@ class AnalyticsServiceTests(TestCase):
         ).first()
         self.assertIsNotNone(utilization)
         self.assertEqual(utilization.spent_amount, Decimal("100.00"))
+
+
+class SpendingDistributionTests(TestCase):
+    """Test cases for sketch-backed spending distribution."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="distuser", email="dist@example.com", password="testpass123"
+        )
+        self.today = datetime.now().date()
+        for days_ago, amount, location in [
+            (0, "10.00", "Cafe"),
+            (0, "20.00", "cafe"),
+            (1, "30.00", "Market"),
+            (2, "40.00", "Bakery"),
+            (2, "50.00", ""),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title="Expense",
+                category="FOOD",
+                amount=Decimal(amount),
+                date=self.today - timedelta(days=days_ago),
+                location=location,
+            )
+
+    def test_signal_stores_daily_sketches(self):
+        """Test the daily row carries sketches of its expenses."""
+        analytics = SpendingAnalytics.objects.get(
+            user=self.user, date=self.today, category="FOOD"
+        )
+        self.assertEqual(sum(w for _, w in analytics.amount_sketch["c"]), 2)
+        self.assertEqual(len(analytics.location_sketch["s"]), 1)
+
+    def test_maintained_on_update_and_delete(self):
+        """Test edited and deleted expenses leave their old daily rows."""
+        yesterday = self.today - timedelta(days=1)
+        expense = Expense.objects.get(user=self.user, date=self.today, amount=10)
+        expense.date = yesterday
+        expense.category = "TRANSPORT"
+        expense.save()
+
+        rows = SpendingAnalytics.objects.filter(user=self.user)
+        today_food = rows.get(date=self.today, category="FOOD")
+        self.assertEqual(
+            (today_food.total_amount, today_food.transaction_count),
+            (Decimal("20.00"), 1),
+        )
+        moved = rows.get(date=yesterday, category="TRANSPORT")
+        self.assertEqual(moved.total_amount, Decimal("10.00"))
+
+        expense.delete()
+        self.assertFalse(rows.filter(category="TRANSPORT").exists())
+
+        Expense.objects.get(user=self.user, date=self.today).delete()
+        self.assertFalse(rows.filter(date=self.today).exists())
+
+    def test_get_spending_heatmap(self):
+        """Test dense heatmap arrays built from daily rollups."""
+        start_date = self.today - timedelta(days=6)
+        with self.assertNumQueries(1):
+            heatmap = AnalyticsService.get_spending_heatmap(
+                user_id=self.user.id,
+                start_date=start_date,
+                end_date=self.today,
+                currency="USD",
+            )
+
+        self.assertEqual(len(heatmap["daily_totals"]), 7)
+        self.assertEqual(heatmap["daily_totals"][-1], 3000)
+        self.assertEqual(heatmap["daily_counts"][-3], 2)
+        self.assertEqual(heatmap["categories"], ["FOOD"])
+        self.assertEqual(sum(heatmap["weekday_totals"][0]), 15000)
+        self.assertEqual(heatmap["weekday_totals"][0][self.today.weekday()], 3000)
+
+    def test_get_spending_distribution(self):
+        """Test merging sketches over a date range."""
+        distribution = AnalyticsService.get_spending_distribution(
+            user_id=self.user.id,
+            start_date=self.today - timedelta(days=2),
+            end_date=self.today,
+            quantiles=(0.5, 1),
+        )
+        self.assertEqual(len(distribution), 1)
+        self.assertEqual(distribution[0]["transaction_count"], 5)
+        self.assertEqual(distribution[0]["percentiles"]["p50"], Decimal("30.00"))
+        self.assertEqual(distribution[0]["percentiles"]["p100"], Decimal("50.00"))
+        self.assertEqual(distribution[0]["distinct_locations"], 3)
+
+
+class MultiCurrencyAnalyticsTests(TestCase):
+    """Test cases for rollups and reports of expenses in several currencies."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="fxuser", email="fx@example.com", password="testpass123"
+        )
+        self.today = datetime.now().date()
+        self.yesterday = self.today - timedelta(days=1)
+        ExchangeRate.objects.create(
+            date=self.today - timedelta(days=10),
+            currency="EUR",
+            rate=Decimal("0.5"),
+            source="test",
+        )
+        Budget.objects.create(
+            user=self.user,
+            name="Groceries",
+            category="FOOD",
+            amount=Decimal("100.00"),
+            start_date=self.today.replace(day=1),
+            end_date=self.today.replace(day=1) + timedelta(days=60),
+        )
+        for amount, currency, day in [
+            ("10.00", "USD", self.today),
+            ("10.00", "EUR", self.today),
+            ("5.00", "EUR", self.yesterday),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title="Expense",
+                category="FOOD",
+                amount=Decimal(amount),
+                currency=currency,
+                date=day,
+            )
+
+    def _daily_rows(self):
+        return sorted(
+            SpendingAnalytics.objects.filter(user=self.user).values_list(
+                "date", "currency", "total_amount", "transaction_count"
+            )
+        )
+
+    def test_daily_rollup_per_currency(self):
+        """Test daily rows never add up amounts of different currencies."""
+        expected = [
+            (self.yesterday, "EUR", Decimal("5.00"), 1),
+            (self.today, "EUR", Decimal("10.00"), 1),
+            (self.today, "USD", Decimal("10.00"), 1),
+        ]
+        self.assertEqual(self._daily_rows(), expected)
+
+        RollupService.rebuild_shard("fx-run", self.user.id, self.user.id)
+        self.assertEqual(self._daily_rows(), expected)
+
+        utilization = BudgetUtilization.objects.get(user=self.user, category="FOOD")
+        self.assertEqual(
+            (utilization.currency, utilization.spent_amount), ("USD", Decimal("10.00"))
+        )
+
+    def test_reports_convert_to_one_currency(self):
+        """Test reports convert each day's spending at that day's rate."""
+        analytics = AnalyticsService.calculate_spending_analytics(
+            self.user.id, self.yesterday, self.today
+        )
+        self.assertEqual(analytics[0]["total_amount"], Decimal("40.00"))
+        self.assertEqual(analytics[0]["total_transactions"], 3)
+
+        trends = AnalyticsService.get_category_trends(
+            self.user.id, "FOOD", months=1, currency="EUR"
+        )
+        self.assertEqual(trends[0]["total_amount"], Decimal("20.00"))
+
+    def test_heatmap_converts_currencies(self):
+        """Test heatmap totals are minor units of the report currency."""
+        heatmap = AnalyticsService.get_spending_heatmap(
+            self.user.id, self.yesterday, self.today, currency="USD"
+        )
+        self.assertEqual(heatmap["currency"], "USD")
+        self.assertEqual(heatmap["daily_totals"], [1000, 3000])
+        self.assertEqual(heatmap["daily_counts"], [1, 2])
+
+        heatmap = AnalyticsService.get_spending_heatmap(
+            self.user.id, self.yesterday, self.today, currency="EUR"
+        )
+        self.assertEqual(heatmap["daily_totals"], [500, 1500])
+
+    def test_missing_rate_rejected(self):
+        """Test reports fail rather than leave out unconvertible spending."""
+        ExchangeRate.objects.all().delete()
+        with self.assertRaises(InvalidCurrency):
+            AnalyticsService.get_spending_heatmap(
+                self.user.id, self.yesterday, self.today, currency="USD"
+            )
+        with self.assertRaises(InvalidCurrency):
+            AnalyticsService.get_spending_insights(self.user.id)
+
+
+class CategoryTrendsTests(TestCase):
+    """Test cases for category trends."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="trenduser", email="trend@example.com", password="testpass123"
+        )
+        self.this_month = datetime.now().date().replace(day=1)
+        for months_ago, amount in [
+            (0, "10.00"),
+            (0, "20.00"),
+            (1, "30.00"),
+            (2, "40.00"),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title="Expense",
+                category="FOOD",
+                amount=Decimal(amount),
+                date=add_periods(self.this_month, -months_ago, "month"),
+            )
+
+    def test_only_requested_months(self):
+        """Test trends cover the requested months, newest first."""
+        trends = AnalyticsService.get_category_trends(self.user.id, "FOOD", months=2)
+
+        self.assertEqual(
+            [(trend["month"], trend["total_amount"]) for trend in trends],
+            [
+                (self.this_month, Decimal("30.00")),
+                (add_periods(self.this_month, -1, "month"), Decimal("30.00")),
+            ],
+        )
+        self.assertEqual(trends[0]["transaction_count"], 2)
+        self.assertEqual(
+            AnalyticsService.get_category_trends(self.user.id, "FOOD", months=0), []
+        )
+        self.assertEqual(
+            len(
+                AnalyticsService.get_category_trends(
+                    self.user.id, "FOOD", months=10**6
+                )
+            ),
+            3,
+        )
+
+
+class RollupServiceTests(TestCase):
+    """Test cases for RollupService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="rollupuser", email="rollup@example.com", password="testpass123"
+        )
+        self.today = datetime.now().date()
+        self.budget = Budget.objects.create(
+            user=self.user,
+            name="Groceries",
+            category="FOOD",
+            amount=Decimal("200.00"),
+            start_date=self.today.replace(day=1),
+            end_date=self.today.replace(day=1) + timedelta(days=60),
+        )
+        for amount, location in [("10.00", "Cafe"), ("25.50", "Market")]:
+            Expense.objects.create(
+                user=self.user,
+                title="Expense",
+                category="FOOD",
+                amount=Decimal(amount),
+                date=self.today,
+                location=location,
+            )
+        self.expected = SpendingAnalytics.objects.get(
+            user=self.user, date=self.today, category="FOOD"
+        )
+
+    def test_rebuild_shard_matches_signal_rollups(self):
+        """Test the set-based rebuild reproduces signal-maintained rows."""
+        SpendingAnalytics.objects.filter(user=self.user).update(
+            total_amount=Decimal("1.00"), transaction_count=99
+        )
+        BudgetUtilization.objects.filter(user=self.user).delete()
+
+        RollupService.create_checkpoints("test-run", [(self.user.id, self.user.id)])
+        result = RollupService.rebuild_shard("test-run", self.user.id, self.user.id)
+
+        self.assertEqual(result["source_rows"], 2)
+        analytics = SpendingAnalytics.objects.get(
+            user=self.user, date=self.today, category="FOOD"
+        )
+        self.assertEqual(analytics.total_amount, Decimal("35.50"))
+        self.assertEqual(analytics.transaction_count, 2)
+        self.assertEqual(analytics.average_amount, Decimal("17.75"))
+        self.assertEqual(analytics.amount_sketch, self.expected.amount_sketch)
+        self.assertEqual(analytics.location_sketch, self.expected.location_sketch)
+
+        utilization = BudgetUtilization.objects.get(user=self.user, category="FOOD")
+        self.assertEqual(utilization.spent_amount, Decimal("35.50"))
+        self.assertEqual(utilization.utilization_percentage, Decimal("17.75"))
+
+    def test_completed_shards_are_skipped(self):
+        """Test checkpoints make a run resumable."""
+        shards = RollupService.plan_shards(1, 25, 10)
+        self.assertEqual(shards, [(1, 10), (11, 20), (21, 25)])
+
+        RollupService.create_checkpoints("resume-run", shards)
+        RollupService.rebuild_shard("resume-run", 1, 10)
+        pending = RollupService.create_checkpoints("resume-run", shards)
+        self.assertEqual(pending, [(11, 20), (21, 25)])
+        self.assertEqual(
+            AnalyticsRebuildCheckpoint.objects.filter(run_id="resume-run").count(), 3
+        )
+
+
+class TagSpendingTests(TestCase):
+    """Test cases for the TagSpending rollup."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="taguser", email="tag@example.com", password="testpass123"
+        )
+        self.today = datetime.now().date()
+        self.month = self.today.replace(day=1)
+        self.last_month = (self.month - timedelta(days=1)).replace(day=1)
+        self.flight = self.create("Flight", "300.00", ["travel", "work"])
+        self.create("Hotel", "120.50", ["travel", "travel"])
+
+    def create(self, title, amount, tags, day=None):
+        return Expense.objects.create(
+            user=self.user,
+            title=title,
+            amount=Decimal(amount),
+            date=day or self.today,
+            tags=tags,
+        )
+
+    def rollup(self):
+        return {
+            (row.month, row.tag): (row.total_amount, row.transaction_count)
+            for row in TagSpending.objects.filter(user=self.user)
+        }
+
+    def test_maintained_on_save(self):
+        """Test saved expenses count once towards each of their tags."""
+        self.assertEqual(
+            self.rollup(),
+            {
+                (self.month, "travel"): (Decimal("420.50"), 2),
+                (self.month, "work"): (Decimal("300.00"), 1),
+            },
+        )
+
+    def test_maintained_on_update_and_delete(self):
+        """Test expenses leave the rollups of tags and months they no longer have."""
+        self.flight.tags = ["travel"]
+        self.flight.date = self.last_month
+        self.flight.save()
+        self.assertEqual(
+            self.rollup(),
+            {
+                (self.last_month, "travel"): (Decimal("300.00"), 1),
+                (self.month, "travel"): (Decimal("120.50"), 1),
+            },
+        )
+
+        self.flight.delete()
+        self.assertEqual(
+            self.rollup(), {(self.month, "travel"): (Decimal("120.50"), 1)}
+        )
+
+    def test_maintained_by_write_service(self):
+        """Test the signal-free write path updates the rollup after commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            ExpenseWriteService.create_many(
+                [
+                    {
+                        "user": self.user,
+                        "title": title,
+                        "amount": Decimal("10.00"),
+                        "date": self.today,
+                        "tags": tags,
+                    }
+                    for title, tags in [("Taxi", ["travel"]), ("Lunch", ["food"])]
+                ]
+            )
+        rollup = self.rollup()
+        self.assertEqual(rollup[(self.month, "travel")], (Decimal("430.50"), 3))
+        self.assertEqual(rollup[(self.month, "food")], (Decimal("10.00"), 1))
+
+    def test_rebuild_matches_incremental_rollup(self):
+        """Test the set-based rebuild reproduces the maintained rows."""
+        self.create("Old trip", "50.00", ["travel"], self.last_month)
+        expected = self.rollup()
+        TagSpending.objects.filter(user=self.user).update(total_amount=Decimal("1"))
+
+        RollupService.create_checkpoints("tag-run", [(self.user.id, self.user.id)])
+        result = RollupService.rebuild_shard("tag-run", self.user.id, self.user.id)
+
+        self.assertEqual(result["tag_rows"], 3)
+        self.assertEqual(self.rollup(), expected)
+
+    def test_get_tag_spending(self):
+        """Test per-tag totals over a range of months, highest first."""
+        self.create("Old trip", "50.00", ["travel"], self.last_month)
+        spending = AnalyticsService.get_tag_spending(
+            self.user.id, self.month, self.today
+        )
+        self.assertEqual(
+            spending,
+            [
+                {
+                    "tag": "travel",
+                    "total_amount": Decimal("420.50"),
+                    "transaction_count": 2,
+                    "average_amount": Decimal("210.25"),
+                },
+                {
+                    "tag": "work",
+                    "total_amount": Decimal("300.00"),
+                    "transaction_count": 1,
+                    "average_amount": Decimal("300.00"),
+                },
+            ],
+        )
+        spending = AnalyticsService.get_tag_spending(
+            self.user.id, self.last_month, self.month, tags=["travel"]
+        )
+        self.assertEqual(
+            [(row["tag"], row["total_amount"]) for row in spending],
+            [("travel", Decimal("470.50"))],
+        )
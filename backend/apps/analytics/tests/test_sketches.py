@@ -0,0 +1,75 @@
+"""
+Tests for analytics sketches.
+"""
+
+import random
+from django.test import SimpleTestCase
+from ..sketches import DistinctCountSketch, QuantileSketch, percentile_label
+
+
+class QuantileSketchTests(SimpleTestCase):
+    """Test cases for QuantileSketch."""
+
+    def test_small_input_is_exact(self):
+        """Test quantiles of a handful of values."""
+        sketch = QuantileSketch()
+        for value in [10, 20, 30, 40, 50]:
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.5), 30)
+        self.assertEqual(sketch.quantile(0), 10)
+        self.assertEqual(sketch.quantile(1), 50)
+
+    def test_merged_sketches_track_exact_quantiles(self):
+        """Test merging many daily sketches stays close to exact quantiles."""
+        rng = random.Random(42)
+        values = []
+        merged = QuantileSketch()
+        for _ in range(365):
+            day = QuantileSketch()
+            for _ in range(rng.randint(1, 30)):
+                value = round(rng.lognormvariate(3, 1), 2)
+                values.append(value)
+                day.add(value)
+            merged.merge(QuantileSketch.from_dict(day.to_dict()))
+
+        values.sort()
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(merged.quantile(q), exact, delta=exact * 0.03)
+        self.assertLessEqual(len(merged.to_dict()["c"]), 2 * merged.compression)
+
+    def test_empty_sketch(self):
+        """Test empty sketches serialize to an empty dict."""
+        sketch = QuantileSketch.from_dict({})
+        self.assertIsNone(sketch.quantile(0.5))
+        self.assertEqual(sketch.to_dict(), {})
+
+
+class DistinctCountSketchTests(SimpleTestCase):
+    """Test cases for DistinctCountSketch."""
+
+    def test_small_counts_are_exact(self):
+        """Test normalized duplicates count once."""
+        sketch = DistinctCountSketch()
+        for location in ["Cafe", " cafe ", "Market", "Gym", ""]:
+            sketch.add(location)
+        self.assertEqual(sketch.estimate(), 3)
+        self.assertIn("s", sketch.to_dict())
+
+    def test_merge_large_counts(self):
+        """Test merged dense sketches estimate within HLL error bounds."""
+        first, second = DistinctCountSketch(), DistinctCountSketch()
+        for i in range(6000):
+            first.add(f"merchant-{i}")
+        for i in range(4000, 10000):
+            second.add(f"merchant-{i}")
+
+        restored = DistinctCountSketch.from_dict(first.to_dict())
+        self.assertIn("d", first.to_dict())
+        restored.merge(DistinctCountSketch.from_dict(second.to_dict()))
+        self.assertAlmostEqual(restored.estimate(), 10000, delta=10000 * 0.1)
+
+    def test_percentile_label(self):
+        """Test percentile response keys."""
+        self.assertEqual(percentile_label(0.9), "p90")
+        self.assertEqual(percentile_label(0.995), "p99.5")
@@ -8,7 +8,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
-from ..models import SpendingAnalytics, BudgetUtilization
+from ..models import SpendingAnalytics, BudgetUtilization, TagSpending
 
 User = get_user_model()
 
@@ -47,3 +47,75 @@ class SpendingAnalyticsViewTests(APITestCase):
         }
         response = self.client.get(url, params)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_distribution_analytics(self):
+        """Test getting approximate spending distribution."""
+        url = reverse("spending-analytics-distribution")
+        params = {
+            "start_date": (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d"),
+            "end_date": datetime.now().strftime("%Y-%m-%d"),
+            "percentiles": "50,90",
+        }
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        params["percentiles"] = "150"
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_by_tag_analytics(self):
+        """Test getting spending totals per tag."""
+        month = datetime.now().date().replace(day=1)
+        for tag, total in [("travel", "80.00"), ("work", "120.00")]:
+            TagSpending.objects.create(
+                user=self.user,
+                month=month,
+                tag=tag,
+                total_amount=Decimal(total),
+                transaction_count=2,
+            )
+        url = reverse("spending-analytics-by-tag")
+        params = {
+            "start_month": (month - timedelta(days=1)).strftime("%Y-%m"),
+            "end_month": month.strftime("%Y-%m"),
+        }
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["tag"] for row in response.data], ["work", "travel"])
+        self.assertEqual(response.data[0]["average_amount"], "60.00")
+
+        response = self.client.get(url, {**params, "tags": "travel"})
+        self.assertEqual([row["tag"] for row in response.data], ["travel"])
+
+        response = self.client.get(url, {"start_month": "2024-13"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SpendingHeatmapViewTests(APITestCase):
+    """Test cases for the spending heatmap view."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="heatmapuser", email="heatmap@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        SpendingAnalytics.objects.create(
+            user=self.user,
+            date=datetime(2024, 2, 29).date(),
+            category="FOOD",
+            total_amount=Decimal("12.34"),
+            transaction_count=2,
+            average_amount=Decimal("6.17"),
+        )
+
+    def test_heatmap_for_year(self):
+        """Test getting a heatmap for a calendar year."""
+        response = self.client.get(reverse("spending-heatmap"), {"year": 2024})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["daily_totals"]), 366)
+        self.assertEqual(response.data["daily_totals"][59], 1234)
+        self.assertEqual(response.data["weekday_totals"], [[0, 0, 0, 1234, 0, 0, 0]])
+
+        response = self.client.get(reverse("spending-heatmap"), {"year": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -28,10 +28,22 @@ class BudgetAdmin(admin.ModelAdmin):
 
     date_hierarchy = "start_date"
 
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("spent_amount", "created_at", "updated_at")
 
     fieldsets = (
-        (None, {"fields": ("user", "name", "category", "amount", "description")}),
+        (
+            None,
+            {
+                "fields": (
+                    "user",
+                    "name",
+                    "category",
+                    "amount",
+                    "spent_amount",
+                    "description",
+                )
+            },
+        ),
         (_("Dates"), {"fields": ("start_date", "end_date")}),
         (
             _("Settings"),
@@ -9,24 +9,30 @@ from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
+from utils.mixins.read_serializer import ReadSerializerListMixin
 from ..models import Budget
 from ..serializers.budgets_serializer import (
     BudgetSerializer,
     BudgetCreateSerializer,
     BudgetUpdateSerializer,
     BudgetListSerializer,
+    BudgetListReadSerializer,
+    BudgetSimulationSerializer,
 )
 from ..services.budgets_service import BudgetService
+from ..services.simulation_service import BudgetSimulationService
 
 
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(ReadSerializerListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing budgets.
     """
 
     permission_classes = [IsAuthenticated]
+    read_serializer = BudgetListReadSerializer()
 
     def get_queryset(self):
         """Get queryset filtered by user."""
@@ -42,6 +48,8 @@ class BudgetViewSet(viewsets.ModelViewSet):
             return BudgetUpdateSerializer
         if self.action == "list":
             return BudgetListSerializer
+        if self.action == "simulate":
+            return BudgetSimulationSerializer
         return BudgetSerializer
 
     def perform_create(self, serializer):
@@ -123,3 +131,22 @@ class BudgetViewSet(viewsets.ModelViewSet):
             BudgetService.get_budget_summary(budget) for budget in active_budgets
         ]
         return Response(summaries)
+
+    @action(detail=False, methods=["post"])
+    def simulate(self, request: Request) -> Response:
+        """
+        Preview how planned expenses or budget changes would affect active
+        budgets, without writing anything.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            results = BudgetSimulationService.simulate(
+                user_id=request.user.id,
+                expenses=serializer.validated_data.get("expenses", []),
+                budget_changes=serializer.validated_data.get("budgets", []),
+            )
+        except ValidationError as e:
+            return Response(e.message_dict, status=status.HTTP_400_BAD_REQUEST)
+        return Response(results)
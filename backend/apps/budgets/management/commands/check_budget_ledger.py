@@ -0,0 +1,56 @@
+"""
+Management command to verify budget spend ledgers against expenses.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Budget
+from ...services.ledger_service import BudgetLedgerService
+
+
+class Command(BaseCommand):
+    """
+    Compare every budget's ``spent_amount`` with the sum of its expenses.
+
+    Drift can only come from writes that bypass the model layer, such as
+    ``QuerySet.update()`` on expenses or manual SQL. Without ``--fix`` the
+    command exits with an error when drift is found, so it can run as a
+    scheduled check.
+    """
+
+    help = "Check budget spent amounts against expenses and optionally repair them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only check this user's budgets")
+        parser.add_argument(
+            "--fix", action="store_true", help="Recompute drifted budgets"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of drifted budgets to list"
+        )
+
+    def handle(self, *args, **options):
+        budgets = Budget.objects.all()
+        if options["user"] is not None:
+            budgets = budgets.filter(user_id=options["user"])
+
+        drifted = BudgetLedgerService.find_drift(budgets).order_by("id")
+        drifted_ids = list(drifted.values_list("id", flat=True))
+        if not drifted_ids:
+            self.stdout.write(self.style.SUCCESS("All budget ledgers are consistent."))
+            return
+
+        for budget in drifted[: options["limit"]]:
+            self.stdout.write(
+                f"  budget {budget.id} (user {budget.user_id}, {budget.category}): "
+                f"ledger {budget.spent_amount}, expenses {budget.actual_spent}"
+            )
+
+        if not options["fix"]:
+            raise CommandError(
+                f"{len(drifted_ids)} budget ledgers drifted. Re-run with --fix to repair."
+            )
+
+        fixed = BudgetLedgerService.recalculate(
+            Budget.objects.filter(id__in=drifted_ids)
+        )
+        self.stdout.write(self.style.SUCCESS(f"Repaired {fixed} budget ledgers."))
@@ -0,0 +1,38 @@
+"""
+Management command to assign covering budgets to existing expenses.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.expenses.models import Expense
+from ...services.match_service import BACKFILL_CHUNK_SIZE, BudgetMatchService
+
+
+class Command(BaseCommand):
+    """
+    Assign each expense without a budget to the active budget covering it.
+
+    New expenses are matched when they are written; this backfills
+    expenses created before automatic matching, or before their budget
+    existed. Re-running only touches expenses that are still unassigned.
+    """
+
+    help = "Assign expenses without a budget to the active budget covering them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only match this user's expenses")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=BACKFILL_CHUNK_SIZE,
+            help="Number of expenses per UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        expenses = Expense.objects.all()
+        if options["user"] is not None:
+            expenses = expenses.filter(user_id=options["user"])
+
+        assigned = BudgetMatchService.backfill(expenses, options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Assigned {assigned} expenses to budgets.")
+        )
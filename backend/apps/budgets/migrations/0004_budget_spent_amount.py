@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:42
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def initialize_spent_amount(apps, schema_editor):
+    """Compute the ledger of existing budgets from their expenses."""
+    Budget = apps.get_model("budgets", "Budget")
+    Expense = apps.get_model("expenses", "Expense")
+
+    totals = (
+        Expense.objects.filter(
+            user_id=OuterRef("user_id"),
+            category=OuterRef("category"),
+            date__gte=OuterRef("start_date"),
+            date__lte=OuterRef("end_date"),
+        )
+        .order_by()
+        .values("user_id")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    Budget.objects.update(
+        spent_amount=Coalesce(
+            Subquery(totals, output_field=models.DecimalField()),
+            Value(Decimal("0.00")),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budgets", "0003_alter_budget_is_active"),
+        ("expenses", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="budget",
+            name="spent_amount",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("0.00"),
+                editable=False,
+                help_text="Running total of expenses in the budget's category and period, maintained by BudgetLedgerService",
+                max_digits=12,
+                verbose_name="Spent Amount",
+            ),
+        ),
+        migrations.RunPython(initialize_spent_amount, migrations.RunPython.noop),
+    ]
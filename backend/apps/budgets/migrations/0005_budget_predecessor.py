@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budgets", "0004_budget_spent_amount"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="budget",
+            name="predecessor",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Recurring budget this budget was rolled over from",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="successors",
+                to="budgets.budget",
+                verbose_name="Predecessor",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="budget",
+            constraint=models.UniqueConstraint(
+                fields=("predecessor", "start_date"),
+                name="budget_unique_successor_period",
+            ),
+        ),
+    ]
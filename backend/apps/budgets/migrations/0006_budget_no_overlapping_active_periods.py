@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:57
+
+import apps.budgets.models
+import django.contrib.postgres.constraints
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+# Overlaps could slip past the old serializer check under concurrency. Keep
+# the earliest budget of each overlapping pair active before adding the
+# constraint.
+DEACTIVATE_OVERLAPS = """
+UPDATE budgets_budget AS b
+SET is_active = false
+WHERE b.is_active AND EXISTS (
+    SELECT 1 FROM budgets_budget AS o
+    WHERE o.is_active
+      AND o.user_id = b.user_id
+      AND o.category = b.category
+      AND o.id < b.id
+      AND DATERANGE(o.start_date, o.end_date, '[]')
+          && DATERANGE(b.start_date, b.end_date, '[]')
+)
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budgets", "0005_budget_predecessor"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunSQL(DEACTIVATE_OVERLAPS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name="budget",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("is_active", True)),
+                expressions=[
+                    ("user", "="),
+                    ("category", "="),
+                    (apps.budgets.models.DateRange("start_date", "end_date"), "&&"),
+                ],
+                name="budget_no_overlapping_active_periods",
+                violation_error_message="An active budget already exists for this category during the specified period.",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:04
+
+import apps.budgets.models
+import django.contrib.postgres.constraints
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budgets", "0007_budget_currency"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="budget",
+            name="budget_no_overlapping_active_periods",
+        ),
+        migrations.AddConstraint(
+            model_name="budget",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("is_active", True)),
+                expressions=[
+                    ("user", "="),
+                    ("category", "="),
+                    ("currency", "="),
+                    (apps.budgets.models.DateRange("start_date", "end_date"), "&&"),
+                ],
+                name="budget_no_overlapping_active_periods",
+                violation_error_message="An active budget already exists for this category and currency during the specified period.",
+            ),
+        ),
+    ]
@@ -5,11 +5,60 @@ Models for the budgets application.
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
-from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeBoundary, RangeOperators
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from utils.helpers.calendar_helpers import RECURRENCE_PERIODS, next_period_end
+from apps.users.models import Profile
+
+
+BUDGET_OVERLAP_CONSTRAINT = "budget_no_overlapping_active_periods"
+BUDGET_OVERLAP_MESSAGE = _(
+    "An active budget already exists for this category and currency during the "
+    "specified period."
+)
+
+
+class DateRange(models.Func):
+    """Inclusive ``daterange(start, end, '[]')`` of two date expressions."""
+
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(start, end, RangeBoundary(inclusive_upper=True), **extra)
+
+
+class BudgetQuerySet(models.QuerySet):
+    """
+    Range lookups served by the GiST index behind the overlap constraint.
+
+    The index only covers active budgets, so these lookups filter on
+    ``is_active`` and are meant to be combined with user, category and
+    currency.
+    """
+
+    def _with_period(self):
+        return self.filter(is_active=True).alias(
+            period=DateRange("start_date", "end_date")
+        )
+
+    def covering(self, day: date) -> "BudgetQuerySet":
+        """Active budgets whose period contains ``day``."""
+        return self._with_period().filter(period__contains=day)
+
+    def overlapping(self, start_date: date, end_date: date) -> "BudgetQuerySet":
+        """Active budgets whose period overlaps ``start_date``..``end_date``."""
+        return self._with_period().filter(
+            period__overlap=DateRange(
+                models.Value(start_date, models.DateField()),
+                models.Value(end_date, models.DateField()),
+            )
+        )
 
 
 class Budget(models.Model):
@@ -51,6 +100,12 @@ class Budget(models.Model):
         decimal_places=2,
         validators=[MinValueValidator(Decimal("0.01"))],
     )
+    currency = models.CharField(
+        _("Currency"),
+        max_length=3,
+        choices=Profile.CurrencyChoices.choices,
+        default=Profile.CurrencyChoices.USD,
+    )
     category = models.CharField(
         _("Category"),
         max_length=100,
@@ -92,6 +147,31 @@ class Budget(models.Model):
         blank=True,
         help_text=_("Additional metadata for the budget"),
     )
+    predecessor = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="successors",
+        verbose_name=_("Predecessor"),
+        help_text=_("Recurring budget this budget was rolled over from"),
+    )
+    spent_amount = models.DecimalField(
+        _("Spent Amount"),
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        editable=False,
+        help_text=_(
+            "Running total of expenses in the budget's category and period, "
+            "maintained by BudgetLedgerService"
+        ),
+    )
+
+    objects = BudgetQuerySet.as_manager()
+
+    # Fields that decide which expenses count towards ``spent_amount``
+    LEDGER_FIELDS = ("user_id", "category", "currency", "start_date", "end_date")
 
     class Meta:
         """
@@ -114,6 +194,23 @@ class Budget(models.Model):
             models.CheckConstraint(
                 check=models.Q(amount__gt=0), name="budget_amount_positive"
             ),
+            # A recurring budget rolls over into at most one budget per period
+            models.UniqueConstraint(
+                fields=["predecessor", "start_date"],
+                name="budget_unique_successor_period",
+            ),
+            # One active budget per user, category and currency at any date
+            ExclusionConstraint(
+                name=BUDGET_OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("user", RangeOperators.EQUAL),
+                    ("category", RangeOperators.EQUAL),
+                    ("currency", RangeOperators.EQUAL),
+                    (DateRange("start_date", "end_date"), RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(is_active=True),
+                violation_error_message=BUDGET_OVERLAP_MESSAGE,
+            ),
         ]
 
     def __str__(self) -> str:
@@ -130,12 +227,63 @@ class Budget(models.Model):
         if self.end_date and self.start_date and self.end_date < self.start_date:
             raise ValidationError(_("End date must not be before start date."))
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the loaded ledger fields to detect scope changes on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_ledger_key = instance.ledger_key
+        return instance
+
+    @property
+    def ledger_key(self) -> tuple:
+        """Values deciding which expenses count towards the budget."""
+        return tuple(getattr(self, field) for field in self.LEDGER_FIELDS)
+
     def save(self, *args, **kwargs):
         """
         Override save to perform custom validation.
+
+        ``spent_amount`` is recalculated when the budget is created or its
+        category, period or owner change. Otherwise it is left out of the
+        UPDATE so a stale instance cannot overwrite concurrent ledger
+        updates.
         """
-        self.full_clean()
-        super().save(*args, **kwargs)
+        from .services.ledger_service import BudgetLedgerService
+
+        # Constraints are enforced by the database on write; validating them
+        # here would cost a query per constraint and still be racy
+        self.full_clean(validate_constraints=False)
+        if self._state.adding or self.ledger_key != getattr(
+            self, "_loaded_ledger_key", None
+        ):
+            self.spent_amount = BudgetLedgerService.calculate_spent(self)
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "spent_amount"}
+        elif kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "spent_amount"
+            ]
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            self._raise_for_overlap(exc)
+            raise
+        self._loaded_ledger_key = self.ledger_key
+
+    @staticmethod
+    def _raise_for_overlap(exc: IntegrityError) -> None:
+        """Translate an overlap constraint violation into a ValidationError."""
+        from django.core.exceptions import ValidationError
+
+        diag = getattr(exc.__cause__, "diag", None)
+        constraint = getattr(diag, "constraint_name", None) or str(exc)
+        if BUDGET_OVERLAP_CONSTRAINT in constraint:
+            raise ValidationError({"category": BUDGET_OVERLAP_MESSAGE}) from exc
 
     @property
     def is_expired(self) -> bool:
@@ -144,15 +292,8 @@ class Budget(models.Model):
 
     @property
     def remaining_amount(self) -> Decimal:
-        """Calculate remaining budget amount."""
-        from apps.expenses.models import Expense
-
-        total_expenses = Expense.objects.filter(
-            user=self.user,
-            category=self.category,
-            date__range=(self.start_date, self.end_date),
-        ).aggregate(total=models.Sum("amount"))["total"] or Decimal("0")
-        return self.amount - total_expenses
+        """Calculate remaining budget amount from the spend ledger."""
+        return self.amount - self.spent_amount
 
     @property
     def utilization_percentage(self) -> Decimal:
@@ -162,30 +303,35 @@ class Budget(models.Model):
         utilized = self.amount - self.remaining_amount
         return (utilized / self.amount * 100).quantize(Decimal("0.01"))
 
-    def calculate_next_end_date(self) -> date:
+    def counts_towards(
+        self, user_id: int, category: str, currency: str, expense_date: date
+    ) -> bool:
         """
-        Calculate the end date for the next recurring period.
-        """
-        start_date = self.end_date + timedelta(days=1)
-
-        if self.recurrence == self.RecurrenceChoices.DAILY:
-            return start_date
+        Check if an expense with these values counts towards the budget.
 
-        elif self.recurrence == self.RecurrenceChoices.WEEKLY:
-            return start_date + timedelta(days=6)
-
-        elif self.recurrence == self.RecurrenceChoices.MONTHLY:
-            if start_date.month == 12:
-                next_month = date(start_date.year + 1, 1, start_date.day)
-            else:
-                next_month = date(start_date.year, start_date.month + 1, start_date.day)
-            return next_month - timedelta(days=1)
+        Args:
+            user_id: Expense owner ID
+            category: Expense category
+            currency: Expense currency
+            expense_date: Expense date
 
-        elif self.recurrence == self.RecurrenceChoices.YEARLY:
-            next_year = date(start_date.year + 1, start_date.month, start_date.day)
-            return next_year - timedelta(days=1)
+        Returns:
+            bool: True if the expense is part of the budget's spent amount
+        """
+        return (
+            user_id == self.user_id
+            and category == self.category
+            and currency == self.currency
+            and self.start_date <= expense_date <= self.end_date
+        )
 
-        return self.end_date
+    def calculate_next_end_date(self) -> date:
+        """
+        Calculate the end date for the next recurring period.
+        """
+        if self.recurrence not in RECURRENCE_PERIODS:
+            return self.end_date
+        return next_period_end(self.end_date + timedelta(days=1), self.recurrence)
 
     @property
     def days_remaining(self) -> int:
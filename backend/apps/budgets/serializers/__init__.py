@@ -7,4 +7,6 @@ from .budgets_serializer import (  # noqa: F401
     BudgetCreateSerializer,
     BudgetUpdateSerializer,
     BudgetListSerializer,
+    BudgetListReadSerializer,
+    BudgetSimulationSerializer,
 )
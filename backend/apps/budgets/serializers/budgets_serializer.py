@@ -2,10 +2,15 @@
 Serializers for the budgets application.
 """
 
+from decimal import Decimal
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.translation import gettext_lazy as _
+from utils.helpers.read_serializers import ReadSerializer, format_decimal
 from ..models import Budget
-from django.db import models
+
+# Planned expenses or budget changes accepted by one simulation request
+SIMULATION_MAX_ITEMS = 100
 
 
 class BudgetSerializer(serializers.ModelSerializer):
@@ -31,6 +36,7 @@ class BudgetSerializer(serializers.ModelSerializer):
             "id",
             "name",
             "amount",
+            "currency",
             "category",
             "start_date",
             "end_date",
@@ -46,6 +52,24 @@ class BudgetSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
+    def create(self, validated_data):
+        """Create the budget, reporting constraint violations as field errors."""
+        try:
+            return super().create(validated_data)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(
+                exc.message_dict if hasattr(exc, "error_dict") else exc.messages
+            ) from exc
+
+    def update(self, instance, validated_data):
+        """Update the budget, reporting constraint violations as field errors."""
+        try:
+            return super().update(instance, validated_data)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(
+                exc.message_dict if hasattr(exc, "error_dict") else exc.messages
+            ) from exc
+
     def validate(self, data):
         """
         Validate budget data.
@@ -74,38 +98,12 @@ class BudgetCreateSerializer(BudgetSerializer):
     def validate(self, data):
         """
         Validate budget creation data.
-        Ensures no overlapping budgets for the same category.
-        Automatically activates the budget if no overlapping active budget exists.
+        New budgets are always active; overlapping active budgets for the
+        same category and currency are rejected by the database exclusion
+        constraint.
         """
         data = super().validate(data)
-
-        # Check for overlapping budgets in the same category
-        overlapping_budgets = Budget.objects.filter(
-            user=data["user"], category=data["category"], is_active=True
-        ).filter(
-            models.Q(start_date__lte=data["end_date"], end_date__gte=data["start_date"])
-        )
-
-        # Logging for debugging
-        print("Overlapping budgets:", overlapping_budgets)
-
-        if self.instance:
-            overlapping_budgets = overlapping_budgets.exclude(pk=self.instance.pk)
-
-        if overlapping_budgets.exists():
-            raise serializers.ValidationError(
-                {
-                    "category": _(
-                        "An active budget already exists for this category "
-                        "during the specified period."
-                    )
-                }
-            )
-
-        # Automatically activate the budget if no overlapping active budget exists
-        if not overlapping_budgets.exists():
-            data["is_active"] = True
-
+        data["is_active"] = True
         return data
 
 
@@ -127,8 +125,7 @@ class BudgetUpdateSerializer(BudgetSerializer):
         Prevents reducing budget below spent amount.
         """
         if self.instance and value < self.instance.amount:
-            spent_amount = self.instance.amount - self.instance.remaining_amount
-            if value < spent_amount:
+            if value < self.instance.spent_amount:
                 raise serializers.ValidationError(
                     _("Cannot reduce budget below spent amount.")
                 )
@@ -150,8 +147,115 @@ class BudgetListSerializer(BudgetSerializer):
             "name",
             "category",
             "amount",
+            "currency",
             "remaining_amount",
             "utilization_percentage",
             "is_active",
             "is_expired",
         ]
+
+
+class BudgetListReadSerializer(ReadSerializer):
+    """
+    Read serializer for listing budgets, with BudgetListSerializer's output.
+    """
+
+    columns = (
+        "id",
+        "name",
+        "category",
+        "amount",
+        "currency",
+        "spent_amount",
+        "is_active",
+        "end_date",
+    )
+
+    def get_context(self):
+        """Add today."""
+        context = super().get_context()
+        context["today"] = context["now"].date()
+        return context
+
+    def to_representation(self, row, context):
+        """Serialize one budget, computing what the model properties do."""
+        amount = row["amount"]
+        spent_amount = row["spent_amount"]
+        utilization = (
+            (spent_amount / amount * 100).quantize(Decimal("0.01"))
+            if amount
+            else Decimal("0.00")
+        )
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "category": row["category"],
+            "amount": format_decimal(amount),
+            "currency": row["currency"],
+            "remaining_amount": format_decimal(amount - spent_amount),
+            "utilization_percentage": format_decimal(utilization),
+            "is_active": row["is_active"],
+            "is_expired": context["today"] > row["end_date"],
+        }
+
+
+class SimulatedExpenseSerializer(serializers.Serializer):
+    """
+    Serializer for a planned expense in a budget simulation.
+    """
+
+    amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01")
+    )
+    category = serializers.ChoiceField(choices=Budget.CategoryChoices.choices)
+    currency = serializers.ChoiceField(
+        choices=Budget._meta.get_field("currency").choices, required=False
+    )
+    date = serializers.DateField(required=False)
+
+
+class BudgetChangeSerializer(serializers.Serializer):
+    """
+    Serializer for a hypothetical change to an active budget.
+    """
+
+    id = serializers.IntegerField()
+    amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01"), required=False
+    )
+    notification_threshold = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        min_value=Decimal("0.01"),
+        max_value=Decimal("100.00"),
+        required=False,
+    )
+
+    def validate(self, data):
+        """Require at least one changed value."""
+        if "amount" not in data and "notification_threshold" not in data:
+            raise serializers.ValidationError(
+                _("Provide a new amount or notification threshold.")
+            )
+        return data
+
+
+class BudgetSimulationSerializer(serializers.Serializer):
+    """
+    Serializer for budget "what-if" simulation requests.
+    """
+
+    expenses = SimulatedExpenseSerializer(
+        many=True, required=False, max_length=SIMULATION_MAX_ITEMS
+    )
+    budgets = BudgetChangeSerializer(
+        many=True, required=False, max_length=SIMULATION_MAX_ITEMS
+    )
+
+    def validate(self, data):
+        """Require at least one planned expense or budget change."""
+        if not data.get("expenses") and not data.get("budgets"):
+            raise serializers.ValidationError(
+                _("Provide planned expenses or budget changes to simulate.")
+            )
+        return data
@@ -3,3 +3,6 @@ Budgets services initialization.
 """
 
 from .budgets_service import BudgetService  # noqa: F401
+from .ledger_service import BudgetLedgerService  # noqa: F401
+from .match_service import BudgetMatchService  # noqa: F401
+from .simulation_service import BudgetSimulationService  # noqa: F401
@@ -2,18 +2,24 @@
 Service layer for budget operations.
 """
 
+import logging
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Union
-from django.db.models import Q, Sum
+from typing import Dict, Iterable, List, Optional, Union
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Sum
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
+from utils.helpers.calendar_helpers import RECURRENCE_PERIODS, next_period_end
 from ..models import Budget
 from apps.expenses.models import Expense
 from apps.notifications.services import NotificationService
 
+logger = logging.getLogger(__name__)
+
 
 class BudgetService:
     """
@@ -100,6 +106,28 @@ class BudgetService:
             "days_remaining": (budget.end_date - timezone.now().date()).days,
         }
 
+    @staticmethod
+    def send_budget_alerts(budget_ids: Iterable[int]) -> None:
+        """
+        Send exceeded or threshold alerts for budgets that received expenses.
+
+        Spending is read from the budget ledger in one query and each budget
+        gets at most one alert, the exceeded alert taking precedence.
+
+        Args:
+            budget_ids: IDs of the budgets to check
+        """
+        budget_ids = set(budget_ids)
+        if not budget_ids:
+            return
+
+        budgets = Budget.objects.filter(id__in=budget_ids).select_related("user")
+        for budget in budgets:
+            if budget.spent_amount > budget.amount:
+                NotificationService.send_budget_exceeded_notification(budget)
+            elif budget.utilization_percentage >= budget.notification_threshold:
+                NotificationService.send_budget_threshold_notification(budget)
+
     @staticmethod
     def check_budget_thresholds(user_id: int) -> None:
         """
@@ -139,48 +167,171 @@ class BudgetService:
 
         return Budget.objects.filter(query)
 
+    ROLLOVER_CHUNK_SIZE = 1000
+
     @staticmethod
-    def rollover_recurring_budgets() -> None:
+    def rollover_recurring_budgets(
+        as_of: Optional[date] = None,
+        catch_up_days: int = 7,
+        chunk_size: Optional[int] = None,
+    ) -> int:
         """
-        Create new budgets for recurring budgets that are ending.
+        Create successor budgets for recurring budgets that have ended.
+
+        Ending budgets are processed in primary key chunks. Each chunk is
+        locked with ``SKIP LOCKED`` so concurrent runs split the work,
+        successor periods are computed once per distinct (end date,
+        recurrence) pair, and successors are inserted with one
+        ``bulk_create``. The ``(predecessor, start_date)`` unique constraint
+        guarantees a budget never rolls over twice, so re-running is safe.
+
+        A successor that would overlap another active budget of the same
+        user, category and currency, such as one the user already created
+        for the next period, is skipped and logged, as the overlap
+        constraint would reject it. Its budget is retried on later runs
+        within ``catch_up_days``.
+
+        Args:
+            as_of: Day whose ending budgets roll over, defaults to today
+            catch_up_days: Also roll over budgets that ended this many days
+                earlier without a successor, to recover missed runs
+            chunk_size: Budgets per chunk
+
+        Returns:
+            int: Number of budgets created
         """
-        tomorrow = timezone.now().date() + timedelta(days=1)
-        ending_budgets = Budget.objects.filter(
+        from .ledger_service import BudgetLedgerService
+        from .match_service import BudgetMatchService
+
+        as_of = as_of or timezone.now().date()
+        chunk_size = chunk_size or BudgetService.ROLLOVER_CHUNK_SIZE
+        recurrences = [
+            choice
+            for choice in Budget.RecurrenceChoices.values
+            if choice in RECURRENCE_PERIODS
+        ]
+        ending = Budget.objects.filter(
             is_active=True,
-            end_date=timezone.now().date(),
-            recurrence__in=["DAILY", "WEEKLY", "MONTHLY", "YEARLY"],
-        )
+            recurrence__in=recurrences,
+            end_date__gte=as_of - timedelta(days=catch_up_days),
+            end_date__lte=as_of,
+        ).exclude(Exists(Budget.objects.filter(predecessor=OuterRef("pk"))))
+
+        periods: Dict[tuple, tuple] = {}
+        created = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                chunk = list(
+                    ending.filter(id__gt=last_id)
+                    .order_by("id")
+                    .select_for_update(skip_locked=True, of=("self",))[:chunk_size]
+                )
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+
+                successors = []
+                for budget in chunk:
+                    key = (budget.end_date, budget.recurrence)
+                    if key not in periods:
+                        start = budget.end_date + timedelta(days=1)
+                        periods[key] = (
+                            start,
+                            next_period_end(start, budget.recurrence),
+                        )
+                    start_date, end_date = periods[key]
+                    successors.append(
+                        Budget(
+                            user_id=budget.user_id,
+                            predecessor_id=budget.id,
+                            name=budget.name,
+                            amount=budget.amount,
+                            currency=budget.currency,
+                            category=budget.category,
+                            start_date=start_date,
+                            end_date=end_date,
+                            recurrence=budget.recurrence,
+                            notification_threshold=budget.notification_threshold,
+                            description=budget.description,
+                            color=budget.color,
+                            is_active=True,
+                        )
+                    )
+                successors = BudgetService._without_overlaps(successors)
+                Budget.objects.bulk_create(successors)
+
+                # Successors of missed runs may already have spending
+                started = [
+                    budget.id for budget in successors if budget.start_date <= as_of
+                ]
+                if started:
+                    BudgetLedgerService.recalculate(
+                        Budget.objects.filter(id__in=started)
+                    )
+
+                transaction.on_commit(
+                    lambda successors=successors: (
+                        NotificationService.send_budget_creation_notifications(
+                            successors
+                        )
+                    )
+                )
+                # bulk_create sends no signals
+                BudgetMatchService.invalidate({budget.user_id for budget in successors})
+                created += len(successors)
+        return created
 
-        for budget in ending_budgets:
-            # Calculate new dates based on recurrence
-            if budget.recurrence == "DAILY":
-                new_start = tomorrow
-                new_end = tomorrow
-            elif budget.recurrence == "WEEKLY":
-                new_start = tomorrow
-                new_end = new_start + timedelta(days=6)
-            elif budget.recurrence == "MONTHLY":
-                new_start = tomorrow
-                # Set to last day of next month
-                next_month = new_start.replace(day=28) + timedelta(days=4)
-                new_end = next_month - timedelta(days=next_month.day)
-            else:  # YEARLY
-                new_start = tomorrow
-                new_end = new_start.replace(year=new_start.year + 1) - timedelta(days=1)
-
-            # Create new budget
-            Budget.objects.create(
-                user=budget.user,
-                name=budget.name,
-                amount=budget.amount,
-                category=budget.category,
-                start_date=new_start,
-                end_date=new_end,
-                recurrence=budget.recurrence,
-                notification_threshold=budget.notification_threshold,
-                description=budget.description,
-                is_active=True,
-            )
+    @staticmethod
+    def _without_overlaps(successors: List[Budget]) -> List[Budget]:
+        """
+        Drop successors overlapping an active budget of their user, category
+        and currency.
+
+        Existing budgets are read in one query, a union of the ``overlapping``
+        lookup per distinct successor period. Successors are also checked
+        against each other.
+
+        Args:
+            successors: Unsaved successor budgets
+
+        Returns:
+            List[Budget]: Successors that can be inserted
+        """
+        users_by_period: Dict[tuple, set] = defaultdict(set)
+        for budget in successors:
+            users_by_period[(budget.start_date, budget.end_date)].add(budget.user_id)
+        querysets = [
+            Budget.objects.overlapping(start_date, end_date)
+            .filter(user_id__in=users)
+            .values_list("user_id", "category", "currency", "start_date", "end_date")
+            for (start_date, end_date), users in users_by_period.items()
+        ]
+        periods: Dict[tuple, List[tuple]] = defaultdict(list)
+        if querysets:
+            for user_id, category, currency, start_date, end_date in querysets[0].union(
+                *querysets[1:], all=True
+            ):
+                periods[(user_id, category, currency)].append((start_date, end_date))
+
+        kept = []
+        for budget in successors:
+            taken = periods[(budget.user_id, budget.category, budget.currency)]
+            if any(
+                start_date <= budget.end_date and budget.start_date <= end_date
+                for start_date, end_date in taken
+            ):
+                logger.info(
+                    "Skipped rolling over budget %s: an active budget overlaps "
+                    "%s..%s",
+                    budget.predecessor_id,
+                    budget.start_date,
+                    budget.end_date,
+                )
+                continue
+            taken.append((budget.start_date, budget.end_date))
+            kept.append(budget)
+        return kept
 
     @staticmethod
     def calculate_budget_forecast(user_id: int, months_ahead: int = 3) -> List[Dict]:
@@ -215,11 +366,11 @@ class BudgetService:
             # Project spending for future months
             for month in range(1, months_ahead + 1):
                 forecast_date = today + timedelta(days=30 * month)
-                budget = active_budgets.filter(
-                    category=category,
-                    start_date__lte=forecast_date,
-                    end_date__gte=forecast_date,
-                ).first()
+                budget = (
+                    active_budgets.filter(category=category)
+                    .covering(forecast_date)
+                    .first()
+                )
 
                 forecasts.append(
                     {
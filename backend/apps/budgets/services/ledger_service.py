@@ -0,0 +1,250 @@
+"""
+Service layer for the per-budget spend ledger.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, Optional, Tuple
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from utils.exceptions.custom_exceptions import BudgetLimitExceeded
+from ..models import Budget
+
+# (user_id, category, currency, date, signed amount)
+LedgerEntry = Tuple[int, str, str, date, Decimal]
+
+
+class BudgetLedgerService:
+    """
+    Service class maintaining ``Budget.spent_amount``.
+
+    A budget's spent amount is the total of the owner's expenses in the
+    budget's category and currency during its period. Expense writes apply signed
+    entries with ``F()`` updates under row locks, so reading the remaining
+    amount or utilization of a budget never aggregates expenses.
+
+    The same counter enforces budget limits: an expense attached to a
+    budget reserves its amount with a conditional UPDATE, so concurrent
+    writers cannot both pass an "aggregate then compare" check and
+    together overspend.
+    """
+
+    @staticmethod
+    def calculate_spent(budget: Budget) -> Decimal:
+        """
+        Sum the expenses counting towards a budget.
+
+        Args:
+            budget: Budget instance
+
+        Returns:
+            Decimal: Total spent
+        """
+        from apps.expenses.models import Expense
+
+        return Expense.objects.filter(
+            user_id=budget.user_id,
+            category=budget.category,
+            currency=budget.currency,
+            date__range=(budget.start_date, budget.end_date),
+        ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
+
+    @staticmethod
+    def spent_subquery() -> Coalesce:
+        """Expression computing each budget's spent amount from expenses."""
+        from apps.expenses.models import Expense
+
+        totals = (
+            Expense.objects.filter(
+                user_id=OuterRef("user_id"),
+                category=OuterRef("category"),
+                currency=OuterRef("currency"),
+                date__gte=OuterRef("start_date"),
+                date__lte=OuterRef("end_date"),
+            )
+            .order_by()
+            .values("user_id")
+            .annotate(total=Sum("amount"))
+            .values("total")
+        )
+        return Coalesce(
+            Subquery(totals, output_field=Budget._meta.get_field("spent_amount")),
+            Value(Decimal("0.00")),
+        )
+
+    @staticmethod
+    def entries_for_change(previous: Optional[Tuple], current: Optional[Tuple]) -> list:
+        """
+        Build the ledger entries for an expense changing from one state to another.
+
+        Args:
+            previous: Ledger entry before, or None if created
+            current: Ledger entry after, or None if deleted
+
+        Returns:
+            list: Signed ledger entries
+        """
+        if previous == current:
+            return []
+        entries = []
+        if previous is not None:
+            entries.append((*previous[:-1], -previous[-1]))
+        if current is not None:
+            entries.append(current)
+        return entries
+
+    @staticmethod
+    def reserve(budget_id: int, amount: Decimal) -> None:
+        """
+        Add an amount to a budget's ledger only if it stays within the limit.
+
+        The check and the increment are one ``UPDATE ... WHERE spent_amount
+        <= amount - x`` statement. Under READ COMMITTED a concurrent
+        reservation waits for the row lock and re-evaluates the condition
+        against the committed total, so no lock is held while validating.
+
+        Args:
+            budget_id: Budget ID
+            amount: Amount to reserve
+
+        Raises:
+            BudgetLimitExceeded: If the budget would be overspent
+        """
+        updated = Budget.objects.filter(
+            id=budget_id, spent_amount__lte=F("amount") - Value(amount)
+        ).update(spent_amount=F("spent_amount") + Value(amount))
+        if not updated:
+            raise BudgetLimitExceeded()
+
+    @staticmethod
+    def apply(
+        entries: Iterable[LedgerEntry], limited_budget_ids: Iterable[int] = ()
+    ) -> Dict[int, Decimal]:
+        """
+        Apply signed expense amounts to every budget they count towards.
+
+        Matching budgets are locked in primary key order, so concurrent
+        writers touching overlapping budgets cannot deadlock, and then
+        updated with a single ``F()`` expression. Increases to budgets in
+        ``limited_budget_ids`` go through ``reserve`` instead.
+
+        Args:
+            entries: Signed ledger entries
+            limited_budget_ids: Budgets whose limit must not be exceeded
+
+        Returns:
+            Dict[int, Decimal]: Amount added per budget ID
+
+        Raises:
+            BudgetLimitExceeded: If a limited budget would be overspent; the
+                enclosing transaction is rolled back
+        """
+        deltas: Dict[Tuple[int, str, str], Dict[date, Decimal]] = defaultdict(
+            lambda: defaultdict(Decimal)
+        )
+        for user_id, category, currency, day, amount in entries:
+            deltas[(user_id, category, currency)][day] += amount
+        if not deltas:
+            return {}
+
+        match = reduce(
+            or_,
+            (
+                Q(
+                    user_id=user_id,
+                    category=category,
+                    currency=currency,
+                    start_date__lte=max(days),
+                    end_date__gte=min(days),
+                )
+                for (user_id, category, currency), days in deltas.items()
+            ),
+        )
+        with transaction.atomic(savepoint=False):
+            budgets = (
+                Budget.objects.select_for_update()
+                .filter(match)
+                .order_by("id")
+                .values_list(
+                    "id", "user_id", "category", "currency", "start_date", "end_date"
+                )
+            )
+            changes: Dict[int, Decimal] = {}
+            for budget_id, user_id, category, currency, start_date, end_date in budgets:
+                delta = sum(
+                    (
+                        amount
+                        for day, amount in deltas[(user_id, category, currency)].items()
+                        if start_date <= day <= end_date
+                    ),
+                    Decimal("0"),
+                )
+                if delta:
+                    changes[budget_id] = delta
+
+            limited_budget_ids = set(limited_budget_ids)
+            unlimited = {}
+            for budget_id, delta in changes.items():
+                if delta > 0 and budget_id in limited_budget_ids:
+                    BudgetLedgerService.reserve(budget_id, delta)
+                else:
+                    unlimited[budget_id] = delta
+
+            if unlimited:
+                Budget.objects.filter(id__in=unlimited).update(
+                    spent_amount=F("spent_amount")
+                    + Case(
+                        *(
+                            When(id=budget_id, then=Value(delta))
+                            for budget_id, delta in unlimited.items()
+                        ),
+                        default=Value(Decimal("0")),
+                        output_field=DecimalField(max_digits=12, decimal_places=2),
+                    )
+                )
+        return changes
+
+    @staticmethod
+    def find_drift(queryset: Optional[QuerySet] = None) -> QuerySet:
+        """
+        Find budgets whose ledger disagrees with their expenses.
+
+        Args:
+            queryset: Budgets to check, defaults to all
+
+        Returns:
+            QuerySet: Budgets annotated with ``actual_spent``
+        """
+        queryset = Budget.objects.all() if queryset is None else queryset
+        return queryset.annotate(
+            actual_spent=BudgetLedgerService.spent_subquery()
+        ).exclude(spent_amount=F("actual_spent"))
+
+    @staticmethod
+    def recalculate(queryset: Optional[QuerySet] = None) -> int:
+        """
+        Recompute the ledger of budgets from their expenses in one UPDATE.
+
+        Args:
+            queryset: Budgets to recompute, defaults to all
+
+        Returns:
+            int: Number of budgets updated
+        """
+        queryset = Budget.objects.all() if queryset is None else queryset
+        return queryset.update(spent_amount=BudgetLedgerService.spent_subquery())
@@ -0,0 +1,227 @@
+"""
+Service layer for matching expenses to the budget covering them.
+"""
+
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet, Subquery
+from core.cache_config import CACHE_TIMEOUTS, CacheService
+from ..models import Budget
+
+# category -> (start dates, end dates, budget IDs, currencies), sorted by start
+IntervalMap = Dict[str, Tuple[List[date], List[date], List[int], List[str]]]
+
+BACKFILL_CHUNK_SIZE = 5000
+
+
+class BudgetMatchService:
+    """
+    Service class assigning expenses to the active budget covering them.
+
+    An expense is covered by the owner's active budget in its category and
+    currency whose period contains the expense date. Active budgets of one
+    user and category never overlap (see the
+    ``budget_no_overlapping_active_periods`` constraint), so each category
+    is a sorted list of disjoint intervals and the covering budget is found
+    by bisecting the start dates.
+
+    The per-user interval map is cached and dropped whenever one of the
+    user's budgets is written, so resolving budgets on the expense write
+    path normally costs no queries.
+    """
+
+    @staticmethod
+    def get_cache_key(user_id: int) -> str:
+        """Cache key of a user's interval map."""
+        return CacheService.get_cache_key("budget_intervals", user_id)
+
+    @staticmethod
+    def build_interval_map(user_id: int) -> IntervalMap:
+        """
+        Load a user's active budgets into an interval map.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            IntervalMap: Disjoint budget periods per category
+        """
+        interval_map: IntervalMap = {}
+        budgets = (
+            Budget.objects.filter(user_id=user_id, is_active=True)
+            .order_by("category", "start_date")
+            .values_list("category", "start_date", "end_date", "id", "currency")
+        )
+        for category, start_date, end_date, budget_id, currency in budgets:
+            starts, ends, ids, currencies = interval_map.setdefault(
+                category, ([], [], [], [])
+            )
+            starts.append(start_date)
+            ends.append(end_date)
+            ids.append(budget_id)
+            currencies.append(currency)
+        return interval_map
+
+    @staticmethod
+    def get_interval_map(user_id: int) -> IntervalMap:
+        """
+        Get a user's interval map from the cache, building it on a miss.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            IntervalMap: Disjoint budget periods per category
+        """
+        return CacheService.get_or_set(
+            BudgetMatchService.get_cache_key(user_id),
+            lambda: BudgetMatchService.build_interval_map(user_id),
+            CACHE_TIMEOUTS["budget_intervals"],
+        )
+
+    @staticmethod
+    def invalidate(user_ids: Iterable[int]) -> None:
+        """
+        Drop users' cached interval maps once the current transaction commits.
+
+        Dropping after commit keeps a concurrent request from caching the
+        map of budgets that are about to change.
+
+        Args:
+            user_ids: User IDs
+        """
+        keys = {BudgetMatchService.get_cache_key(user_id) for user_id in user_ids}
+        transaction.on_commit(lambda: CacheService.invalidate_many(keys))
+
+    @staticmethod
+    def find(
+        interval_map: IntervalMap,
+        category: str,
+        day: date,
+        currency: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Find the budget covering a date in an interval map.
+
+        Args:
+            interval_map: Interval map of the expense owner
+            category: Expense category
+            day: Expense date
+            currency: Expense currency; budgets in other currencies never match
+
+        Returns:
+            Optional[int]: Covering budget ID, if any
+        """
+        if category not in interval_map:
+            return None
+        starts, ends, ids, currencies = interval_map[category]
+        index = bisect_right(starts, day) - 1
+        if index >= 0 and day <= ends[index] and currency in (None, currencies[index]):
+            return ids[index]
+        return None
+
+    @staticmethod
+    def match(
+        user_id: int, category: str, day: date, currency: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Find the active budget covering an expense.
+
+        Args:
+            user_id: User ID
+            category: Expense category
+            day: Expense date
+            currency: Expense currency, if it must match
+
+        Returns:
+            Optional[int]: Covering budget ID, if any
+        """
+        return BudgetMatchService.find(
+            BudgetMatchService.get_interval_map(user_id), category, day, currency
+        )
+
+    @staticmethod
+    def assign(expenses: Iterable) -> List:
+        """
+        Assign the covering budget to expenses that have none.
+
+        Each user's interval map is fetched once for the whole batch.
+
+        Args:
+            expenses: Unsaved or loaded expense instances
+
+        Returns:
+            List: Expenses that were assigned a budget
+        """
+        interval_maps: Dict[int, IntervalMap] = {}
+        assigned = []
+        for expense in expenses:
+            if expense.budget_id is not None:
+                continue
+            if expense.user_id not in interval_maps:
+                interval_maps[expense.user_id] = BudgetMatchService.get_interval_map(
+                    expense.user_id
+                )
+            budget_id = BudgetMatchService.find(
+                interval_maps[expense.user_id],
+                expense.category,
+                expense.date,
+                expense.currency,
+            )
+            if budget_id is not None:
+                expense.budget_id = budget_id
+                expense.budget_matched = True
+                assigned.append(expense)
+        return assigned
+
+    @staticmethod
+    def backfill(
+        queryset: Optional[QuerySet] = None, chunk_size: int = BACKFILL_CHUNK_SIZE
+    ) -> int:
+        """
+        Assign covering budgets to existing expenses without one.
+
+        Expenses are walked in primary key chunks, each assigned with one
+        UPDATE whose correlated subquery is served by the budgets' partial
+        GiST index. Chunks are separate statements, so a long backfill holds
+        no long-running locks and can be interrupted and re-run. The budget ledger is unaffected because it
+        already counts expenses by category and date.
+
+        Args:
+            queryset: Expenses to consider, defaults to all
+            chunk_size: Number of expenses per UPDATE
+
+        Returns:
+            int: Number of expenses assigned a budget
+        """
+        from apps.expenses.models import Expense
+
+        queryset = Expense.objects.all() if queryset is None else queryset
+        queryset = queryset.filter(budget__isnull=True)
+        covering = Budget.objects.filter(
+            user_id=OuterRef("user_id"),
+            category=OuterRef("category"),
+            currency=OuterRef("currency"),
+        ).covering(OuterRef("date"))
+
+        assigned = 0
+        last_id = 0
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                return assigned
+            last_id = ids[-1]
+            assigned += (
+                Expense.objects.filter(id__in=ids, budget__isnull=True)
+                .filter(Exists(covering))
+                .update(
+                    budget=Subquery(covering.values("id")[:1]),
+                    budget_matched=True,
+                )
+            )
@@ -0,0 +1,236 @@
+"""
+Service layer for in-memory "what-if" budget simulations.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from django.core.exceptions import ValidationError
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from ..models import Budget
+
+# Spending history used to project the rest of each budget period, matching
+# the three month average of ``BudgetService.calculate_budget_forecast``
+FORECAST_HISTORY_DAYS = 90
+
+# Alerts in increasing severity
+ALERT_LEVELS = (None, "THRESHOLD", "EXCEEDED")
+
+
+@dataclass(frozen=True)
+class SimulatedBudget:
+    """Snapshot of an active budget's limit, thresholds and spend."""
+
+    id: int
+    name: str
+    category: str
+    currency: str
+    amount: Decimal
+    notification_threshold: Decimal
+    start_date: date
+    end_date: date
+    spent_amount: Decimal
+
+    @property
+    def utilization_percentage(self) -> Decimal:
+        """Utilization, computed like ``Budget.utilization_percentage``."""
+        return (self.spent_amount / self.amount * 100).quantize(Decimal("0.01"))
+
+    @property
+    def alert(self) -> Optional[str]:
+        """The alert ``BudgetService.send_budget_alerts`` would send, if any."""
+        if self.spent_amount > self.amount:
+            return "EXCEEDED"
+        if self.utilization_percentage >= self.notification_threshold:
+            return "THRESHOLD"
+        return None
+
+    def counts_towards(
+        self, category: str, currency: Optional[str], expense_date: date
+    ) -> bool:
+        """Check if an expense of the owner counts towards the budget."""
+        return (
+            category == self.category
+            and currency in (None, self.currency)
+            and self.start_date <= expense_date <= self.end_date
+        )
+
+    def days_ahead(self, today: date) -> int:
+        """Number of days of the period after ``today``."""
+        first = max(today + timedelta(days=1), self.start_date)
+        return max((self.end_date - first).days + 1, 0)
+
+
+class BudgetSimulationService:
+    """
+    Service class previewing hypothetical expenses and budget changes.
+
+    The user's active budgets, their ledger totals and recent spending per
+    category and currency are loaded once; hypothetical expenses and budget
+    changes are applied to in-memory copies. Nothing is written, so no
+    signals fire.
+    """
+
+    @staticmethod
+    def load(user_id: int, today: Optional[date] = None) -> Dict:
+        """
+        Load the state a simulation starts from in two queries.
+
+        Args:
+            user_id: User ID
+            today: Reference date, defaults to the current date
+
+        Returns:
+            Dict: ``budgets`` by ID and ``daily_rates`` by category and
+            currency, as budgets only count spending in their own currency
+        """
+        from apps.expenses.models import Expense
+
+        today = today or timezone.now().date()
+        budgets = {
+            row["id"]: SimulatedBudget(**row)
+            for row in Budget.objects.filter(
+                user_id=user_id, is_active=True, end_date__gte=today
+            )
+            .order_by("start_date", "id")
+            .values(
+                "id",
+                "name",
+                "category",
+                "currency",
+                "amount",
+                "notification_threshold",
+                "start_date",
+                "end_date",
+                "spent_amount",
+            )
+        }
+        history = (
+            Expense.objects.filter(
+                user_id=user_id,
+                date__gt=today - timedelta(days=FORECAST_HISTORY_DAYS),
+                date__lte=today,
+            )
+            .values("category", "currency")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+        daily_rates = {
+            (row["category"], row["currency"]): row["total"] / FORECAST_HISTORY_DAYS
+            for row in history
+        }
+        return {"budgets": budgets, "daily_rates": daily_rates}
+
+    @staticmethod
+    def simulate(
+        user_id: int,
+        expenses: Iterable[Dict] = (),
+        budget_changes: Iterable[Dict] = (),
+        today: Optional[date] = None,
+    ) -> List[Dict]:
+        """
+        Preview the effect of planned expenses and budget changes.
+
+        Args:
+            user_id: User ID
+            expenses: Planned expenses with ``amount``, ``category`` and an
+                optional ``date`` (defaults to today) and ``currency`` (counts
+                towards budgets in any currency when omitted)
+            budget_changes: Changes with a budget ``id`` and a new ``amount``
+                and/or ``notification_threshold``
+            today: Reference date, defaults to the current date
+
+        Returns:
+            List[Dict]: Current and simulated figures per active budget
+
+        Raises:
+            ValidationError: If a change targets a budget that is not active
+        """
+        today = today or timezone.now().date()
+        state = BudgetSimulationService.load(user_id, today)
+        current = state["budgets"]
+
+        simulated = dict(current)
+        for change in budget_changes:
+            budget_id = change["id"]
+            if budget_id not in simulated:
+                raise ValidationError(
+                    {
+                        "budgets": _("Budget {0} is not an active budget.").format(
+                            budget_id
+                        )
+                    }
+                )
+            fields = {
+                field: change[field]
+                for field in ("amount", "notification_threshold")
+                if change.get(field) is not None
+            }
+            simulated[budget_id] = replace(simulated[budget_id], **fields)
+
+        for expense in expenses:
+            expense_date = expense.get("date") or today
+            for budget_id, budget in simulated.items():
+                if budget.counts_towards(
+                    expense["category"], expense.get("currency"), expense_date
+                ):
+                    simulated[budget_id] = replace(
+                        budget, spent_amount=budget.spent_amount + expense["amount"]
+                    )
+
+        return [
+            BudgetSimulationService._compare(
+                current[budget_id],
+                budget,
+                state["daily_rates"].get(
+                    (budget.category, budget.currency), Decimal("0")
+                ),
+                today,
+            )
+            for budget_id, budget in simulated.items()
+        ]
+
+    @staticmethod
+    def _summarize(budget: SimulatedBudget) -> Dict:
+        """Figures of one budget state."""
+        return {
+            "amount": budget.amount,
+            "spent_amount": budget.spent_amount,
+            "remaining_amount": budget.amount - budget.spent_amount,
+            "utilization_percentage": budget.utilization_percentage,
+            "alert": budget.alert,
+        }
+
+    @staticmethod
+    def _compare(
+        before: SimulatedBudget,
+        after: SimulatedBudget,
+        daily_rate: Decimal,
+        today: date,
+    ) -> Dict:
+        """Compare a budget before and after the simulated changes."""
+        projected = (
+            after.spent_amount + daily_rate * after.days_ahead(today)
+        ).quantize(Decimal("0.01"))
+        return {
+            "id": after.id,
+            "name": after.name,
+            "category": after.category,
+            "currency": after.currency,
+            "start_date": after.start_date,
+            "end_date": after.end_date,
+            "current": BudgetSimulationService._summarize(before),
+            "simulated": BudgetSimulationService._summarize(after),
+            "new_alert": (
+                after.alert
+                if ALERT_LEVELS.index(after.alert) > ALERT_LEVELS.index(before.alert)
+                else None
+            ),
+            "forecast": {
+                "projected_spending": projected,
+                "projected_status": "OVER" if projected > after.amount else "UNDER",
+            },
+        }
@@ -3,10 +3,10 @@
 Signal handlers for budgets application.
 """
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 from .models import Budget
+from .services.match_service import BudgetMatchService
 from apps.notifications.services import NotificationService
 
 
@@ -41,30 +41,14 @@ def notify_budget_creation(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Budget)
-def handle_recurring_budget(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=Budget)
+def invalidate_budget_intervals(sender, instance, **kwargs):
     """
-    Signal to handle recurring budget logic.
+    Signal to drop the owner's cached budget interval map.
 
     Args:
         sender: The model class
         instance: The actual budget instance
-        created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if not created and instance.is_active and instance.recurrence != "NONE":
-        today = timezone.now().date()
-
-        # Check if the budget is ending and needs to be renewed
-        if instance.end_date == today:
-            Budget.objects.create(
-                user=instance.user,
-                name=instance.name,
-                amount=instance.amount,
-                category=instance.category,
-                start_date=today + timezone.timedelta(days=1),
-                end_date=instance.calculate_next_end_date(),
-                recurrence=instance.recurrence,
-                notification_threshold=instance.notification_threshold,
-                description=f"Auto-renewed from budget {instance.id}",
-                is_active=True,
-            )
+    BudgetMatchService.invalidate([instance.user_id])
@@ -0,0 +1,20 @@
+"""
+Celery tasks for the budgets application.
+"""
+
+from datetime import date
+from typing import Optional
+from celery import shared_task
+from .services.budgets_service import BudgetService
+
+
+@shared_task
+def rollover_recurring_budgets(as_of: Optional[str] = None) -> int:
+    """
+    Roll over recurring budgets that ended on or before ``as_of``.
+
+    Scheduled nightly; safe to re-run for the same day.
+    """
+    return BudgetService.rollover_recurring_budgets(
+        as_of=date.fromisoformat(as_of) if as_of else None
+    )
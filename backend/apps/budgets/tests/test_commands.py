@@ -0,0 +1,90 @@
+"""
+Tests for budget management commands.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from apps.expenses.models import Expense
+from ..models import Budget
+
+User = get_user_model()
+
+
+class CheckBudgetLedgerCommandTests(TestCase):
+    """Test cases for the check_budget_ledger command."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="cmduser", email="cmd@example.com", password="testpass123"
+        )
+        self.budget = Budget.objects.create(
+            user=self.user,
+            name="Food Budget",
+            amount=Decimal("500.00"),
+            category="FOOD",
+            start_date=date.today() - timedelta(days=5),
+            end_date=date.today() + timedelta(days=5),
+        )
+
+    def test_consistent(self):
+        """Test a clean ledger passes."""
+        out = StringIO()
+        call_command("check_budget_ledger", stdout=out)
+        self.assertIn("consistent", out.getvalue())
+
+    def test_drift_reported_and_fixed(self):
+        """Test drift fails the check and --fix repairs it."""
+        Budget.objects.filter(pk=self.budget.pk).update(spent_amount=Decimal("12.00"))
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_budget_ledger", stdout=out)
+        self.assertIn(f"budget {self.budget.pk}", out.getvalue())
+
+        call_command("check_budget_ledger", "--fix", stdout=StringIO())
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.spent_amount, Decimal("0.00"))
+
+
+class MatchExpenseBudgetsCommandTests(TestCase):
+    """Test cases for the match_expense_budgets command."""
+
+    def test_assigns_unmatched_expenses(self):
+        """Test expenses without a budget are assigned for the given user."""
+        users = [
+            User.objects.create_user(
+                username=f"match{index}", email=f"match{index}@example.com"
+            )
+            for index in range(2)
+        ]
+        for user in users:
+            Budget.objects.create(
+                user=user,
+                name="Food Budget",
+                amount=Decimal("500.00"),
+                category="FOOD",
+                start_date=date.today() - timedelta(days=5),
+                end_date=date.today() + timedelta(days=5),
+            )
+        Expense.objects.bulk_create(
+            [
+                Expense(
+                    user=user,
+                    title="Imported",
+                    amount=Decimal("5.00"),
+                    category="FOOD",
+                    date=date.today(),
+                )
+                for user in users
+            ]
+        )
+
+        out = StringIO()
+        call_command("match_expense_budgets", "--user", str(users[0].id), stdout=out)
+        self.assertIn("Assigned 1 expenses", out.getvalue())
+        self.assertEqual(Expense.objects.filter(budget__isnull=True).count(), 1)
@@ -0,0 +1,81 @@
+"""
+Concurrency tests for budget limit enforcement.
+"""
+
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from apps.expenses.models import Expense
+from apps.expenses.services.expense_write_service import ExpenseWriteService
+from utils.exceptions.custom_exceptions import BudgetLimitExceeded
+from ..models import Budget
+
+User = get_user_model()
+
+
+class BudgetReservationConcurrencyTests(TransactionTestCase):
+    """Stress the budget reservation with concurrent writers."""
+
+    WORKERS = 8
+    ATTEMPTS_PER_WORKER = 5
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="raceuser", email="race@example.com", password="testpass123"
+        )
+        self.budget = Budget.objects.create(
+            user=self.user,
+            name="Contended Budget",
+            amount=Decimal("100.00"),
+            category="FOOD",
+            start_date=date.today() - timedelta(days=1),
+            end_date=date.today() + timedelta(days=1),
+        )
+
+    def _worker(self, barrier, outcomes):
+        try:
+            barrier.wait()
+            for _ in range(self.ATTEMPTS_PER_WORKER):
+                try:
+                    ExpenseWriteService.create(
+                        {
+                            "user": self.user,
+                            "title": "Concurrent lunch",
+                            "amount": Decimal("7.00"),
+                            "category": "FOOD",
+                            "date": date.today(),
+                            "budget": self.budget,
+                        }
+                    )
+                    outcomes.append("created")
+                except BudgetLimitExceeded:
+                    outcomes.append("rejected")
+        finally:
+            connection.close()
+
+    def test_concurrent_expenses_never_overspend(self):
+        """Test concurrent writers fill the budget exactly up to its limit."""
+        barrier = threading.Barrier(self.WORKERS)
+        outcomes = []
+        threads = [
+            threading.Thread(target=self._worker, args=(barrier, outcomes))
+            for _ in range(self.WORKERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        created = outcomes.count("created")
+        self.assertEqual(len(outcomes), self.WORKERS * self.ATTEMPTS_PER_WORKER)
+        # 14 x 7.00 = 98.00 fits, a 15th would overspend 100.00
+        self.assertEqual(created, 14)
+        self.assertEqual(Expense.objects.filter(budget=self.budget).count(), created)
+
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.spent_amount, Decimal("98.00"))
+        self.assertLessEqual(self.budget.spent_amount, self.budget.amount)
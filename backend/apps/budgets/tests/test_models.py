@@ -122,3 +122,88 @@ class BudgetModelTests(TestCase):
 
         self.assertEqual(budget.recurrence, "MONTHLY")
         self.assertIn(budget.recurrence, dict(Budget.RecurrenceChoices.choices).keys())
+
+
+class BudgetRecurrenceTests(TestCase):
+    """Test cases for recurring budget periods."""
+
+    def test_calculate_next_end_date_month_end(self):
+        """Test next periods never overflow short months."""
+        budget = Budget(
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 30),
+            recurrence=Budget.RecurrenceChoices.MONTHLY,
+        )
+        self.assertEqual(budget.calculate_next_end_date(), date(2024, 2, 28))
+
+        budget.end_date = date(2024, 1, 31)
+        self.assertEqual(budget.calculate_next_end_date(), date(2024, 2, 29))
+
+        budget.recurrence = Budget.RecurrenceChoices.YEARLY
+        budget.end_date = date(2024, 12, 31)
+        self.assertEqual(budget.calculate_next_end_date(), date(2025, 12, 31))
+
+        budget.recurrence = Budget.RecurrenceChoices.NONE
+        self.assertEqual(budget.calculate_next_end_date(), date(2024, 12, 31))
+
+
+class BudgetOverlapTests(TestCase):
+    """Test cases for the active budget overlap constraint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="overlapuser", email="overlap@example.com", password="testpass123"
+        )
+        self.start = date(2024, 1, 1)
+        self.budget = self._budget(self.start, date(2024, 1, 31))
+
+    def _budget(self, start_date, end_date, **overrides):
+        fields = {
+            "user": self.user,
+            "name": "Food",
+            "amount": Decimal("100.00"),
+            "category": "FOOD",
+            "start_date": start_date,
+            "end_date": end_date,
+            **overrides,
+        }
+        return Budget.objects.create(**fields)
+
+    def test_overlapping_active_budget_rejected(self):
+        """Test an overlapping active budget raises a clean validation error."""
+        with self.assertRaises(ValidationError) as ctx:
+            self._budget(date(2024, 1, 31), date(2024, 2, 29))
+        self.assertIn("category", ctx.exception.message_dict)
+        self.assertEqual(Budget.objects.count(), 1)
+
+    def test_non_overlapping_budgets_allowed(self):
+        """Test adjacent periods, inactive budgets, other categories and
+        other currencies."""
+        self._budget(date(2024, 2, 1), date(2024, 2, 29))
+        self._budget(self.start, date(2024, 1, 31), is_active=False)
+        self._budget(self.start, date(2024, 1, 31), category="TRANSPORT")
+        self._budget(self.start, date(2024, 1, 31), currency="EUR")
+        self.assertEqual(Budget.objects.count(), 5)
+
+    def test_reactivating_overlapping_budget_rejected(self):
+        """Test the constraint also covers budgets becoming active."""
+        inactive = self._budget(date(2024, 1, 15), date(2024, 2, 15), is_active=False)
+        inactive.is_active = True
+        with self.assertRaises(ValidationError):
+            inactive.save()
+
+    def test_covering_and_overlapping(self):
+        """Test the range lookups only match active budgets."""
+        self._budget(date(2024, 1, 10), date(2024, 1, 20), is_active=False)
+        self.assertEqual(
+            list(Budget.objects.covering(date(2024, 1, 31))), [self.budget]
+        )
+        self.assertFalse(Budget.objects.covering(date(2024, 2, 1)).exists())
+        self.assertEqual(
+            list(Budget.objects.overlapping(date(2023, 12, 1), self.start)),
+            [self.budget],
+        )
+        self.assertFalse(
+            Budget.objects.overlapping(date(2023, 12, 1), date(2023, 12, 31)).exists()
+        )
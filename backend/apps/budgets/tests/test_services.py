@@ -4,15 +4,24 @@ Tests for budget services.
 
 from datetime import date, timedelta
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from apps.expenses.models import Expense
+from apps.notifications.models import Notification
 from ..models import Budget
 from ..services.budgets_service import BudgetService
+from ..services.ledger_service import BudgetLedgerService
+from ..services.match_service import BudgetMatchService
+from ..services.simulation_service import BudgetSimulationService
 
 User = get_user_model()
 
+# Lock and read a chunk, read budgets overlapping its successors and insert
+# them, then find no further chunk; each step in its own savepoint.
+# Independent of the chunk's size.
+ROLLOVER_QUERIES = 8
+
 
 class BudgetServiceTests(TestCase):
     """Test cases for BudgetService."""
@@ -125,3 +134,489 @@ class BudgetServiceTests(TestCase):
         self.assertEqual(forecast[0]["category"], "Food")
         self.assertTrue("projected_spending" in forecast[0])
         self.assertTrue("budget_amount" in forecast[0])
+
+
+class BudgetLedgerTests(TestCase):
+    """Test cases for the budget spend ledger."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="ledgeruser", email="ledger@example.com", password="testpass123"
+        )
+        self.today = date.today()
+        self.budget = Budget.objects.create(
+            user=self.user,
+            name="Food Budget",
+            amount=Decimal("500.00"),
+            category="FOOD",
+            start_date=self.today - timedelta(days=10),
+            end_date=self.today + timedelta(days=20),
+        )
+
+    def _expense(self, amount, category="FOOD", days_ago=0):
+        return Expense.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=Decimal(amount),
+            category=category,
+            date=self.today - timedelta(days=days_ago),
+        )
+
+    def _spent(self):
+        return Budget.objects.get(pk=self.budget.pk).spent_amount
+
+    def test_expense_writes_update_ledger(self):
+        """Test create, update and delete move the spent amount."""
+        expense = self._expense("40.00")
+        self._expense("15.00", category="TRANSPORT")
+        self._expense("99.00", days_ago=30)
+        self.assertEqual(self._spent(), Decimal("40.00"))
+
+        expense = Expense.objects.get(pk=expense.pk)
+        expense.amount = Decimal("65.00")
+        expense.save()
+        self.assertEqual(self._spent(), Decimal("65.00"))
+
+        expense.category = "SHOPPING"
+        expense.save()
+        self.assertEqual(self._spent(), Decimal("0.00"))
+
+        expense.category = "FOOD"
+        expense.save()
+        expense.delete()
+        self.assertEqual(self._spent(), Decimal("0.00"))
+
+    def test_remaining_amount_reads_ledger(self):
+        """Test reading remaining amount and utilization runs no queries."""
+        self._expense("125.00")
+        budget = Budget.objects.get(pk=self.budget.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(budget.remaining_amount, Decimal("375.00"))
+            self.assertEqual(budget.utilization_percentage, Decimal("25.00"))
+
+    def test_budget_scope_change_recalculates(self):
+        """Test new budgets and period changes recompute the ledger."""
+        self._expense("30.00", days_ago=15)
+        self._expense("20.00")
+        self.assertEqual(self._spent(), Decimal("20.00"))
+
+        budget = Budget.objects.get(pk=self.budget.pk)
+        budget.start_date = self.today - timedelta(days=20)
+        budget.save()
+        self.assertEqual(self._spent(), Decimal("50.00"))
+
+        other = Budget.objects.create(
+            user=self.user,
+            name="Older Food Budget",
+            is_active=False,
+            amount=Decimal("100.00"),
+            category="FOOD",
+            start_date=self.today - timedelta(days=16),
+            end_date=self.today - timedelta(days=14),
+        )
+        self.assertEqual(other.spent_amount, Decimal("30.00"))
+
+    def test_stale_instance_does_not_overwrite_ledger(self):
+        """Test saving an unrelated change keeps concurrent ledger updates."""
+        stale = Budget.objects.get(pk=self.budget.pk)
+        self._expense("80.00")
+        stale.name = "Renamed"
+        stale.save()
+        self.assertEqual(self._spent(), Decimal("80.00"))
+
+    def test_find_drift_and_recalculate(self):
+        """Test drift from bulk updates is detected and repaired."""
+        self._expense("45.00")
+        Expense.objects.filter(user=self.user).update(amount=Decimal("60.00"))
+        self.assertEqual(
+            list(BudgetLedgerService.find_drift().values_list("id", flat=True)),
+            [self.budget.pk],
+        )
+
+        BudgetLedgerService.recalculate()
+        self.assertEqual(self._spent(), Decimal("60.00"))
+        self.assertFalse(BudgetLedgerService.find_drift().exists())
+
+
+class BudgetRolloverTests(TestCase):
+    """Test cases for the recurring budget rollover job."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="rolloveruser",
+            email="rollover@example.com",
+            password="testpass123",
+        )
+        self.as_of = date(2024, 1, 31)
+
+    def _budget(self, recurrence, start_date, end_date=None, **extra):
+        extra.setdefault("user", self.user)
+        extra.setdefault("category", "FOOD")
+        return Budget.objects.create(
+            name=f"{recurrence} budget",
+            amount=Decimal("300.00"),
+            start_date=start_date,
+            end_date=end_date or self.as_of,
+            recurrence=recurrence,
+            **extra,
+        )
+
+    def test_rollover_creates_successors_once(self):
+        """Test successors get the next period and re-runs are no-ops."""
+        monthly = self._budget("MONTHLY", date(2024, 1, 1))
+        weekly = self._budget("WEEKLY", date(2024, 1, 25), category="TRANSPORT")
+        self._budget("NONE", date(2024, 1, 1), category="SHOPPING")
+        self._budget("MONTHLY", date(2024, 1, 1), is_active=False)
+        self._budget(
+            "MONTHLY", date(2024, 1, 1), end_date=date(2024, 2, 29), category="HOUSING"
+        )
+        notifications = Notification.objects.filter(user=self.user)
+        before = notifications.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = BudgetService.rollover_recurring_budgets(as_of=self.as_of)
+        self.assertEqual(created, 2)
+
+        monthly_next = monthly.successors.get()
+        self.assertEqual(
+            (monthly_next.start_date, monthly_next.end_date),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+        )
+        weekly_next = weekly.successors.get()
+        self.assertEqual(
+            (weekly_next.start_date, weekly_next.end_date),
+            (date(2024, 2, 1), date(2024, 2, 7)),
+        )
+        self.assertEqual(notifications.count() - before, 2)
+
+        self.assertEqual(BudgetService.rollover_recurring_budgets(as_of=self.as_of), 0)
+        self.assertEqual(Budget.objects.filter(predecessor=monthly).count(), 1)
+
+    def test_rollover_query_count_is_flat(self):
+        """Test a chunk costs the same queries for one or many budgets."""
+        self._budget("MONTHLY", date(2024, 1, 1))
+        with self.assertNumQueries(ROLLOVER_QUERIES):
+            BudgetService.rollover_recurring_budgets(as_of=self.as_of)
+
+        for index in range(20):
+            user = User.objects.create_user(
+                username=f"rollover{index}", email=f"rollover{index}@example.com"
+            )
+            self._budget(
+                "MONTHLY", date(2024, 1, 1), end_date=date(2024, 1, 30), user=user
+            )
+        with self.assertNumQueries(ROLLOVER_QUERIES):
+            created = BudgetService.rollover_recurring_budgets(as_of=date(2024, 1, 30))
+        self.assertEqual(created, 20)
+
+    def test_rollover_skips_overlapping_successors(self):
+        """Test a successor overlapping an active budget does not stop the run."""
+        conflicting = self._budget("MONTHLY", date(2024, 1, 1))
+        # Created by hand for part of the next period
+        self._budget("NONE", date(2024, 2, 10), end_date=date(2024, 2, 20))
+        user = User.objects.create_user(username="cleanuser", email="clean@example.com")
+        clean = self._budget("MONTHLY", date(2024, 1, 1), user=user)
+
+        with self.assertLogs("apps.budgets.services.budgets_service", "INFO"):
+            created = BudgetService.rollover_recurring_budgets(as_of=self.as_of)
+
+        self.assertEqual(created, 1)
+        self.assertFalse(conflicting.successors.exists())
+        self.assertEqual(clean.successors.get().start_date, date(2024, 2, 1))
+
+    def test_rollover_catches_up_missed_runs(self):
+        """Test budgets that ended during missed runs roll over with spending."""
+        budget = self._budget("WEEKLY", date(2024, 1, 22), end_date=date(2024, 1, 28))
+        Expense.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=Decimal("42.00"),
+            category="FOOD",
+            date=date(2024, 1, 30),
+        )
+
+        BudgetService.rollover_recurring_budgets(as_of=self.as_of)
+        successor = budget.successors.get()
+        self.assertEqual(successor.start_date, date(2024, 1, 29))
+        self.assertEqual(successor.spent_amount, Decimal("42.00"))
+
+
+class BudgetMatchTests(TestCase):
+    """Test cases for matching expenses to covering budgets."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="matchuser", email="match@example.com", password="testpass123"
+        )
+        self.today = date.today()
+        self.current = self._budget(
+            self.today - timedelta(days=10), self.today + timedelta(days=20)
+        )
+        self.previous = self._budget(
+            self.today - timedelta(days=40), self.today - timedelta(days=11)
+        )
+
+    def _budget(self, start_date, end_date, **overrides):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Budget.objects.create(
+                **{
+                    "user": self.user,
+                    "name": "Food Budget",
+                    "amount": Decimal("100.00"),
+                    "category": "FOOD",
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    **overrides,
+                }
+            )
+
+    def _expense(self, amount="10.00", category="FOOD", days_ago=0):
+        return Expense.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=Decimal(amount),
+            category=category,
+            date=self.today - timedelta(days=days_ago),
+        )
+
+    def test_find_bisects_disjoint_periods(self):
+        """Test lookups at period edges, gaps and other categories."""
+        self._budget(
+            self.today - timedelta(days=60),
+            self.today - timedelta(days=50),
+            is_active=False,
+        )
+        interval_map = BudgetMatchService.build_interval_map(self.user.id)
+        find = BudgetMatchService.find
+
+        self.assertEqual(
+            find(interval_map, "FOOD", self.today + timedelta(days=20)),
+            self.current.id,
+        )
+        self.assertEqual(
+            find(interval_map, "FOOD", self.today - timedelta(days=11)),
+            self.previous.id,
+        )
+        self.assertEqual(
+            find(interval_map, "FOOD", self.today - timedelta(days=40)),
+            self.previous.id,
+        )
+        self.assertIsNone(find(interval_map, "FOOD", self.today - timedelta(days=55)))
+        self.assertIsNone(find(interval_map, "FOOD", self.today + timedelta(days=21)))
+        self.assertIsNone(find(interval_map, "TRANSPORT", self.today))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_interval_map_cached_until_budgets_change(self):
+        """Test matching is query-free until a budget write drops the map."""
+        BudgetMatchService.match(self.user.id, "FOOD", self.today)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                BudgetMatchService.match(self.user.id, "FOOD", self.today),
+                self.current.id,
+            )
+
+        transport = self._budget(
+            self.today, self.today + timedelta(days=5), category="TRANSPORT"
+        )
+        self.assertEqual(
+            BudgetMatchService.match(self.user.id, "TRANSPORT", self.today),
+            transport.id,
+        )
+
+    def test_save_assigns_covering_budget(self):
+        """Test matched expenses are not held to the budget limit."""
+        expense = self._expense("150.00")
+        self.assertEqual(expense.budget_id, self.current.id)
+        self.assertTrue(expense.budget_matched)
+
+        self.current.refresh_from_db()
+        self.assertEqual(self.current.spent_amount, Decimal("150.00"))
+        self.assertIsNone(self._expense(category="TRANSPORT").budget_id)
+
+        # Budgets never match or count expenses in another currency
+        euro = Expense.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=Decimal("10.00"),
+            currency="EUR",
+            category="FOOD",
+            date=self.today,
+        )
+        self.assertIsNone(euro.budget_id)
+        self.current.refresh_from_db()
+        self.assertEqual(self.current.spent_amount, Decimal("150.00"))
+
+    def test_matched_budget_follows_date_changes(self):
+        """Test a matched expense is matched again when it moves."""
+        expense = Expense.objects.get(id=self._expense().id)
+        expense.date = self.today - timedelta(days=20)
+        expense.save()
+        self.assertEqual(expense.budget_id, self.previous.id)
+
+        expense.date = self.today - timedelta(days=100)
+        expense.save()
+        self.assertIsNone(expense.budget_id)
+        self.assertFalse(expense.budget_matched)
+
+    def test_write_service_assigns_budgets(self):
+        """Test the signal-free write path matches budgets in memory."""
+        from apps.expenses.services import ExpenseWriteService
+
+        rows = [
+            {
+                "user": self.user,
+                "title": "Groceries",
+                "amount": Decimal("80.00"),
+                "category": "FOOD",
+                "date": self.today - timedelta(days=days_ago),
+            }
+            for days_ago in (0, 1, 20)
+        ]
+        expenses = ExpenseWriteService.create_many(rows)
+        self.assertEqual(
+            [expense.budget_id for expense in expenses],
+            [self.current.id, self.current.id, self.previous.id],
+        )
+
+    def test_backfill(self):
+        """Test existing unassigned expenses are assigned in bulk."""
+        Expense.objects.bulk_create(
+            [
+                Expense(
+                    user=self.user,
+                    title="Imported",
+                    amount=Decimal("5.00"),
+                    category=category,
+                    date=self.today - timedelta(days=days_ago),
+                )
+                for category, days_ago in (
+                    ("FOOD", 0),
+                    ("FOOD", 30),
+                    ("FOOD", 90),
+                    ("TRANSPORT", 0),
+                )
+            ]
+        )
+        self.assertEqual(BudgetMatchService.backfill(chunk_size=2), 2)
+        self.assertEqual(
+            set(
+                Expense.objects.filter(budget_matched=True).values_list(
+                    "budget_id", flat=True
+                )
+            ),
+            {self.current.id, self.previous.id},
+        )
+        self.assertEqual(BudgetMatchService.backfill(), 0)
+
+
+class BudgetSimulationTests(TestCase):
+    """Test cases for in-memory budget simulations."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="simuser", email="sim@example.com", password="testpass123"
+        )
+        self.today = date.today()
+        self.food = Budget.objects.create(
+            user=self.user,
+            name="Food Budget",
+            amount=Decimal("100.00"),
+            category="FOOD",
+            start_date=self.today - timedelta(days=9),
+            end_date=self.today + timedelta(days=20),
+            notification_threshold=Decimal("80.00"),
+        )
+        self.transport = Budget.objects.create(
+            user=self.user,
+            name="Transport Budget",
+            amount=Decimal("50.00"),
+            category="TRANSPORT",
+            start_date=self.today - timedelta(days=9),
+            end_date=self.today + timedelta(days=20),
+        )
+        Expense.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=Decimal("45.00"),
+            category="FOOD",
+            date=self.today,
+        )
+
+    def _by_id(self, results):
+        return {result["id"]: result for result in results}
+
+    def test_planned_expense_crosses_threshold(self):
+        """Test a planned expense raises utilization and a threshold alert."""
+        results = self._by_id(
+            BudgetSimulationService.simulate(
+                self.user.id,
+                expenses=[{"amount": Decimal("40.00"), "category": "FOOD"}],
+            )
+        )
+        food = results[self.food.id]
+        self.assertEqual(food["current"]["spent_amount"], Decimal("45.00"))
+        self.assertEqual(food["simulated"]["spent_amount"], Decimal("85.00"))
+        self.assertEqual(food["simulated"]["utilization_percentage"], Decimal("85.00"))
+        self.assertEqual(food["new_alert"], "THRESHOLD")
+        self.assertIsNone(results[self.transport.id]["new_alert"])
+
+        # Expenses outside the period or category do not count
+        results = self._by_id(
+            BudgetSimulationService.simulate(
+                self.user.id,
+                expenses=[
+                    {
+                        "amount": Decimal("40.00"),
+                        "category": "FOOD",
+                        "date": self.today + timedelta(days=21),
+                    }
+                ],
+            )
+        )
+        self.assertEqual(
+            results[self.food.id]["simulated"]["spent_amount"], Decimal("45.00")
+        )
+
+    def test_budget_change_and_forecast(self):
+        """Test a lower amount is exceeded and the forecast projects spending."""
+        results = self._by_id(
+            BudgetSimulationService.simulate(
+                self.user.id, budget_changes=[{"id": self.food.id, "amount": 40}]
+            )
+        )
+        food = results[self.food.id]
+        self.assertEqual(food["simulated"]["remaining_amount"], Decimal("-5.00"))
+        self.assertEqual(food["new_alert"], "EXCEEDED")
+        # 45.00 over the last 90 days projected over the 20 remaining days
+        self.assertEqual(food["forecast"]["projected_spending"], Decimal("55.00"))
+        self.assertEqual(food["forecast"]["projected_status"], "OVER")
+        self.food.refresh_from_db()
+        self.assertEqual(self.food.amount, Decimal("100.00"))
+
+    def test_forecast_counts_budget_currency_only(self):
+        """Test spending in other currencies does not raise the forecast."""
+        Expense.objects.create(
+            user=self.user,
+            title="Groceries abroad",
+            amount=Decimal("900.00"),
+            currency="JPY",
+            category="FOOD",
+            date=self.today,
+        )
+        food = self._by_id(BudgetSimulationService.simulate(self.user.id))[self.food.id]
+        self.assertEqual(food["forecast"]["projected_spending"], Decimal("55.00"))
+
+    def test_unknown_budget_rejected(self):
+        """Test changes to budgets that are not active are rejected."""
+        self.transport.is_active = False
+        self.transport.save()
+        with self.assertRaises(ValidationError):
+            BudgetSimulationService.simulate(
+                self.user.id, budget_changes=[{"id": self.transport.id, "amount": 1}]
+            )
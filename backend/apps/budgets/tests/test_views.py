@@ -9,6 +9,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from ..models import Budget
+from ..serializers import BudgetListSerializer
 
 User = get_user_model()
 
@@ -42,7 +43,7 @@ class BudgetViewSetTests(APITestCase):
                 if k != "start_date" and k != "end_date"
             },
             start_date=self.today,
-            end_date=self.today + timedelta(days=30)
+            end_date=self.today + timedelta(days=30),
         )
 
     def test_create_budget(self):
@@ -173,3 +174,114 @@ class BudgetViewSetTests(APITestCase):
 
         response = self.client.post(url, invalid_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BudgetSimulationViewTests(APITestCase):
+    """Test cases for the budget simulation endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="simviewuser", email="simview@example.com", password="pass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.today = date.today()
+        self.budgets = [
+            Budget.objects.create(
+                user=self.user,
+                name=f"{category} Budget",
+                amount=Decimal("100.00"),
+                category=category,
+                start_date=self.today - timedelta(days=5),
+                end_date=self.today + timedelta(days=25),
+            )
+            for category in ("FOOD", "TRANSPORT", "SHOPPING")
+        ]
+        self.url = reverse("budget-simulate")
+
+    def test_simulate_in_bounded_queries(self):
+        """Test a simulation reads two queries and writes nothing."""
+        payload = {
+            "expenses": [
+                {"amount": "30.00", "category": category}
+                for category in ("FOOD", "FOOD", "TRANSPORT")
+            ],
+            "budgets": [{"id": self.budgets[2].id, "notification_threshold": "50"}],
+        }
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {result["id"]: result for result in response.data}
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            results[self.budgets[0].id]["simulated"]["spent_amount"], Decimal("60.00")
+        )
+        self.assertEqual(
+            results[self.budgets[1].id]["simulated"]["remaining_amount"],
+            Decimal("70.00"),
+        )
+        self.assertFalse(Budget.objects.filter(spent_amount__gt=0).exists())
+
+    def test_simulate_validation(self):
+        """Test empty requests and foreign budgets are rejected."""
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(
+            username="simother", email="simother@example.com", password="pass123"
+        )
+        foreign = Budget.objects.create(
+            user=other,
+            name="Other Budget",
+            amount=Decimal("100.00"),
+            category="FOOD",
+            start_date=self.today,
+            end_date=self.today + timedelta(days=5),
+        )
+        response = self.client.post(
+            self.url, {"budgets": [{"id": foreign.id, "amount": "10"}]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("budgets", response.data)
+
+
+class BudgetListReadSerializerTests(APITestCase):
+    """Test cases for listing budgets with BudgetListReadSerializer."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.today = date.today()
+
+    def test_list_matches_list_serializer(self):
+        """Test the read serializer lists budgets as BudgetListSerializer does."""
+        budget = Budget.objects.create(
+            user=self.user,
+            name="This month",
+            amount=Decimal("1000.00"),
+            category=Budget.CategoryChoices.FOOD,
+            start_date=self.today,
+            end_date=self.today + timedelta(days=30),
+        )
+        Budget.objects.filter(pk=budget.pk).update(spent_amount=Decimal("333.33"))
+        Budget.objects.create(
+            user=self.user,
+            name="Last month",
+            amount=Decimal("300.00"),
+            category=Budget.CategoryChoices.FOOD,
+            start_date=self.today - timedelta(days=60),
+            end_date=self.today - timedelta(days=31),
+            is_active=False,
+        )
+        response = self.client.get(reverse("budget-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = BudgetListSerializer(
+            Budget.objects.filter(user=self.user), many=True
+        ).data
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data, expected)
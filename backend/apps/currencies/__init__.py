@@ -0,0 +1,5 @@
+"""
+Currencies application initialization.
+"""
+
+default_app_config = "apps.currencies.apps.CurrenciesConfig"
@@ -0,0 +1,18 @@
+"""
+Admin configuration for the currencies application.
+"""
+
+from django.contrib import admin
+from .models import ExchangeRate
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for ExchangeRate model.
+    """
+
+    list_display = ("date", "currency", "rate", "source")
+    list_filter = ("currency", "source")
+    date_hierarchy = "date"
+    readonly_fields = ("created_at",)
@@ -0,0 +1,15 @@
+# apps/currencies/apps.py
+"""
+Apps configuration for the currencies application.
+"""
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CurrenciesConfig(AppConfig):
+    """Configuration for currencies application."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.currencies"
+    verbose_name = _("Currencies")
@@ -0,0 +1,33 @@
+"""
+Management command to load exchange rates into the rate table.
+"""
+
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from ...providers import ExchangeRateProviderError, FileRateProvider
+from ...services.currency_service import CurrencyService
+
+
+class Command(BaseCommand):
+    """
+    Load one day's exchange rates from the configured provider.
+
+    ``--file`` reads a JSON rate file instead, which is handy for seeding
+    development databases and backfilling history.
+    """
+
+    help = "Load exchange rates for a day into the rate table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date", type=date.fromisoformat, help="Day to load, defaults to today"
+        )
+        parser.add_argument("--file", help="Load rates from this JSON file")
+
+    def handle(self, *args, **options):
+        provider = FileRateProvider(options["file"]) if options["file"] else None
+        try:
+            loaded = CurrencyService.load_rates(options["date"], provider)
+        except ExchangeRateProviderError as e:
+            raise CommandError(str(e)) from e
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} exchange rates."))
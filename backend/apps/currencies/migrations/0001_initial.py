@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("currency", models.CharField(max_length=3, verbose_name="Currency")),
+                (
+                    "rate",
+                    models.DecimalField(
+                        decimal_places=10,
+                        help_text="Units of the currency per unit of the base currency",
+                        max_digits=20,
+                        verbose_name="Rate",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        blank=True,
+                        help_text="Provider the rate was loaded from",
+                        max_length=50,
+                        verbose_name="Source",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Exchange Rate",
+                "verbose_name_plural": "Exchange Rates",
+                "ordering": ["-date", "currency"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="exchangerate",
+            constraint=models.UniqueConstraint(
+                fields=("currency", "date"), name="exchange_rate_unique_currency_date"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="exchangerate",
+            constraint=models.CheckConstraint(
+                check=models.Q(("rate__gt", 0)), name="exchange_rate_positive"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+"""
+Models for the currencies application.
+"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ExchangeRate(models.Model):
+    """
+    Daily exchange rate of a currency against the base currency.
+
+    ``rate`` is the number of units of ``currency`` one unit of the base
+    currency (``DEFAULT_CURRENCY``) buys on ``date``. Converting between
+    two other currencies goes through the base: ``amount * to / from``.
+    """
+
+    date = models.DateField(_("Date"))
+    currency = models.CharField(_("Currency"), max_length=3)
+    rate = models.DecimalField(
+        _("Rate"),
+        max_digits=20,
+        decimal_places=10,
+        help_text=_("Units of the currency per unit of the base currency"),
+    )
+    source = models.CharField(
+        _("Source"),
+        max_length=50,
+        blank=True,
+        help_text=_("Provider the rate was loaded from"),
+    )
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        """
+        Meta options for ExchangeRate model.
+        """
+
+        verbose_name = _("Exchange Rate")
+        verbose_name_plural = _("Exchange Rates")
+        ordering = ["-date", "currency"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency", "date"], name="exchange_rate_unique_currency_date"
+            ),
+            models.CheckConstraint(
+                check=models.Q(rate__gt=0), name="exchange_rate_positive"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the exchange rate."""
+        return f"{self.currency} {self.rate} ({self.date})"
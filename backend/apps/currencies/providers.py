@@ -0,0 +1,139 @@
+"""
+Exchange rate providers.
+
+Providers only run when rates are loaded into the ``ExchangeRate`` table,
+by the ``load_exchange_rates`` command or task, never while serving a
+request. The provider is chosen with the ``EXCHANGE_RATE_PROVIDER``
+setting.
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Optional
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from utils.constants import DEFAULT_CURRENCY
+
+
+class ExchangeRateProviderError(Exception):
+    """Raised when a provider cannot supply rates."""
+
+
+class ExchangeRateProvider:
+    """
+    Base class for exchange rate sources.
+
+    Subclasses return the rates of one day as units of each currency per
+    unit of ``DEFAULT_CURRENCY``.
+    """
+
+    name = "base"
+
+    def fetch(self, day: date) -> Dict[str, Decimal]:
+        """
+        Fetch the rates for a day.
+
+        Args:
+            day: Day to fetch rates for
+
+        Returns:
+            Dict[str, Decimal]: Rate per currency code
+
+        Raises:
+            ExchangeRateProviderError: If the rates cannot be fetched
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def rebase(base: str, rates: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        """
+        Re-express rates quoted against ``base`` against ``DEFAULT_CURRENCY``.
+
+        Args:
+            base: Currency the rates are quoted against
+            rates: Rate per currency code
+
+        Returns:
+            Dict[str, Decimal]: Rates against ``DEFAULT_CURRENCY``
+        """
+        rates = {**rates, base: Decimal("1")}
+        if base == DEFAULT_CURRENCY:
+            return rates
+        if DEFAULT_CURRENCY not in rates:
+            raise ExchangeRateProviderError(
+                f"Rates quoted against {base} do not include {DEFAULT_CURRENCY}"
+            )
+        pivot = rates[DEFAULT_CURRENCY]
+        return {currency: rate / pivot for currency, rate in rates.items()}
+
+
+class FileRateProvider(ExchangeRateProvider):
+    """
+    Provider reading rates from a JSON file.
+
+    The file holds ``{"base": "USD", "rates": {"EUR": "0.92", ...}}``,
+    optionally keyed by ISO date for several days. A file without dates
+    applies to any day, which makes it a stand-in for a real feed.
+    """
+
+    name = "file"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.EXCHANGE_RATES_FILE)
+
+    def fetch(self, day: date) -> Dict[str, Decimal]:
+        try:
+            with self.path.open() as rates_file:
+                data = json.load(rates_file, parse_float=Decimal)
+        except (OSError, ValueError) as e:
+            raise ExchangeRateProviderError(
+                f"Cannot read rates from {self.path}: {e}"
+            ) from e
+
+        if "rates" not in data:
+            data = data.get(day.isoformat())
+            if data is None:
+                raise ExchangeRateProviderError(f"No rates for {day} in {self.path}")
+        return self.rebase(
+            data.get("base", DEFAULT_CURRENCY),
+            {code: Decimal(str(rate)) for code, rate in data["rates"].items()},
+        )
+
+
+class HttpRateProvider(ExchangeRateProvider):
+    """
+    Provider fetching rates from an HTTP API with a bounded timeout.
+
+    ``EXCHANGE_RATES_URL`` is formatted with ``base`` and ``date`` and must
+    return ``{"base": ..., "rates": {...}}``.
+    """
+
+    name = "http"
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None):
+        self.url = url or settings.EXCHANGE_RATES_URL
+        self.timeout = timeout or settings.EXCHANGE_RATES_TIMEOUT
+
+    def fetch(self, day: date) -> Dict[str, Decimal]:
+        try:
+            response = requests.get(
+                self.url.format(base=DEFAULT_CURRENCY, date=day.isoformat()),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = json.loads(response.text, parse_float=Decimal)
+        except (requests.RequestException, ValueError) as e:
+            raise ExchangeRateProviderError(f"Cannot fetch rates: {e}") from e
+
+        return self.rebase(
+            data.get("base", DEFAULT_CURRENCY),
+            {code: Decimal(str(rate)) for code, rate in data.get("rates", {}).items()},
+        )
+
+
+def get_provider() -> ExchangeRateProvider:
+    """Instantiate the provider configured by ``EXCHANGE_RATE_PROVIDER``."""
+    return import_string(settings.EXCHANGE_RATE_PROVIDER)()
@@ -0,0 +1,5 @@
+"""
+Currencies services initialization.
+"""
+
+from .currency_service import CurrencyService  # noqa: F401
@@ -0,0 +1,378 @@
+"""
+Service layer for exchange rates and currency conversion.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from django.db.models import (
+    Case,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.utils import timezone
+from core.cache_config import CACHE_TIMEOUTS, CacheService
+from utils.constants import DEFAULT_CURRENCY
+from utils.exceptions.custom_exceptions import InvalidCurrency
+from utils.helpers import money
+from ..models import ExchangeRate
+from ..providers import ExchangeRateProvider, get_provider
+
+# Rates are held as integers scaled by the model's decimal places
+RATE_DECIMAL_PLACES = ExchangeRate._meta.get_field("rate").decimal_places
+RATE_SCALE = 10**RATE_DECIMAL_PLACES
+
+# (date the rates were published, scaled rate per currency)
+RateTable = Tuple[Optional[date], Dict[str, int]]
+
+CONVERTED_FIELD = DecimalField(max_digits=20, decimal_places=RATE_DECIMAL_PLACES)
+
+
+class LRUCache:
+    """
+    Small thread-safe in-process LRU cache with a time to live.
+
+    It sits in front of the shared cache so hot rate tables are read
+    without a network round trip. Entries expire so rates loaded by
+    another process are picked up.
+    """
+
+    def __init__(self, maxsize: int = 64, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """Return a live entry and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+rate_tables = LRUCache()
+
+
+class CurrencyService:
+    """
+    Service class for exchange rates and currency conversion.
+
+    Rates live in the ``ExchangeRate`` table, loaded daily by a provider.
+    Conversions read the rate table of a day from an in-process LRU, then
+    the shared cache, then the database, and never call the provider.
+    Arithmetic is done on integer minor units and scaled integer rates
+    with half-even rounding, so results do not depend on float or Decimal
+    context precision.
+    """
+
+    @staticmethod
+    def minor_unit_exponent(currency: str) -> int:
+        """Number of minor unit digits of a currency."""
+        return money.minor_unit_exponent(currency)
+
+    @staticmethod
+    def to_minor(amount: Decimal, currency: str) -> int:
+        """
+        Convert an amount to integer minor units, rounding half to even.
+
+        Args:
+            amount: Amount in major units
+            currency: Currency code
+
+        Returns:
+            int: Amount in minor units
+        """
+        return money.to_minor(amount, money.minor_unit_exponent(currency))
+
+    @staticmethod
+    def from_minor(units: int, currency: str) -> Decimal:
+        """
+        Convert integer minor units to a Decimal amount.
+
+        Args:
+            units: Amount in minor units
+            currency: Currency code
+
+        Returns:
+            Decimal: Amount in major units
+        """
+        return money.from_minor(units, money.minor_unit_exponent(currency))
+
+    @staticmethod
+    def load_rates(
+        day: Optional[date] = None, provider: Optional[ExchangeRateProvider] = None
+    ) -> int:
+        """
+        Fetch a day's rates from a provider and store them.
+
+        Args:
+            day: Day to load, defaults to today
+            provider: Provider to use, defaults to ``EXCHANGE_RATE_PROVIDER``
+
+        Returns:
+            int: Number of rates stored
+
+        Raises:
+            ExchangeRateProviderError: If the provider cannot supply rates
+        """
+        day = day or timezone.now().date()
+        provider = provider or get_provider()
+        rates = [
+            ExchangeRate(
+                date=day,
+                currency=currency,
+                rate=rate.quantize(Decimal(1).scaleb(-RATE_DECIMAL_PLACES)),
+                source=provider.name,
+            )
+            for currency, rate in provider.fetch(day).items()
+            if currency != DEFAULT_CURRENCY
+        ]
+        ExchangeRate.objects.bulk_create(
+            rates,
+            update_conflicts=True,
+            unique_fields=["currency", "date"],
+            update_fields=["rate", "source"],
+        )
+        # Later days fall back to this day's rates until their own load
+        rate_tables.clear()
+        CacheService.invalidate(CurrencyService.get_cache_key(day))
+        return len(rates)
+
+    @staticmethod
+    def get_cache_key(day: date) -> str:
+        """Shared cache key of a day's rate table."""
+        return CacheService.get_cache_key("exchange_rates", day.isoformat())
+
+    @staticmethod
+    def build_rate_table(day: date) -> RateTable:
+        """
+        Read the latest rate of every currency published on or before a day.
+
+        Args:
+            day: Day to convert on
+
+        Returns:
+            RateTable: Publication date of the newest rate and scaled rates
+        """
+        rows = list(
+            ExchangeRate.objects.filter(date__lte=day)
+            .order_by("currency", "-date")
+            .distinct("currency")
+            .values_list("currency", "date", "rate")
+        )
+        rates = {
+            currency: int(rate.scaleb(RATE_DECIMAL_PLACES))
+            for currency, _, rate in rows
+        }
+        rates[DEFAULT_CURRENCY] = RATE_SCALE
+        return max((published for _, published, _ in rows), default=None), rates
+
+    @staticmethod
+    def get_rate_table(day: Optional[date] = None) -> RateTable:
+        """
+        Get a day's rate table from the in-process LRU or shared cache.
+
+        Args:
+            day: Day to convert on, defaults to today
+
+        Returns:
+            RateTable: Publication date of the newest rate and scaled rates
+        """
+        day = day or timezone.now().date()
+        table = rate_tables.get(day)
+        if table is None:
+            table = CacheService.get_or_set(
+                CurrencyService.get_cache_key(day),
+                lambda: CurrencyService.build_rate_table(day),
+                CACHE_TIMEOUTS["exchange_rates"],
+            )
+            rate_tables.set(day, table)
+        return table
+
+    @staticmethod
+    def convert_minor(
+        units: int, from_currency: str, to_currency: str, rates: Dict[str, int]
+    ) -> int:
+        """
+        Convert minor units between currencies with a rate table.
+
+        Args:
+            units: Amount in minor units of ``from_currency``
+            from_currency: Source currency code
+            to_currency: Target currency code
+            rates: Scaled rates from a rate table
+
+        Returns:
+            int: Amount in minor units of ``to_currency``
+
+        Raises:
+            InvalidCurrency: If either currency has no rate
+        """
+        if from_currency == to_currency:
+            return units
+        for currency in (from_currency, to_currency):
+            if currency not in rates:
+                raise InvalidCurrency(f"No exchange rate for {currency}")
+        exponent = CurrencyService.minor_unit_exponent(
+            to_currency
+        ) - CurrencyService.minor_unit_exponent(from_currency)
+        numerator = units * rates[to_currency]
+        denominator = rates[from_currency]
+        if exponent >= 0:
+            numerator *= 10**exponent
+        else:
+            denominator *= 10**-exponent
+        return money.divide_half_even(numerator, denominator)
+
+    @staticmethod
+    def convert(
+        amount: Decimal,
+        from_currency: str,
+        to_currency: str,
+        day: Optional[date] = None,
+    ) -> Decimal:
+        """
+        Convert one amount between currencies.
+
+        Args:
+            amount: Amount in ``from_currency``
+            from_currency: Source currency code
+            to_currency: Target currency code
+            day: Day whose rates to use, defaults to today
+
+        Returns:
+            Decimal: Amount in ``to_currency``
+        """
+        return CurrencyService.convert_many(
+            [(amount, from_currency, day)], to_currency
+        )[0]
+
+    @staticmethod
+    def convert_many(
+        rows: Iterable[Tuple[Decimal, str, Optional[date]]], to_currency: str
+    ) -> List[Decimal]:
+        """
+        Convert many amounts, each on its own day, to one currency.
+
+        Accepts any iterable of ``(amount, currency, date)``, such as
+        ``queryset.values_list("amount", "currency", "date")``. Rate tables
+        are fetched once per distinct day.
+
+        Args:
+            rows: ``(amount, currency, date)`` tuples; a None date means today
+            to_currency: Target currency code
+
+        Returns:
+            List[Decimal]: Converted amounts, in input order
+        """
+        tables: Dict[Optional[date], Dict[str, int]] = {}
+        converted = []
+        for amount, currency, day in rows:
+            if day not in tables:
+                tables[day] = CurrencyService.get_rate_table(day)[1]
+            units = CurrencyService.convert_minor(
+                CurrencyService.to_minor(amount, currency),
+                currency,
+                to_currency,
+                tables[day],
+            )
+            converted.append(CurrencyService.from_minor(units, to_currency))
+        return converted
+
+    @staticmethod
+    def rate_expression(currency, day_field: str = "date"):
+        """
+        SQL expression for a currency's latest rate on or before a row's day.
+
+        Args:
+            currency: Currency code, or an ``F()`` to a currency column
+            day_field: Date column of the outer query
+
+        Returns:
+            Expression: Rate, 1 for the base currency, NULL when unknown
+        """
+        if isinstance(currency, str):
+            if currency == DEFAULT_CURRENCY:
+                return Value(Decimal(1), output_field=CONVERTED_FIELD)
+            lookup = Value(currency)
+        else:
+            lookup = OuterRef(currency.name)
+        latest = Subquery(
+            ExchangeRate.objects.filter(currency=lookup, date__lte=OuterRef(day_field))
+            .order_by("-date")
+            .values("rate")[:1],
+            output_field=CONVERTED_FIELD,
+        )
+        if isinstance(currency, str):
+            return latest
+        return Case(
+            When(
+                **{currency.name: DEFAULT_CURRENCY},
+                then=Value(Decimal(1), output_field=CONVERTED_FIELD),
+            ),
+            default=latest,
+            output_field=CONVERTED_FIELD,
+        )
+
+    @staticmethod
+    def converted_amount(
+        to_currency: str,
+        amount_field: str = "amount",
+        currency_field: str = "currency",
+        day_field: str = "date",
+    ) -> ExpressionWrapper:
+        """
+        SQL expression converting each row's amount on the row's own day.
+
+        Use it inside aggregates, e.g. ``Sum(converted_amount("EUR"))``, so
+        totals across currencies are computed in the database by joining
+        the rate table through indexed correlated lookups.
+
+        Args:
+            to_currency: Target currency code
+            amount_field: Amount column
+            currency_field: Currency column
+            day_field: Date column whose rates apply
+
+        Returns:
+            ExpressionWrapper: Converted amount, NULL when a rate is missing
+        """
+        return ExpressionWrapper(
+            F(amount_field)
+            * CurrencyService.rate_expression(to_currency, day_field)
+            / CurrencyService.rate_expression(F(currency_field), day_field),
+            output_field=CONVERTED_FIELD,
+        )
@@ -0,0 +1,14 @@
+"""
+Celery tasks for the currencies application.
+"""
+
+from typing import Optional
+from datetime import date
+from celery import shared_task
+from .services.currency_service import CurrencyService
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def load_exchange_rates(day: Optional[str] = None) -> int:
+    """Load a day's exchange rates from the configured provider."""
+    return CurrencyService.load_rates(date.fromisoformat(day) if day else None)
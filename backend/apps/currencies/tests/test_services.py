@@ -0,0 +1,209 @@
+"""
+Tests for currency services and rate providers.
+"""
+
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from apps.expenses.models import Expense
+from apps.expenses.services.expenses_service import ExpenseService
+from utils.exceptions.custom_exceptions import InvalidCurrency
+from ..models import ExchangeRate
+from ..providers import ExchangeRateProviderError, FileRateProvider, HttpRateProvider
+from ..services.currency_service import CurrencyService, LRUCache, rate_tables
+
+User = get_user_model()
+
+
+class RateFileMixin:
+    """Helpers writing rate files for providers."""
+
+    def _rate_file(self, data):
+        rates_file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(data, rates_file)
+        rates_file.close()
+        self.addCleanup(os.unlink, rates_file.name)
+        return rates_file.name
+
+
+class CurrencyServiceTests(RateFileMixin, TestCase):
+    """Test cases for CurrencyService."""
+
+    def setUp(self):
+        """Set up test data."""
+        rate_tables.clear()
+        self.addCleanup(rate_tables.clear)
+        CurrencyService.load_rates(
+            date(2024, 1, 1),
+            FileRateProvider(
+                self._rate_file({"base": "USD", "rates": {"EUR": 0.5, "JPY": 150}})
+            ),
+        )
+
+    def test_minor_units_round_half_even(self):
+        """Test conversion to minor units rounds half to even per currency."""
+        self.assertEqual(CurrencyService.to_minor(Decimal("10.005"), "USD"), 1000)
+        self.assertEqual(CurrencyService.to_minor(Decimal("10.015"), "USD"), 1002)
+        self.assertEqual(CurrencyService.to_minor(Decimal("-0.125"), "EUR"), -12)
+        self.assertEqual(CurrencyService.to_minor(Decimal("2.5"), "JPY"), 2)
+        self.assertEqual(CurrencyService.from_minor(1234, "USD"), Decimal("12.34"))
+        self.assertEqual(CurrencyService.from_minor(1234, "JPY"), Decimal("1234"))
+
+    def test_load_rates_rebases_and_upserts(self):
+        """Test rates quoted against another base are stored against USD."""
+        provider = FileRateProvider(
+            self._rate_file({"base": "EUR", "rates": {"USD": 2, "GBP": 1.6}})
+        )
+        CurrencyService.load_rates(date(2024, 1, 1), provider)
+
+        rates = dict(
+            ExchangeRate.objects.filter(date=date(2024, 1, 1)).values_list(
+                "currency", "rate"
+            )
+        )
+        self.assertEqual(rates["EUR"], Decimal("0.5"))
+        self.assertEqual(rates["GBP"], Decimal("0.8"))
+        self.assertNotIn("USD", rates)
+        self.assertEqual(ExchangeRate.objects.filter(currency="EUR").count(), 1)
+
+    def test_convert_uses_latest_rate_on_or_before_day(self):
+        """Test conversions pick each day's rates, falling back to older ones."""
+        CurrencyService.load_rates(
+            date(2024, 2, 1),
+            FileRateProvider(self._rate_file({"rates": {"EUR": 0.8, "JPY": 100}})),
+        )
+        self.assertEqual(
+            CurrencyService.convert(Decimal("10.00"), "USD", "EUR", date(2024, 1, 15)),
+            Decimal("5.00"),
+        )
+        self.assertEqual(
+            CurrencyService.convert(Decimal("10.00"), "EUR", "JPY", date(2024, 3, 1)),
+            Decimal("1250"),
+        )
+        with self.assertRaises(InvalidCurrency):
+            CurrencyService.convert(Decimal("1.00"), "USD", "EUR", date(2023, 12, 31))
+        with self.assertRaises(InvalidCurrency):
+            CurrencyService.convert(Decimal("1.00"), "USD", "CHF", date(2024, 1, 1))
+
+    def test_convert_many_reads_each_day_once(self):
+        """Test batches hit the database once per distinct day."""
+        rows = [
+            (Decimal("1.01"), "EUR", date(2024, 1, 2)),
+            (Decimal("3.00"), "JPY", date(2024, 1, 2)),
+            (Decimal("0.03"), "USD", date(2024, 1, 3)),
+        ] * 50
+        with self.assertNumQueries(2):
+            converted = CurrencyService.convert_many(rows, "USD")
+        self.assertEqual(
+            converted[:3], [Decimal("2.02"), Decimal("0.02"), Decimal("0.03")]
+        )
+
+        # The in-process LRU serves repeated days
+        with self.assertNumQueries(0):
+            CurrencyService.convert_many(rows, "EUR")
+
+    def test_summary_converts_in_sql(self):
+        """Test expense totals across currencies are converted per expense date."""
+        user = User.objects.create_user(
+            username="fxuser", email="fx@example.com", password="testpass123"
+        )
+        for amount, currency in (("10.00", "USD"), ("10.00", "EUR"), ("300", "JPY")):
+            Expense.objects.create(
+                user=user,
+                title="Lunch",
+                amount=Decimal(amount),
+                currency=currency,
+                category="FOOD",
+                date=date(2024, 1, 10),
+            )
+
+        summary = ExpenseService.get_expense_summary(user_id=user.id, currency="EUR")
+        self.assertEqual(summary[0]["total_amount"], Decimal("16.00"))
+        self.assertEqual(summary[0]["transaction_count"], 3)
+
+    def test_summary_rejects_expenses_without_rates(self):
+        """Test converted summaries fail rather than skip unconvertible expenses."""
+        user = User.objects.create_user(
+            username="norateuser", email="norate@example.com", password="testpass123"
+        )
+        for day in (date(2023, 12, 31), date(2024, 1, 10)):
+            Expense.objects.create(
+                user=user,
+                title="Lunch",
+                amount=Decimal("10.00"),
+                currency="EUR",
+                category="FOOD",
+                date=day,
+            )
+
+        with self.assertRaises(InvalidCurrency):
+            ExpenseService.get_expense_summary(user_id=user.id, currency="USD")
+        summary = ExpenseService.get_expense_summary(
+            user_id=user.id,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+            currency="USD",
+        )
+        self.assertEqual(summary[0]["total_amount"], Decimal("20.00"))
+        self.assertEqual(summary[0]["transaction_count"], 1)
+        self.assertNotIn("unconverted_count", summary[0])
+
+    def test_lru_cache_evicts_and_expires(self):
+        """Test the LRU keeps recently used entries within its size and TTL."""
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+        with mock.patch("time.monotonic", return_value=10**9):
+            self.assertIsNone(cache.get("a"))
+
+
+class RateProviderTests(RateFileMixin, TestCase):
+    """Test cases for exchange rate providers."""
+
+    def test_file_provider_dated_rates(self):
+        """Test files keyed by date only serve the days they contain."""
+        provider = FileRateProvider(
+            self._rate_file({"2024-01-01": {"rates": {"EUR": "0.9"}}})
+        )
+        self.assertEqual(provider.fetch(date(2024, 1, 1))["EUR"], Decimal("0.9"))
+        with self.assertRaises(ExchangeRateProviderError):
+            provider.fetch(date(2024, 1, 2))
+
+    def test_http_provider_times_out(self):
+        """Test HTTP fetches are bounded by a timeout and fail cleanly."""
+        import requests
+
+        provider = HttpRateProvider(
+            url="https://rates.example.com/{base}/{date}", timeout=2
+        )
+        with mock.patch("requests.get", side_effect=requests.Timeout) as get:
+            with self.assertRaises(ExchangeRateProviderError):
+                provider.fetch(date(2024, 1, 1))
+        get.assert_called_once_with(
+            "https://rates.example.com/USD/2024-01-01", timeout=2
+        )
+
+    def test_load_exchange_rates_command(self):
+        """Test the command loads a rate file for a given day."""
+        out = StringIO()
+        call_command(
+            "load_exchange_rates",
+            "--date",
+            "2024-01-05",
+            "--file",
+            self._rate_file({"rates": {"EUR": 0.9, "GBP": 0.8}}),
+            stdout=out,
+        )
+        self.assertIn("Loaded 2 exchange rates", out.getvalue())
+        self.assertEqual(ExchangeRate.objects.filter(date=date(2024, 1, 5)).count(), 2)
@@ -3,8 +3,12 @@ Admin configuration for the expenses application.
 """
 
 from django.contrib import admin
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
+from apps.users.models import User
+from apps.users.services import UserService
 from .models import Expense
+from .services import ExpenseService
 
 
 @admin.register(Expense)
@@ -31,7 +35,6 @@ class ExpenseAdmin(admin.ModelAdmin):
 
     search_fields = (
         "title",
-        "category",
         "notes",
         "user__username",
         "user__email",
@@ -63,6 +66,21 @@ class ExpenseAdmin(admin.ModelAdmin):
         """
         return super().get_queryset(request).select_related("user", "budget")
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search expenses with full-text search, and their owners with the
+        user search, so both are answered by indexes.
+        """
+        if not search_term.strip():
+            return queryset, False
+        owners = User.objects.filter(UserService.SEARCH.matches(search_term))
+        return (
+            queryset.filter(
+                ExpenseService.SEARCH.matches(search_term) | Q(user__in=owners)
+            ),
+            False,
+        )
+
     def save_model(self, request, obj, form, change):
         """
         Override save_model to handle any custom saving logic.
@@ -13,24 +13,34 @@ from django.utils.translation import gettext_lazy as _
 from django.db.models import Q
 from django.utils import timezone
 
+from apps.users.models import Profile
+from utils.mixins.read_serializer import ReadSerializerListMixin
+from core.throttling import (
+    BurstRateThrottle,
+    CustomUserRateThrottle,
+    ExpenseRateThrottle,
+)
 from ..models import Expense
 from ..serializers.expenses_serializer import (
     ExpenseSerializer,
     ExpenseCreateSerializer,
     ExpenseUpdateSerializer,
     ExpenseListSerializer,
+    ExpenseListReadSerializer,
     ExpenseSummarySerializer,
     ExpenseRecurrenceSerializer,
 )
 from ..services.expenses_service import ExpenseService
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(ReadSerializerListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing expenses.
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_classes = [CustomUserRateThrottle, BurstRateThrottle, ExpenseRateThrottle]
+    read_serializer = ExpenseListReadSerializer()
 
     def get_queryset(self):
         """Get queryset filtered by user and optional parameters."""
@@ -43,6 +53,13 @@ class ExpenseViewSet(viewsets.ModelViewSet):
         is_recurring = self.request.query_params.get("is_recurring")
         min_amount = self.request.query_params.get("min_amount")
         max_amount = self.request.query_params.get("max_amount")
+        search = self.request.query_params.get("q", "").strip()
+        tags = [
+            tag.strip()
+            for tag in self.request.query_params.get("tags", "").split(",")
+            if tag.strip()
+        ]
+        tags_match = self.request.query_params.get("tags_match", "any")
 
         if category:
             queryset = queryset.filter(category=category)
@@ -72,6 +89,14 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass
 
+        if tags:
+            queryset = ExpenseService.filter_by_tags(
+                queryset, tags, match_all=tags_match.lower() == "all"
+            )
+
+        if search:
+            queryset = ExpenseService.search_expenses(queryset, search)
+
         return queryset.select_related("budget")
 
     def get_serializer_class(self):
@@ -96,6 +121,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
         start_date = request.query_params.get("start_date")
         end_date = request.query_params.get("end_date")
         category = request.query_params.get("category")
+        currency = request.query_params.get("currency")
 
         try:
             if start_date:
@@ -107,12 +133,18 @@ class ExpenseViewSet(viewsets.ModelViewSet):
                 {"error": _("Invalid date format. Use YYYY-MM-DD")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if currency and currency not in Profile.CurrencyChoices.values:
+            return Response(
+                {"error": _("Unsupported currency")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         summary = ExpenseService.get_expense_summary(
             user_id=request.user.id,
             start_date=start_date,
             end_date=end_date,
             category=category,
+            currency=currency,
         )
         serializer = ExpenseSummarySerializer(summary, many=True)
         return Response(serializer.data)
@@ -211,9 +243,19 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def insights(self, request: Request) -> Response:
         """
-        Get expense insights.
+        Get expense insights comparing two periods.
+
+        Query params: ``period`` (week, month, quarter, year or ``<N>d``,
+        default ``30d``) and ``compare`` (previous or yoy).
         """
-        insights = ExpenseService.get_expense_insights(user_id=request.user.id)
+        try:
+            insights = ExpenseService.get_expense_insights(
+                user_id=request.user.id,
+                period=request.query_params.get("period", "30d"),
+                compare=request.query_params.get("compare", "previous"),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(insights)
 
     @action(detail=True, methods=["post"])
@@ -257,11 +299,15 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             from apps.budgets.models import Budget
 
             budget = Budget.objects.get(
-                id=budget_id, user=request.user, category=expense.category
+                id=budget_id,
+                user=request.user,
+                category=expense.category,
+                currency=expense.currency,
             )
 
-            ExpenseService.validate_expense_against_budget(expense)
             expense.budget = budget
+            expense.budget_matched = False
+            ExpenseService.validate_expense_against_budget(expense)
             expense.save()
 
             serializer = self.get_serializer(expense)
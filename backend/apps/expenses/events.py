@@ -0,0 +1,135 @@
+"""
+Domain events for the expenses application.
+
+Write paths that bypass model signals (see ``ExpenseWriteService``) describe
+what happened with typed events instead. Events raised inside
+``ExpenseEventDispatcher.collect()`` are handled together once the
+transaction commits, so rollups, budget utilization and alerts cost a fixed
+number of queries per batch rather than per expense.
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, List, Optional, Sequence, Tuple
+from django.db import transaction
+
+
+@dataclass(frozen=True)
+class ExpenseCreated:
+    """An expense was inserted."""
+
+    expense_id: int
+    user_id: int
+    date: date
+    category: str
+    amount: Decimal
+    currency: str
+    budget_id: Optional[int] = None
+    tags: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_expense(cls, expense) -> "ExpenseCreated":
+        """Build the event from a saved expense."""
+        return cls(
+            expense_id=expense.id,
+            user_id=expense.user_id,
+            date=expense.date,
+            category=expense.category,
+            amount=expense.amount,
+            currency=expense.currency,
+            budget_id=expense.budget_id,
+            tags=tuple(tag for *_, tag in expense.tag_keys),
+        )
+
+
+class ExpenseEventDispatcher:
+    """
+    Buffers expense events and handles them after the transaction commits.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    @contextmanager
+    def collect(cls, using: Optional[str] = None) -> Iterator[List]:
+        """
+        Open a transaction whose events are dispatched as one batch on commit.
+
+        Nothing is dispatched if the transaction, or an enclosing one, rolls
+        back.
+
+        Args:
+            using: Database alias
+
+        Yields:
+            List: The events collected so far
+        """
+        events: List = []
+        stack = cls._stack()
+        stack.append(events)
+        try:
+            with transaction.atomic(using=using):
+                yield events
+                transaction.on_commit(lambda: cls.dispatch(events), using=using)
+        finally:
+            stack.pop()
+
+    @classmethod
+    def emit(cls, event) -> None:
+        """
+        Record an event.
+
+        Inside ``collect()`` the event joins the current batch, otherwise it
+        is dispatched on its own when the current transaction commits.
+
+        Args:
+            event: Event instance
+        """
+        stack = cls._stack()
+        if stack:
+            stack[-1].append(event)
+        else:
+            transaction.on_commit(lambda: cls.dispatch([event]))
+
+    @classmethod
+    def dispatch(cls, events: Sequence) -> None:
+        """
+        Apply the side effects of a batch of events.
+
+        Args:
+            events: Events to handle
+        """
+        if not events:
+            return
+        from apps.analytics.services import AnalyticsService
+        from apps.budgets.services import BudgetService
+        from core.cache_config import CacheService
+
+        created = [event for event in events if isinstance(event, ExpenseCreated)]
+        AnalyticsService.refresh_daily_rollups(
+            (event.user_id, event.date, event.category, event.currency)
+            for event in created
+        )
+        AnalyticsService.refresh_tag_rollups(
+            (event.user_id, event.date.replace(day=1), event.currency, tag)
+            for event in created
+            for tag in event.tags
+        )
+        AnalyticsService.refresh_budget_utilization(
+            (event.user_id, event.date.replace(day=1)) for event in created
+        )
+        BudgetService.send_budget_alerts(
+            {event.budget_id for event in created if event.budget_id}
+        )
+        for user_id in {event.user_id for event in events}:
+            CacheService.bump_data_version(user_id)
+
+    @classmethod
+    def _stack(cls) -> List[List]:
+        """Get this thread's stack of open collection batches."""
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
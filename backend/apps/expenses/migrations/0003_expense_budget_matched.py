@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("expenses", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="expense",
+            name="budget_matched",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Whether the budget was assigned automatically by category and date",
+                verbose_name="Budget Matched",
+            ),
+        ),
+    ]
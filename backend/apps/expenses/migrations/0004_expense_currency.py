@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("expenses", "0003_expense_budget_matched"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="expense",
+            name="currency",
+            field=models.CharField(
+                choices=[
+                    ("USD", "US Dollar"),
+                    ("EUR", "Euro"),
+                    ("GBP", "British Pound"),
+                    ("JPY", "Japanese Yen"),
+                    ("AUD", "Australian Dollar"),
+                    ("CAD", "Canadian Dollar"),
+                    ("CHF", "Swiss Franc"),
+                    ("CNY", "Chinese Yuan"),
+                    ("INR", "Indian Rupee"),
+                ],
+                default="USD",
+                max_length=3,
+                verbose_name="Currency",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:15
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budgets", "0007_budget_currency"),
+        ("expenses", "0005_expense_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expense",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"],
+                name="expenses_expense_tags_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
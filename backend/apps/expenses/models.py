@@ -3,11 +3,18 @@ Models for the expenses application.
 """
 
 from decimal import Decimal
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
 from apps.budgets.models import Budget
+from apps.users.models import Profile
+from utils.constants import MAX_TAG_LENGTH
+
+# Text search configuration of ``Expense.search_vector`` and its queries
+SEARCH_CONFIG = "english"
 
 
 class Expense(models.Model):
@@ -52,6 +59,12 @@ class Expense(models.Model):
         decimal_places=2,
         validators=[MinValueValidator(Decimal("0.01"))],
     )
+    currency = models.CharField(
+        _("Currency"),
+        max_length=3,
+        choices=Profile.CurrencyChoices.choices,
+        default=Profile.CurrencyChoices.USD,
+    )
     category = models.CharField(
         _("Category"),
         max_length=100,
@@ -73,6 +86,14 @@ class Expense(models.Model):
         related_name="expenses",
         verbose_name=_("Budget"),
     )
+    budget_matched = models.BooleanField(
+        _("Budget Matched"),
+        default=False,
+        editable=False,
+        help_text=_(
+            "Whether the budget was assigned automatically by category and date"
+        ),
+    )
     notes = models.TextField(
         _("Notes"), blank=True, help_text=_("Additional details about the expense")
     )
@@ -101,6 +122,22 @@ class Expense(models.Model):
     )
     created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+    # Maintained by PostgreSQL on every write, bulk ones included
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("tags", weight="B", config=SEARCH_CONFIG)
+            + SearchVector("location", weight="C", config=SEARCH_CONFIG)
+            + SearchVector("notes", weight="D", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # Fields that decide which budgets the expense counts towards
+    LEDGER_FIELDS = ("user_id", "category", "currency", "date", "amount")
+    # Fields that decide which tag rollups the expense counts towards
+    TAG_FIELDS = ("user_id", "date", "currency", "tags")
 
     class Meta:
         """
@@ -114,6 +151,13 @@ class Expense(models.Model):
             models.Index(fields=["user", "category"]),
             models.Index(fields=["date"]),
             models.Index(fields=["is_recurring"]),
+            GinIndex(fields=["search_vector"], name="expenses_expense_search_gin"),
+            # Answers ``tags @> '["tag"]'``, the ``tags__contains`` lookup
+            GinIndex(
+                fields=["tags"],
+                opclasses=["jsonb_path_ops"],
+                name="expenses_expense_tags_gin",
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -134,13 +178,76 @@ class Expense(models.Model):
 
         if self.date and self.date > timezone.now().date():
             raise ValidationError(_("Expense date cannot be in the future."))
+        if not isinstance(self.tags, list) or not all(
+            isinstance(tag, str) and tag.strip() and len(tag) <= MAX_TAG_LENGTH
+            for tag in self.tags
+        ):
+            raise ValidationError(
+                {
+                    "tags": _(
+                        "Tags must be a list of non-empty strings of at most "
+                        "%(length)d characters."
+                    )
+                    % {"length": MAX_TAG_LENGTH}
+                }
+            )
+
+    def full_clean(self, exclude=None, validate_unique=True, validate_constraints=True):
+        """
+        Validate the expense, except for the generated ``search_vector``.
+
+        Django before 5.0.2 reads generated fields while cleaning, which
+        fails on unsaved instances.
+        """
+        exclude = {*(exclude or ()), "search_vector"}
+        super().full_clean(exclude, validate_unique, validate_constraints)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the loaded ledger entry and tag keys so saves can apply the
+        difference.
+        """
+        instance = super().from_db(db, field_names, values)
+        deferred = instance.get_deferred_fields()
+        if not deferred.intersection(cls.LEDGER_FIELDS):
+            instance._loaded_ledger_entry = instance.ledger_entry
+        if not deferred.intersection(cls.TAG_FIELDS):
+            instance._loaded_tag_keys = instance.tag_keys
+        return instance
+
+    @property
+    def ledger_entry(self) -> tuple:
+        """The expense's budget ledger entry, with the ``LEDGER_FIELDS`` values."""
+        return tuple(getattr(self, field) for field in self.LEDGER_FIELDS)
+
+    @property
+    def tag_keys(self) -> frozenset:
+        """
+        The ``(user_id, month, currency, tag)`` tag rollup rows the expense
+        counts in.
+        """
+        if not isinstance(self.tags, list) or self.date is None:
+            return frozenset()
+        month = self.date.replace(day=1)
+        return frozenset(
+            (self.user_id, month, self.currency, tag)
+            for tag in self.tags
+            if isinstance(tag, str)
+        )
 
     def save(self, *args, **kwargs):
         """
         Override save to perform custom validation.
+
+        The row and the budget ledger update applied by the ``post_save``
+        signal are written in one transaction.
         """
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+        self._loaded_ledger_entry = self.ledger_entry
+        self._loaded_tag_keys = self.tag_keys
 
     @property
     def month_year(self) -> str:
@@ -7,6 +7,7 @@ from .expenses_serializer import (  # noqa: F401
     ExpenseCreateSerializer,
     ExpenseUpdateSerializer,
     ExpenseListSerializer,
+    ExpenseListReadSerializer,
     ExpenseSummarySerializer,
     ExpenseRecurrenceSerializer,
 )
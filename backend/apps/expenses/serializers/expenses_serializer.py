@@ -3,9 +3,17 @@ Serializers for the expenses application.
 """
 
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.translation import gettext_lazy as _
 from apps.budgets.models import Budget
+from utils.helpers.read_serializers import (
+    ReadSerializer,
+    choice_labels,
+    format_date,
+    format_decimal,
+)
 from ..models import Expense
+from ..services.expense_write_service import ExpenseWriteService
 
 
 class ExpenseSerializer(serializers.ModelSerializer):
@@ -28,6 +36,7 @@ class ExpenseSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "amount",
+            "currency",
             "category",
             "date",
             "payment_method",
@@ -74,8 +83,7 @@ class ExpenseCreateSerializer(ExpenseSerializer):
         """Validate budget exists and belongs to user."""
         if value:
             try:
-                budget = Budget.objects.get(id=value, user=self.context["request"].user)
-                return budget.id
+                return Budget.objects.get(id=value, user=self.context["request"].user)
             except Budget.DoesNotExist:
                 raise serializers.ValidationError(_("Invalid budget selected."))
         return value
@@ -84,11 +92,15 @@ class ExpenseCreateSerializer(ExpenseSerializer):
         """
         Create expense with proper budget assignment.
         """
-        budget_id = validated_data.pop("budget_id", None)
-        if budget_id:
-            budget = Budget.objects.get(id=budget_id)
+        budget = validated_data.pop("budget_id", None)
+        if budget:
             validated_data["budget"] = budget
-        return super().create(validated_data)
+        try:
+            return ExpenseWriteService.create(validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(
+                e.message_dict if hasattr(e, "error_dict") else e.messages
+            )
 
 
 class ExpenseUpdateSerializer(ExpenseSerializer):
@@ -121,6 +133,7 @@ class ExpenseListSerializer(ExpenseSerializer):
             "id",
             "title",
             "amount",
+            "currency",
             "category",
             "date",
             "payment_method",
@@ -130,6 +143,52 @@ class ExpenseListSerializer(ExpenseSerializer):
         ]
 
 
+class ExpenseListReadSerializer(ReadSerializer):
+    """
+    Read serializer for listing expenses, with ExpenseListSerializer's output.
+    """
+
+    columns = (
+        "id",
+        "title",
+        "amount",
+        "currency",
+        "category",
+        "date",
+        "payment_method",
+        "is_recurring",
+        "metadata",
+    )
+
+    def get_context(self):
+        """Add today and the category labels."""
+        context = super().get_context()
+        context["today"] = context["now"].date()
+        context["categories"] = choice_labels(Expense, "category")
+        return context
+
+    def to_representation(self, row, context):
+        """Serialize one expense, as ``Expense.get_category_info`` describes it."""
+        category = row["category"]
+        metadata = row["metadata"]
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "amount": format_decimal(row["amount"]),
+            "currency": row["currency"],
+            "category": category,
+            "date": format_date(row["date"]),
+            "payment_method": row["payment_method"],
+            "is_recurring": row["is_recurring"],
+            "category_info": {
+                "name": context["categories"].get(category, category),
+                "icon": metadata.get("category_icon", "default-icon"),
+                "color": metadata.get("category_color", "#000000"),
+            },
+            "is_recent": (context["today"] - row["date"]).days <= 30,
+        }
+
+
 class ExpenseSummarySerializer(serializers.Serializer):
     """
     Serializer for expense summary data.
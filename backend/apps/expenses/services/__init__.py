@@ -3,3 +3,4 @@ Expenses services initialization.
 """
 
 from .expenses_service import ExpenseService  # noqa: F401
+from .expense_write_service import ExpenseWriteService  # noqa: F401
@@ -0,0 +1,105 @@
+"""
+Signal-free write path for expenses.
+"""
+
+from typing import Dict, Iterable, List
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from apps.budgets.services import BudgetLedgerService, BudgetMatchService
+from ..events import ExpenseCreated, ExpenseEventDispatcher
+from ..models import Expense
+
+
+class ExpenseWriteService:
+    """
+    Service class for creating expenses without model signals.
+
+    Each expense is validated once in memory and inserted with
+    ``bulk_create``, which does not send ``pre_save``/``post_save``. The
+    side effects the signals would have run are described by
+    ``ExpenseCreated`` events and applied in one batch after commit; only
+    the budget ledger is updated inside the transaction. Expenses without
+    a budget are assigned the covering one from the cached interval map.
+    """
+
+    @staticmethod
+    def validate(expense: Expense) -> None:
+        """
+        Validate an unsaved expense without touching the database.
+
+        Foreign keys are expected to be resolved by the caller (the user is
+        the requester and budgets are looked up by the serializer), so they
+        are not re-fetched here.
+
+        Args:
+            expense: Expense to validate
+
+        Raises:
+            ValidationError: If the expense is invalid
+        """
+        expense.full_clean(
+            exclude=["user", "budget"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+        budget = expense.budget
+        if budget is not None:
+            if budget.user_id != expense.user_id:
+                raise ValidationError({"budget": _("Invalid budget selected.")})
+            if budget.currency != expense.currency:
+                raise ValidationError(
+                    {"currency": _("Expense currency must match the budget currency.")}
+                )
+            if not budget.start_date <= expense.date <= budget.end_date:
+                raise ValidationError(
+                    _("Expense date must fall within the budget period.")
+                )
+
+    @staticmethod
+    def create(data: Dict) -> Expense:
+        """
+        Create a single expense.
+
+        Args:
+            data: Expense field values, including ``user`` or ``user_id``
+
+        Returns:
+            Expense: Created expense
+        """
+        return ExpenseWriteService.create_many([data])[0]
+
+    @staticmethod
+    def create_many(rows: Iterable[Dict]) -> List[Expense]:
+        """
+        Validate and insert expenses in one statement.
+
+        Args:
+            rows: Expense field values, each including ``user`` or ``user_id``
+
+        Returns:
+            List[Expense]: Created expenses
+
+        Raises:
+            ValidationError: If any expense is invalid; nothing is inserted
+            BudgetLimitExceeded: If the batch would overspend an attached
+                budget; nothing is inserted
+        """
+        expenses = [Expense(**row) for row in rows]
+        for expense in expenses:
+            ExpenseWriteService.validate(expense)
+        BudgetMatchService.assign(expenses)
+
+        with ExpenseEventDispatcher.collect():
+            Expense.objects.bulk_create(expenses)
+            BudgetLedgerService.apply(
+                [expense.ledger_entry for expense in expenses],
+                limited_budget_ids={
+                    expense.budget_id
+                    for expense in expenses
+                    if expense.budget_id and not expense.budget_matched
+                },
+            )
+            for expense in expenses:
+                expense._loaded_ledger_entry = expense.ledger_entry
+                ExpenseEventDispatcher.emit(ExpenseCreated.from_expense(expense))
+        return expenses
@@ -4,13 +4,34 @@ Service layer for expense operations.
 
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
-from django.db.models import Sum, Avg, Count, Q, F
-from django.db.models.functions import TruncMonth, ExtractYear, ExtractMonth
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import (
+    Sum,
+    Avg,
+    Count,
+    DecimalField,
+    Q,
+    F,
+    Func,
+    JSONField,
+    QuerySet,
+)
+from django.db.models.functions import Cast, JSONObject, ExtractYear, ExtractMonth
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-from ..models import Expense
+from core.cache_config import CACHE_TIMEOUTS, CacheService
+from utils.exceptions.custom_exceptions import InvalidCurrency
+from utils.helpers.calendar_helpers import (
+    add_periods,
+    bucket_daily_totals,
+    expand_recurrence,
+    period_bounds,
+)
+from utils.helpers.money import from_minor, minor_units
+from utils.helpers.search import FullTextSearch
+from ..models import SEARCH_CONFIG, Expense
 
 
 class ExpenseService:
@@ -18,6 +39,8 @@ class ExpenseService:
     Service class for handling expense operations.
     """
 
+    SEARCH = FullTextSearch("search_vector", SEARCH_CONFIG)
+
     @staticmethod
     def create_recurring_expenses(
         expense_data: Dict, start_date: date, end_date: date, frequency: str
@@ -34,31 +57,12 @@ class ExpenseService:
         Returns:
             List[Expense]: Created expenses
         """
-        expenses = []
-        current_date = start_date
-
-        while current_date <= end_date:
-            expense_data["date"] = current_date
-            expense = Expense.objects.create(**expense_data)
-            expenses.append(expense)
-
-            # Calculate next date based on frequency
-            if frequency == "DAILY":
-                current_date += timedelta(days=1)
-            elif frequency == "WEEKLY":
-                current_date += timedelta(weeks=1)
-            elif frequency == "MONTHLY":
-                # Handle month increment
-                if current_date.month == 12:
-                    current_date = current_date.replace(
-                        year=current_date.year + 1, month=1
-                    )
-                else:
-                    current_date = current_date.replace(month=current_date.month + 1)
-            else:  # YEARLY
-                current_date = current_date.replace(year=current_date.year + 1)
-
-        return expenses
+        from .expense_write_service import ExpenseWriteService
+
+        return ExpenseWriteService.create_many(
+            {**expense_data, "date": occurrence}
+            for occurrence in expand_recurrence(start_date, end_date, frequency)
+        )
 
     @staticmethod
     def get_expense_summary(
@@ -66,6 +70,7 @@ class ExpenseService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         category: Optional[str] = None,
+        currency: Optional[str] = None,
     ) -> List[Dict]:
         """
         Get expense summary with aggregated data.
@@ -75,9 +80,16 @@ class ExpenseService:
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
             category: Optional category for filtering
+            currency: Optional currency to convert amounts to, each at the
+                rate of its expense date; amounts are summed as recorded
+                otherwise
 
         Returns:
             List[Dict]: Summary data
+
+        Raises:
+            InvalidCurrency: If an expense has no exchange rate on or before
+                its date, as ``CurrencyService.convert`` would
         """
         query = Q(user_id=user_id)
 
@@ -86,16 +98,40 @@ class ExpenseService:
         if category:
             query &= Q(category=category)
 
-        return (
-            Expense.objects.filter(query)
-            .values("category")
+        queryset = Expense.objects.filter(query)
+        amount = "amount"
+        checks = {}
+        if currency:
+            from apps.currencies.services import CurrencyService
+
+            # NULL without a rate, which Sum and Avg would silently skip
+            queryset = queryset.alias(
+                converted_amount=CurrencyService.converted_amount(currency)
+            )
+            amount = "converted_amount"
+            checks["unconverted_count"] = Count(
+                "id", filter=Q(converted_amount__isnull=True)
+            )
+        money = DecimalField(max_digits=12, decimal_places=2)
+
+        summary = (
+            queryset.values("category")
             .annotate(
-                total_amount=Sum("amount"),
+                total_amount=Cast(Sum(amount), money),
                 transaction_count=Count("id"),
-                average_amount=Avg("amount"),
+                average_amount=Cast(Avg(amount), money),
+                **checks,
             )
             .order_by("-total_amount")
         )
+        if currency:
+            summary = list(summary)
+            if sum(row.pop("unconverted_count") for row in summary):
+                raise InvalidCurrency(
+                    _("Some expenses have no exchange rate to %(currency)s")
+                    % {"currency": currency}
+                )
+        return summary
 
     @staticmethod
     def get_monthly_trend(
@@ -112,23 +148,21 @@ class ExpenseService:
         Returns:
             List[Dict]: Monthly trend data
         """
-        start_date = timezone.now().date() - timedelta(days=30 * months)
+        today = timezone.now().date()
+        start_date = add_periods(today.replace(day=1), -(months - 1), "month")
         query = Q(user_id=user_id, date__gte=start_date)
 
         if category:
             query &= Q(category=category)
 
-        return (
+        # Aggregate per day in SQL, then bucket days into months by lookup
+        daily = (
             Expense.objects.filter(query)
-            .annotate(month=TruncMonth("date"))
-            .values("month")
-            .annotate(
-                total_amount=Sum("amount"),
-                transaction_count=Count("id"),
-                average_amount=Avg("amount"),
-            )
-            .order_by("month")
+            .values("date")
+            .annotate(total_amount=Sum("amount"), transaction_count=Count("id"))
+            .order_by()
         )
+        return bucket_daily_totals(daily, "month", label="month")
 
     @staticmethod
     def get_category_distribution(
@@ -179,62 +213,178 @@ class ExpenseService:
         Returns:
             List[Dict]: Forecast data
         """
-        recurring_expenses = Expense.objects.filter(user_id=user_id, is_recurring=True)
+        recurring_expenses = Expense.objects.filter(
+            user_id=user_id, is_recurring=True
+        ).values_list(minor_units("amount"), "date", "metadata__recurrence_type")
+
+        # Totals are summed once, in minor units, then reused for every month
+        monthly_total = 0
+        yearly_totals: Dict[int, int] = {}
+        for amount, expense_date, recurrence_type in recurring_expenses:
+            if recurrence_type == "MONTHLY":
+                monthly_total += amount
+            elif recurrence_type == "YEARLY":
+                yearly_totals[expense_date.month] = (
+                    yearly_totals.get(expense_date.month, 0) + amount
+                )
 
         forecast = []
         today = timezone.now().date()
 
         for month in range(months_ahead):
             forecast_date = today + timedelta(days=30 * month)
-            month_total = Decimal("0")
-
-            for expense in recurring_expenses:
-                # Check if expense should recur this month
-                should_recur = (
-                    expense.metadata.get("recurrence_type") == "MONTHLY"
-                ) or (
-                    expense.metadata.get("recurrence_type") == "YEARLY"
-                    and expense.date.month == forecast_date.month
-                )
-                if should_recur:
-                    month_total += expense.amount
-
-            forecast.append({"month": forecast_date, "total_amount": month_total})
+            month_total = monthly_total + yearly_totals.get(forecast_date.month, 0)
+            forecast.append(
+                {"month": forecast_date, "total_amount": from_minor(month_total)}
+            )
 
         return forecast
 
+    INSIGHT_PERIODS = ("week", "month", "quarter", "year")
+    INSIGHT_COMPARISONS = ("previous", "yoy")
+    # Longest ``<N>d`` period, ten years
+    INSIGHT_MAX_DAYS = 3660
+
+    @staticmethod
+    def get_insight_windows(
+        period: str = "30d", compare: str = "previous", today: Optional[date] = None
+    ) -> Tuple[Tuple[date, date], Tuple[date, date]]:
+        """
+        Resolve the current and comparison date windows for insights.
+
+        Calendar periods (``week``, ``month``, ``quarter``, ``year``) cover the
+        period to date and are compared with the same span of the previous
+        period. ``<N>d`` covers the last N days, at most ``INSIGHT_MAX_DAYS``.
+        ``yoy`` compares with the same window one year earlier. Windows never
+        overlap.
+
+        Args:
+            period: ``week``, ``month``, ``quarter``, ``year`` or ``<N>d``
+            compare: ``previous`` or ``yoy``
+            today: Reference date, defaults to the current date
+
+        Returns:
+            Tuple: ``((current_start, current_end), (previous_start, previous_end))``
+
+        Raises:
+            ValueError: If the period or comparison is not supported
+        """
+        today = today or timezone.now().date()
+        if compare not in ExpenseService.INSIGHT_COMPARISONS:
+            raise ValueError("Invalid compare. Use previous or yoy")
+
+        if period in ExpenseService.INSIGHT_PERIODS:
+            start = period_bounds(today, period)[0]
+            span = period
+        elif (
+            period.endswith("d")
+            and period[:-1].isdigit()
+            and 0 < int(period[:-1]) <= ExpenseService.INSIGHT_MAX_DAYS
+        ):
+            start = today - timedelta(days=int(period[:-1]) - 1)
+            span = None
+        else:
+            raise ValueError(
+                "Invalid period. Use week, month, quarter, year or a number of days "
+                f"up to {ExpenseService.INSIGHT_MAX_DAYS}d like 30d"
+            )
+
+        if compare == "yoy":
+            previous_start = add_periods(start, -1, "year")
+            previous_end = add_periods(today, -1, "year")
+        else:
+            if span:
+                previous_start = add_periods(start, -1, span)
+            else:
+                previous_start = start - (today - start) - timedelta(days=1)
+            previous_end = min(
+                previous_start + (today - start), start - timedelta(days=1)
+            )
+        return (start, today), (previous_start, previous_end)
+
     @staticmethod
-    def get_expense_insights(user_id: int) -> Dict:
+    def get_expense_insights(
+        user_id: int, period: str = "30d", compare: str = "previous"
+    ) -> Dict:
         """
         Get insights about user's spending patterns.
 
+        All figures for both windows come from one grouped scan using
+        conditional aggregation. Results are cached per user data version,
+        which expense writes bump.
+
         Args:
             user_id: User ID
+            period: ``week``, ``month``, ``quarter``, ``year`` or ``<N>d``
+            compare: ``previous`` or ``yoy``
 
         Returns:
             Dict: Spending insights
         """
-        today = timezone.now().date()
-        thirty_days_ago = today - timedelta(days=30)
-        previous_thirty_days = thirty_days_ago - timedelta(days=30)
-
-        # Current period expenses
-        current_period = Expense.objects.filter(
-            user_id=user_id, date__range=(thirty_days_ago, today)
+        current, previous = ExpenseService.get_insight_windows(period, compare)
+        cache_key = CacheService.get_cache_key(
+            "analytics",
+            user_id,
+            f"insights:{CacheService.get_data_version(user_id)}:{period}:{compare}:{current[1]}",
+        )
+        return CacheService.get_or_set(
+            cache_key,
+            lambda: ExpenseService._compute_expense_insights(
+                user_id, current, previous
+            ),
+            CACHE_TIMEOUTS["analytics"],
         )
-        current_total = current_period.aggregate(total=Sum("amount"))[
-            "total"
-        ] or Decimal("0")
 
-        # Previous period expenses
-        previous_period = Expense.objects.filter(
-            user_id=user_id, date__range=(previous_thirty_days, thirty_days_ago)
+    @staticmethod
+    def _compute_expense_insights(
+        user_id: int, current: Tuple[date, date], previous: Tuple[date, date]
+    ) -> Dict:
+        """Compute insights for two date windows in a single query."""
+        in_current = Q(date__range=current)
+        in_previous = Q(date__range=previous)
+        largest = ArrayAgg(
+            JSONObject(
+                id="id",
+                title="title",
+                amount="amount",
+                date="date",
+                category="category",
+            ),
+            filter=in_current,
+            ordering=("-amount", "-id"),
         )
-        previous_total = previous_period.aggregate(total=Sum("amount"))[
-            "total"
-        ] or Decimal("0")
+        rows = (
+            Expense.objects.filter(user_id=user_id)
+            .filter(in_current | in_previous)
+            .values("category")
+            .annotate(
+                current_total=Sum("amount", filter=in_current),
+                current_count=Count("id", filter=in_current),
+                previous_total=Sum("amount", filter=in_previous),
+                largest=Func(
+                    largest, template="(%(expressions)s)[1]", output_field=JSONField()
+                ),
+            )
+            .order_by()
+        )
+
+        current_total = previous_total = Decimal("0")
+        categories = []
+        largest_expense = None
+        for row in rows:
+            current_total += row["current_total"] or Decimal("0")
+            previous_total += row["previous_total"] or Decimal("0")
+            if not row["current_count"]:
+                continue
+            categories.append(row)
+            candidate = row["largest"]
+            candidate["amount"] = Decimal(str(candidate["amount"]))
+            if largest_expense is None or (candidate["amount"], candidate["id"]) > (
+                largest_expense["amount"],
+                largest_expense["id"],
+            ):
+                largest_expense = candidate
 
-        # Calculate change
         if previous_total > 0:
             change_percentage = (
                 (current_total - previous_total) / previous_total
@@ -242,20 +392,32 @@ class ExpenseService:
         else:
             change_percentage = 100 if current_total > 0 else 0
 
+        most_frequent = max(
+            categories,
+            key=lambda row: (row["current_count"], row["current_total"]),
+            default=None,
+        )
         return {
+            "current_period": {"start": current[0], "end": current[1]},
+            "previous_period": {"start": previous[0], "end": previous[1]},
             "current_period_total": current_total,
             "previous_period_total": previous_total,
             "change_percentage": change_percentage,
-            "top_categories": list(
-                current_period.values("category")
-                .annotate(total=Sum("amount"))
-                .order_by("-total")[:5]
+            "top_categories": [
+                {"category": row["category"], "total": row["current_total"]}
+                for row in sorted(
+                    categories, key=lambda row: row["current_total"], reverse=True
+                )[:5]
+            ],
+            "largest_expense": largest_expense,
+            "most_frequent_category": (
+                {
+                    "category": most_frequent["category"],
+                    "count": most_frequent["current_count"],
+                }
+                if most_frequent
+                else None
             ),
-            "largest_expense": current_period.order_by("-amount").first(),
-            "most_frequent_category": current_period.values("category")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-            .first(),
         }
 
     @staticmethod
@@ -263,6 +425,10 @@ class ExpenseService:
         """
         Validate expense against associated budget.
 
+        This is an early, lock-free check for friendly errors. The limit is
+        enforced race-free when the expense is saved, by reserving its
+        amount on the budget ledger (see ``BudgetLedgerService.reserve``).
+
         Args:
             expense: Expense instance to validate
 
@@ -278,10 +444,59 @@ class ExpenseService:
                     _("Expense date must fall within the budget period.")
                 )
 
-            # Check if expense would exceed budget
-            current_total = expense.budget.expenses.aggregate(total=Sum("amount"))[
-                "total"
-            ] or Decimal("0")
+            # Check if expense would exceed budget, using the budget ledger
+            # without the expense's own previously saved amount
+            current_total = expense.budget.spent_amount
+            previous = getattr(expense, "_loaded_ledger_entry", None)
+            if previous and expense.budget.counts_towards(*previous[:-1]):
+                current_total -= previous[-1]
 
             if (current_total + expense.amount) > expense.budget.amount:
                 raise ValidationError(_("This expense would exceed the budget limit."))
+
+    @staticmethod
+    def search_expenses(queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Search expenses by title, tags, location and notes.
+
+        Words match whole words or their beginnings, after stemming, and
+        matches in the title rank highest, then tags, location and notes.
+        The search is one more filter on ``queryset``, so it is answered in
+        the same query as the filters already applied.
+
+        Args:
+            queryset: Expenses to search
+            query: Search query
+
+        Returns:
+            QuerySet: Matching expenses, best first
+        """
+        return ExpenseService.SEARCH.apply(queryset, query)
+
+    @staticmethod
+    def filter_by_tags(
+        queryset: QuerySet, tags: Iterable[str], match_all: bool = False
+    ) -> QuerySet:
+        """
+        Filter expenses on their tags.
+
+        Every tag becomes a ``tags @> '["tag"]'`` containment test, which
+        the ``jsonb_path_ops`` GIN index on ``tags`` answers.
+
+        Args:
+            queryset: Expenses to filter
+            tags: Tags to look for
+            match_all: Whether expenses need every tag rather than any
+
+        Returns:
+            QuerySet: Expenses carrying all or any of the tags
+        """
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return queryset
+        if match_all:
+            return queryset.filter(tags__contains=tags)
+        condition = Q()
+        for tag in tags:
+            condition |= Q(tags__contains=[tag])
+        return queryset.filter(condition)
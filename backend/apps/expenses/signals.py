@@ -2,12 +2,39 @@
 Signal handlers for expenses application.
 """
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.db.models import Sum
 from django.utils import timezone
 from .models import Expense
-from apps.notifications.services import NotificationService
+from apps.budgets.models import Budget
+from apps.budgets.services import (
+    BudgetLedgerService,
+    BudgetMatchService,
+    BudgetService,
+)
+from core.cache_config import CacheService
+from utils.helpers.calendar_helpers import RECURRENCE_PERIODS, add_periods
+
+
+@receiver(pre_save, sender=Expense)
+def match_expense_budget(sender, instance, **kwargs):
+    """
+    Signal to assign the covering budget to an expense without one.
+
+    Expenses whose budget was matched automatically are matched again when
+    their category or date changes.
+
+    Args:
+        sender: The model class
+        instance: The actual expense instance
+        **kwargs: Additional keyword arguments
+    """
+    if instance.budget_matched and (
+        getattr(instance, "_loaded_ledger_entry", None) != instance.ledger_entry
+    ):
+        instance.budget = None
+        instance.budget_matched = False
+    BudgetMatchService.assign([instance])
 
 
 @receiver(pre_save, sender=Expense)
@@ -22,30 +49,20 @@ def check_expense_budget(sender, instance, **kwargs):
     """
     from django.core.exceptions import ValidationError
 
-    if instance.budget:
+    if instance.budget_id and not instance.budget_matched:
         # Check if expense date falls within budget period
         if not (
             instance.budget.start_date <= instance.date <= instance.budget.end_date
         ):
             raise ValidationError("Expense date must fall within the budget period.")
-
-        # Calculate current total excluding this expense if it's being updated
-        current_total = (
-            instance.budget.expenses.exclude(id=instance.id).aggregate(
-                total=Sum("amount")
-            )["total"]
-            or 0
-        )
-
-        # Check if this expense would exceed budget
-        if (current_total + instance.amount) > instance.budget.amount:
-            NotificationService.send_budget_exceeded_notification(instance.budget)
+        if instance.budget.currency != instance.currency:
+            raise ValidationError("Expense currency must match the budget currency.")
 
 
 @receiver(post_save, sender=Expense)
 def update_budget_utilization(sender, instance, created, **kwargs):
     """
-    Signal to update budget utilization after expense save.
+    Signal to update the budget ledger after expense save and send alerts.
 
     Args:
         sender: The model class
@@ -53,15 +70,54 @@ def update_budget_utilization(sender, instance, created, **kwargs):
         created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if instance.budget:
-        total_expenses = (
-            instance.budget.expenses.aggregate(total=Sum("amount"))["total"] or 0
-        )
+    if created:
+        previous = None
+    elif hasattr(instance, "_loaded_ledger_entry"):
+        previous = instance._loaded_ledger_entry
+    else:
+        # Loaded without the ledger fields, the old entry is unknown
+        BudgetLedgerService.recalculate(Budget.objects.filter(user_id=instance.user_id))
+        previous = instance.ledger_entry
+    # Spending explicitly attached to a budget must stay within its limit
+    BudgetLedgerService.apply(
+        BudgetLedgerService.entries_for_change(previous, instance.ledger_entry),
+        limited_budget_ids=(
+            [instance.budget_id]
+            if instance.budget_id and not instance.budget_matched
+            else ()
+        ),
+    )
+
+    if instance.budget_id:
+        BudgetService.send_budget_alerts([instance.budget_id])
+
+
+@receiver(post_delete, sender=Expense)
+def remove_from_budget_ledger(sender, instance, **kwargs):
+    """
+    Signal to take a deleted expense out of the budget ledger.
+
+    Args:
+        sender: The model class
+        instance: The actual expense instance
+        **kwargs: Additional keyword arguments
+    """
+    previous = getattr(instance, "_loaded_ledger_entry", instance.ledger_entry)
+    BudgetLedgerService.apply(BudgetLedgerService.entries_for_change(previous, None))
+
 
-        utilization_percentage = (total_expenses / instance.budget.amount) * 100
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def bump_expense_data_version(sender, instance, **kwargs):
+    """
+    Signal to invalidate cached results derived from the user's expenses.
 
-        if utilization_percentage >= instance.budget.notification_threshold:
-            NotificationService.send_budget_threshold_notification(instance.budget)
+    Args:
+        sender: The model class
+        instance: The actual expense instance
+        **kwargs: Additional keyword arguments
+    """
+    CacheService.bump_data_version(instance.user_id)
 
 
 @receiver(post_save, sender=Expense)
@@ -78,25 +134,12 @@ def handle_recurring_expense(sender, instance, created, **kwargs):
     if created and instance.is_recurring:
         # Create next recurring expense based on metadata
         recurrence_type = instance.metadata.get("recurrence_type")
-        if recurrence_type:
-            from datetime import timedelta
-
-            if recurrence_type == "DAILY":
-                next_date = instance.date + timedelta(days=1)
-            elif recurrence_type == "WEEKLY":
-                next_date = instance.date + timedelta(days=7)
-            elif recurrence_type == "MONTHLY":
-                # Get the same day next month
-                if instance.date.month == 12:
-                    next_date = instance.date.replace(
-                        year=instance.date.year + 1, month=1
-                    )
-                else:
-                    next_date = instance.date.replace(month=instance.date.month + 1)
-            elif recurrence_type == "YEARLY":
-                next_date = instance.date.replace(year=instance.date.year + 1)
-            else:
-                return
+        if recurrence_type in RECURRENCE_PERIODS:
+            # Keep the original day of month so month ends do not drift
+            anchor_day = instance.metadata.get("anchor_day", instance.date.day)
+            next_date = add_periods(
+                instance.date, 1, recurrence_type, anchor_day=anchor_day
+            )
 
             # Only create next expense if it's in the future
             if next_date > timezone.now().date():
@@ -112,5 +155,5 @@ def handle_recurring_expense(sender, instance, created, **kwargs):
                     location=instance.location,
                     is_recurring=True,
                     tags=instance.tags,
-                    metadata=instance.metadata,
+                    metadata={**instance.metadata, "anchor_day": anchor_day},
                 )
@@ -108,6 +108,18 @@ class ExpenseModelTests(TestCase):
         self.assertEqual(expense.tags, ["test", "json"])
         self.assertEqual(expense.metadata, {"key": "value"})
 
+    def test_expense_tags_validation(self):
+        """Test tags must be a list of short, non-empty strings."""
+        for tags in [{"tag": "work"}, ["work", 1], ["work", " "], ["x" * 51]]:
+            with self.subTest(tags=tags), self.assertRaises(ValidationError):
+                Expense.objects.create(
+                    user=self.user,
+                    title="Tagged Expense",
+                    amount=Decimal("10.00"),
+                    date=self.today,
+                    tags=tags,
+                )
+
     def test_expense_month_year(self):
         """Test month_year property."""
         month_year = self.expense.month_year
@@ -135,12 +147,12 @@ class ExpenseModelTests(TestCase):
         self.assertTrue(status["has_budget"])
         self.assertEqual(status["budget_name"], self.budget.name)
 
-        # Test expense without budget
+        # Test expense without a covering budget
         expense_no_budget = Expense.objects.create(
             user=self.user,
             title="No Budget Expense",
             amount=Decimal("25.00"),
-            category=Expense.CategoryChoices.FOOD,
+            category=Expense.CategoryChoices.TRANSPORT,
             date=self.today,
         )
         status = expense_no_budget.get_budget_status()
@@ -4,16 +4,23 @@ Tests for expense services.
 
 from datetime import date, timedelta
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from apps.analytics.models import BudgetUtilization, SpendingAnalytics
 from apps.budgets.models import Budget
 from ..models import Expense
+from ..services.expense_write_service import ExpenseWriteService
 from ..services.expenses_service import ExpenseService
 
 User = get_user_model()
 
+# Savepoint, insert, budget ledger lock and update, release; daily rollup
+# select and upsert; budget utilization reads and upsert; the alert query.
+# Independent of batch size.
+WRITE_PATH_QUERIES = 11
+
 
 class ExpenseServiceTests(TestCase):
     """Test cases for ExpenseService."""
@@ -147,6 +154,37 @@ class ExpenseServiceTests(TestCase):
             all("month" in month and "total_amount" in month for month in forecast)
         )
 
+    def test_recurring_expenses_forecast_totals(self):
+        """Test monthly expenses recur every month and yearly ones in their month."""
+        # Bulk created so the next occurrences are not scheduled
+        Expense.objects.bulk_create(
+            Expense(
+                user=self.user,
+                title=f"{recurrence_type} Recurring",
+                amount=Decimal(amount),
+                category=Expense.CategoryChoices.FOOD,
+                date=self.today,
+                is_recurring=True,
+                metadata={"recurrence_type": recurrence_type},
+            )
+            for amount, recurrence_type in (
+                ("100.00", "MONTHLY"),
+                ("0.05", "MONTHLY"),
+                ("12.34", "YEARLY"),
+            )
+        )
+
+        forecast = ExpenseService.get_recurring_expenses_forecast(
+            user_id=self.user.id, months_ahead=12
+        )
+
+        for month in forecast:
+            expected = Decimal("100.05")
+            if month["month"].month == self.today.month:
+                expected += Decimal("12.34")
+            self.assertEqual(month["total_amount"], expected)
+        self.assertEqual(forecast[0]["total_amount"], Decimal("112.39"))
+
     def test_get_expense_insights(self):
         """Test getting expense insights."""
         insights = ExpenseService.get_expense_insights(user_id=self.user.id)
@@ -184,3 +222,280 @@ class ExpenseServiceTests(TestCase):
 
         with self.assertRaises(ValidationError):
             ExpenseService.validate_expense_against_budget(expense)
+
+
+class ExpenseInsightsTests(TestCase):
+    """Test cases for period-comparison insights."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="insightuser", email="insight@example.com", password="testpass123"
+        )
+        self.today = timezone.now().date()
+        for days_ago, amount, category in [
+            (0, "40.00", Expense.CategoryChoices.FOOD),
+            (1, "10.00", Expense.CategoryChoices.FOOD),
+            (2, "90.00", Expense.CategoryChoices.TRANSPORT),
+            (7, "25.00", Expense.CategoryChoices.FOOD),
+            (8, "60.00", Expense.CategoryChoices.SHOPPING),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title=f"{category} {amount}",
+                amount=Decimal(amount),
+                category=category,
+                date=self.today - timedelta(days=days_ago),
+            )
+
+    def test_insight_windows(self):
+        """Test resolving comparison windows without overlap."""
+        today = date(2024, 3, 31)
+        self.assertEqual(
+            ExpenseService.get_insight_windows("30d", "previous", today),
+            ((date(2024, 3, 2), today), (date(2024, 2, 1), date(2024, 3, 1))),
+        )
+        self.assertEqual(
+            ExpenseService.get_insight_windows("month", "previous", today),
+            ((date(2024, 3, 1), today), (date(2024, 2, 1), date(2024, 2, 29))),
+        )
+        self.assertEqual(
+            ExpenseService.get_insight_windows("quarter", "yoy", today),
+            ((date(2024, 1, 1), today), (date(2023, 1, 1), date(2023, 3, 31))),
+        )
+        self.assertEqual(
+            ExpenseService.get_insight_windows("3660d", "yoy", today)[1][0],
+            date(2013, 3, 25),
+        )
+        for period in ("fortnight", "0d", "3661d", "1000000d"):
+            with self.assertRaises(ValueError):
+                ExpenseService.get_insight_windows(period, "previous", today)
+
+    def test_insights_single_query(self):
+        """Test insights are computed in one query and are JSON friendly."""
+        with self.assertNumQueries(1):
+            insights = ExpenseService.get_expense_insights(
+                user_id=self.user.id, period="7d"
+            )
+
+        self.assertEqual(insights["current_period_total"], Decimal("140.00"))
+        self.assertEqual(insights["previous_period_total"], Decimal("85.00"))
+        self.assertEqual(
+            insights["top_categories"][0],
+            {"category": "TRANSPORT", "total": Decimal("90.00")},
+        )
+        self.assertEqual(insights["largest_expense"]["amount"], Decimal("90.00"))
+        self.assertEqual(
+            insights["most_frequent_category"], {"category": "FOOD", "count": 2}
+        )
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_insights_cached_by_data_version(self):
+        """Test cached insights are invalidated by expense writes."""
+        ExpenseService.get_expense_insights(user_id=self.user.id, period="7d")
+        with self.assertNumQueries(0):
+            ExpenseService.get_expense_insights(user_id=self.user.id, period="7d")
+
+        Expense.objects.filter(user=self.user).first().delete()
+        insights = ExpenseService.get_expense_insights(
+            user_id=self.user.id, period="7d"
+        )
+        self.assertLess(insights["current_period_total"], Decimal("140.00"))
+
+
+class ExpenseWriteServiceTests(TestCase):
+    """Test cases for the signal-free expense write path."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="writeuser", email="write@example.com", password="testpass123"
+        )
+        self.today = timezone.now().date()
+        self.budget = Budget.objects.create(
+            user=self.user,
+            name="Food Budget",
+            amount=Decimal("100.00"),
+            category=Expense.CategoryChoices.FOOD,
+            start_date=self.today.replace(day=1),
+            end_date=self.today + timedelta(days=30),
+        )
+
+    def _rows(self, count, amount="10.00"):
+        return [
+            {
+                "user": self.user,
+                "title": f"Lunch {index}",
+                "amount": Decimal(amount),
+                "category": Expense.CategoryChoices.FOOD,
+                "date": self.today,
+                "budget": self.budget,
+            }
+            for index in range(count)
+        ]
+
+    def test_write_path_query_budget(self):
+        """Test a batch costs the same fixed number of queries as one expense."""
+        # Stay under the alert threshold so no notifications are written
+        with self.assertNumQueries(WRITE_PATH_QUERIES):
+            with self.captureOnCommitCallbacks(execute=True):
+                ExpenseWriteService.create(self._rows(1, "1.00")[0])
+
+        with self.assertNumQueries(WRITE_PATH_QUERIES):
+            with self.captureOnCommitCallbacks(execute=True):
+                ExpenseWriteService.create_many(self._rows(25, "1.00"))
+
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 26)
+
+    def test_side_effects_applied_on_commit(self):
+        """Test rollups and utilization are refreshed once the batch commits."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            expenses = ExpenseWriteService.create_many(self._rows(3))
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(all(expense.pk for expense in expenses))
+
+        daily = SpendingAnalytics.objects.get(
+            user=self.user, date=self.today, category=Expense.CategoryChoices.FOOD
+        )
+        self.assertEqual(daily.total_amount, Decimal("30.00"))
+        self.assertEqual(daily.transaction_count, 3)
+
+        utilization = BudgetUtilization.objects.get(
+            user=self.user,
+            category=Expense.CategoryChoices.FOOD,
+            month=self.today.replace(day=1),
+        )
+        self.assertEqual(utilization.spent_amount, Decimal("30.00"))
+
+    def test_invalid_batch_inserts_nothing(self):
+        """Test validation runs before anything is written."""
+        rows = self._rows(2)
+        rows[1]["date"] = self.today + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValidationError):
+                ExpenseWriteService.create_many(rows)
+        self.assertEqual(callbacks, [])
+        self.assertFalse(Expense.objects.filter(user=self.user).exists())
+
+    def test_rejects_budget_of_other_user(self):
+        """Test expenses cannot be attached to another user's budget."""
+        other = User.objects.create_user(
+            username="otherwrite",
+            email="otherwrite@example.com",
+            password="testpass123",
+        )
+        row = self._rows(1)[0]
+        row["user"] = other
+        with self.assertRaises(ValidationError):
+            ExpenseWriteService.create(row)
+
+
+class ExpenseSearchTests(TestCase):
+    """Test cases for ExpenseService.search_expenses."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="searchuser", email="search@example.com", password="testpass123"
+        )
+        self.today = timezone.now().date()
+        for title, notes, location, tags in [
+            ("Coffee beans", "", "Market", []),
+            ("Lunch", "Coffee with the team", "Cafe Nero", ["work"]),
+            ("Train ticket", "Commute", "Central station", ["coffee"]),
+            ("Groceries", "Weekly shopping", "Supermarket", []),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title=title,
+                amount=Decimal("10.00"),
+                category=Expense.CategoryChoices.FOOD,
+                date=self.today,
+                notes=notes,
+                location=location,
+                tags=tags,
+            )
+
+    def search(self, query, queryset=None):
+        if queryset is None:
+            queryset = Expense.objects.filter(user=self.user)
+        return [
+            expense.title for expense in ExpenseService.search_expenses(queryset, query)
+        ]
+
+    def test_ranks_by_field_weight(self):
+        """Test title matches rank above tags, and tags above notes."""
+        self.assertEqual(
+            self.search("coffee"), ["Coffee beans", "Train ticket", "Lunch"]
+        )
+
+    def test_matches_stems_and_prefixes(self):
+        """Test words match other forms and the beginning of words."""
+        self.assertEqual(self.search("shop"), ["Groceries"])
+        self.assertEqual(self.search("stat"), ["Train ticket"])
+        self.assertEqual(self.search("super"), ["Groceries"])
+
+    def test_requires_every_word(self):
+        """Test every word of the query must match."""
+        self.assertEqual(self.search("coffee team"), ["Lunch"])
+
+    def test_combines_with_filters(self):
+        """Test the search only narrows the given queryset."""
+        queryset = Expense.objects.filter(user=self.user, location="Market")
+        self.assertEqual(self.search("coffee", queryset), ["Coffee beans"])
+
+    def test_vector_kept_current(self):
+        """Test updates, bulk ones included, are searchable at once."""
+        Expense.objects.filter(title="Groceries").update(notes="Birthday cake")
+        self.assertEqual(self.search("birthday"), ["Groceries"])
+
+    def test_ignores_syntax(self):
+        """Test query operators are searched as plain words."""
+        self.assertEqual(self.search("coffee & !beans:*"), ["Coffee beans"])
+        self.assertEqual(self.search("&|!"), [])
+
+
+class ExpenseTagFilterTests(TestCase):
+    """Test cases for ExpenseService.filter_by_tags."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="taguser", email="tag@example.com", password="testpass123"
+        )
+        for title, tags in [
+            ("Flight", ["travel", "work"]),
+            ("Hotel", ["travel"]),
+            ("Laptop", ["work"]),
+            ("Groceries", []),
+        ]:
+            Expense.objects.create(
+                user=self.user,
+                title=title,
+                amount=Decimal("10.00"),
+                date=timezone.now().date(),
+                tags=tags,
+            )
+
+    def filter(self, tags, match_all=False):
+        return sorted(
+            ExpenseService.filter_by_tags(
+                Expense.objects.filter(user=self.user), tags, match_all
+            ).values_list("title", flat=True)
+        )
+
+    def test_matches_any_tag(self):
+        """Test expenses with any of the tags match by default."""
+        self.assertEqual(self.filter(["travel"]), ["Flight", "Hotel"])
+        self.assertEqual(self.filter(["travel", "work"]), ["Flight", "Hotel", "Laptop"])
+
+    def test_matches_all_tags(self):
+        """Test expenses need every tag with match_all."""
+        self.assertEqual(self.filter(["travel", "work"], match_all=True), ["Flight"])
+
+    def test_no_tags_keeps_queryset(self):
+        """Test an empty tag list does not filter."""
+        self.assertEqual(len(self.filter([])), 4)
+        self.assertEqual(self.filter(["unknown"]), [])
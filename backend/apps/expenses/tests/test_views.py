@@ -10,6 +10,7 @@ from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from apps.budgets.models import Budget
 from ..models import Expense
+from ..serializers import ExpenseListSerializer
 
 User = get_user_model()
 
@@ -73,6 +74,26 @@ class ExpenseViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_list_matches_list_serializer(self):
+        """Test the read serializer lists expenses as ExpenseListSerializer does."""
+        Expense.objects.create(
+            user=self.user,
+            title="Old concert",
+            amount=Decimal("1234.50"),
+            category=Expense.CategoryChoices.ENTERTAINMENT,
+            date=self.today - timedelta(days=45),
+            is_recurring=True,
+            metadata={"category_icon": "music", "category_color": "#ff0000"},
+        )
+        response = self.client.get(reverse("expense-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = ExpenseListSerializer(
+            Expense.objects.filter(user=self.user), many=True
+        ).data
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data, expected)
+
     def test_retrieve_expense(self):
         """Test retrieving a single expense."""
         url = reverse("expense-detail", args=[self.expense.id])
@@ -159,6 +180,12 @@ class ExpenseViewSetTests(APITestCase):
         self.assertIn("current_period_total", response.data)
         self.assertIn("top_categories", response.data)
 
+        response = self.client.get(url, {"period": "quarter", "compare": "yoy"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, {"period": "decade"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_duplicate_expense(self):
         """Test duplicating an expense."""
         url = reverse("expense-duplicate", args=[self.expense.id])
@@ -170,9 +197,11 @@ class ExpenseViewSetTests(APITestCase):
 
     def test_attach_to_budget(self):
         """Test attaching expense to budget."""
+        # Inactive, as an active one would overlap self.budget
         new_budget = Budget.objects.create(
             user=self.user,
             name="New Budget",
+            is_active=False,
             amount=Decimal("500.00"),
             category=Expense.CategoryChoices.FOOD,
             start_date=self.today,
@@ -223,6 +252,12 @@ class ExpenseViewSetTests(APITestCase):
             response.status_code, status.HTTP_200_OK
         )  # Should ignore invalid filter
 
+    def test_expense_insights_rejects_huge_period(self):
+        """Test a period reaching before the first date is a bad request."""
+        response = self.client.get(reverse("expense-insights"), {"period": "1000000d"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_unauthorized_access(self):
         """Test unauthorized access to expense endpoints."""
         self.client.force_authenticate(user=None)
@@ -240,3 +275,49 @@ class ExpenseViewSetTests(APITestCase):
         for url in urls:
             response = self.client.get(url)
             self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_search_expenses(self):
+        """Test searching expenses together with the other filters."""
+        Expense.objects.create(
+            user=self.user,
+            title="Taxi to the airport",
+            amount=Decimal("80.00"),
+            category=Expense.CategoryChoices.TRANSPORT,
+            date=self.today,
+        )
+        url = reverse("expense-list")
+
+        response = self.client.get(url, {"q": "taxi"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [expense["title"] for expense in response.data], ["Taxi to the airport"]
+        )
+
+        response = self.client.get(
+            url, {"q": "taxi", "category": Expense.CategoryChoices.FOOD}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_filter_expenses_by_tags(self):
+        """Test filtering expenses on any or all of a list of tags."""
+        for title, tags in [("Flight", ["travel", "work"]), ("Hotel", ["travel"])]:
+            Expense.objects.create(
+                user=self.user,
+                title=title,
+                amount=Decimal("80.00"),
+                category=Expense.CategoryChoices.TRANSPORT,
+                date=self.today,
+                tags=tags,
+            )
+        url = reverse("expense-list")
+
+        response = self.client.get(url, {"tags": "work, travel"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(expense["title"] for expense in response.data), ["Flight", "Hotel"]
+        )
+
+        response = self.client.get(url, {"tags": "work,travel", "tags_match": "all"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([expense["title"] for expense in response.data], ["Flight"])
@@ -10,23 +10,27 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils.translation import gettext_lazy as _
 
+from apps.users.services import UserContextService
+from utils.mixins.read_serializer import ReadSerializerListMixin
 from ..models import Notification, NotificationPreference
 from ..serializers.notifications_serializer import (
     NotificationSerializer,
     NotificationCreateSerializer,
     NotificationListSerializer,
+    NotificationListReadSerializer,
     NotificationPreferenceSerializer,
     NotificationBulkActionSerializer,
 )
 from ..services.notifications_service import NotificationService
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ReadSerializerListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing notifications.
     """
 
     permission_classes = [IsAuthenticated]
+    read_serializer = NotificationListReadSerializer()
 
     def get_queryset(self):
         """Get queryset filtered by user and optional parameters."""
@@ -118,9 +122,7 @@ class NotificationPreferenceViewSet(viewsets.ModelViewSet):
     
     def get_object(self):
         """Get the notification preferences object for the current user."""
-        queryset = self.get_queryset()
-        obj, created = NotificationPreference.objects.get_or_create(user=self.request.user)
-        return obj
+        return UserContextService.get(self.request.user).preferences
     
     def perform_update(self, serializer):
         """Update notification preferences."""
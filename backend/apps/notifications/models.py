@@ -7,6 +7,7 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from utils.mixins.change_tracking import ChangeTrackingMixin
 
 User = get_user_model()
 
@@ -126,7 +127,7 @@ class Notification(models.Model):
         return int(delta.total_seconds() / 60)
 
 
-class NotificationPreference(models.Model):
+class NotificationPreference(ChangeTrackingMixin, models.Model):
     """User notification preferences."""
 
     user = models.OneToOneField(
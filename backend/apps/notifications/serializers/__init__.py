@@ -6,6 +6,7 @@ from .notifications_serializer import (  # noqa: F401
     NotificationSerializer,
     NotificationCreateSerializer,
     NotificationListSerializer,
+    NotificationListReadSerializer,
     NotificationPreferenceSerializer,
     NotificationBulkActionSerializer,
 )
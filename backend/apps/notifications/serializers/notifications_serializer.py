@@ -4,6 +4,7 @@ Serializers for the notifications application.
 
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
+from utils.helpers.read_serializers import ReadSerializer, format_datetime
 from ..models import Notification, NotificationPreference
 
 
@@ -157,6 +158,36 @@ class NotificationListSerializer(NotificationSerializer):
         ]
 
 
+class NotificationListReadSerializer(ReadSerializer):
+    """
+    Read serializer for listing notifications, with NotificationListSerializer's
+    output.
+    """
+
+    columns = (
+        "id",
+        "title",
+        "notification_type",
+        "priority",
+        "is_read",
+        "created_at",
+        "expires_at",
+    )
+
+    def to_representation(self, row, context):
+        """Serialize one notification."""
+        expires_at = row["expires_at"]
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "notification_type": row["notification_type"],
+            "priority": row["priority"],
+            "is_read": row["is_read"],
+            "created_at": format_datetime(row["created_at"], context["zone"]),
+            "is_expired": expires_at is not None and context["now"] > expires_at,
+        }
+
+
 class NotificationBulkActionSerializer(serializers.Serializer):
     """
     Serializer for bulk notification actions.
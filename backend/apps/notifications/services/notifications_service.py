@@ -7,8 +7,9 @@ from typing import Dict, List, Optional
 from django.db.models import Q
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.mail import send_mail, send_mass_mail
 from django.conf import settings
+from apps.users.services import UserContextService
 from ..models import Notification, NotificationPreference
 
 User = get_user_model()
@@ -50,7 +51,7 @@ class NotificationService:
 
         # Check notification preferences
         try:
-            preferences = user.notification_preferences
+            preferences = UserContextService.get(user).preferences
             
             # Check if this type of notification is enabled
             if notification_type == 'BUDGET_ALERT' and not preferences.budget_alerts:
@@ -298,6 +299,63 @@ class NotificationService:
             priority=Notification.Priority.HIGH,
         )
 
+    @staticmethod
+    def send_budget_creation_notifications(budgets) -> List[Notification]:
+        """
+        Send creation notifications for many budgets at once.
+
+        Users and their preferences are read in one query, notifications
+        are inserted with one statement and emails share one connection.
+
+        Args:
+            budgets: Saved budget instances
+
+        Returns:
+            List[Notification]: Created notifications
+        """
+        budgets = list(budgets)
+        if not budgets:
+            return []
+
+        users = User.objects.select_related("notification_preferences").in_bulk(
+            {budget.user_id for budget in budgets}
+        )
+        notifications = []
+        for budget in budgets:
+            user = users.get(budget.user_id)
+            preferences = getattr(user, "notification_preferences", None)
+            if user is None or (preferences and not preferences.budget_alerts):
+                continue
+            notifications.append(
+                Notification(
+                    user=user,
+                    title="New Budget Created",
+                    message=f"Your budget '{budget.name}' has been successfully created.",
+                    notification_type=Notification.NotificationTypes.BUDGET_ALERT,
+                    priority=Notification.Priority.HIGH,
+                    data={"budget_id": budget.id},
+                )
+            )
+        Notification.objects.bulk_create(notifications)
+
+        emails = [
+            (
+                f"[Budget Tracker] {notification.title}",
+                f"{notification.message}\n\n",
+                settings.DEFAULT_FROM_EMAIL,
+                [notification.user.email],
+            )
+            for notification in notifications
+            if notification.user.email
+            and (
+                not hasattr(notification.user, "notification_preferences")
+                or notification.user.notification_preferences.email_notifications
+            )
+        ]
+        if emails:
+            send_mass_mail(emails, fail_silently=True)
+        return notifications
+
     @staticmethod
     def update_user_preferences(
         user_id: int, preferences_data: Dict
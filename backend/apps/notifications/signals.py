@@ -2,10 +2,11 @@
 Signals for the notifications application.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from apps.users.services import UserContextService
 from .models import NotificationPreference, Notification
 
 User = get_user_model()
@@ -16,7 +17,7 @@ def create_notification_preferences(sender, instance, created, **kwargs):
     """
     Create notification preferences for new users.
     """
-    if created and not hasattr(instance, 'notification_preferences'):
+    if created:
         NotificationPreference.objects.create(
             user=instance,
             email_notifications=True,
@@ -28,7 +29,18 @@ def create_notification_preferences(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_notification_preferences(sender, instance, **kwargs):
     """
-    Save notification preferences for existing users.
+    Save the loaded notification preferences of a user when they changed.
     """
-    if hasattr(instance, 'notification_preferences'):
+    if not User.notification_preferences.is_cached(instance):
+        return
+    if instance.notification_preferences.has_changed():
         instance.notification_preferences.save()
+
+
+@receiver(post_save, sender=NotificationPreference)
+@receiver(post_delete, sender=NotificationPreference)
+def invalidate_user_context(sender, instance, **kwargs):
+    """
+    Drop the owner's cached user context.
+    """
+    UserContextService.invalidate([instance.user_id])
@@ -2,11 +2,14 @@
 Tests for notification views.
 """
 
+from datetime import timedelta
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from ..models import Notification, NotificationPreference
+from ..serializers import NotificationListSerializer
 
 User = get_user_model()
 
@@ -71,3 +74,44 @@ class NotificationViewTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class NotificationListReadSerializerTests(APITestCase):
+    """Test cases for listing notifications with NotificationListReadSerializer."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_matches_list_serializer(self):
+        """Test the read serializer lists notifications as
+        NotificationListSerializer does."""
+        Notification.objects.create(
+            user=self.user,
+            title="Current",
+            message="Fresh news",
+            notification_type=Notification.NotificationTypes.SYSTEM,
+        )
+        Notification.objects.create(
+            user=self.user,
+            title="Expired",
+            message="Old news",
+            notification_type=Notification.NotificationTypes.BUDGET_ALERT,
+            priority=Notification.Priority.HIGH,
+            is_read=True,
+            expires_at=timezone.now() - timedelta(hours=1),
+        )
+        response = self.client.get(
+            reverse("notifications:notification-list"), {"include_expired": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = NotificationListSerializer(
+            Notification.objects.filter(user=self.user).order_by("-created_at"),
+            many=True,
+        ).data
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data, expected)
@@ -7,6 +7,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 from .models import User, Profile
+from .services.users_service import UserService
 
 
 @admin.register(User)
@@ -25,7 +26,7 @@ class UserAdmin(BaseUserAdmin):
         "date_joined",
     )
     list_filter = ("is_active", "is_verified", "is_staff", "date_joined")
-    search_fields = ("email", "username", "first_name", "last_name", "phone_number")
+    search_fields = ("email", "username", "first_name", "last_name")
     ordering = ("-date_joined",)
 
     fieldsets = (
@@ -63,6 +64,12 @@ class UserAdmin(BaseUserAdmin):
         ),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search with the user search engine, which trigram indexes answer."""
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(UserService.SEARCH.matches(search_term)), False
+
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
@@ -0,0 +1,127 @@
+"""
+Async login and registration views for ASGI deployments.
+
+DRF views run synchronously, so under ASGI every request waits for the
+thread Django runs them on. These views await password hashing instead,
+which runs in ``PasswordService``'s process pool, and only hand the short
+database work to that thread. Being plain Django views, they apply the
+anonymous rate throttle of the DRF views themselves.
+"""
+
+import json
+from typing import Any, Dict, Optional
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from django.utils.translation import gettext_lazy as _
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.throttling import CustomAnonRateThrottle
+from ..serializers.users_serializer import (
+    LoginSerializer,
+    TokenSerializer,
+    UserCreateSerializer,
+    UserSerializer,
+)
+from ..services.auth_service import AuthService
+from ..services.password_service import PasswordService
+
+
+def _read_json(request: HttpRequest) -> Dict[str, Any]:
+    try:
+        data = json.loads(request.body or b"{}")
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _error_response(error: APIException) -> JsonResponse:
+    return JsonResponse({"detail": str(error.detail)}, status=error.status_code)
+
+
+async def _throttled_response(request: HttpRequest) -> Optional[JsonResponse]:
+    """
+    Apply the anonymous rate throttle as DRF views do.
+
+    Returns:
+        Optional[JsonResponse]: 429 response with a ``Retry-After`` header
+        when the client is throttled, else None
+    """
+    throttle = CustomAnonRateThrottle()
+    if await sync_to_async(throttle.allow_request)(request, None):
+        return None
+    error = Throttled(throttle.wait())
+    response = _error_response(error)
+    if error.wait is not None:
+        response["Retry-After"] = str(error.wait)
+    return response
+
+
+class AsyncLoginView(View):
+    """Async version of ``UserViewSet.login``."""
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        """Login user."""
+        throttled = await _throttled_response(request)
+        if throttled:
+            return throttled
+
+        serializer = LoginSerializer(data=_read_json(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user, error = await AuthService.aauthenticate_user(
+                serializer.validated_data["email"],
+                serializer.validated_data["password"],
+                ip_address=request.META.get("REMOTE_ADDR"),
+            )
+        except APIException as e:
+            return _error_response(e)
+        if error:
+            return JsonResponse(
+                {"error": str(error)}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        tokens = await sync_to_async(AuthService.get_tokens_for_user)(user)
+        return JsonResponse(TokenSerializer(tokens).data)
+
+
+class AsyncRegisterView(View):
+    """Async version of ``RegisterView``."""
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        """Register user."""
+        throttled = await _throttled_response(request)
+        if throttled:
+            return throttled
+
+        serializer = UserCreateSerializer(data=_read_json(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            password_hash = await PasswordService.amake_password(
+                serializer.validated_data["password"]
+            )
+        except APIException as e:
+            return _error_response(e)
+        return JsonResponse(
+            await sync_to_async(self.create_user)(serializer, password_hash),
+            status=status.HTTP_201_CREATED,
+        )
+
+    @staticmethod
+    def create_user(serializer: UserCreateSerializer, password_hash: str) -> Dict:
+        """Save the user and build the response, on the sync thread."""
+        user = serializer.save(password_hash=password_hash)
+        refresh = RefreshToken.for_user(user)
+        return {
+            "user": UserSerializer(user).data,
+            "tokens": {
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+            },
+            "message": str(_("Registration successful")),
+        }
@@ -1,6 +1,7 @@
 """Authentication URLs."""
 
 from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
@@ -12,12 +13,17 @@ from .views import (
     ProfileViewSet,
     CheckEmailView
 )
+from .async_views import AsyncLoginView, AsyncRegisterView
 
 urlpatterns = [
     # Authentication Endpoints
     path('register/', RegisterView.as_view(), name='register'),
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+    # Async variants hashing passwords without blocking ASGI workers
+    path('async/register/', csrf_exempt(AsyncRegisterView.as_view()), name='async_register'),
+    path('async/token/', csrf_exempt(AsyncLoginView.as_view()), name='async_token'),
     
     # Password Management
     path('reset-password/', ResetPasswordView.as_view(), name='reset_password'),
@@ -10,9 +10,12 @@ from .views import (
     ProfileViewSet,
     SecurityStatusViewSet,
     CheckEmailView,
+    UserViewSet,
 )
 
 urlpatterns = [
+    path("search/", UserViewSet.as_view({"get": "search"}), name="user-search"),
+
     # Authentication endpoints
     path("api/v1/auth/register/", RegisterView.as_view(), name="register-user"),
     path("api/v1/auth/token/", CustomTokenObtainPairView.as_view(), name="token"),
@@ -4,12 +4,11 @@ API views for the users application.
 
 from rest_framework import viewsets, status, generics, mixins
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.request import Request
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
-from django.utils import timezone
 import logging
 import rest_framework.serializers as serializers
 from django.db import transaction
@@ -31,9 +30,11 @@ from ..serializers.users_serializer import (
 from ..serializers.profile_serializer import ProfileSerializer
 from ..services.auth_service import AuthService
 from ..services.users_service import UserService
-from ..services.profile_service import ProfileService
-from ..models import Profile
+from ..services.context_service import UserContextService
+from ..services.password_service import PasswordService
 from rest_framework_simplejwt.tokens import RefreshToken
+from core.authentication import TokenStatusService
+from utils.constants import MAX_SEARCH_PAGE_SIZE, SEARCH_PAGE_SIZE
 
 User = get_user_model()
 
@@ -71,24 +72,58 @@ class UserViewSet(viewsets.ModelViewSet):
             "login",
         ]:
             return [AllowAny()]
+        if self.action == "search":
+            return [IsAdminUser()]
         return super().get_permissions()
 
+    @action(detail=False, methods=["get"])
+    def search(self, request: Request) -> Response:
+        """
+        Search users by username, email or name, best matches first.
+
+        Pass the returned ``next`` as ``cursor`` to get the next page.
+        """
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_PAGE_SIZE))
+            if limit < 1 or limit > MAX_SEARCH_PAGE_SIZE:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {
+                    "error": _("Limit must be between 1 and %(max)d")
+                    % {"max": MAX_SEARCH_PAGE_SIZE}
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        page = UserService.search_users(
+            request.query_params.get("q", ""),
+            active_only=request.query_params.get("active", "true").lower() == "true",
+            limit=limit,
+            cursor=request.query_params.get("cursor"),
+        )
+        return Response(
+            {
+                "results": UserSerializer(page.results, many=True).data,
+                "next": page.next_cursor,
+            }
+        )
+
     @action(detail=False, methods=["post"])
     def login(self, request: Request) -> Response:
         """Login user."""
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        try:
-            user = User.objects.get(email=serializer.validated_data["email"])
-            if user.check_password(serializer.validated_data["password"]):
-                tokens = AuthService.get_tokens_for_user(user)
-                return Response(TokenSerializer(tokens).data)
-            raise User.DoesNotExist
-        except User.DoesNotExist:
-            return Response(
-                {"error": _("Invalid credentials")}, status=status.HTTP_401_UNAUTHORIZED
-            )
+        user, error = AuthService.authenticate_user(
+            serializer.validated_data["email"],
+            serializer.validated_data["password"],
+            ip_address=request.META.get("REMOTE_ADDR"),
+        )
+        if error:
+            return Response({"error": error}, status=status.HTTP_401_UNAUTHORIZED)
+        tokens = AuthService.get_tokens_for_user(user)
+        return Response(TokenSerializer(tokens).data)
 
     @action(detail=False, methods=["post"])
     def register(self, request: Request) -> Response:
@@ -196,7 +231,8 @@ class UserViewSet(viewsets.ModelViewSet):
         and returns the profile data.
         """
         # Ensure profile exists
-        profile, created = Profile.objects.get_or_create(user=request.user)
+        context = UserContextService.get(request.user)
+        profile, created = context.profile, context.profile_created
         
         # Use the profile serializer to represent the profile
         serializer = ProfileSerializer(profile, context={'request': request})
@@ -216,7 +252,8 @@ class UserViewSet(viewsets.ModelViewSet):
         creating a profile if it doesn't exist.
         """
         # Ensure profile exists
-        profile, created = Profile.objects.get_or_create(user=request.user)
+        context = UserContextService.get(request.user)
+        profile, created = context.profile, context.profile_created
         
         # Prepare security status
         security_status = {
@@ -247,7 +284,7 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["put"])
     def update_profile(self, request: Request) -> Response:
         """Update user profile."""
-        profile = ProfileService.get_or_create_profile(request.user)
+        profile = UserContextService.get(request.user).profile
         serializer = ProfileSerializer(profile, data=request.data, partial=True)
         
         if serializer.is_valid():
@@ -270,8 +307,7 @@ class ProfileViewSet(viewsets.GenericViewSet,
 
     def get_object(self):
         """Get or create profile for current user."""
-        profile, _ = Profile.objects.get_or_create(user=self.request.user)
-        return profile
+        return UserContextService.get(self.request.user).profile
 
     def retrieve(self, request, *args, **kwargs):
         """Get user profile."""
@@ -316,7 +352,7 @@ class SecurityStatusViewSet(viewsets.ViewSet):
 
     def list(self, request: Request) -> Response:
         """Return security status for the current user."""
-        profile = ProfileService.get_or_create_profile(request.user)
+        profile = UserContextService.get(request.user).profile
         security_status = {
             "two_factor_enabled": profile.two_factor_enabled,
             "email_verified": request.user.is_active,  # Adjust based on your email verification logic
@@ -449,9 +485,10 @@ class ResetPasswordConfirmView(generics.GenericAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
                 
-            # Set new password
-            user.set_password(password)
+            # Set new password and sign out every existing session
+            PasswordService.set_password(user, password)
             user.save()
+            TokenStatusService.revoke_tokens(user.pk)
             
             return Response(
                 {"message": _("Password reset successful")},
@@ -483,16 +520,18 @@ class CustomTokenObtainPairView(generics.GenericAPIView):
         try:
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            
-            user = serializer.validated_data['user']
-            
+
+            user, error = AuthService.authenticate_user(
+                serializer.validated_data['email'],
+                serializer.validated_data['password'],
+                ip_address=request.META.get('REMOTE_ADDR'),
+            )
+            if error:
+                raise serializers.ValidationError({'non_field_errors': [error]})
+
             # Generate tokens
             refresh = RefreshToken.for_user(user)
-            
-            # Update last login
-            user.last_login = timezone.now()
-            user.save(update_fields=['last_login'])
-            
+
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
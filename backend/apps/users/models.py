@@ -6,13 +6,17 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
+from utils.helpers.search import trigram_index
+from utils.mixins.change_tracking import ChangeTrackingMixin
 
 
-class User(AbstractUser):
+class User(ChangeTrackingMixin, AbstractUser):
     """
     Custom user model extending Django's AbstractUser.
     """
 
+    TRACKED_FIELDS = ("last_login", "is_active")
+
     phone_regex = RegexValidator(
         regex=r"^\+?1?\d{9,15}$",
         message=_(
@@ -40,11 +44,29 @@ class User(AbstractUser):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["-date_joined"]
+        indexes = [
+            trigram_index("username", "users_user_username_trgm"),
+            trigram_index("email", "users_user_email_trgm"),
+            trigram_index("first_name", "users_user_first_name_trgm"),
+            trigram_index("last_name", "users_user_last_name_trgm"),
+        ]
 
     def __str__(self) -> str:
         """String representation of user."""
         return self.email
 
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """
+        Reload fields from the database.
+
+        Users authenticated from a token have every field but the primary
+        key deferred, so reading one deferred field loads all of them.
+        """
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields, **kwargs)
+
     def get_full_name(self) -> str:
         """
         Get user's full name.
@@ -90,7 +112,7 @@ class User(AbstractUser):
         self.save(update_fields=["preferences"])
 
 
-class Profile(models.Model):
+class Profile(ChangeTrackingMixin, models.Model):
     """
     Additional user profile information.
     """
@@ -6,6 +6,7 @@ from django.core.validators import validate_email, ValidationError
 from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from ..models import Profile
+from ..services.password_service import PasswordService
 
 BaseUser = get_user_model()
 
@@ -113,8 +114,12 @@ class UserSerializer(serializers.ModelSerializer[UserType]):
     def to_representation(self, instance: Type[UserType]) -> Dict[str, Any]:
         """Customize data representation."""
         data = super().to_representation(instance)
-        data["total_expenses"] = instance.expenses.count()
-        data["total_budgets"] = instance.budgets.count()
+        # Counted here unless the caller counted them for many users at once
+        for related in ("expenses", "budgets"):
+            total = getattr(instance, f"total_{related}", None)
+            if total is None:
+                total = getattr(instance, related).count()
+            data[f"total_{related}"] = total
         return data
 
 
@@ -193,8 +198,9 @@ class UserCreateSerializer(UserSerializer):
                 if field in validated_data:
                     profile_data[field] = validated_data.pop(field)
 
-            # Extract password before user creation
+            # Extract password before user creation, async views hash it first
             password = validated_data.pop('password')
+            password_hash = validated_data.pop('password_hash', None)
 
             # Create base user first
             user = BaseUser(
@@ -207,7 +213,10 @@ class UserCreateSerializer(UserSerializer):
             )
             
             # Set password properly
-            user.set_password(password)
+            if password_hash:
+                user.password = password_hash
+            else:
+                PasswordService.set_password(user, password)
             user.save()
 
             # Create or get profile
@@ -255,36 +264,10 @@ class LoginSerializer(serializers.Serializer):
     )
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate login credentials."""
-        import logging
-        logger = logging.getLogger(__name__)
-
-        email = attrs.get("email", "").lower()
-        password = attrs.get("password", "")
-
-        logger.info(f"Login attempt for email: {email}")
-
-        if not email or not password:
-            logger.warning("Login attempt with missing email or password")
+        """Validate login input, credentials are checked by ``AuthService``."""
+        attrs["email"] = attrs.get("email", "").lower()
+        if not attrs["email"] or not attrs.get("password"):
             raise serializers.ValidationError(_("Please provide both email and password."))
-
-        user = BaseUser.objects.filter(email=email).first()
-
-        if not user:
-            logger.warning(f"No user found with email: {email}")
-            raise serializers.ValidationError(_("Invalid email or password."))
-
-        logger.info(f"User found: {user.username}, Checking password")
-        
-        if not user.check_password(password):
-            logger.warning(f"Password check failed for user: {user.username}")
-            raise serializers.ValidationError(_("Invalid email or password."))
-
-        if not user.is_active:
-            logger.warning(f"Inactive user login attempt: {user.username}")
-            raise serializers.ValidationError(_("This account is inactive."))
-
-        attrs["user"] = user
         return attrs
 
 
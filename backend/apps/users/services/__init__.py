@@ -5,3 +5,6 @@ Users services initialization.
 from .auth_service import AuthService  # noqa: F401
 from .users_service import UserService  # noqa: F401
 from .profile_service import ProfileService  # noqa: F401
+from .context_service import UserContext, UserContextService  # noqa: F401
+from .lockout_service import LoginLockoutService  # noqa: F401
+from .password_service import PasswordService  # noqa: F401
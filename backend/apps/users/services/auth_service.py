@@ -4,6 +4,7 @@ Authentication service for users.
 
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, List, Any, Union
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.tokens import default_token_generator
@@ -12,12 +13,15 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.mail import send_mail
 from django.conf import settings
-from django.core.cache import cache
 from django.db import transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django_otp.oath import TOTP
 from django_otp.plugins.otp_totp.models import TOTPDevice
 from ..models import Profile, User
+from .context_service import UserContextService
+from .lockout_service import LoginLockoutService
+from .password_service import PasswordService
 from apps.utils import LoggerUtils  # Import LoggerUtils
 
 
@@ -26,10 +30,6 @@ class AuthService:
     Service class for authentication operations.
     """
 
-    LOGIN_ATTEMPT_CACHE_PREFIX = "login_attempt_"
-    MAX_LOGIN_ATTEMPTS = 5
-    LOCKOUT_TIME = 30  # minutes
-
     @staticmethod
     @transaction.atomic
     def register_user(data: Dict[str, Any]) -> Tuple[User, Profile]:
@@ -57,7 +57,7 @@ class AuthService:
             first_name=first_name,
             last_name=last_name,
         )
-        user.set_password(data["password"])
+        PasswordService.set_password(user, data["password"])
         user.save()
 
         # Initialize user preferences
@@ -91,35 +91,81 @@ class AuthService:
     def authenticate_user(
         email: str, password: str, ip_address: Optional[str] = None
     ) -> Tuple[Optional[User], Optional[str]]:
-        """Authentication handler."""
-        if AuthService._is_account_locked(email):
-            LoggerUtils.info(f"Account locked for email: {email}")
+        """
+        Authenticate a user, locking out repeated failures.
+
+        Args:
+            email: User email
+            password: User password
+            ip_address: Client IP address
+
+        Returns:
+            Tuple[Optional[User], Optional[str]]: The user, or an error message
+        """
+        if LoginLockoutService.get_lockout(email, ip_address):
+            LoggerUtils.info(f"Login locked out for email: {email}")
             return None, _("Account temporarily locked. Try again later.")
 
         try:
-            user = User.objects.get(email=email.lower())
+            user = User.objects.select_related("profile").get(email=email.lower())
             LoggerUtils.info(f"User found: {user.email}")
 
             if not user.is_active:
                 LoggerUtils.info(f"Account deactivated for email: {email}")
                 return None, _("Account is deactivated.")
 
-            if not user.check_password(password):
+            if not PasswordService.check_password(user, password):
                 LoggerUtils.info(f"Invalid password for email: {email}")
-                AuthService._record_failed_attempt(email)
+                LoginLockoutService.record_failure(email, ip_address)
                 return None, _("Invalid credentials.")
 
             LoggerUtils.info(f"Successful login for email: {email}")
-            AuthService._clear_login_attempts(email)
+            LoginLockoutService.clear(email)
             AuthService._update_login_metadata(user, ip_address)
 
             return user, None
 
         except User.DoesNotExist:
             LoggerUtils.info(f"User does not exist for email: {email}")
-            AuthService._record_failed_attempt(email)
+            LoginLockoutService.record_failure(email, ip_address)
             return None, _("Invalid credentials.")
 
+    @staticmethod
+    async def aauthenticate_user(
+        email: str, password: str, ip_address: Optional[str] = None
+    ) -> Tuple[Optional[User], Optional[str]]:
+        """
+        Async version of ``authenticate_user`` for ASGI views.
+
+        The password is checked without blocking the event loop.
+        """
+        if await sync_to_async(LoginLockoutService.get_lockout)(email, ip_address):
+            LoggerUtils.info(f"Login locked out for email: {email}")
+            return None, _("Account temporarily locked. Try again later.")
+
+        try:
+            user = await User.objects.select_related("profile").aget(
+                email=email.lower()
+            )
+        except User.DoesNotExist:
+            LoggerUtils.info(f"User does not exist for email: {email}")
+            await sync_to_async(LoginLockoutService.record_failure)(email, ip_address)
+            return None, _("Invalid credentials.")
+
+        if not user.is_active:
+            LoggerUtils.info(f"Account deactivated for email: {email}")
+            return None, _("Account is deactivated.")
+
+        if not await PasswordService.acheck_password(user, password):
+            LoggerUtils.info(f"Invalid password for email: {email}")
+            await sync_to_async(LoginLockoutService.record_failure)(email, ip_address)
+            return None, _("Invalid credentials.")
+
+        LoggerUtils.info(f"Successful login for email: {email}")
+        await sync_to_async(LoginLockoutService.clear)(email)
+        await sync_to_async(AuthService._update_login_metadata)(user, ip_address)
+        return user, None
+
     @staticmethod
     def send_verification_email(user: User) -> None:
         """Send verification email."""
@@ -145,41 +191,15 @@ class AuthService:
         domain = email.split("@")[1]
         return domain in disposable_domains
 
-    @staticmethod
-    def _record_failed_attempt(email: str) -> None:
-        """Record failed attempt."""
-        key = f"{AuthService.LOGIN_ATTEMPT_CACHE_PREFIX}{email}"
-        attempts = cache.get(key, 0)
-        attempts += 1
-
-        if attempts >= AuthService.MAX_LOGIN_ATTEMPTS:
-            cache.set(key, attempts, AuthService.LOCKOUT_TIME * 60)
-        else:
-            cache.set(key, attempts, 300)
-
-    @staticmethod
-    def _is_account_locked(email: str) -> bool:
-        """Check if account is locked."""
-        key = f"{AuthService.LOGIN_ATTEMPT_CACHE_PREFIX}{email}"
-        attempts = cache.get(key, 0)
-        return attempts >= AuthService.MAX_LOGIN_ATTEMPTS
-
     @staticmethod
     def _update_login_metadata(user: User, ip_address: Optional[str]) -> None:
         """Update login metadata."""
+        user.last_login = timezone.now()
+        update_fields = ["last_login"]
         if ip_address:
             user.last_login_ip = ip_address
-
-        user.preferences["login_count"] = user.preferences.get("login_count", 0) + 1
-        user.preferences["last_login_at"] = datetime.now().isoformat()
-
-        if ip_address:
-            recent_ips = user.preferences.get("recent_ips", [])
-            if ip_address not in recent_ips:
-                recent_ips.insert(0, ip_address)
-                user.preferences["recent_ips"] = recent_ips[:5]
-
-        user.save(update_fields=["last_login_ip", "preferences"])
+            update_fields.append("last_login_ip")
+        user.save(update_fields=update_fields)
 
     @staticmethod
     def get_tokens_for_user(user: User) -> Dict[str, str]:
@@ -188,9 +208,10 @@ class AuthService:
 
         refresh["email"] = user.email
         refresh["is_verified"] = user.is_verified
+        profile = UserContextService.get(user).profile
         refresh["preferences"] = {
-            "theme": user.profile.theme,
-            "language": user.profile.language,
+            "theme": profile.theme,
+            "language": profile.language,
         }
 
         return {
@@ -226,17 +247,16 @@ class AuthService:
     @staticmethod
     def get_security_status(user: User) -> Dict[str, Any]:
         """Get security status."""
+        profile = UserContextService.get(user).profile
         return {
             "account_verified": user.is_verified,
-            "two_factor_enabled": user.profile.two_factor_enabled,
+            "two_factor_enabled": profile.two_factor_enabled,
             "last_password_change": user.preferences.get("last_password_change"),
             "recent_suspicious_activities": len(
                 user.preferences.get("suspicious_activities", [])
             ),
             "active_sessions": user.preferences.get("active_sessions", []),
-            "login_attempts": cache.get(
-                f"{AuthService.LOGIN_ATTEMPT_CACHE_PREFIX}{user.email}", 0
-            ),
+            "login_attempts": LoginLockoutService.get_failures(user.email),
             "security_recommendations": AuthService._get_security_recommendations(user),
         }
 
@@ -254,7 +274,7 @@ class AuthService:
                 }
             )
 
-        if not user.profile.two_factor_enabled:
+        if not UserContextService.get(user).profile.two_factor_enabled:
             recommendations.append(
                 {
                     "type": "ENABLE_2FA",
@@ -322,10 +342,7 @@ class AuthService:
         Returns:
             Union[Dict[str, Any], None]: Authentication tokens if successful, None otherwise
         """
-        try:
-            user = User.objects.get(email=email)
-            if user.check_password(password) and AuthService.verify_otp(user, token):
-                return AuthService.get_tokens_for_user(user)
-        except User.DoesNotExist:
-            pass
+        user = AuthService.authenticate_user(email, password)[0]
+        if user is not None and AuthService.verify_otp(user, token):
+            return AuthService.get_tokens_for_user(user)
         return None
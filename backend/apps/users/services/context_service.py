@@ -0,0 +1,160 @@
+"""
+Per-request and cached context of a user.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Type
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, router, transaction
+from core.cache_config import CACHE_TIMEOUTS, CacheService
+from apps.notifications.models import NotificationPreference
+from ..models import Profile, User
+
+
+@dataclass
+class UserContext:
+    """A user with their profile and notification preferences."""
+
+    user: User
+    profile: Profile
+    preferences: NotificationPreference
+    profile_created: bool = False
+
+
+class UserContextService:
+    """
+    Service class loading a user's profile and notification preferences.
+
+    The context is kept on the user instance, which lives for one request,
+    and also sets the ``user.profile`` and ``user.notification_preferences``
+    relation caches. Across requests the two rows are cached as field
+    values and dropped whenever either is saved or deleted. A warm context
+    therefore costs no queries and a cold one a single ``select_related``
+    query.
+    """
+
+    CONTEXT_ATTRIBUTE = "_user_context"
+
+    @staticmethod
+    def get_cache_key(user_id: int) -> str:
+        """Cache key of a user's profile and preference rows."""
+        return CacheService.get_cache_key("user_context", user_id)
+
+    @staticmethod
+    def get(user: User) -> UserContext:
+        """
+        Get the context of a user, loading it on first use.
+
+        Missing profile or preference rows are created.
+
+        Args:
+            user: User instance
+
+        Returns:
+            UserContext: The user's context
+        """
+        context = user.__dict__.get(UserContextService.CONTEXT_ATTRIBUTE)
+        if context is None:
+            context = UserContextService._from_cache(user)
+            if context is None:
+                context = UserContextService._from_database(user)
+            UserContextService._attach(context)
+        return context
+
+    @staticmethod
+    def invalidate(user_ids: Iterable[int]) -> None:
+        """
+        Drop users' cached contexts once the current transaction commits.
+
+        Args:
+            user_ids: User IDs
+        """
+        keys = {UserContextService.get_cache_key(user_id) for user_id in user_ids}
+        transaction.on_commit(lambda: CacheService.invalidate_many(keys))
+
+    @staticmethod
+    def _from_cache(user: User) -> Optional[UserContext]:
+        """Rebuild a context from cached rows, if both are cached."""
+        cached = cache.get(UserContextService.get_cache_key(user.pk))
+        if not cached:
+            return None
+        profile = UserContextService._restore(Profile, cached["profile"])
+        preferences = UserContextService._restore(
+            NotificationPreference, cached["preferences"]
+        )
+        if profile is None or preferences is None:
+            return None
+        return UserContext(user, profile, preferences)
+
+    @staticmethod
+    def _from_database(user: User) -> UserContext:
+        """Load a context with one query and cache its rows."""
+        loaded = User.objects.select_related("profile", "notification_preferences").get(
+            pk=user.pk
+        )
+        # Users authenticated from a token get the rest of their row for free
+        user.set_loaded_values(
+            {name: getattr(loaded, name) for name in user.get_deferred_fields()}
+        )
+        profile_created = False
+        try:
+            profile = loaded.profile
+        except ObjectDoesNotExist:
+            profile, profile_created = Profile.objects.get_or_create(user=user)
+        try:
+            preferences = loaded.notification_preferences
+        except ObjectDoesNotExist:
+            preferences, _ = NotificationPreference.objects.get_or_create(user=user)
+
+        cache.set(
+            UserContextService.get_cache_key(user.pk),
+            {
+                "profile": UserContextService._snapshot(profile),
+                "preferences": UserContextService._snapshot(preferences),
+            },
+            CACHE_TIMEOUTS["user_context"],
+        )
+        return UserContext(user, profile, preferences, profile_created)
+
+    @staticmethod
+    def _attach(context: UserContext) -> None:
+        """Keep the context on its user and fill the relation caches."""
+        user = context.user
+        setattr(user, UserContextService.CONTEXT_ATTRIBUTE, context)
+        for instance, related_name in (
+            (context.profile, "profile"),
+            (context.preferences, "notification_preferences"),
+        ):
+            getattr(User, related_name).related.set_cached_value(user, instance)
+            type(instance).user.field.set_cached_value(instance, user)
+
+    @staticmethod
+    def _snapshot(instance: models.Model) -> Dict:
+        """Field values of a row, by attribute name."""
+        return {
+            field.attname: getattr(instance, field.attname)
+            for field in instance._meta.concrete_fields
+        }
+
+    @staticmethod
+    def _restore(model: Type[models.Model], values: Dict) -> Optional[models.Model]:
+        """
+        Rebuild a row from its field values as if it was just loaded.
+
+        Args:
+            model: Model class
+            values: Field values by attribute name
+
+        Returns:
+            Optional[models.Model]: The instance, or None if the values were
+            cached with different fields
+        """
+        field_names = [field.attname for field in model._meta.concrete_fields]
+        if set(values) != set(field_names):
+            return None
+        return model.from_db(
+            router.db_for_read(model),
+            field_names,
+            [values[name] for name in field_names],
+        )
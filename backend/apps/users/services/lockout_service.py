@@ -0,0 +1,219 @@
+"""
+Lockout of logins after repeated failures.
+"""
+
+import logging
+import math
+import time
+from typing import List, Optional, Tuple
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from core.throttling import get_redis
+from utils.constants import (
+    LOGIN_COOLDOWN_MINUTES,
+    LOGIN_LOCKOUT_SECONDS,
+    MAX_LOGIN_ATTEMPTS,
+    MAX_LOGIN_ATTEMPTS_PER_IP,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LoginLockoutService:
+    """
+    Service class locking out logins after repeated failures.
+
+    Failures are counted per account and per IP address with ``INCR`` and
+    ``EXPIRE`` in one pipelined round trip, so concurrent attempts are never
+    lost. Once a count reaches its limit the bucket is locked, for twice as
+    long with every further failure and at most ``LOGIN_COOLDOWN_MINUTES``.
+    Counts are forgotten after that long without failures.
+
+    Lockouts share the throttling Redis. When ``settings.THROTTLE_REDIS_URL``
+    is empty they are counted in the Django cache instead, with ``add`` and
+    ``incr``, which are atomic on the Redis and Memcached backends. While
+    Redis is down logins are let through if
+    ``settings.LOGIN_LOCKOUT_FAIL_OPEN`` is set, and refused otherwise.
+    """
+
+    KEY_PREFIX = "login_lockout"
+    LIMITS = {"account": MAX_LOGIN_ATTEMPTS, "ip": MAX_LOGIN_ATTEMPTS_PER_IP}
+    WINDOW = LOGIN_COOLDOWN_MINUTES * 60
+
+    @staticmethod
+    def _client() -> Optional[redis.Redis]:
+        url = settings.THROTTLE_REDIS_URL
+        return get_redis(url) if url else None
+
+    @staticmethod
+    def _redis_error(action: str, error: redis.RedisError) -> int:
+        """Log a Redis failure and return the lockout it implies."""
+        logger.warning(f"{action} failed: {error}")
+        return 0 if settings.LOGIN_LOCKOUT_FAIL_OPEN else LOGIN_LOCKOUT_SECONDS
+
+    @staticmethod
+    def _key(bucket: str, ident: str, kind: str) -> str:
+        return f"{LoginLockoutService.KEY_PREFIX}:{bucket}:{ident}:{kind}"
+
+    @staticmethod
+    def _buckets(email: str, ip_address: Optional[str]) -> List[Tuple[str, str]]:
+        buckets = [("account", email.lower())]
+        if ip_address:
+            buckets.append(("ip", ip_address))
+        return buckets
+
+    @staticmethod
+    def _lockout_seconds(bucket: str, count: int) -> int:
+        """Lockout of a bucket with ``count`` failures, 0 under its limit."""
+        excess = count - LoginLockoutService.LIMITS[bucket]
+        if excess < 0:
+            return 0
+        return min(
+            LOGIN_LOCKOUT_SECONDS * 2 ** min(excess, 16), LoginLockoutService.WINDOW
+        )
+
+    @staticmethod
+    def _cache_incr(key: str) -> int:
+        """Increment a failure count in the cache, restarting its window."""
+        cache.add(key, 0, LoginLockoutService.WINDOW)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Expired or evicted since it was added
+            cache.add(key, 1, LoginLockoutService.WINDOW)
+            return 1
+        cache.touch(key, LoginLockoutService.WINDOW)
+        return count
+
+    @staticmethod
+    def get_lockout(email: str, ip_address: Optional[str] = None) -> int:
+        """
+        Seconds until logins to an account, or from an address, may resume.
+
+        Args:
+            email: Account email
+            ip_address: Client IP address
+
+        Returns:
+            int: Remaining lockout, 0 if neither is locked
+        """
+        keys = [
+            LoginLockoutService._key(bucket, ident, "locked")
+            for bucket, ident in LoginLockoutService._buckets(email, ip_address)
+        ]
+        client = LoginLockoutService._client()
+        if client is None:
+            # The cache cannot tell a key's TTL, so locks hold their expiry
+            now = time.time()
+            locks = cache.get_many(keys).values()
+            return max(
+                (math.ceil(until - now) for until in locks if until > now), default=0
+            )
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.pttl(key)
+                ttls = pipe.execute()
+        except redis.RedisError as e:
+            return LoginLockoutService._redis_error("Login lockout check", e)
+        return max((math.ceil(ttl / 1000) for ttl in ttls if ttl > 0), default=0)
+
+    @staticmethod
+    def record_failure(email: str, ip_address: Optional[str] = None) -> int:
+        """
+        Count a failed login and lock out the buckets over their limit.
+
+        Args:
+            email: Account email
+            ip_address: Client IP address
+
+        Returns:
+            int: Seconds the login is now locked out for, 0 if it is not
+        """
+        buckets = LoginLockoutService._buckets(email, ip_address)
+        client = LoginLockoutService._client()
+        if client is None:
+            lockout = 0
+            for bucket, ident in buckets:
+                count = LoginLockoutService._cache_incr(
+                    LoginLockoutService._key(bucket, ident, "failures")
+                )
+                seconds = LoginLockoutService._lockout_seconds(bucket, count)
+                if seconds:
+                    cache.set(
+                        LoginLockoutService._key(bucket, ident, "locked"),
+                        time.time() + seconds,
+                        seconds,
+                    )
+                    lockout = max(lockout, seconds)
+            return lockout
+        try:
+            with client.pipeline() as pipe:
+                for bucket, ident in buckets:
+                    key = LoginLockoutService._key(bucket, ident, "failures")
+                    pipe.incr(key)
+                    pipe.expire(key, LoginLockoutService.WINDOW)
+                counts = pipe.execute()[::2]
+
+            lockout = 0
+            with client.pipeline(transaction=False) as pipe:
+                for (bucket, ident), count in zip(buckets, counts):
+                    seconds = LoginLockoutService._lockout_seconds(bucket, count)
+                    if not seconds:
+                        continue
+                    pipe.set(
+                        LoginLockoutService._key(bucket, ident, "locked"), 1, ex=seconds
+                    )
+                    lockout = max(lockout, seconds)
+                if lockout:
+                    pipe.execute()
+        except redis.RedisError as e:
+            return LoginLockoutService._redis_error("Recording a failed login", e)
+        return lockout
+
+    @staticmethod
+    def clear(email: str) -> None:
+        """
+        Forget an account's failures after a successful login.
+
+        Failures of the client's address are kept, so one valid account
+        does not reset an attacker's count.
+
+        Args:
+            email: Account email
+        """
+        keys = [
+            LoginLockoutService._key("account", email.lower(), kind)
+            for kind in ("failures", "locked")
+        ]
+        client = LoginLockoutService._client()
+        if client is None:
+            cache.delete_many(keys)
+            return
+        try:
+            client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to clear failed logins: {e}")
+
+    @staticmethod
+    def get_failures(email: str) -> int:
+        """
+        Recent failed logins to an account.
+
+        Args:
+            email: Account email
+
+        Returns:
+            int: Failures within the last ``LOGIN_COOLDOWN_MINUTES``
+        """
+        key = LoginLockoutService._key("account", email.lower(), "failures")
+        client = LoginLockoutService._client()
+        if client is None:
+            return cache.get(key, 0)
+        try:
+            count = client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read failed logins: {e}")
+            return 0
+        return int(count or 0)
@@ -0,0 +1,162 @@
+"""
+Password hashing off the request thread.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from utils.exceptions.custom_exceptions import PasswordHashingBusy
+from utils.helpers import password_hashing
+from utils.helpers.password_hashing import HashingPool, HashingQueueFull
+from ..models import User
+
+
+class PasswordService:
+    """
+    Service class hashing and checking passwords in a process pool.
+
+    ``settings.PASSWORD_HASHING_WORKERS`` processes hash passwords, with at
+    most ``settings.PASSWORD_HASHING_MAX_QUEUE`` more waiting. Requests
+    beyond that fail fast with ``PasswordHashingBusy`` so latency stays
+    bounded during login storms. With no workers, passwords are hashed on
+    the calling thread, or a worker thread for the async methods.
+
+    Correct passwords whose hash is outdated are rehashed in the same
+    worker call and saved, as ``settings.PASSWORD_HASH_UPGRADE`` allows.
+    """
+
+    _pool: Optional[HashingPool] = None
+    _pool_config = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_pool() -> Optional[HashingPool]:
+        """
+        Get the process pool of the current settings, starting it if needed.
+
+        Returns:
+            Optional[HashingPool]: The pool, None when hashing inline
+        """
+        config = (
+            settings.PASSWORD_HASHING_WORKERS,
+            settings.PASSWORD_HASHING_MAX_QUEUE,
+            tuple(settings.PASSWORD_HASHERS),
+        )
+        if PasswordService._pool_config != config:
+            with PasswordService._lock:
+                if PasswordService._pool_config != config:
+                    if PasswordService._pool is not None:
+                        PasswordService._pool.shutdown()
+                    PasswordService._pool = (
+                        HashingPool(*config) if config[0] > 0 else None
+                    )
+                    PasswordService._pool_config = config
+        return PasswordService._pool
+
+    @staticmethod
+    def _get_upgrade_policy() -> str:
+        policy = settings.PASSWORD_HASH_UPGRADE
+        if policy not in password_hashing.UPGRADE_POLICIES:
+            raise ImproperlyConfigured(
+                f"PASSWORD_HASH_UPGRADE must be one of "
+                f"{', '.join(password_hashing.UPGRADE_POLICIES)}"
+            )
+        return policy
+
+    @staticmethod
+    def _submit(function: Callable, *args) -> Optional[Future]:
+        """Start a hash in the pool, None when hashing inline."""
+        pool = PasswordService.get_pool()
+        if pool is None:
+            return None
+        try:
+            return pool.submit(function, *args)
+        except HashingQueueFull:
+            raise PasswordHashingBusy()
+
+    @staticmethod
+    def make_password(password: str) -> str:
+        """
+        Hash a password with the preferred hasher.
+
+        Args:
+            password: Raw password
+
+        Returns:
+            str: Encoded password
+
+        Raises:
+            PasswordHashingBusy: If too many hashes are waiting
+        """
+        future = PasswordService._submit(password_hashing.hash_password, password)
+        if future is None:
+            return password_hashing.hash_password(password)
+        return future.result()
+
+    @staticmethod
+    async def amake_password(password: str) -> str:
+        """Async version of ``make_password``."""
+        future = PasswordService._submit(password_hashing.hash_password, password)
+        if future is None:
+            return await sync_to_async(
+                password_hashing.hash_password, thread_sensitive=False
+            )(password)
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def set_password(user: User, password: str) -> None:
+        """
+        Set a user's password, without saving the user.
+
+        Args:
+            user: User instance
+            password: Raw password
+        """
+        user.password = PasswordService.make_password(password)
+        user._password = password
+
+    @staticmethod
+    def check_password(user: User, password: str) -> bool:
+        """
+        Check a user's password, saving an upgraded hash if it is correct.
+
+        Args:
+            user: User instance
+            password: Raw password
+
+        Returns:
+            bool: True if the password is correct
+
+        Raises:
+            PasswordHashingBusy: If too many hashes are waiting
+        """
+        args = (password, user.password, PasswordService._get_upgrade_policy())
+        future = PasswordService._submit(password_hashing.check_password, *args)
+        if future is None:
+            is_correct, upgraded = password_hashing.check_password(*args)
+        else:
+            is_correct, upgraded = future.result()
+        if upgraded:
+            user.password = upgraded
+            user.save(update_fields=["password"])
+        return is_correct
+
+    @staticmethod
+    async def acheck_password(user: User, password: str) -> bool:
+        """Async version of ``check_password``."""
+        args = (password, user.password, PasswordService._get_upgrade_policy())
+        future = PasswordService._submit(password_hashing.check_password, *args)
+        if future is None:
+            is_correct, upgraded = await sync_to_async(
+                password_hashing.check_password, thread_sensitive=False
+            )(*args)
+        else:
+            is_correct, upgraded = await asyncio.wrap_future(future)
+        if upgraded:
+            user.password = upgraded
+            await user.asave(update_fields=["password"])
+        return is_correct
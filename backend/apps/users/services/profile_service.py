@@ -10,6 +10,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q
 from ..models import Profile, User
+from .context_service import UserContextService
 
 
 class ProfileService:
@@ -108,16 +109,7 @@ class ProfileService:
         Returns:
             Profile: User's profile
         """
-        profile, created = Profile.objects.get_or_create(
-            user=user,
-            defaults={
-                "language": user.preferences.get("language", "en"),
-                "timezone": user.preferences.get("timezone", "UTC"),
-                "theme": Profile.ThemeChoices.SYSTEM,
-                "default_currency": Profile.CurrencyChoices.USD,
-            },
-        )
-        return profile
+        return UserContextService.get(user).profile
 
     @staticmethod
     def get_profile_stats(profile: Profile) -> Dict:
@@ -4,12 +4,13 @@ Enhanced user-related services.
 
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db.models import Count
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q
-from ..models import Profile
+from utils.helpers.search import SearchPage, TrigramSearch
+from ..models import Profile, User
+from .password_service import PasswordService
 
 # User = get_user_model()
 
@@ -19,6 +20,8 @@ class UserService:
     Enhanced service class for user operations.
     """
 
+    SEARCH = TrigramSearch(("username", "email", "first_name", "last_name"))
+
     @staticmethod
     def update_user(user: User, data: Dict) -> User:
         """
@@ -117,7 +120,7 @@ class UserService:
         Raises:
             ValidationError: If validation fails
         """
-        if not user.check_password(password):
+        if not PasswordService.check_password(user, password):
             raise ValidationError(_("Invalid password"))
 
         # Store deactivation info
@@ -144,31 +147,47 @@ class UserService:
 
     @staticmethod
     def search_users(
-        query: str, active_only: bool = True, limit: int = 10
-    ) -> List[User]:
+        query: str,
+        active_only: bool = True,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
         """
-        Search users by various criteria.
+        Search users by username, email or name.
+
+        Users with a field equal to, then starting with, the query come
+        first. Results are paged by keyset, so deep pages stay cheap.
 
         Args:
             query: Search query
             active_only: Only active users
             limit: Result limit
+            cursor: ``next_cursor`` of the previous page
 
         Returns:
-            List[User]: Matching users
+            SearchPage: Matching users, with ``total_expenses`` and
+            ``total_budgets`` set, and the cursor of the next page
         """
-        search_fields = (
-            Q(username__icontains=query)
-            | Q(email__icontains=query)
-            | Q(first_name__icontains=query)
-            | Q(last_name__icontains=query)
-        )
-
-        filters = Q(search_fields)
+        users = User.objects.select_related("profile")
         if active_only:
-            filters &= Q(is_active=True)
+            users = users.filter(is_active=True)
+
+        page = UserService.SEARCH.search(users, query, limit=limit, cursor=cursor)
+        UserService._set_totals(page.results)
+        return page
 
-        return User.objects.filter(filters)[:limit]
+    @staticmethod
+    def _set_totals(users: List[User]) -> None:
+        """Count the expenses and budgets of users, one query per relation."""
+        ids = [user.pk for user in users]
+        for relation in ("expenses", "budgets"):
+            totals = dict(
+                User.objects.filter(pk__in=ids)
+                .annotate(total=Count(relation))
+                .values_list("pk", "total")
+            )
+            for user in users:
+                setattr(user, f"total_{relation}", totals.get(user.pk, 0))
 
     @staticmethod
     def get_user_activity_summary(user: User) -> Dict:
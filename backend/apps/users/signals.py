@@ -3,11 +3,13 @@
 Signal handlers for users application.
 """
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from core.authentication import TokenStatusService
 from .models import Profile
+from .services import UserContextService
 
 User = get_user_model()
 
@@ -28,21 +30,41 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, created, **kwargs):
     """
-    Signal to save user profile on user save.
+    Signal to save the user's loaded profile when it has unsaved changes.
+
+    A profile that was never loaded cannot have changed, so it is neither
+    fetched nor written.
 
     Args:
         sender: The model class
         instance: The actual user instance
+        created: Boolean indicating if this is a new instance
         **kwargs: Additional keyword arguments
     """
-    if not hasattr(instance, "profile"):
-        Profile.objects.create(user=instance)
-    else:
+    if created or not User.profile.is_cached(instance):
+        return
+    if instance.profile.has_changed():
         instance.profile.save()
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def publish_user_status(sender, instance, created=False, **kwargs):
+    """
+    Signal to evict the user's cached token status everywhere when it changes.
+
+    Args:
+        sender: The model class
+        instance: The actual user instance
+        created: Boolean indicating if this is a new instance
+        **kwargs: Additional keyword arguments
+    """
+    if kwargs["signal"] is post_delete or instance.has_changed("is_active"):
+        TokenStatusService.publish(instance.pk)
+
+
 @receiver(pre_save, sender=User)
 def update_user_activity(sender, instance, **kwargs):
     """
@@ -53,11 +75,8 @@ def update_user_activity(sender, instance, **kwargs):
         instance: The actual user instance
         **kwargs: Additional keyword arguments
     """
-    if instance.pk:  # Existing user
-        old_instance = User.objects.get(pk=instance.pk)
-        # Update last_login if it's different
-        if instance.last_login != old_instance.last_login:
-            instance.last_activity = timezone.now()
+    if instance.has_changed("last_login"):
+        instance.last_activity = timezone.now()
 
 
 @receiver(post_save, sender=Profile)
@@ -70,28 +89,40 @@ def handle_two_factor_change(sender, instance, **kwargs):
         instance: The actual profile instance
         **kwargs: Additional keyword arguments
     """
-    if instance.pk:
-        old_instance = Profile.objects.get(pk=instance.pk)
-        if instance.two_factor_enabled != old_instance.two_factor_enabled:
-            if instance.two_factor_enabled:
-                # Send 2FA enabled notification
-                from apps.notifications.services import NotificationService
-
-                NotificationService.create_notification(
-                    user_id=instance.user.id,
-                    title="Two-Factor Authentication Enabled",
-                    message="Two-factor authentication has been enabled for your account.",
-                    notification_type="SECURITY",
-                    priority="HIGH",
-                )
-            else:
-                # Send 2FA disabled notification
-                from apps.notifications.services import NotificationService
-
-                NotificationService.create_notification(
-                    user_id=instance.user.id,
-                    title="Two-Factor Authentication Disabled",
-                    message="Two-factor authentication has been disabled for your account.",
-                    notification_type="SECURITY",
-                    priority="HIGH",
-                )
+    if instance.has_changed("two_factor_enabled"):
+        if instance.two_factor_enabled:
+            # Send 2FA enabled notification
+            from apps.notifications.services import NotificationService
+
+            NotificationService.create_notification(
+                user_id=instance.user_id,
+                title="Two-Factor Authentication Enabled",
+                message="Two-factor authentication has been enabled for your account.",
+                notification_type="SECURITY",
+                priority="HIGH",
+            )
+        else:
+            # Send 2FA disabled notification
+            from apps.notifications.services import NotificationService
+
+            NotificationService.create_notification(
+                user_id=instance.user_id,
+                title="Two-Factor Authentication Disabled",
+                message="Two-factor authentication has been disabled for your account.",
+                notification_type="SECURITY",
+                priority="HIGH",
+            )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_user_context(sender, instance, **kwargs):
+    """
+    Signal to drop the owner's cached user context.
+
+    Args:
+        sender: The model class
+        instance: The actual profile instance
+        **kwargs: Additional keyword arguments
+    """
+    UserContextService.invalidate([instance.user_id])
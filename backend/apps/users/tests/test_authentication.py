@@ -0,0 +1,95 @@
+"""
+Tests for JWT authentication from token claims.
+"""
+
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from core.authentication import ClaimsJWTAuthentication, TokenStatusService
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ClaimsJWTAuthenticationTests(TestCase):
+    """Test cases for ClaimsJWTAuthentication."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="claims@example.com",
+            username="claims",
+            password="testpass123",
+            first_name="Claims",
+        )
+        TokenStatusService.status_cache.clear()
+        self.addCleanup(TokenStatusService.status_cache.clear)
+        self.addCleanup(cache.clear)
+
+    def authenticate(self, token):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_user_built_without_reading_the_row(self):
+        """Test only the status is queried, and only until it is cached."""
+        token = AccessToken.for_user(self.user)
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertTrue(user.is_active)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "claims@example.com")
+            self.assertEqual(user.first_name, "Claims")
+        self.assertFalse(user.has_changed())
+
+    def test_deactivation_takes_effect_immediately(self):
+        """Test deactivating a user evicts their cached status."""
+        token = AccessToken.for_user(self.user)
+        self.authenticate(token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_revoked_tokens_rejected(self):
+        """Test tokens issued before a revocation are rejected."""
+        token = AccessToken.for_user(self.user)
+        token["iat"] -= 10
+        self.authenticate(token)
+
+        # Revoked a few seconds ago, so new tokens are from a later second
+        with mock.patch("time.time", return_value=token["iat"] + 5):
+            with self.captureOnCommitCallbacks(execute=True):
+                TokenStatusService.revoke_tokens(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        self.assertEqual(
+            self.authenticate(AccessToken.for_user(self.user)).pk, self.user.pk
+        )
+
+    def test_tokens_of_the_revocation_second_rejected(self):
+        """Test a token issued earlier in the second of a revocation is rejected."""
+        token = AccessToken.for_user(self.user)
+        with mock.patch("time.time", return_value=token["iat"] + 0.999):
+            with self.captureOnCommitCallbacks(execute=True):
+                TokenStatusService.revoke_tokens(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_deleted_user_rejected(self):
+        """Test tokens of deleted users are rejected."""
+        token = AccessToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
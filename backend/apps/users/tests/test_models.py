@@ -3,7 +3,9 @@
 Tests for user models.
 """
 
+from unittest import mock
 from django.test import TestCase
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from ..models import Profile
@@ -104,3 +106,58 @@ class ProfileModelTests(TestCase):
         self.assertFalse(self.profile.notification_emails)
         self.assertFalse(self.profile.activity_emails)
         self.assertFalse(self.profile.marketing_emails)  # Default False
+
+
+class ChangeTrackingTests(TestCase):
+    """Test cases for in-memory change tracking of users and profiles."""
+
+    def setUp(self):
+        """Set up test data."""
+        User.objects.create_user(
+            email="tracked@example.com", username="tracked", password="testpass123"
+        )
+        self.user = User.objects.select_related("profile").get(username="tracked")
+
+    def test_changes_detected_in_memory(self):
+        """Test changes are found against the loaded values."""
+        profile = self.user.profile
+        self.assertFalse(profile.has_changed())
+
+        profile.theme = Profile.ThemeChoices.DARK
+        self.assertEqual(profile.changed_fields(), {"theme": Profile.ThemeChoices.SYSTEM})
+        self.assertTrue(profile.has_changed("theme"))
+        self.assertFalse(profile.has_changed("two_factor_enabled"))
+
+        profile.save()
+        self.assertFalse(profile.has_changed())
+
+    def test_login_is_a_single_write(self):
+        """Test saving the login time neither reads nor writes the profile."""
+        self.user.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=["last_login"])
+        self.assertFalse(self.user.has_changed())
+
+    def test_dirty_profile_saved_with_user(self):
+        """Test a changed loaded profile is saved with its user."""
+        self.user.profile.language = "fr"
+        with self.assertNumQueries(2):
+            self.user.save()
+        self.assertEqual(Profile.objects.get(user=self.user).language, "fr")
+
+    def test_two_factor_change_notifies(self):
+        """Test toggling 2FA is detected without reading the profile again."""
+        profile = self.user.profile
+        with mock.patch(
+            "apps.notifications.services.NotificationService.create_notification"
+        ) as create_notification:
+            with self.assertNumQueries(1):
+                profile.save()
+            create_notification.assert_not_called()
+
+            profile.toggle_two_factor()
+        create_notification.assert_called_once()
+        self.assertEqual(
+            create_notification.call_args.kwargs["title"],
+            "Two-Factor Authentication Enabled",
+        )
@@ -3,14 +3,27 @@
 Tests for user services.
 """
 
-from django.test import TestCase
+import threading
+from unittest import mock
+
+import fakeredis
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, identify_hasher
+from django.test import TestCase, override_settings
 from django.core import mail
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from ..models import Profile
 from ..services.auth_service import AuthService
 from ..services.users_service import UserService
 from ..services.profile_service import ProfileService
+from ..services.context_service import UserContextService
+from ..services import lockout_service
+from ..services.lockout_service import LoginLockoutService
+from ..services.password_service import PasswordService
+from utils.exceptions.custom_exceptions import InvalidSearchCursor, PasswordHashingBusy
+from utils.helpers import password_hashing
 
 User = get_user_model()
 
@@ -156,3 +169,348 @@ class ProfileServiceTests(TestCase):
 
         self.assertIsInstance(new_profile, Profile)
         self.assertEqual(new_profile.user, new_user)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class UserContextServiceTests(TestCase):
+    """Test cases for UserContextService."""
+
+    def setUp(self):
+        """Set up test data."""
+        User.objects.create_user(
+            email="context@example.com", username="context", password="testpass123"
+        )
+        self.user_id = User.objects.get(username="context").pk
+        self.addCleanup(cache.clear)
+
+    def test_context_loaded_once_per_request(self):
+        """Test a cold context is one query and repeated use costs none."""
+        user = User.objects.get(pk=self.user_id)
+        with self.assertNumQueries(1):
+            context = UserContextService.get(user)
+            self.assertIs(UserContextService.get(user), context)
+            self.assertIs(user.profile, context.profile)
+            self.assertIs(user.notification_preferences, context.preferences)
+            self.assertIs(context.profile.user, user)
+        self.assertFalse(context.profile_created)
+
+    def test_context_cached_across_requests(self):
+        """Test a later request reads the context from the cache."""
+        UserContextService.get(User.objects.get(pk=self.user_id))
+
+        user = User.objects.get(pk=self.user_id)
+        with self.assertNumQueries(0):
+            context = UserContextService.get(user)
+        self.assertEqual(context.profile.pk, Profile.objects.get(user=user).pk)
+        self.assertFalse(context.profile.has_changed())
+
+    def test_writes_invalidate_cached_context(self):
+        """Test saving the profile or preferences drops the cached context."""
+        profile = UserContextService.get(User.objects.get(pk=self.user_id)).profile
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.theme = Profile.ThemeChoices.DARK
+            profile.save()
+
+        context = UserContextService.get(User.objects.get(pk=self.user_id))
+        self.assertEqual(context.profile.theme, Profile.ThemeChoices.DARK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            context.preferences.budget_alerts = False
+            context.preferences.save()
+        user = User.objects.get(pk=self.user_id)
+        with self.assertNumQueries(1):
+            context = UserContextService.get(user)
+        self.assertFalse(context.preferences.budget_alerts)
+
+    def test_missing_profile_created(self):
+        """Test users without a profile get one."""
+        Profile.objects.filter(user_id=self.user_id).delete()
+
+        context = UserContextService.get(User.objects.get(pk=self.user_id))
+        self.assertTrue(context.profile_created)
+        self.assertTrue(Profile.objects.filter(user_id=self.user_id).exists())
+
+
+@override_settings(THROTTLE_REDIS_URL="redis://lockout-test")
+class LoginLockoutServiceTests(TestCase):
+    """Test cases for LoginLockoutService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(
+            lockout_service, "get_redis", return_value=self.redis
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        User.objects.create_user(
+            email="lockout@example.com", username="lockout", password="testpass123"
+        )
+
+    def _fail_logins(self, times, email="lockout@example.com", ip_address="10.0.0.1"):
+        for _ in range(times):
+            user = AuthService.authenticate_user(email, "wrong", ip_address)[0]
+            self.assertIsNone(user)
+
+    def test_account_locked_after_failures(self):
+        """Test an account is locked out, even for the right password."""
+        self._fail_logins(4)
+        self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 0)
+        self._fail_logins(1)
+        self.assertEqual(LoginLockoutService.get_lockout("LOCKOUT@example.com"), 30)
+
+        user, error = AuthService.authenticate_user(
+            "lockout@example.com", "testpass123", "10.0.0.2"
+        )
+        self.assertIsNone(user)
+        self.assertIsNotNone(error)
+        self.assertEqual(LoginLockoutService.get_failures("lockout@example.com"), 5)
+
+    def test_lockout_doubles_with_further_failures(self):
+        """Test every failure after a lockout doubles it, up to the cooldown."""
+        self._fail_logins(5)
+        lockouts = []
+        for _ in range(7):
+            self.redis.delete("login_lockout:account:lockout@example.com:locked")
+            lockouts.append(LoginLockoutService.record_failure("lockout@example.com"))
+        self.assertEqual(lockouts, [60, 120, 240, 480, 900, 900, 900])
+
+    def test_address_locked_across_accounts(self):
+        """Test an address trying many accounts is locked out."""
+        for index in range(20):
+            self._fail_logins(1, email=f"unknown{index}@example.com")
+
+        self.assertEqual(
+            LoginLockoutService.get_lockout("lockout@example.com", "10.0.0.1"), 30
+        )
+        self.assertEqual(
+            LoginLockoutService.get_lockout("lockout@example.com", "10.0.0.2"), 0
+        )
+
+    def test_success_clears_account_failures_only(self):
+        """Test a login resets its account, but not its address."""
+        self._fail_logins(3)
+        user, error = AuthService.authenticate_user(
+            "lockout@example.com", "testpass123", "10.0.0.1"
+        )
+        self.assertEqual(user.email, "lockout@example.com")
+        self.assertIsNone(error)
+        self.assertEqual(user.last_login_ip, "10.0.0.1")
+        self.assertEqual(LoginLockoutService.get_failures("lockout@example.com"), 0)
+        self.assertEqual(int(self.redis.get("login_lockout:ip:10.0.0.1:failures")), 3)
+
+    def test_concurrent_failures_all_counted(self):
+        """Test failures recorded at the same time are never lost."""
+
+        def record():
+            for _ in range(25):
+                LoginLockoutService.record_failure("lockout@example.com", "10.0.0.1")
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(LoginLockoutService.get_failures("lockout@example.com"), 100)
+
+    def test_failures_expire(self):
+        """Test failure counts expire after the cooldown."""
+        self._fail_logins(1)
+        ttl = self.redis.ttl("login_lockout:account:lockout@example.com:failures")
+        self.assertEqual(ttl, LoginLockoutService.WINDOW)
+
+    @override_settings(
+        THROTTLE_REDIS_URL="",
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+    )
+    def test_cache_without_redis_url(self):
+        """Test lockouts are counted in the cache without a Redis."""
+        self._fail_logins(4)
+        self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 0)
+        self._fail_logins(1)
+        self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 30)
+        self.assertEqual(LoginLockoutService.get_failures("lockout@example.com"), 5)
+
+        user, error = AuthService.authenticate_user(
+            "lockout@example.com", "testpass123", "10.0.0.2"
+        )
+        self.assertIsNone(user)
+        self.assertIsNotNone(error)
+        self.assertEqual(self.redis.keys("*"), [])
+
+        LoginLockoutService.clear("lockout@example.com")
+        self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 0)
+        self.assertEqual(LoginLockoutService.get_failures("lockout@example.com"), 0)
+
+    def test_redis_down(self):
+        """Test logins are let through or refused while Redis is down."""
+        server = fakeredis.FakeServer()
+        server.connected = False
+        patcher = mock.patch.object(
+            lockout_service,
+            "get_redis",
+            return_value=fakeredis.FakeRedis(server=server),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with override_settings(LOGIN_LOCKOUT_FAIL_OPEN=True):
+            self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 0)
+        with override_settings(LOGIN_LOCKOUT_FAIL_OPEN=False):
+            self.assertEqual(LoginLockoutService.get_lockout("lockout@example.com"), 30)
+            user, error = AuthService.authenticate_user(
+                "lockout@example.com", "testpass123", "10.0.0.1"
+            )
+            self.assertIsNone(user)
+            self.assertIsNotNone(error)
+
+
+class PasswordServiceTests(TestCase):
+    """Test cases for PasswordService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="hashing@example.com", username="hashing", password="unused"
+        )
+
+    def set_hash(self, encoded):
+        User.objects.filter(pk=self.user.pk).update(password=encoded)
+        self.user.refresh_from_db()
+
+    def stored_hash(self):
+        return User.objects.values_list("password", flat=True).get(pk=self.user.pk)
+
+    def test_outdated_hash_upgraded_on_login(self):
+        """Test a hash with fewer iterations is replaced on a correct login."""
+        self.set_hash(
+            PBKDF2PasswordHasher().encode("testpass123", "salt", iterations=1000)
+        )
+        self.assertFalse(PasswordService.check_password(self.user, "wrongpass"))
+        self.assertIn("$1000$", self.stored_hash())
+
+        self.assertTrue(PasswordService.check_password(self.user, "testpass123"))
+        self.assertNotIn("$1000$", self.stored_hash())
+        self.assertTrue(self.user.check_password("testpass123"))
+
+    def test_upgrade_policies(self):
+        """Test the upgrade policy decides which hashes are replaced."""
+        weak = PBKDF2PasswordHasher().encode("testpass123", "salt", iterations=1000)
+        for policy in (password_hashing.UPGRADE_HASHER, password_hashing.UPGRADE_NEVER):
+            self.set_hash(weak)
+            with override_settings(PASSWORD_HASH_UPGRADE=policy):
+                self.assertTrue(
+                    PasswordService.check_password(self.user, "testpass123")
+                )
+            self.assertEqual(self.stored_hash(), weak)
+
+        with override_settings(
+            PASSWORD_HASHERS=[
+                "django.contrib.auth.hashers.MD5PasswordHasher",
+                "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            ],
+            PASSWORD_HASH_UPGRADE=password_hashing.UPGRADE_HASHER,
+        ):
+            self.assertTrue(PasswordService.check_password(self.user, "testpass123"))
+            self.assertEqual(identify_hasher(self.stored_hash()).algorithm, "md5")
+
+    def test_async_check(self):
+        """Test the async check verifies and upgrades like the sync one."""
+        self.set_hash(
+            PBKDF2PasswordHasher().encode("testpass123", "salt", iterations=1000)
+        )
+        self.assertTrue(
+            async_to_sync(PasswordService.acheck_password)(self.user, "testpass123")
+        )
+        self.assertNotIn("$1000$", self.stored_hash())
+
+    def test_hashing_in_worker_processes(self):
+        """Test hashes run in the pool and a full queue turns work away."""
+        self.addCleanup(PasswordService.get_pool)
+        with override_settings(
+            PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_MAX_QUEUE=0
+        ):
+            encoded = PasswordService.make_password("testpass123")
+            self.set_hash(encoded)
+            self.assertTrue(PasswordService.check_password(self.user, "testpass123"))
+
+            pool = PasswordService.get_pool()
+            future = pool.submit(password_hashing.hash_password, "testpass123")
+            with self.assertRaises(PasswordHashingBusy):
+                PasswordService.make_password("testpass123")
+            future.result()
+            self.assertEqual(pool.pending, 0)
+
+
+class UserSearchTests(TestCase):
+    """Test cases for UserService.search_users."""
+
+    def setUp(self):
+        """Set up test data."""
+        for username, email, first_name, last_name in [
+            ("jsmith", "john.smith@example.com", "John", "Smith"),
+            ("smithy", "smithy@example.com", "Anna", "Blacksmith"),
+            ("jdoe", "jane.doe@example.com", "Jane", "Doe"),
+            ("johnny", "johnny@example.com", "Johnny", "Walker"),
+        ]:
+            User.objects.create_user(
+                username=username,
+                email=email,
+                password="testpass123",
+                first_name=first_name,
+                last_name=last_name,
+            )
+
+    def usernames(self, page):
+        return [user.username for user in page.results]
+
+    def test_ranks_prefix_matches_first(self):
+        """Test users with a field starting with the query come first."""
+        page = UserService.search_users("smith")
+
+        self.assertEqual(self.usernames(page), ["jsmith", "smithy"])
+        self.assertGreater(page.results[0].search_rank, page.results[1].search_rank)
+        self.assertIsNone(page.next_cursor)
+
+    def test_matches_every_word(self):
+        """Test every word of the query must match one of the fields."""
+        page = UserService.search_users("JOHN smith")
+
+        self.assertEqual(self.usernames(page), ["jsmith"])
+
+    def test_excludes_inactive_users(self):
+        """Test inactive users are only found when asked for."""
+        User.objects.filter(username="jdoe").update(is_active=False)
+
+        self.assertEqual(self.usernames(UserService.search_users("jane")), [])
+        self.assertEqual(
+            self.usernames(UserService.search_users("jane", active_only=False)),
+            ["jdoe"],
+        )
+
+    def test_keyset_pagination(self):
+        """Test following cursors visits every match once, in rank order."""
+        expected = self.usernames(UserService.search_users("example", limit=10))
+        seen, cursor = [], None
+        while True:
+            page = UserService.search_users("example", limit=1, cursor=cursor)
+            seen += self.usernames(page)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        with self.assertRaises(InvalidSearchCursor):
+            UserService.search_users("smith", cursor="not-a-cursor")
+
+    def test_empty_query(self):
+        """Test an empty query finds nobody."""
+        self.assertEqual(UserService.search_users("  ").results, [])
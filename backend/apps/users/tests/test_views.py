@@ -3,11 +3,17 @@
 Tests for user views.
 """
 
+from unittest import mock
+
+import fakeredis
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core import mail
+from core import throttling
+from utils.helpers.search import encode_cursor
 from ..models import Profile
 
 User = get_user_model()
@@ -181,3 +187,161 @@ class ProfileViewTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncAuthViewTests(APITestCase):
+    """Test cases for the async login and registration views."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="async@example.com", username="async", password="testpass123"
+        )
+
+    def test_login(self):
+        """Test async login returns tokens."""
+        response = self.client.post(
+            reverse("async_token"),
+            {"email": "ASYNC@example.com", "password": "testpass123"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.json())
+        self.assertIn("refresh", response.json())
+
+    def test_login_invalid_credentials(self):
+        """Test async login with invalid credentials."""
+        response = self.client.post(
+            reverse("async_token"),
+            {"email": "async@example.com", "password": "wrongpass"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_register(self):
+        """Test async registration creates a user with a usable password."""
+        response = self.client.post(
+            reverse("async_register"),
+            {
+                "email": "new-async@example.com",
+                "username": "newasync",
+                "first_name": "New",
+                "last_name": "Async",
+                "password": "Str0ng-Passw0rd!",
+                "confirm_password": "Str0ng-Passw0rd!",
+                "terms_accepted": True,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("tokens", response.json())
+        user = User.objects.get(email="new-async@example.com")
+        self.assertTrue(user.check_password("Str0ng-Passw0rd!"))
+
+
+@override_settings(
+    THROTTLE_REDIS_URL="redis://throttle-test",
+    THROTTLE_SCOPES={"anon": {"rate": "10/minute", "burst": 1}},
+)
+class AsyncAuthThrottleTests(APITestCase):
+    """Test cases for the anonymous rate throttle of the async auth views."""
+
+    def setUp(self):
+        """Run the throttle against a fresh in-memory Redis."""
+        patcher = mock.patch.object(
+            throttling, "get_redis", return_value=fakeredis.FakeRedis()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        throttling.get_script.cache_clear()
+        self.addCleanup(throttling.get_script.cache_clear)
+        throttling.GCRAThrottle.blocked.clear()
+        self.addCleanup(throttling.GCRAThrottle.blocked.clear)
+
+    def assertThrottled(self, url_name, data):
+        first = self.client.post(reverse(url_name), data, format="json")
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse(url_name), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "6")
+        self.assertIn("throttled", response.json()["detail"])
+
+    def test_login_throttled(self):
+        """Test async login is rejected once the client is over its rate."""
+        self.assertThrottled("async_token", {"email": "not-an-email"})
+
+    def test_register_throttled(self):
+        """Test async registration is rejected once the client is over its rate."""
+        self.assertThrottled("async_register", {"email": "not-an-email"})
+
+
+class UserSearchViewTests(APITestCase):
+    """Test cases for the user search view."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", username="admin", password="testpass123"
+        )
+        User.objects.create_user(
+            email="john.smith@example.com",
+            username="jsmith",
+            password="testpass123",
+            first_name="John",
+            last_name="Smith",
+        )
+        self.url = reverse("user-search")
+
+    def test_search(self):
+        """Test admins can search users."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"q": "smith"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [user["username"] for user in response.data["results"]], ["jsmith"]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_search_query_count(self):
+        """Test result totals are counted in a fixed number of queries."""
+        for index in range(3):
+            User.objects.create_user(
+                email=f"smith{index}@example.com",
+                username=f"smith{index}",
+                password="testpass123",
+            )
+        self.client.force_authenticate(user=self.admin)
+        # Search, then the expense and budget totals
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"q": "smith"})
+
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_search_requires_admin(self):
+        """Test other users cannot search users."""
+        self.client.force_authenticate(user=User.objects.get(username="jsmith"))
+        response = self.client.get(self.url, {"q": "smith"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is a bad request."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"q": "smith", "cursor": "bogus"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_forged_cursor(self):
+        """Test a well-formed cursor with invalid values is a bad request."""
+        self.client.force_authenticate(user=self.admin)
+        for rank, pk in [(1.0, "x"), (1.0, [1]), (1.0, True), (float("nan"), 1)]:
+            with self.subTest(rank=rank, pk=pk):
+                response = self.client.get(
+                    self.url, {"q": "smith", "cursor": encode_cursor(rank, pk)}
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
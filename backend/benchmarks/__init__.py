@@ -0,0 +1,8 @@
+"""
+Standalone performance benchmarks.
+
+Each module is runnable with ``python -m benchmarks.<name>`` from the
+backend directory against the database configured by
+``DJANGO_SETTINGS_MODULE`` (``core.settings.local`` by default). Benchmarks
+create their own data and remove it afterwards.
+"""
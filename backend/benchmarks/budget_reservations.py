@@ -0,0 +1,162 @@
+"""
+Throughput of budget limit enforcement under contention.
+
+Many threads add expenses to the same budget. ``reserve`` uses the
+conditional ledger UPDATE; ``locked-aggregate`` is the naive alternative
+that locks the budget row and sums its expenses before every insert. Both
+only insert the expense; ``write-path`` runs the full
+``ExpenseWriteService`` including the after-commit rollups and alerts.
+
+    python -m benchmarks.budget_reservations --threads 16 --attempts 200
+"""
+
+import argparse
+import os
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from apps.budgets.models import Budget  # noqa: E402
+from apps.budgets.services import BudgetLedgerService  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.services import ExpenseWriteService  # noqa: E402
+from utils.exceptions.custom_exceptions import BudgetLimitExceeded  # noqa: E402
+
+AMOUNT = Decimal("1.00")
+
+
+def _expense_data(budget):
+    return {
+        "user": budget.user,
+        "title": "Benchmark expense",
+        "amount": AMOUNT,
+        "category": budget.category,
+        "date": date.today(),
+        "budget": budget,
+    }
+
+
+def reserve(budget) -> bool:
+    """Create an expense after a conditional ledger reservation."""
+    try:
+        with transaction.atomic():
+            BudgetLedgerService.reserve(budget.pk, AMOUNT)
+            Expense.objects.bulk_create([Expense(**_expense_data(budget))])
+    except BudgetLimitExceeded:
+        return False
+    return True
+
+
+def write_path(budget) -> bool:
+    """Create an expense through ExpenseWriteService."""
+    try:
+        ExpenseWriteService.create(_expense_data(budget))
+    except BudgetLimitExceeded:
+        return False
+    return True
+
+
+def locked_aggregate(budget) -> bool:
+    """Create an expense after locking the budget and summing its expenses."""
+    with transaction.atomic():
+        locked = Budget.objects.select_for_update().get(pk=budget.pk)
+        spent = locked.expenses.aggregate(total=Sum("amount"))["total"] or 0
+        if spent + AMOUNT > locked.amount:
+            return False
+        Expense.objects.bulk_create([Expense(**_expense_data(budget))])
+    return True
+
+
+STRATEGIES = {
+    "reserve": reserve,
+    "locked-aggregate": locked_aggregate,
+    "write-path": write_path,
+}
+
+
+def run(strategy, budget, threads, attempts):
+    """Run one strategy and return (created, rejected, seconds)."""
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        created = rejected = 0
+        try:
+            barrier.wait()
+            for _ in range(attempts):
+                if STRATEGIES[strategy](budget):
+                    created += 1
+                else:
+                    rejected += 1
+        finally:
+            connection.close()
+        results.append((created, rejected))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return sum(r[0] for r in results), sum(r[1] for r in results), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=100, help="Attempts per thread")
+    parser.add_argument(
+        "--limit",
+        type=Decimal,
+        help="Budget amount, defaults to half of all attempts so both paths are hit",
+    )
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action="append")
+    args = parser.parse_args()
+
+    total = args.threads * args.attempts
+    limit = args.limit or AMOUNT * (total // 2)
+    user = get_user_model().objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:12]}", password=uuid.uuid4().hex
+    )
+    try:
+        for strategy in args.strategy or list(STRATEGIES):
+            budget = Budget.objects.create(
+                user=user,
+                name=f"Benchmark {strategy}",
+                amount=limit,
+                category="FOOD",
+                start_date=date.today() - timedelta(days=1),
+                end_date=date.today() + timedelta(days=1),
+            )
+            created, rejected, elapsed = run(
+                strategy, budget, args.threads, args.attempts
+            )
+            spent = (
+                Expense.objects.filter(budget=budget).aggregate(t=Sum("amount"))["t"]
+                or 0
+            )
+            print(
+                f"{strategy:>16}: {total / elapsed:8.0f} writes/sec  "
+                f"created={created} rejected={rejected} "
+                f"spent={spent} limit={limit} "
+                f"{'OK' if spent <= limit else 'OVERSPENT'}"
+            )
+            Expense.objects.filter(user=user).delete()
+            Budget.objects.filter(user=user).delete()
+    finally:
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
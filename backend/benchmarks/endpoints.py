@@ -0,0 +1,613 @@
+"""
+Query count, latency and peak memory of every API route.
+
+Creates a throwaway test database, fills it with ``benchmarks.seed`` and
+requests every route of ``core.urls`` with each method it accepts, as a
+seeded user, or a staff user for admin routes, authenticated by a JWT.
+Every request starts from empty caches and runs in a transaction that is
+rolled back after its on-commit callbacks ran, so writes are measured in
+full but never change the data later requests see. Results are compared
+with ``benchmarks/baseline.json``:
+
+* the query count of a route must not grow,
+* its status code must not change, unless it stops failing,
+* its peak traced memory may grow by ``--memory-tolerance``, or 32 KiB,
+* its p95 latency, which depends on the machine, is only checked when
+  ``--latency-tolerance`` is given.
+
+The exit status is 1 when a route regressed or has no baseline. The schema
+relies on PostgreSQL, so a local PostgreSQL is needed; caches, channel
+layers, Celery and email are switched to in-process backends.
+
+    python -m benchmarks.endpoints --scale small --iterations 20
+    python -m benchmarks.endpoints --route budgets --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.tokens import default_token_generator  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import TestCase, override_settings  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import URLPattern, URLResolver, get_resolver  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from django.utils.encoding import force_bytes  # noqa: E402
+from django.utils.http import urlsafe_base64_encode  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+from apps.analytics.models import BudgetUtilization, SpendingAnalytics  # noqa: E402
+from apps.budgets.models import Budget  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.notifications.models import Notification  # noqa: E402
+from core.authentication import TokenStatusService  # noqa: E402
+from core.celery import app as celery_app  # noqa: E402
+from . import seed as seeding  # noqa: E402
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+
+# Routes that are not part of the API
+IGNORED_PREFIXES = ("admin/", "__debug__/", "media/", "^media/")
+IGNORED_NAMES = {"api-root"}
+
+# Object whose primary key fills ``<pk>``, by route basename
+PK_SOURCES = {
+    "budget": "budget",
+    "expense": "expense",
+    "notification": "notification",
+    "spending-analytics": "spending",
+    "budget-utilization": "utilization",
+}
+
+# Everything external is replaced by an in-process backend
+ISOLATED_SETTINGS = {
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    "CHANNEL_LAYERS": {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    "DEBUG_PROPAGATE_EXCEPTIONS": False,
+    # Repeated requests must not hit rate limits
+    "THROTTLE_REDIS_URL": "",
+}
+
+NEW_PASSWORD = "Benchmark-Pass-2"
+
+# Peak memory growth that is always allowed, small peaks vary by this much
+MEMORY_SLACK_KIB = 32
+
+
+@dataclass(frozen=True)
+class Route:
+    """One method of one URL pattern."""
+
+    name: str
+    pattern: str
+    method: str
+
+    @property
+    def key(self) -> str:
+        """Identifier of the route in results and the baseline."""
+        return f"{self.method.upper()} /{self.pattern}"
+
+
+@dataclass
+class Context:
+    """Seeded objects the requests refer to."""
+
+    user: object
+    objects: Dict[str, int] = field(default_factory=dict)
+    notifications: List[int] = field(default_factory=list)
+    refresh: str = ""
+    uid: str = ""
+    reset_token: str = ""
+    staff_token: str = ""
+
+
+def _readable(pattern: str) -> str:
+    """Turn router regexes into ``<name>`` placeholders."""
+    pattern = re.sub(r"\(\?P<(\w+)>[^)]*\)", r"<\1>", pattern)
+    return pattern.replace("^", "").replace("$", "")
+
+
+def discover_routes(
+    patterns=None, prefix: str = "", seen: Optional[Set[str]] = None
+) -> Iterator[Route]:
+    """
+    Walk the URL configuration and yield every API route and method.
+
+    Format suffix variants, the admin, media and router root views are
+    skipped, as are patterns shadowed by an earlier identical one.
+
+    Args:
+        patterns: URL patterns to walk, defaults to the root configuration
+        prefix: Pattern prefix of ``patterns``
+        seen: Keys of the routes already yielded
+
+    Yields:
+        Route: Each route and method, in URL configuration order
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    if seen is None:
+        seen = set()
+    for entry in patterns:
+        pattern = prefix + str(entry.pattern)
+        if pattern.startswith(IGNORED_PREFIXES):
+            continue
+        if isinstance(entry, URLResolver):
+            yield from discover_routes(entry.url_patterns, pattern, seen)
+            continue
+        if not isinstance(entry, URLPattern) or entry.name in IGNORED_NAMES:
+            continue
+        if "format" in entry.pattern.regex.groupindex:
+            continue
+
+        callback = entry.callback
+        actions = getattr(callback, "actions", None)
+        if actions:
+            methods = list(actions)
+        else:
+            view_class = getattr(callback, "view_class", None) or getattr(
+                callback, "cls", None
+            )
+            methods = [
+                method
+                for method in getattr(view_class, "http_method_names", ["get"])
+                if method not in ("head", "options") and hasattr(view_class, method)
+            ]
+        for method in methods:
+            route = Route(entry.name, _readable(pattern), method)
+            if route.key not in seen:
+                seen.add(route.key)
+                yield route
+
+
+def _expense_data(context: Context) -> Dict:
+    return {
+        "title": "Benchmark expense",
+        "amount": "12.50",
+        "category": Expense.CategoryChoices.FOOD,
+        "date": timezone.now().date().isoformat(),
+        "payment_method": Expense.PaymentMethod.CASH,
+    }
+
+
+def _budget_data(context: Context) -> Dict:
+    # Far enough ahead not to overlap any seeded budget
+    start_date = timezone.now().date() + timedelta(days=400)
+    return {
+        "name": "Benchmark budget",
+        "amount": "500.00",
+        "category": Budget.CategoryChoices.FOOD,
+        "start_date": start_date.isoformat(),
+        "end_date": (start_date + timedelta(days=29)).isoformat(),
+    }
+
+
+def _register(context: Context) -> Dict:
+    return {
+        "anonymous": True,
+        "data": {
+            "username": "benchmark-new",
+            "email": "benchmark-new@example.com",
+            "password": NEW_PASSWORD,
+            "confirm_password": NEW_PASSWORD,
+            "first_name": "New",
+            "last_name": "User",
+            "terms_accepted": True,
+        },
+    }
+
+
+def _login(context: Context) -> Dict:
+    return {
+        "anonymous": True,
+        "data": {"email": context.user.email, "password": seeding.PASSWORD},
+    }
+
+
+def _email(context: Context) -> Dict:
+    return {"anonymous": True, "data": {"email": context.user.email}}
+
+
+def _reset_confirm(context: Context) -> Dict:
+    return {
+        "anonymous": True,
+        "data": {
+            "uid": context.uid,
+            "token": context.reset_token,
+            "password": NEW_PASSWORD,
+            "confirm_password": NEW_PASSWORD,
+        },
+    }
+
+
+def _profile(context: Context) -> Dict:
+    return {"data": {"theme": "DARK", "language": "en"}}
+
+
+def _mark_read(context: Context) -> Dict:
+    return {"data": {"notification_ids": context.notifications, "action": "mark_read"}}
+
+
+def _notification_data(context: Context) -> Dict:
+    return {
+        "data": {
+            "user": context.user.id,
+            "title": "Benchmark",
+            "message": "Benchmark notification.",
+            "notification_type": Notification.NotificationTypes.SYSTEM,
+            "priority": Notification.Priority.LOW,
+        }
+    }
+
+
+def _last_quarter(context: Context) -> Dict:
+    today = timezone.now().date()
+    return {
+        "query": {
+            "start_date": (today - timedelta(days=90)).isoformat(),
+            "end_date": today.isoformat(),
+        }
+    }
+
+
+def _preferences(context: Context) -> Dict:
+    return {"data": {"budget_alerts": False}}
+
+
+# Request details by (route name, method); other routes get a bare request
+SCENARIOS: Dict[Tuple[str, str], Callable[[Context], Dict]] = {
+    ("register", "post"): _register,
+    ("register-user", "post"): _register,
+    ("token_obtain_pair", "post"): _login,
+    ("token", "post"): _login,
+    ("async_register", "post"): _register,
+    ("async_token", "post"): _login,
+    ("token_refresh", "post"): lambda c: {
+        "anonymous": True,
+        "data": {"refresh": c.refresh},
+    },
+    ("reset_password", "post"): _email,
+    ("reset-password", "post"): _email,
+    ("reset_password_confirm", "post"): _reset_confirm,
+    ("reset-password-confirm", "post"): _reset_confirm,
+    ("check-email", "post"): _email,
+    ("user_profile", "put"): _profile,
+    ("user_profile", "patch"): _profile,
+    ("profile-detail", "put"): _profile,
+    ("profile-detail", "patch"): _profile,
+    ("schema", "get"): lambda c: {"anonymous": True},
+    ("swagger-ui", "get"): lambda c: {"anonymous": True},
+    ("redoc", "get"): lambda c: {"anonymous": True},
+    ("user-search", "get"): lambda c: {"staff": True, "query": {"q": "bench user"}},
+    ("budget-list", "post"): lambda c: {"data": {**_budget_data(c), "user": c.user.id}},
+    ("budget-detail", "put"): lambda c: {"data": _budget_data(c)},
+    ("budget-detail", "patch"): lambda c: {"data": {"amount": "750.00"}},
+    ("budget-category", "get"): lambda c: {
+        "query": {"category": Budget.CategoryChoices.FOOD}
+    },
+    ("budget-simulate", "post"): lambda c: {
+        "data": {
+            "expenses": [{"amount": "50.00", "category": Budget.CategoryChoices.FOOD}],
+            "budget_changes": [{"id": c.objects["budget"], "amount": "100.00"}],
+        }
+    },
+    ("expense-list", "post"): lambda c: {"data": _expense_data(c)},
+    ("expense-detail", "put"): lambda c: {"data": _expense_data(c)},
+    ("expense-detail", "patch"): lambda c: {"data": {"amount": "13.00"}},
+    ("expense-create-recurring", "post"): lambda c: {
+        "data": {
+            "start_date": (timezone.now().date() - timedelta(days=6)).isoformat(),
+            "end_date": timezone.now().date().isoformat(),
+            "frequency": "DAILY",
+            "expense_data": _expense_data(c),
+        }
+    },
+    ("expense-attach-to-budget", "post"): lambda c: {
+        "data": {"budget_id": c.objects["budget"]}
+    },
+    ("spending-analytics-distribution", "get"): _last_quarter,
+    ("spending-analytics-by-category", "get"): _last_quarter,
+    ("spending-analytics-by-tag", "get"): lambda c: {
+        "query": {
+            "start_month": (timezone.now() - timedelta(days=90)).strftime("%Y-%m"),
+            "end_month": timezone.now().strftime("%Y-%m"),
+        }
+    },
+    ("spending-trends", "get"): lambda c: {
+        "query": {"category": Expense.CategoryChoices.FOOD}
+    },
+    ("budget-utilization-monthly-summary", "get"): lambda c: {
+        "query": {"month": timezone.now().strftime("%Y-%m")}
+    },
+    ("bulk-action", "post"): _mark_read,
+    ("notification-bulk-action", "post"): _mark_read,
+    ("notification-list", "post"): _notification_data,
+    ("notification-detail", "put"): _notification_data,
+    ("notification-detail", "patch"): lambda c: {"data": {"is_read": True}},
+    ("notification-preferences", "put"): _preferences,
+    ("notification-preferences", "patch"): _preferences,
+}
+
+
+def build_context(user) -> Context:
+    """Collect the seeded objects of the benchmark user."""
+    today = timezone.now().date()
+    context = Context(user=user)
+    context.objects = {
+        "budget": Budget.objects.filter(user=user, category="FOOD")
+        .covering(today)
+        .values_list("id", flat=True)
+        .first(),
+        "expense": Expense.objects.filter(user=user)
+        .order_by("-date", "id")
+        .values_list("id", flat=True)
+        .first(),
+        "notification": Notification.objects.filter(user=user)
+        .values_list("id", flat=True)
+        .first(),
+        "spending": SpendingAnalytics.objects.filter(user=user)
+        .values_list("id", flat=True)
+        .first(),
+        "utilization": BudgetUtilization.objects.filter(user=user)
+        .values_list("id", flat=True)
+        .first(),
+    }
+    context.notifications = list(
+        Notification.objects.filter(user=user).values_list("id", flat=True)[:20]
+    )
+    context.refresh = str(RefreshToken.for_user(user))
+    context.uid = urlsafe_base64_encode(force_bytes(user.pk))
+    context.reset_token = default_token_generator.make_token(user)
+    staff = get_user_model().objects.create_user(
+        username="benchmark-staff",
+        email="benchmark-staff@example.com",
+        password=seeding.PASSWORD,
+        is_staff=True,
+    )
+    context.staff_token = str(RefreshToken.for_user(staff).access_token)
+    return context
+
+
+def build_request(route: Route, context: Context) -> Dict:
+    """Path, payload and credentials of a route's request."""
+    spec = SCENARIOS.get((route.name, route.method), lambda c: {})(context)
+    path = "/" + route.pattern
+    if "<pk>" in path:
+        basename = max(
+            (name for name in PK_SOURCES if route.name.startswith(name + "-")), key=len
+        )
+        source = PK_SOURCES[basename]
+        path = path.replace("<pk>", str(context.objects[source]))
+    return {
+        "path": path,
+        "data": spec.get("query") if route.method == "get" else spec.get("data"),
+        "anonymous": spec.get("anonymous", False),
+        "staff": spec.get("staff", False),
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def measure(route: Route, context: Context, token: str, iterations: int) -> Dict:
+    """
+    Request a route repeatedly and summarize its cost.
+
+    The first request counts queries, the second traces memory and the
+    remaining ``iterations`` are timed without instrumentation.
+
+    Args:
+        route: Route to request
+        context: Seeded objects
+        token: Access token of the benchmark user
+        iterations: Number of timed requests
+
+    Returns:
+        Dict: ``status``, ``queries``, ``p50_ms``, ``p95_ms`` and ``peak_kib``
+    """
+    request = build_request(route, context)
+    client = APIClient()
+    client.raise_request_exception = False
+    if request["staff"]:
+        token = context.staff_token
+    if not request["anonymous"]:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def send():
+        cache.clear()
+        TokenStatusService.status_cache.clear()
+        with transaction.atomic():
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                response = getattr(client, route.method)(
+                    request["path"], request["data"], format="json"
+                )
+            transaction.set_rollback(True)
+        return response
+
+    with CaptureQueriesContext(connection) as queries:
+        response = send()
+    # Later requests reset the query log the capture slices
+    query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        send()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        send()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "status": response.status_code,
+        "queries": query_count,
+        "p50_ms": round(_percentile(timings, 0.5), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    memory_tolerance: float,
+    latency_tolerance: Optional[float],
+) -> Dict[str, List[str]]:
+    """
+    Find regressions of each route against its baseline.
+
+    Args:
+        results: Measurements by route key
+        baseline: Baseline measurements by route key
+        memory_tolerance: Allowed relative growth of peak memory, at least
+            ``MEMORY_SLACK_KIB``
+        latency_tolerance: Allowed relative growth of p95 latency, if checked
+
+    Returns:
+        Dict[str, List[str]]: Problems by route key, for routes that have any
+    """
+    problems: Dict[str, List[str]] = {}
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            problems[key] = ["no baseline"]
+            continue
+        found = []
+        if result["queries"] > expected["queries"]:
+            found.append(f"queries {expected['queries']} -> {result['queries']}")
+        if result["status"] != expected["status"] and not (
+            expected["status"] >= 500 and result["status"] < 500
+        ):
+            found.append(f"status {expected['status']} -> {result['status']}")
+        allowed_kib = max(expected["peak_kib"] * memory_tolerance, MEMORY_SLACK_KIB)
+        if result["peak_kib"] > expected["peak_kib"] + allowed_kib:
+            found.append(f"peak {expected['peak_kib']} -> {result['peak_kib']} KiB")
+        if latency_tolerance is not None and result["p95_ms"] > expected["p95_ms"] * (
+            1 + latency_tolerance
+        ):
+            found.append(f"p95 {expected['p95_ms']} -> {result['p95_ms']} ms")
+        if found:
+            problems[key] = found
+    return problems
+
+
+def run(routes: List[Route], scale: seeding.Scale, seed: int, iterations: int):
+    """Seed a test database and measure every route, yielding results."""
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        users = seeding.seed(scale, seed)
+        user = users[0]
+        context = build_context(user)
+        token = str(RefreshToken.for_user(user).access_token)
+        for route in routes:
+            yield route, measure(route, context, token, iterations)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(seeding.SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--route", help="Only routes whose key contains this text")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline instead of comparing",
+    )
+    parser.add_argument("--memory-tolerance", type=float, default=0.25)
+    parser.add_argument("--latency-tolerance", type=float)
+    args = parser.parse_args()
+
+    baseline = {"scale": args.scale, "seed": args.seed, "routes": {}}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    if not args.update_baseline and (baseline["scale"], baseline["seed"]) != (
+        args.scale,
+        args.seed,
+    ):
+        parser.error(
+            f"The baseline was recorded with --scale {baseline['scale']} "
+            f"--seed {baseline['seed']}"
+        )
+
+    routes = [
+        route
+        for route in discover_routes()
+        if not args.route or args.route in route.key
+    ]
+    # Failing routes are reported in the table, not as logged tracebacks
+    logging.disable(logging.CRITICAL)
+    setup_test_environment(debug=False)
+    celery_app.conf.task_always_eager = True
+    results = {}
+    try:
+        with override_settings(**ISOLATED_SETTINGS):
+            print(
+                f"{'route':<64} {'status':>6} {'queries':>7} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'peak KiB':>9}"
+            )
+            for route, result in run(
+                routes, seeding.SCALES[args.scale], args.seed, args.iterations
+            ):
+                results[route.key] = result
+                print(
+                    f"{route.key:<64} {result['status']:>6} {result['queries']:>7} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                    f"{result['peak_kib']:>9.1f}"
+                )
+    finally:
+        teardown_test_environment()
+
+    if args.update_baseline:
+        if (baseline["scale"], baseline["seed"]) != (args.scale, args.seed):
+            baseline = {"scale": args.scale, "seed": args.seed, "routes": {}}
+        baseline["routes"].update(results)
+        baseline["routes"] = dict(sorted(baseline["routes"].items()))
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Wrote {len(results)} routes to {args.baseline}")
+        return
+
+    problems = compare(
+        results, baseline["routes"], args.memory_tolerance, args.latency_tolerance
+    )
+    for key, found in problems.items():
+        print(f"REGRESSION {key}: {', '.join(found)}")
+    if problems:
+        raise SystemExit(1)
+    print(f"{len(results)} routes within the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Expense search latency with full-text search versus ``icontains``.
+
+Seeds ``--expenses`` expenses, ``--per-user`` to a user, with titles,
+notes, locations and tags drawn from everyday words, then times a few
+queries two ways:
+
+* ``user``: one user's matching expenses, best first, as
+  ``GET /api/v1/expenses/?q=`` returns them,
+* ``admin``: the newest 100 matches over every user, as the admin lists
+  them.
+
+``fulltext`` is ``ExpenseService.search_expenses`` on the GIN-indexed
+``search_vector``; ``icontains`` ORs substring filters on the same fields,
+which the admin's ``search_fields`` did. Run it at two sizes to see the
+full-text latency stay flat while the table grows.
+
+Seeded expenses are kept for the next run; ``--clean`` deletes them.
+
+    python -m benchmarks.expense_search --expenses 1000000 --iterations 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.services import ExpenseService  # noqa: E402
+from apps.users.models import User  # noqa: E402
+
+PREFIX = "bench-expense-search"
+BATCH_SIZE = 10000
+ADMIN_PAGE = 100
+
+TITLES = [
+    "Coffee", "Lunch", "Dinner", "Groceries", "Taxi", "Train ticket", "Bus fare",
+    "Rent", "Electricity bill", "Water bill", "Internet", "Phone plan", "Gym",
+    "Cinema", "Concert tickets", "Books", "Pharmacy", "Doctor visit", "Fuel",
+    "Parking", "Flight", "Hotel", "Gift", "Haircut", "Shoes", "Laundry",
+]  # fmt: skip
+NOTES = [
+    "", "", "", "with the team", "birthday dinner", "monthly payment",
+    "paid in cash", "split with friends", "airport transfer", "weekly shopping",
+    "client meeting", "school supplies", "repair of the kitchen sink",
+]  # fmt: skip
+LOCATIONS = [
+    "", "Nairobi", "Mombasa", "Kisumu", "London", "Berlin", "Tokyo", "Market",
+    "Central station", "Airport", "Mall", "Corner shop", "Supermarket",
+]  # fmt: skip
+TAGS = ["work", "family", "travel", "health", "fun", "home", "kids", "urgent"]
+
+QUERIES = [
+    "coffee",  # common title
+    "kitchen sink",  # rare note
+    "airport",  # location and notes
+    "travel",  # tag
+    "concert tick",  # prefix of the last word
+]
+
+
+def seed(count, per_user, rng):
+    """Create the benchmark users and expenses that are missing."""
+    users = list(User.objects.filter(username__startswith=PREFIX).order_by("pk"))
+    password = make_password(None)
+    for index in range(len(users), -(-count // per_user)):
+        users.append(
+            User.objects.create(
+                username=f"{PREFIX}-{index}",
+                email=f"{PREFIX}-{index}@example.com",
+                password=password,
+            )
+        )
+
+    existing = Expense.objects.filter(user__username__startswith=PREFIX).count()
+    today = timezone.now().date()
+    for start in range(existing, count, BATCH_SIZE):
+        expenses = []
+        for number in range(start, min(start + BATCH_SIZE, count)):
+            expenses.append(
+                Expense(
+                    user=users[number // per_user],
+                    title=rng.choice(TITLES),
+                    amount=Decimal(rng.randint(100, 20000)) / 100,
+                    category=rng.choice(Expense.CategoryChoices.values),
+                    date=today - timedelta(days=rng.randrange(730)),
+                    notes=rng.choice(NOTES),
+                    location=rng.choice(LOCATIONS),
+                    tags=rng.sample(TAGS, rng.randint(0, 2)),
+                )
+            )
+        Expense.objects.bulk_create(expenses)
+        print(f"seeded {min(start + BATCH_SIZE, count)}/{count} expenses", end="\r")
+    if existing < count:
+        print()
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Expense._meta.db_table}")
+    return users
+
+
+def fulltext(queryset, query, limit):
+    if limit is None:
+        return list(ExpenseService.search_expenses(queryset, query))
+    return list(queryset.filter(ExpenseService.SEARCH.matches(query))[:limit])
+
+
+def icontains(queryset, query, limit):
+    for word in query.split():
+        queryset = queryset.filter(
+            Q(title__icontains=word)
+            | Q(notes__icontains=word)
+            | Q(location__icontains=word)
+        )
+    return list(queryset[:limit])
+
+
+STRATEGIES = {"fulltext": fulltext, "icontains": icontains}
+
+
+def timed(strategy, queryset, query, limit, iterations):
+    """Median seconds of a search and the number of rows it returned."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        rows = STRATEGIES[strategy](queryset, query, limit)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--expenses", type=int, default=1_000_000)
+    parser.add_argument("--per-user", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--query", action="append", help="Defaults to QUERIES")
+    parser.add_argument("--clean", action="store_true", help="Delete seeded data")
+    args = parser.parse_args()
+
+    if args.clean:
+        # Bypasses the per-row budget ledger signals, there are no budgets
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Expense._meta.db_table} WHERE user_id IN "
+                f"(SELECT id FROM {User._meta.db_table} WHERE username LIKE %s)",
+                [f"{PREFIX}-%"],
+            )
+        User.objects.filter(username__startswith=PREFIX).delete()
+        return
+
+    users = seed(args.expenses, args.per_user, random.Random(args.seed))
+    user_expenses = Expense.objects.filter(user=users[0])
+    scopes = [
+        ("user", user_expenses, None),
+        ("admin", Expense.objects.all(), ADMIN_PAGE),
+    ]
+    total = Expense.objects.count()
+    print(f"{total} expenses, {user_expenses.count()} of the searching user")
+    print(f"{'query':>14}  {'scope':>5}  {'fulltext':>16}  {'icontains':>16}")
+    for query in args.query or QUERIES:
+        for scope, queryset, limit in scopes:
+            cells = []
+            for strategy in STRATEGIES:
+                seconds, rows = timed(strategy, queryset, query, limit, args.iterations)
+                cells.append(f"{seconds * 1000:7.1f} ms {rows:>5}")
+            print(f"{query:>14}  {scope:>5}  {cells[0]:>16}  {cells[1]:>16}")
+
+
+if __name__ == "__main__":
+    main()
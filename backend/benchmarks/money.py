@@ -0,0 +1,132 @@
+"""
+Decimal versus integer minor unit arithmetic for batch money work.
+
+Sums amounts, flags budgets over a threshold and computes utilization
+percentages over many rows, as the rollups, alerts and forecasts do.
+``decimal`` is per-row Decimal arithmetic on rows read as Decimal. ``int``
+works on rows read as integer minor units with ``money.minor_units``.
+``numpy`` is the vectorized path, only run when NumPy is installed. The
+``utilization`` results are Decimals, so building them is included. Every
+strategy must produce identical results.
+
+    python -m benchmarks.money --rows 200000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from utils.helpers import money
+
+HUNDREDTH = Decimal("0.01")
+THRESHOLD = Decimal("80.00")
+
+
+def decimal_sum(amounts, limits):
+    """Total with Decimal arithmetic."""
+    total = Decimal("0")
+    for amount in amounts:
+        total += amount
+    return total
+
+
+def int_sum(units, limit_units):
+    """Total on integer minor units."""
+    return money.from_minor(sum(units))
+
+
+def decimal_threshold(amounts, limits):
+    """Budgets at or over the threshold, with Decimal arithmetic."""
+    return [
+        (amount / limit * 100).quantize(HUNDREDTH) >= THRESHOLD
+        for amount, limit in zip(amounts, limits)
+    ]
+
+
+def int_threshold(units, limit_units):
+    """Budgets at or over the threshold, on integer basis points."""
+    threshold = money.to_minor(THRESHOLD)
+    return [
+        money.basis_points(part, whole) >= threshold
+        for part, whole in zip(units, limit_units)
+    ]
+
+
+def numpy_threshold(units, limit_units):
+    """Budgets at or over the threshold, on NumPy int64 arrays."""
+    threshold = money.to_minor(THRESHOLD)
+    return [
+        points >= threshold for points in money.basis_points_many(units, limit_units)
+    ]
+
+
+def decimal_utilization(amounts, limits):
+    """Utilization percentages with Decimal arithmetic."""
+    return [
+        (amount / limit * 100).quantize(HUNDREDTH)
+        for amount, limit in zip(amounts, limits)
+    ]
+
+
+def numpy_utilization(units, limit_units):
+    """Utilization percentages from NumPy basis points."""
+    return [
+        money.percentage_from_basis_points(points)
+        for points in money.basis_points_many(units, limit_units)
+    ]
+
+
+OPERATIONS = {
+    "sum": {"decimal": decimal_sum, "int": int_sum},
+    "threshold": {
+        "decimal": decimal_threshold,
+        "int": int_threshold,
+        "numpy": numpy_threshold,
+    },
+    "utilization": {"decimal": decimal_utilization, "numpy": numpy_utilization},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5, help="Best of N runs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    units = [rng.randint(0, 500000) for _ in range(args.rows)]
+    limit_units = [rng.randint(1, 400000) for _ in range(args.rows)]
+    inputs = {
+        "decimal": (
+            [money.from_minor(value) for value in units],
+            [money.from_minor(value) for value in limit_units],
+        ),
+        "int": (units, limit_units),
+        "numpy": (units, limit_units),
+    }
+
+    for operation, strategies in OPERATIONS.items():
+        expected = baseline = None
+        for strategy, function in strategies.items():
+            if strategy == "numpy" and money.np is None:
+                print(f"{operation:>11} {strategy:>8}: skipped, NumPy is not installed")
+                continue
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = function(*inputs[strategy])
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            expected = expected if expected is not None else result
+            baseline = baseline or best
+            print(
+                f"{operation:>11} {strategy:>8}: {args.rows / best:12.0f} rows/sec  "
+                f"{best * 1000:8.1f} ms  x{baseline / best:5.2f}  "
+                f"{'OK' if result == expected else 'MISMATCH'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Login latency under a burst, with inline versus pooled password hashing.
+
+``--burst`` logins arrive at once on one event loop, as on an ASGI worker.
+``inline`` checks each password on the loop, which is what a synchronous
+view costs; ``pool`` awaits ``HashingPool`` with ``--workers`` processes
+and at most ``--max-queue`` waiting hashes, and rejects the rest at once.
+A ticker measures how long the loop was kept from serving anything else.
+
+    python -m benchmarks.password_hashing --burst 64 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from utils.helpers import password_hashing  # noqa: E402
+from utils.helpers.password_hashing import HashingPool, HashingQueueFull  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+async def ticker(interval, lags, done):
+    """Record how late every tick of the loop is."""
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def inline_login(encoded, pool):
+    return password_hashing.check_password(PASSWORD, encoded)[0]
+
+
+async def pool_login(encoded, pool):
+    future = pool.submit(password_hashing.check_password, PASSWORD, encoded)
+    return (await asyncio.wrap_future(future))[0]
+
+
+STRATEGIES = {"inline": inline_login, "pool": pool_login}
+
+
+async def burst(login, encoded, pool, size):
+    """
+    Start ``size`` logins at once.
+
+    Returns:
+        Tuple[List[float], int, List[float]]: Seconds until each accepted
+        login finished, logins rejected, and event loop lags
+    """
+    lags, done = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(0.005, lags, done))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+
+    async def timed():
+        try:
+            assert await login(encoded, pool)
+        except HashingQueueFull:
+            return None
+        return time.perf_counter() - started
+
+    results = await asyncio.gather(*(timed() for _ in range(size)))
+    done.set()
+    await tick
+    latencies = sorted(result for result in results if result is not None)
+    return latencies, results.count(None), lags
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst", type=int, default=64, help="Concurrent logins")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action="append")
+    args = parser.parse_args()
+
+    encoded = password_hashing.hash_password(PASSWORD)
+    pool = HashingPool(args.workers, args.max_queue, settings.PASSWORD_HASHERS)
+    try:
+        # Spawn every worker before measuring
+        for future in [
+            pool.submit(password_hashing.hash_password, PASSWORD)
+            for _ in range(args.workers)
+        ]:
+            future.result()
+
+        for strategy in args.strategy or list(STRATEGIES):
+            latencies, rejected, lags = asyncio.run(
+                burst(STRATEGIES[strategy], encoded, pool, args.burst)
+            )
+            print(
+                f"{strategy:>6}: accepted={len(latencies):<4} rejected={rejected:<4} "
+                f"p50 {percentile(latencies, 0.5) * 1000:8.1f} ms  "
+                f"p99 {percentile(latencies, 0.99) * 1000:8.1f} ms  "
+                f"max loop lag {max(lags, default=0) * 1000:8.1f} ms"
+            )
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Synthetic users, budgets, expenses and notifications for benchmarks.
+
+Rows are bulk inserted, then the budget matches, budget ledger and
+analytics rollups are brought up to date the way the write path would
+leave them. A given scale and seed always produce the same data, apart
+from primary keys and timestamps.
+
+    python -m benchmarks.seed --scale medium --seed 1
+"""
+
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from typing import List
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from apps.analytics.services.rollup_service import RollupService  # noqa: E402
+from apps.budgets.models import Budget  # noqa: E402
+from apps.budgets.services import BudgetLedgerService, BudgetMatchService  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.notifications.models import Notification  # noqa: E402
+from utils.helpers.calendar_helpers import (  # noqa: E402
+    ordinal_bounds,
+    period_ordinal,
+)
+
+User = get_user_model()
+
+PASSWORD = "benchmark-password"
+
+# Days of expense history before today
+HISTORY_DAYS = 365
+
+TITLES = ("Groceries", "Lunch", "Fuel", "Rent", "Cinema", "Pharmacy", "Course")
+LOCATIONS = ("Nairobi", "Berlin", "London", "New York", "Tokyo", "")
+TAGS = ("work", "family", "travel", "subscription", "gift")
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Number of rows created per benchmark user."""
+
+    users: int
+    budgets: int
+    expenses: int
+    notifications: int
+
+
+SCALES = {
+    "small": Scale(users=5, budgets=4, expenses=200, notifications=20),
+    "medium": Scale(users=20, budgets=8, expenses=1000, notifications=100),
+    "large": Scale(users=50, budgets=12, expenses=5000, notifications=500),
+}
+
+
+def _budgets(user, count, rng, today):
+    """Monthly budgets cycling through categories, newest month first."""
+    categories = Budget.CategoryChoices.values
+    month = period_ordinal(today, "month")
+    budgets = []
+    for index in range(count):
+        start_date, end_date = ordinal_bounds(month - index // len(categories), "month")
+        budgets.append(
+            Budget(
+                user=user,
+                name=f"Budget {index + 1}",
+                amount=Decimal(rng.randint(200, 2000)),
+                category=categories[index % len(categories)],
+                start_date=start_date,
+                end_date=end_date,
+                recurrence="MONTHLY",
+            )
+        )
+    return budgets
+
+
+def _expenses(user, count, rng, today):
+    """Expenses spread over the last year, a few of them recurring."""
+    expenses = []
+    for _ in range(count):
+        recurring = rng.random() < 0.05
+        expenses.append(
+            Expense(
+                user=user,
+                title=rng.choice(TITLES),
+                amount=Decimal(rng.randint(100, 25000)).scaleb(-2),
+                category=rng.choice(Expense.CategoryChoices.values),
+                date=today - timedelta(days=rng.randrange(HISTORY_DAYS)),
+                payment_method=rng.choice(Expense.PaymentMethod.values),
+                location=rng.choice(LOCATIONS),
+                tags=rng.sample(TAGS, rng.randint(0, 2)),
+                is_recurring=recurring,
+                metadata=(
+                    {"recurrence_type": rng.choice(("MONTHLY", "YEARLY"))}
+                    if recurring
+                    else {}
+                ),
+            )
+        )
+    return expenses
+
+
+def _notifications(user, count, rng):
+    """Notifications of every type, about half of them read."""
+    now = timezone.now()
+    notifications = []
+    for index in range(count):
+        is_read = rng.random() < 0.5
+        notifications.append(
+            Notification(
+                user=user,
+                title=f"Notification {index + 1}",
+                message="Synthetic benchmark notification.",
+                notification_type=rng.choice(Notification.NotificationTypes.values),
+                priority=rng.choice(Notification.Priority.values),
+                is_read=is_read,
+                read_at=now if is_read else None,
+            )
+        )
+    return notifications
+
+
+def seed(scale: Scale, seed: int = 0, prefix: str = "bench") -> List:
+    """
+    Create benchmark users and their data.
+
+    Args:
+        scale: Rows to create per user
+        seed: Random seed
+        prefix: Username prefix, must not be in use
+
+    Returns:
+        List: The created users, whose password is ``PASSWORD``
+    """
+    rng = random.Random(seed)
+    today = timezone.now().date()
+    password = make_password(PASSWORD)
+
+    with transaction.atomic():
+        users = []
+        for index in range(scale.users):
+            # Saved one by one so profiles and preferences are created
+            user = User(
+                username=f"{prefix}{index}",
+                email=f"{prefix}{index}@example.com",
+                password=password,
+                first_name="Bench",
+                last_name=f"User {index}",
+            )
+            user.save()
+            users.append(user)
+
+        budgets, expenses, notifications = [], [], []
+        for user in users:
+            budgets += _budgets(user, scale.budgets, rng, today)
+            expenses += _expenses(user, scale.expenses, rng, today)
+            notifications += _notifications(user, scale.notifications, rng)
+        Budget.objects.bulk_create(budgets, batch_size=1000)
+        Expense.objects.bulk_create(expenses, batch_size=1000)
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+
+        user_ids = [user.id for user in users]
+        BudgetMatchService.backfill(Expense.objects.filter(user_id__in=user_ids))
+        BudgetLedgerService.recalculate(Budget.objects.filter(user_id__in=user_ids))
+        RollupService.rebuild_shard(
+            f"{prefix}-seed", min(user_ids, default=0), max(user_ids, default=0)
+        )
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefix", default="bench", help="Username prefix")
+    args = parser.parse_args()
+
+    users = seed(SCALES[args.scale], args.seed, args.prefix)
+    scale = SCALES[args.scale]
+    print(
+        f"Seeded {len(users)} users with {scale.budgets} budgets, "
+        f"{scale.expenses} expenses and {scale.notifications} notifications each. "
+        f"Password: {PASSWORD}"
+    )
+
+
+if __name__ == "__main__":
+    main()
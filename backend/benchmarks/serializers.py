@@ -0,0 +1,199 @@
+"""
+List serialization throughput of DRF list serializers versus read serializers.
+
+Seeds one user with ``--rows`` expenses, budgets and notifications, then
+serializes a page of each, as ``GET /api/v1/<app>/`` lists them, two ways:
+
+* ``drf``: the model instances with the DRF list serializer, which the
+  list views used,
+* ``read``: the ``values()`` rows with the read serializer, which the
+  list views use now.
+
+``serialize`` times only the serialization of rows already fetched;
+``fetch+serialize`` also times reading them from the database. Both
+strategies must produce identical output.
+
+Seeded rows are kept for the next run; ``--clean`` deletes them.
+
+    python -m benchmarks.serializers --rows 10000 --iterations 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from apps.budgets.models import Budget  # noqa: E402
+from apps.budgets.serializers import (  # noqa: E402
+    BudgetListReadSerializer,
+    BudgetListSerializer,
+)
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.serializers import (  # noqa: E402
+    ExpenseListReadSerializer,
+    ExpenseListSerializer,
+)
+from apps.notifications.models import Notification  # noqa: E402
+from apps.notifications.serializers import (  # noqa: E402
+    NotificationListReadSerializer,
+    NotificationListSerializer,
+)
+from apps.users.models import User  # noqa: E402
+
+PREFIX = "bench-serializers"
+BATCH_SIZE = 10000
+
+
+def seed(rows, rng):
+    """Create the benchmark user and the rows that are missing."""
+    user, _ = User.objects.get_or_create(
+        username=PREFIX,
+        defaults={"email": f"{PREFIX}@example.com", "password": make_password(None)},
+    )
+    today = timezone.now().date()
+    now = timezone.now()
+
+    def expense(number):
+        return Expense(
+            user=user,
+            title=f"Expense {number}",
+            amount=Decimal(rng.randint(100, 20000)) / 100,
+            category=rng.choice(Expense.CategoryChoices.values),
+            date=today - timedelta(days=rng.randrange(90)),
+            is_recurring=rng.random() < 0.1,
+        )
+
+    def budget(number):
+        # Inactive, so that periods of the same category may overlap
+        start_date = today - timedelta(days=rng.randrange(365))
+        amount = rng.randint(10000, 200000)
+        return Budget(
+            user=user,
+            name=f"Budget {number}",
+            amount=Decimal(amount) / 100,
+            spent_amount=Decimal(rng.randint(0, amount * 3 // 2)) / 100,
+            category=rng.choice(Budget.CategoryChoices.values),
+            start_date=start_date,
+            end_date=start_date + timedelta(days=30),
+            is_active=False,
+        )
+
+    def notification(number):
+        return Notification(
+            user=user,
+            title=f"Notification {number}",
+            message="Benchmark notification",
+            notification_type=rng.choice(Notification.NotificationTypes.values),
+            priority=rng.choice(Notification.Priority.values),
+            is_read=rng.random() < 0.5,
+            expires_at=now + timedelta(hours=rng.randint(-48, 48)),
+        )
+
+    for model, build in [
+        (Expense, expense),
+        (Budget, budget),
+        (Notification, notification),
+    ]:
+        existing = model.objects.filter(user=user).count()
+        for start in range(existing, rows, BATCH_SIZE):
+            model.objects.bulk_create(
+                build(number) for number in range(start, min(start + BATCH_SIZE, rows))
+            )
+        if existing < rows:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+    return user
+
+
+def timed(function, iterations):
+    """Median seconds of ``function`` and what it returned."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--clean", action="store_true", help="Delete seeded data")
+    args = parser.parse_args()
+
+    if args.clean:
+        # Bypasses the per-row ledger and rollup signals of expenses
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Expense._meta.db_table} WHERE user_id IN "
+                f"(SELECT id FROM {User._meta.db_table} WHERE username = %s)",
+                [PREFIX],
+            )
+        User.objects.filter(username=PREFIX).delete()
+        return
+
+    user = seed(args.rows, random.Random(args.seed))
+    lists = [
+        (
+            "expenses",
+            Expense.objects.filter(user=user)[: args.rows],
+            ExpenseListSerializer,
+            ExpenseListReadSerializer(),
+        ),
+        (
+            "budgets",
+            Budget.objects.filter(user=user)[: args.rows],
+            BudgetListSerializer,
+            BudgetListReadSerializer(),
+        ),
+        (
+            "notifications",
+            Notification.objects.filter(user=user).order_by("-created_at")[: args.rows],
+            NotificationListSerializer,
+            NotificationListReadSerializer(),
+        ),
+    ]
+
+    print(f"{args.rows} rows a page, rows/s")
+    print(f"{'list':>14}  {'step':>15}  {'drf':>10}  {'read':>10}  {'speedup':>7}")
+    for name, queryset, serializer_class, read_serializer in lists:
+        instances = list(queryset)
+        rows = list(read_serializer.rows(queryset))
+        steps = [
+            (
+                "serialize",
+                lambda: serializer_class(instances, many=True).data,
+                lambda: read_serializer.serialize(rows),
+            ),
+            (
+                "fetch+serialize",
+                lambda: serializer_class(queryset.all(), many=True).data,
+                lambda: read_serializer.serialize(read_serializer.rows(queryset)),
+            ),
+        ]
+        for step, drf, read in steps:
+            drf_seconds, drf_data = timed(drf, args.iterations)
+            read_seconds, read_data = timed(read, args.iterations)
+            assert drf_data == read_data, f"{name} read serializer output differs"
+            print(
+                f"{name:>14}  {step:>15}  {len(rows) / drf_seconds:>10,.0f}  "
+                f"{len(rows) / read_seconds:>10,.0f}  "
+                f"{drf_seconds / read_seconds:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Tag filter and per-tag totals latency, indexed and rolled up versus scans.
+
+Reuses the expenses seeded by ``benchmarks.expense_search``, each with up
+to two tags, and rebuilds their ``TagSpending`` rollup (``bulk_create``
+skips the signals that maintain it). Then it times:
+
+* ``filter``: counting every user's expenses with any or all of two tags,
+  as ``?tags=...&tags_match=...`` filters them, with the ``jsonb_path_ops``
+  GIN index (``indexed``) and with index scans disabled (``scan``),
+* ``totals``: twelve months of per-tag totals, as ``spending/by_tag/``
+  returns them, from the monthly rollup (``indexed``) and by unnesting
+  the expenses (``scan``), for one user and for every seeded user.
+
+    python -m benchmarks.tag_analytics --expenses 1000000 --iterations 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from apps.analytics.models import TagSpending  # noqa: E402
+from apps.analytics.services import AnalyticsService, RollupService  # noqa: E402
+from apps.expenses.models import Expense  # noqa: E402
+from apps.expenses.services import ExpenseService  # noqa: E402
+from benchmarks.expense_search import PREFIX, seed  # noqa: E402
+
+TAGS = ["travel", "work"]
+
+UNNEST_TOTALS = f"""
+    SELECT tag, SUM(amount), COUNT(*)
+    FROM {Expense._meta.db_table}
+    CROSS JOIN LATERAL (
+        SELECT DISTINCT jsonb_array_elements_text(tags) AS tag
+    ) AS expense_tags
+    WHERE user_id BETWEEN %s AND %s AND date BETWEEN %s AND %s
+    GROUP BY tag
+    ORDER BY 2 DESC, tag
+"""
+
+
+def without_index_scans(function):
+    """Run ``function`` with index and bitmap scans disabled."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        return function()
+
+
+def filter_count(match_all, indexed):
+    def count():
+        return ExpenseService.filter_by_tags(
+            Expense.objects.all(), TAGS, match_all
+        ).count()
+
+    return count() if indexed else without_index_scans(count)
+
+
+def totals(users, start_date, end_date, indexed):
+    low, high = users[0].pk, users[-1].pk
+    if indexed:
+        if low == high:
+            return AnalyticsService.get_tag_spending(low, start_date, end_date)
+        return list(
+            TagSpending.objects.filter(
+                user_id__gte=low,
+                user_id__lte=high,
+                month__range=(start_date, end_date),
+            )
+            .values("tag")
+            .annotate(total=Sum("total_amount"), count=Sum("transaction_count"))
+            .order_by("-total", "tag")
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(UNNEST_TOTALS, [low, high, start_date, end_date])
+        return cursor.fetchall()
+
+
+def timed(function, iterations):
+    """Median seconds of ``function`` and what it returned."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--expenses", type=int, default=1_000_000)
+    parser.add_argument("--per-user", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    users = seed(args.expenses, args.per_user, random.Random(args.seed))
+    started = time.perf_counter()
+    with transaction.atomic():
+        tag_rows = RollupService.rebuild_tag_spending(users[0].pk, users[-1].pk)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {TagSpending._meta.db_table}")
+    print(
+        f"rebuilt {tag_rows} tag rows for {len(users)} {PREFIX} users "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+
+    today = timezone.now().date()
+    year = ((today - timedelta(days=335)).replace(day=1), today)
+    cases = [
+        (f"filter any {','.join(TAGS)}", lambda i: filter_count(False, i)),
+        (f"filter all {','.join(TAGS)}", lambda i: filter_count(True, i)),
+        ("totals one user", lambda i: totals(users[:1], *year, i)),
+        ("totals all users", lambda i: totals(users, *year, i)),
+    ]
+    print(f"{Expense.objects.count()} expenses")
+    print(f"{'case':>22}  {'indexed':>10}  {'scan':>10}")
+    for name, run in cases:
+        indexed, _ = timed(lambda: run(True), args.iterations)
+        scan, _ = timed(lambda: run(False), args.iterations)
+        print(f"{name:>22}  {indexed * 1000:7.1f} ms  {scan * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Cost and accuracy of timestamp list throttling versus GCRA on Redis.
+
+``history`` is DRF's ``SimpleRateThrottle``, which the throttles used to
+be, keeping each client's request timestamps in the Django cache.
+``gcra`` is ``core.throttling.GCRAThrottle``. Both allow ``--limit``
+requests an hour and run against the Redis at ``--redis-url``:
+
+* ``allowed``: one client sends ``--limit`` requests, so its timestamp
+  list grows to the limit,
+* ``blocked``: the same client, now over its limit, keeps sending,
+* ``contended``: ``--threads`` threads send twice the limit for a new
+  client at once, and requests admitted beyond the limit are reported.
+
+    python -m benchmarks.throttling --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from rest_framework.throttling import SimpleRateThrottle  # noqa: E402
+from core import throttling  # noqa: E402
+
+SCOPE = "benchmark"
+
+
+class HistoryThrottle(SimpleRateThrottle):
+    """Timestamp list throttle, with ``rate`` set by ``main``."""
+
+    scope = SCOPE
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
+
+
+class BenchmarkGCRAThrottle(throttling.GCRAThrottle):
+    """GCRA throttle of the benchmark scope."""
+
+    scope = SCOPE
+
+
+STRATEGIES = {"history": HistoryThrottle, "gcra": BenchmarkGCRAThrottle}
+
+
+def _request(client_id):
+    request = RequestFactory().get("/")
+    request.user = SimpleNamespace(pk=client_id, is_authenticated=True)
+    return request
+
+
+def check(throttle_class, request, count):
+    """
+    Send requests one after another.
+
+    Returns:
+        Tuple[int, List[float]]: Requests allowed, and seconds per check
+    """
+    allowed, timings = 0, []
+    for _ in range(count):
+        started = time.perf_counter()
+        allowed += throttle_class().allow_request(request, None)
+        timings.append(time.perf_counter() - started)
+    return allowed, timings
+
+
+def contend(throttle_class, request, threads, count):
+    """
+    Send requests from several threads at once.
+
+    Returns:
+        Tuple[int, float]: Requests allowed, and seconds taken
+    """
+    allowed = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        allowed.append(check(throttle_class, request, count // threads)[0])
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(allowed), time.perf_counter() - started
+
+
+def report(phase, strategy, count, allowed, elapsed, timings=None):
+    p95 = ""
+    if timings:
+        p95 = f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1e6:8.1f} us  "
+    print(
+        f"{phase:>9} {strategy:>8}: {count / elapsed:10.0f} checks/sec  "
+        f"{p95}allowed={allowed}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--limit", type=int, default=1000, help="Requests per hour")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action="append")
+    args = parser.parse_args()
+
+    HistoryThrottle.rate = f"{args.limit}/hour"
+    isolated = override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": args.redis_url,
+            }
+        },
+        THROTTLE_REDIS_URL=args.redis_url,
+        THROTTLE_SCOPES={SCOPE: {"rate": f"{args.limit}/hour", "burst": args.limit}},
+    )
+    redis = throttling.get_redis(args.redis_url)
+    client_ids = iter(range(time.time_ns(), time.time_ns() + 10**6))
+
+    with isolated:
+        for strategy in args.strategy or list(STRATEGIES):
+            throttle_class = STRATEGIES[strategy]
+            request = _request(next(client_ids))
+            keys = [throttle_class().get_cache_key(request, None)]
+
+            allowed, timings = check(throttle_class, request, args.limit)
+            report("allowed", strategy, args.limit, allowed, sum(timings), timings)
+            allowed, timings = check(throttle_class, request, args.limit)
+            report("blocked", strategy, args.limit, allowed, sum(timings), timings)
+
+            request = _request(next(client_ids))
+            keys.append(throttle_class().get_cache_key(request, None))
+            sent = args.limit * 2 // args.threads * args.threads
+            allowed, elapsed = contend(throttle_class, request, args.threads, sent)
+            report("contended", strategy, sent, allowed, elapsed)
+            print(
+                f"{'':>18}  limit={args.limit} "
+                f"{'OK' if allowed <= args.limit else 'OVER-ADMITTED'}"
+            )
+
+            cache.delete_many(keys)
+            redis.delete(*keys)
+            throttling.GCRAThrottle.blocked.clear()
+
+
+if __name__ == "__main__":
+    main()
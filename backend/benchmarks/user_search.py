@@ -0,0 +1,156 @@
+"""
+User search latency with and without the trigram indexes.
+
+Seeds ``--users`` users, a million by default, named from common first
+and last names, then times ``UserService.search_users`` for a few typical
+admin queries. ``indexed`` is the search as deployed; ``unindexed`` runs
+the same query with index scans disabled, which is what the ``icontains``
+search cost before the indexes; ``deep`` fetches the tenth page from its
+cursor.
+
+Seeded users are kept for the next run; ``--clean`` deletes them.
+
+    python -m benchmarks.user_search --users 1000000 --iterations 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from math import nan
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.local")
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from apps.users.models import User  # noqa: E402
+from apps.users.services import UserService  # noqa: E402
+
+PREFIX = "bench-search"
+BATCH_SIZE = 10000
+DEEP_PAGES = 10
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+    "Linda", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan",
+    "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Wanjiru",
+    "Kamau", "Akinyi", "Otieno", "Aisha", "Mohamed", "Yuki", "Hiroshi",
+    "Olga", "Dmitri", "Lucia", "Mateo", "Chloe", "Lukas", "Amara", "Kofi",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson",
+    "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee",
+    "Mwangi", "Ochieng", "Njoroge", "Kariuki", "Tanaka", "Suzuki", "Ivanova",
+    "Petrov", "Rossi", "Fernandez", "Dubois", "Schmidt", "Mensah", "Okafor",
+]  # fmt: skip
+DOMAINS = ["example.com", "mail.example.org", "corp.example.net"]
+
+QUERIES = [
+    "wanjiru",  # common first name
+    "okafor",  # common last name
+    "jsmith",  # username fragment
+    "joh",  # short prefix
+    "mary tanaka",  # first and last name
+    "user4242",  # rare fragment
+    "@corp.example",  # email domain
+]
+
+
+def seed(count, rng):
+    """Create the benchmark users that are missing."""
+    existing = User.objects.filter(username__startswith=PREFIX).count()
+    password = make_password(None)
+    for start in range(existing, count, BATCH_SIZE):
+        users = []
+        for number in range(start, min(start + BATCH_SIZE, count)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            handle = f"{first[0]}{last}{number}".lower()
+            users.append(
+                User(
+                    username=f"{PREFIX}-{handle}",
+                    email=f"{handle}.user{number}@{rng.choice(DOMAINS)}",
+                    first_name=first,
+                    last_name=last,
+                    password=password,
+                )
+            )
+        User.objects.bulk_create(users)
+        print(f"seeded {min(start + BATCH_SIZE, count)}/{count} users", end="\r")
+    if existing < count:
+        print()
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+
+
+def search(query, indexed, cursor=None):
+    """Fetch one page of results."""
+    with transaction.atomic():
+        if not indexed:
+            with connection.cursor() as db:
+                db.execute("SET LOCAL enable_indexscan = off")
+                db.execute("SET LOCAL enable_bitmapscan = off")
+        return UserService.search_users(query, cursor=cursor)
+
+
+def deep_cursor(query, pages):
+    """Cursor of the page ``pages`` pages in, None if there are fewer."""
+    cursor = None
+    for _ in range(pages - 1):
+        cursor = search(query, True, cursor).next_cursor
+        if cursor is None:
+            break
+    return cursor
+
+
+def timed(query, indexed, cursor, iterations):
+    """Median seconds of ``search`` and the number of rows it returned."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        page = search(query, indexed, cursor)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(page.results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--query", action="append", help="Defaults to QUERIES")
+    parser.add_argument("--skip-unindexed", action="store_true")
+    parser.add_argument("--clean", action="store_true", help="Delete seeded users")
+    args = parser.parse_args()
+
+    if args.clean:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {User._meta.db_table} WHERE username LIKE %s",
+                [f"{PREFIX}-%"],
+            )
+        return
+
+    seed(args.users, random.Random(args.seed))
+    print(f"{'query':>16}  {'indexed':>10}  {'deep':>10}  {'unindexed':>10}  rows")
+    for query in args.query or QUERIES:
+        indexed, rows = timed(query, True, None, args.iterations)
+        cursor = deep_cursor(query, DEEP_PAGES)
+        deep = timed(query, True, cursor, args.iterations)[0] if cursor else nan
+        unindexed = (
+            nan
+            if args.skip_unindexed
+            else timed(query, False, None, args.iterations)[0]
+        )
+        print(
+            f"{query:>16}  {indexed * 1000:7.1f} ms  {deep * 1000:7.1f} ms  "
+            f"{unindexed * 1000:7.1f} ms  {rows}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+JWT authentication that trusts verified token claims.
+
+``JWTAuthentication`` loads the user row on every authenticated request.
+``ClaimsJWTAuthentication`` instead builds the user from the token's user
+ID, with every other field deferred and loaded together on first access,
+and checks the user's active and revocation status in a per-process TTL
+cache. Deactivating a user or revoking their tokens evicts the status in
+every process through Redis pub/sub, and the TTL bounds staleness when a
+message is missed.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from core.cache_config import CacheService
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:token-revocations"
+
+# Seconds to wait before reconnecting a dropped revocation subscription
+RECONNECT_DELAY = 5
+
+
+class UserStatus(NamedTuple):
+    """Authentication status of a user."""
+
+    is_active: bool
+    # Tokens issued in or before this UNIX second are revoked, 0 for none
+    valid_after: int = 0
+
+
+class UserStatusCache:
+    """
+    Thread-safe in-process cache of user statuses with a fixed TTL.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, Optional[UserStatus]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[UserStatus]]:
+        """
+        Look up a user's status.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple[bool, Optional[UserStatus]]: Whether the status was cached,
+            and the status, None for users that do not exist
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def set(self, user_id: int, status: Optional[UserStatus]) -> None:
+        """Cache a user's status for the TTL."""
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, status)
+
+    def evict(self, user_id: int) -> None:
+        """Forget a user's status."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Forget every status."""
+        with self._lock:
+            self._entries.clear()
+
+
+class RevocationListener:
+    """
+    Background subscription evicting revoked users from the status cache.
+    """
+
+    def __init__(self, url: str, status_cache: UserStatusCache):
+        self.url = url
+        self.status_cache = status_cache
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        """Start the subscription thread unless it is running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="token-revocations", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                pubsub = redis.Redis.from_url(self.url).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(REVOCATION_CHANNEL)
+                # Revocations published while disconnected were missed
+                self.status_cache.clear()
+                for message in pubsub.listen():
+                    self.status_cache.evict(int(message["data"]))
+            except Exception as e:
+                logger.warning(f"Token revocation subscription failed: {e}")
+                self.status_cache.clear()
+                time.sleep(RECONNECT_DELAY)
+
+
+class TokenStatusService:
+    """
+    Service class for users' token status.
+
+    Whether a user is active comes from the database. Revocation times are
+    kept in the shared cache for an access token lifetime, after which
+    every token issued before them has expired anyway.
+    """
+
+    status_cache = UserStatusCache(settings.JWT_STATUS_CACHE_TTL)
+    listener = (
+        RevocationListener(settings.JWT_REVOCATION_REDIS_URL, status_cache)
+        if settings.JWT_REVOCATION_REDIS_URL
+        else None
+    )
+
+    @staticmethod
+    def get_status(user_id: int) -> Optional[UserStatus]:
+        """
+        Get a user's status, from the process cache when fresh.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Optional[UserStatus]: The status, None if the user does not exist
+        """
+        if TokenStatusService.listener is not None:
+            TokenStatusService.listener.ensure_started()
+        cached, status = TokenStatusService.status_cache.get(user_id)
+        if cached:
+            return status
+
+        is_active = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list("is_active", flat=True)
+            .first()
+        )
+        if is_active is not None:
+            valid_after = cache.get(
+                CacheService.get_cache_key("token_revocation", user_id), 0
+            )
+            status = UserStatus(is_active, valid_after)
+        TokenStatusService.status_cache.set(user_id, status)
+        return status
+
+    @staticmethod
+    def revoke_tokens(user_id: int) -> None:
+        """
+        Revoke every token issued to a user until now.
+
+        Token ``iat`` claims are whole seconds, so every token issued in the
+        current second is revoked, including any issued just after this
+        call: clients sign in again a second later.
+
+        Args:
+            user_id: User ID
+        """
+        cache.set(
+            CacheService.get_cache_key("token_revocation", user_id),
+            int(time.time()),
+            int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+        )
+        TokenStatusService.publish(user_id)
+
+    @staticmethod
+    def publish(user_id: int) -> None:
+        """
+        Evict a user's status in every process once the transaction commits.
+
+        Args:
+            user_id: User ID
+        """
+
+        def evict():
+            TokenStatusService.status_cache.evict(user_id)
+            if not settings.JWT_REVOCATION_REDIS_URL:
+                return
+            try:
+                redis.Redis.from_url(settings.JWT_REVOCATION_REDIS_URL).publish(
+                    REVOCATION_CHANNEL, user_id
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to publish token revocation: {e}")
+
+        transaction.on_commit(evict)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from the token instead of a query.
+
+    The returned user has only its primary key loaded. Reading any other
+    field loads all of them in one query, so requests that only need the
+    user's ID never read the user row.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        User = get_user_model()
+        user_id = User._meta.pk.to_python(user_id)
+        status = TokenStatusService.get_status(user_id)
+        if status is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not status.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if status.valid_after and validated_token.get("iat", 0) <= status.valid_after:
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        return User.from_db(
+            router.db_for_read(User),
+            [User._meta.pk.attname, "is_active"],
+            [user_id, status.is_active],
+        )
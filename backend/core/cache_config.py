@@ -1,6 +1,7 @@
 from django.core.cache import cache
 from django.conf import settings
 from datetime import timedelta
+import time
 
 # Cache key prefixes for different types of data
 CACHE_KEYS = {
@@ -9,6 +10,11 @@ CACHE_KEYS = {
     'expense': 'expense_{}',
     'analytics': 'analytics_{}_{}',  # user_id, metric_type
     'categories': 'categories_{}_{}',  # user_id, category_type
+    'data_version': 'data_version_{}',  # user_id
+    'budget_intervals': 'budget_intervals_{}',  # user_id
+    'exchange_rates': 'exchange_rates_{}',  # ISO date
+    'user_context': 'user_context_{}',  # user_id
+    'token_revocation': 'token_revocation_{}',  # user_id
 }
 
 # Cache timeout settings (in seconds)
@@ -18,6 +24,10 @@ CACHE_TIMEOUTS = {
     'expense': 60 * 15,  # 15 minutes
     'analytics': 60 * 60,  # 1 hour
     'categories': 60 * 60 * 24,  # 24 hours
+    'data_version': None,  # never expires
+    'budget_intervals': 60 * 60,  # 1 hour, dropped on budget writes
+    'exchange_rates': 60 * 60,  # 1 hour, dropped when rates are loaded
+    'user_context': 60 * 30,  # 30 minutes, dropped on profile and preference writes
 }
 
 class CacheService:
@@ -36,8 +46,33 @@ class CacheService:
         """Remove a key from cache"""
         cache.delete(key)
 
+    @staticmethod
+    def invalidate_many(keys):
+        """Remove several known keys from cache in one round trip"""
+        cache.delete_many(list(keys))
+
     @staticmethod
     def bulk_invalidate(pattern: str):
         """Remove multiple keys matching a pattern"""
         keys = cache.keys(f"*{pattern}*")
         cache.delete_many(keys)
+
+    @staticmethod
+    def get_data_version(user_id: int) -> int:
+        """Get the version of a user's financial data, used to key derived results"""
+        key = CacheService.get_cache_key('data_version', user_id)
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so a lost key never reuses an old version
+            cache.add(key, time.time_ns() // 1000, CACHE_TIMEOUTS['data_version'])
+            version = cache.get(key)
+        return version or 0
+
+    @staticmethod
+    def bump_data_version(user_id: int) -> None:
+        """Invalidate every result keyed by the user's current data version"""
+        key = CacheService.get_cache_key('data_version', user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns() // 1000, CACHE_TIMEOUTS['data_version'])
@@ -33,6 +33,14 @@ app.conf.beat_schedule = {
         'task': 'apps.shared_expenses.tasks.clean_cancelled_expenses',
         'schedule': crontab(hour=0, minute=0),  # Run daily at midnight
     },
+    'rollover-recurring-budgets': {
+        'task': 'apps.budgets.tasks.rollover_recurring_budgets',
+        'schedule': crontab(hour=0, minute=15),  # Run nightly after midnight
+    },
+    'load-exchange-rates': {
+        'task': 'apps.currencies.tasks.load_exchange_rates',
+        'schedule': crontab(hour=0, minute=5),  # Run daily after midnight
+    },
 }
 
 @app.task(bind=True, ignore_result=True)
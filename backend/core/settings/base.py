@@ -29,6 +29,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -51,6 +52,7 @@ LOCAL_APPS = [
     "apps.expenses",
     "apps.analytics",
     "apps.notifications",  # Add notifications app
+    "apps.currencies",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -118,6 +120,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Processes hashing passwords off the request thread, 0 to hash inline
+PASSWORD_HASHING_WORKERS = config("PASSWORD_HASHING_WORKERS", default=2, cast=int)
+# Hashes that may wait for a worker before sign-ins are turned away
+PASSWORD_HASHING_MAX_QUEUE = config("PASSWORD_HASHING_MAX_QUEUE", default=32, cast=int)
+# Rehash correct passwords on login when "outdated", on a "hasher" change, or "never"
+PASSWORD_HASH_UPGRADE = config("PASSWORD_HASH_UPGRADE", default="outdated")
+
 # Internationalization
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -142,20 +151,32 @@ AUTH_USER_MODEL = "users.User"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "core.throttling.CustomAnonRateThrottle",
+        "core.throttling.CustomUserRateThrottle",
+        "core.throttling.BurstRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {
-        "anon": "100/day",
-        "user": "1000/day"
-    }
+}
+
+# Redis keeping rate limit and login lockout state. When empty, throttling
+# is off and login lockouts are counted in the default cache.
+THROTTLE_REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+# Let logins through while the lockout Redis is down, instead of refusing them
+LOGIN_LOCKOUT_FAIL_OPEN = config("LOGIN_LOCKOUT_FAIL_OPEN", default=True, cast=bool)
+# Sustained rate and requests allowed at once of each throttle scope
+THROTTLE_SCOPES = {
+    "anon": {"rate": "100/day", "burst": 100},
+    "user": {"rate": "1000/day", "burst": 1000},
+    "burst": {"rate": "60/minute", "burst": 20},
+    "analytics": {"rate": "300/hour", "burst": 30},
+    "expenses": {"rate": "120/minute", "burst": 30},
+    "sharing": {"rate": "30/minute", "burst": 5},
 }
 
 # Spectacular API Settings
@@ -182,6 +203,11 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Seconds a process trusts a user's cached active and revocation status
+JWT_STATUS_CACHE_TTL = config("JWT_STATUS_CACHE_TTL", default=5, cast=int)
+# Redis publishing token revocations to every process, empty to rely on the TTL
+JWT_REVOCATION_REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = config(
     "CORS_ALLOWED_ORIGINS",
@@ -245,6 +271,17 @@ CACHES = {
 # Cache time to live is 15 minutes
 CACHE_TTL = 60 * 15
 
+# Exchange rates, loaded daily into the rate table by this provider
+EXCHANGE_RATE_PROVIDER = config(
+    "EXCHANGE_RATE_PROVIDER", default="apps.currencies.providers.FileRateProvider"
+)
+EXCHANGE_RATES_FILE = config(
+    "EXCHANGE_RATES_FILE",
+    default=str(BASE_DIR / "apps" / "currencies" / "data" / "exchange_rates.json"),
+)
+EXCHANGE_RATES_URL = config("EXCHANGE_RATES_URL", default="")
+EXCHANGE_RATES_TIMEOUT = config("EXCHANGE_RATES_TIMEOUT", default=5, cast=float)
+
 # Session Configuration
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
@@ -101,6 +101,9 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 # Disable password validation in development
 AUTH_PASSWORD_VALIDATORS = []
 
+# Hash passwords inline in development, runserver reloads would respawn workers
+PASSWORD_HASHING_WORKERS = config("PASSWORD_HASHING_WORKERS", default=0, cast=int)
+
 # Celery Configuration
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = config(
@@ -108,6 +111,13 @@ CELERY_RESULT_BACKEND = config(
 )
 CELERY_TASK_ALWAYS_EAGER = True  # Tasks are executed immediately in development
 
+# Token revocations only reach other processes when REDIS_URL is set
+JWT_REVOCATION_REDIS_URL = config("REDIS_URL", default="")
+
+# Throttling is off locally unless REDIS_URL is set, and login lockouts are
+# counted in the cache instead
+THROTTLE_REDIS_URL = config("REDIS_URL", default="")
+
 # Cache settings
 CACHES = {
     "default": {
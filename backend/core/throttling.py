@@ -1,28 +1,248 @@
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
-from django.core.cache import cache
+"""
+Rate limiting with the generic cell rate algorithm (GCRA) on Redis.
 
-class CustomAnonRateThrottle(AnonRateThrottle):
-    rate = '100/day'
+DRF's ``SimpleRateThrottle`` keeps a list of request timestamps per client
+in the cache and reads, trims and writes it back on every request, which
+is O(n) in the rate and lets concurrent workers overwrite each other's
+updates. ``GCRAThrottle`` keeps a single "theoretical arrival time" per
+client and updates it with a Lua script, so every check is one atomic
+Redis round trip of constant size. Clients that are rejected are also
+remembered in-process until they may send again, and further requests
+from them are rejected without touching Redis.
 
-class CustomUserRateThrottle(UserRateThrottle):
-    rate = '1000/day'
+Each scope is configured in ``settings.THROTTLE_SCOPES`` with a sustained
+``rate`` such as ``"60/minute"`` and a ``burst`` of requests that may
+arrive at once. Throttling is disabled when ``settings.THROTTLE_REDIS_URL``
+is empty, and fails open while Redis is unreachable.
+"""
 
-class BurstRateThrottle(UserRateThrottle):
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for Redis before letting the request through
+REDIS_TIMEOUT = 0.25
+
+# Blocked clients remembered per process before expired entries are pruned
+MAX_BLOCKED_CLIENTS = 10000
+
+# KEYS[1]: theoretical arrival time of the client's next request, in ms
+# ARGV[1]: emission interval, ms between requests at the sustained rate
+# ARGV[2]: burst, requests allowed at once
+# Returns {1, 0} when allowed, {0, ms until the next request is allowed}
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - interval * burst
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call("SET", KEYS[1], string.format("%d", new_tat), "PX", new_tat - now)
+return {1, 0}
+"""
+
+DURATIONS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a rate such as ``"60/minute"``.
+
+    Args:
+        rate: Number of requests per second, minute, hour or day
+
+    Returns:
+        Tuple[int, int]: Number of requests and duration in seconds
+    """
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+@lru_cache(maxsize=None)
+def get_redis(url: str) -> redis.Redis:
+    """Shared Redis client of a URL."""
+    return redis.Redis.from_url(
+        url, socket_timeout=REDIS_TIMEOUT, socket_connect_timeout=REDIS_TIMEOUT
+    )
+
+
+@lru_cache(maxsize=None)
+def get_script(url: str):
+    """GCRA script registered on the client of a URL, run by its SHA."""
+    return get_redis(url).register_script(GCRA_SCRIPT)
+
+
+class BlockedClients:
+    """
+    Thread-safe in-process record of clients rejected until a deadline.
+    """
+
+    def __init__(self, max_size: int = MAX_BLOCKED_CLIENTS):
+        self.max_size = max_size
+        self._deadlines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, key: str) -> float:
+        """
+        Seconds until a client may send again.
+
+        Args:
+            key: Client throttle key
+
+        Returns:
+            float: Remaining wait, 0 if the client is not blocked
+        """
+        deadline = self._deadlines.get(key)
+        if deadline is None:
+            return 0
+        return max(deadline - time.monotonic(), 0)
+
+    def block(self, key: str, seconds: float) -> None:
+        """Reject a client for the given number of seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._deadlines) >= self.max_size:
+                self._deadlines = {
+                    k: deadline
+                    for k, deadline in self._deadlines.items()
+                    if deadline > now
+                }
+            self._deadlines[key] = now + seconds
+
+    def clear(self) -> None:
+        """Forget every blocked client."""
+        with self._lock:
+            self._deadlines.clear()
+
+
+class GCRAThrottle(BaseThrottle):
+    """
+    Throttle a scope's clients with GCRA on Redis.
+
+    Authenticated requests are limited per user and anonymous ones per IP
+    address.
+    """
+
+    scope: Optional[str] = None
+    blocked = BlockedClients()
+
+    def __init__(self):
+        self._wait = None
+
+    def get_scope_config(self) -> Tuple[int, int]:
+        """
+        Emission interval and burst of the throttle's scope.
+
+        Returns:
+            Tuple[int, int]: Milliseconds between requests at the sustained
+            rate, and requests allowed at once
+        """
+        try:
+            config = settings.THROTTLE_SCOPES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No throttle configuration for scope '{self.scope}'"
+            )
+        num_requests, duration = parse_rate(config["rate"])
+        return (
+            max(duration * 1000 // num_requests, 1),
+            config.get("burst", num_requests),
+        )
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        """
+        Redis key of the client, None to not throttle the request.
+        """
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return f"throttle:{self.scope}:{ident}"
+
+    def allow_request(self, request, view) -> bool:
+        url = settings.THROTTLE_REDIS_URL
+        key = self.get_cache_key(request, view)
+        if not url or key is None:
+            return True
+
+        wait = self.blocked.wait(key)
+        if wait:
+            self._wait = wait
+            return False
+
+        interval, burst = self.get_scope_config()
+        try:
+            allowed, wait_ms = get_script(url)(keys=[key], args=[interval, burst])
+        except redis.RedisError as e:
+            logger.warning(f"Throttle check for scope '{self.scope}' failed: {e}")
+            return True
+        if allowed:
+            return True
+
+        self._wait = wait_ms / 1000
+        self.blocked.block(key, self._wait)
+        return False
+
+    def wait(self) -> Optional[float]:
+        return self._wait
+
+
+class CustomAnonRateThrottle(GCRAThrottle):
+    """Throttle for anonymous requests, per IP address"""
+
+    scope = "anon"
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        if request.user and request.user.is_authenticated:
+            return None
+        return super().get_cache_key(request, view)
+
+
+class CustomUserRateThrottle(GCRAThrottle):
+    """Throttle for authenticated requests, per user"""
+
+    scope = "user"
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return super().get_cache_key(request, view)
+
+
+class BurstRateThrottle(GCRAThrottle):
     """Throttle for burst requests (e.g., real-time updates)"""
-    scope = 'burst'
-    rate = '60/minute'
 
-class AnalyticsRateThrottle(UserRateThrottle):
+    scope = "burst"
+
+
+class AnalyticsRateThrottle(GCRAThrottle):
     """Specific throttle for analytics endpoints"""
-    scope = 'analytics'
-    rate = '300/hour'
 
-class ExpenseRateThrottle(UserRateThrottle):
+    scope = "analytics"
+
+
+class ExpenseRateThrottle(GCRAThrottle):
     """Specific throttle for expense-related endpoints"""
-    scope = 'expenses'
-    rate = '120/minute'
 
-class SharingRateThrottle(UserRateThrottle):
+    scope = "expenses"
+
+
+class SharingRateThrottle(GCRAThrottle):
     """Specific throttle for sharing-related endpoints"""
-    scope = 'sharing'
-    rate = '30/minute'
+
+    scope = "sharing"
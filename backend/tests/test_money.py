@@ -0,0 +1,92 @@
+"""
+Tests for the integer minor unit money helpers.
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+from apps.expenses.models import Expense
+from utils.helpers import money
+
+User = get_user_model()
+
+
+def _random_amount(rng):
+    return Decimal(rng.randint(-(10**6), 10**10)).scaleb(-2)
+
+
+class MoneyHelperTests(SimpleTestCase):
+    """Test cases for the money helpers."""
+
+    def test_minor_units_round_trip(self):
+        """Test amounts survive conversion to and from minor units."""
+        rng = random.Random(39)
+        for _ in range(1000):
+            amount = _random_amount(rng)
+            self.assertEqual(money.from_minor(money.to_minor(amount)), amount)
+        self.assertEqual(money.to_minor(Decimal("0.125")), 12)
+        self.assertEqual(money.to_minor(Decimal("0.135")), 14)
+        self.assertEqual(money.to_minor(Decimal("-0.125")), -12)
+        self.assertEqual(money.to_minor(Decimal("7"), places=0), 7)
+
+    def test_percentage_matches_decimal_rounding(self):
+        """Test percentages equal the Decimal quantize they replace."""
+        rng = random.Random(39)
+        pairs = [(Decimal("1.00"), Decimal("8.00")), (Decimal("0.01"), Decimal("1.60"))]
+        pairs += [
+            (_random_amount(rng), abs(_random_amount(rng)) + Decimal("0.01"))
+            for _ in range(5000)
+        ]
+        for part, whole in pairs:
+            expected = (part / whole * 100).quantize(Decimal("0.01"))
+            result = money.percentage(money.to_minor(part), money.to_minor(whole))
+            self.assertEqual(result, expected)
+            self.assertEqual(result.as_tuple().exponent, -2)
+        self.assertEqual(money.percentage(5, 0), Decimal("0.00"))
+
+    def test_batch_basis_points_with_and_without_numpy(self):
+        """Test vectorized and plain integer basis points agree."""
+        rng = random.Random(39)
+        parts = [money.to_minor(_random_amount(rng)) for _ in range(1000)]
+        wholes = [money.to_minor(abs(_random_amount(rng))) for _ in range(1000)]
+        wholes[::100] = [0] * 10
+        expected = [money.basis_points(p, w) for p, w in zip(parts, wholes)]
+
+        self.assertEqual(money.basis_points_many(parts, wholes), expected)
+        with mock.patch.object(money, "np", None):
+            self.assertEqual(money.basis_points_many(parts, wholes), expected)
+        self.assertEqual(
+            money.percentage_from_basis_points(expected[1]),
+            money.percentage(parts[1], wholes[1]),
+        )
+
+
+class MinorUnitsExpressionTests(TestCase):
+    """Test cases for reading amounts as minor units in SQL."""
+
+    def test_minor_units_reads_integers(self):
+        """Test columns and aggregates are read as exact integer minor units."""
+        user = User.objects.create_user(
+            username="moneyuser", email="money@example.com", password="testpass123"
+        )
+        for amount in ("0.01", "19.99", "1234.50"):
+            Expense.objects.create(
+                user=user,
+                title="Item",
+                amount=Decimal(amount),
+                category="FOOD",
+                date=date(2024, 1, 10),
+            )
+
+        expenses = Expense.objects.filter(user=user)
+        self.assertEqual(
+            sorted(expenses.values_list(money.minor_units("amount"), flat=True)),
+            [1, 1999, 123450],
+        )
+        self.assertEqual(
+            expenses.aggregate(total=money.minor_units(Sum("amount")))["total"], 125450
+        )
@@ -0,0 +1,126 @@
+"""
+Tests for the GCRA throttles.
+"""
+
+from unittest import mock
+
+import fakeredis
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from core import throttling
+from core.throttling import (
+    BurstRateThrottle,
+    CustomAnonRateThrottle,
+    CustomUserRateThrottle,
+)
+
+
+class StubUser:
+    """Authenticated user with just a primary key."""
+
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+@override_settings(
+    THROTTLE_REDIS_URL="redis://throttle-test",
+    THROTTLE_SCOPES={
+        "anon": {"rate": "10/minute", "burst": 2},
+        "user": {"rate": "10/minute", "burst": 2},
+        "burst": {"rate": "60/minute", "burst": 3},
+    },
+)
+class GCRAThrottleTests(SimpleTestCase):
+    """Test cases for GCRAThrottle."""
+
+    def setUp(self):
+        """Run every throttle against a fresh in-memory Redis."""
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(throttling, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        throttling.get_script.cache_clear()
+        self.addCleanup(throttling.get_script.cache_clear)
+        throttling.GCRAThrottle.blocked.clear()
+        self.addCleanup(throttling.GCRAThrottle.blocked.clear)
+
+    def request(self, user=None):
+        request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        request.user = user or AnonymousUser()
+        return request
+
+    def check(self, throttle_class, request):
+        throttle = throttle_class()
+        return throttle.allow_request(request, None), throttle.wait()
+
+    def test_burst_then_rejected(self):
+        """Test the burst is allowed at once and the next request waits."""
+        request = self.request(StubUser(1))
+        for _ in range(3):
+            self.assertEqual(self.check(BurstRateThrottle, request), (True, None))
+
+        allowed, wait = self.check(BurstRateThrottle, request)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1)
+
+    def test_blocked_client_rejected_without_redis(self):
+        """Test a rejected client is rejected in-process until it may retry."""
+        request = self.request(StubUser(1))
+        for _ in range(4):
+            self.check(BurstRateThrottle, request)
+
+        with mock.patch.object(throttling, "get_script") as get_script:
+            allowed, wait = self.check(BurstRateThrottle, request)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        get_script.assert_not_called()
+
+    def test_clients_and_scopes_are_independent(self):
+        """Test each user and scope has its own limit."""
+        first, second = self.request(StubUser(1)), self.request(StubUser(2))
+        for _ in range(2):
+            self.assertTrue(self.check(CustomUserRateThrottle, first)[0])
+        self.assertFalse(self.check(CustomUserRateThrottle, first)[0])
+
+        self.assertTrue(self.check(CustomUserRateThrottle, second)[0])
+        self.assertTrue(self.check(BurstRateThrottle, first)[0])
+
+    def test_anonymous_and_authenticated_throttles(self):
+        """Test anonymous requests are limited per IP, users only per user."""
+        anonymous, user = self.request(), self.request(StubUser(1))
+        for _ in range(2):
+            self.assertTrue(self.check(CustomAnonRateThrottle, anonymous)[0])
+        self.assertFalse(self.check(CustomAnonRateThrottle, anonymous)[0])
+
+        self.assertTrue(self.check(CustomAnonRateThrottle, user)[0])
+        self.assertTrue(self.check(CustomUserRateThrottle, anonymous)[0])
+        self.assertEqual(self.redis.keys("throttle:user:*"), [])
+
+    def test_key_expires_with_the_limit(self):
+        """Test the client's state expires once it is back to a full burst."""
+        self.check(BurstRateThrottle, self.request(StubUser(1)))
+        ttl = self.redis.pttl("throttle:burst:1")
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(ttl, 1000)
+
+    def test_fails_open_when_redis_is_down(self):
+        """Test requests are allowed while Redis is unreachable."""
+        server = fakeredis.FakeServer()
+        server.connected = False
+        request = self.request(StubUser(1))
+        with mock.patch.object(
+            throttling, "get_redis", return_value=fakeredis.FakeRedis(server=server)
+        ), self.assertLogs("core.throttling", "WARNING"):
+            for _ in range(5):
+                self.assertTrue(self.check(BurstRateThrottle, request)[0])
+
+    @override_settings(THROTTLE_REDIS_URL="")
+    def test_disabled_without_redis_url(self):
+        """Test throttling is off when no Redis is configured."""
+        request = self.request(StubUser(1))
+        for _ in range(5):
+            self.assertTrue(self.check(BurstRateThrottle, request)[0])
+        self.assertEqual(self.redis.keys("*"), [])
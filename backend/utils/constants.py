@@ -5,8 +5,10 @@ Constants used throughout the application.
 from django.utils.translation import gettext_lazy as _
 
 # User related constants
-MAX_LOGIN_ATTEMPTS = 5
-LOGIN_COOLDOWN_MINUTES = 15
+MAX_LOGIN_ATTEMPTS = 5  # failed logins per account before it is locked out
+MAX_LOGIN_ATTEMPTS_PER_IP = 20
+LOGIN_LOCKOUT_SECONDS = 30  # first lockout, doubled with every further failure
+LOGIN_COOLDOWN_MINUTES = 15  # longest lockout, and how long failures are counted
 PASSWORD_RESET_TIMEOUT_DAYS = 1
 EMAIL_VERIFICATION_TIMEOUT_DAYS = 3
 
@@ -34,12 +36,17 @@ EXPENSE_CATEGORIES = [
     ("DEBT", _("Debt Payments")),
     ("OTHER", _("Other")),
 ]
+MAX_TAG_LENGTH = 50
 
 # Analytics related constants
 MAX_FORECAST_MONTHS = 12
 TREND_ANALYSIS_DEFAULT_MONTHS = 6
 INSIGHT_GENERATION_THRESHOLD = 30  # minimum days of data needed
 
+# Search related constants
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
 # Notification related constants
 NOTIFICATION_TYPES = [
     ("BUDGET_ALERT", _("Budget Alert")),
@@ -64,4 +64,16 @@ class InvalidAnalyticsPeriod(APIException):
 class NotificationDeliveryFailed(APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_detail = _("Failed to deliver notification")
-    default_code = "notification_delivery_failed"
\ No newline at end of file
+    default_code = "notification_delivery_failed"
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many sign-ins in progress, please try again shortly")
+    default_code = "password_hashing_busy"
+
+
+class InvalidSearchCursor(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = _("Invalid search cursor")
+    default_code = "invalid_search_cursor"
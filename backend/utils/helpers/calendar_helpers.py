@@ -0,0 +1,325 @@
+"""
+Calendar helper functions.
+
+Period arithmetic shared by budgets, expenses and analytics. Every day in
+``CALENDAR_START``..``CALENDAR_END`` is precomputed once into flat arrays
+indexed by day number, so bucketing a date into its week, month, quarter or
+year is an array lookup and recurrences expand without per-step date math.
+"""
+
+import calendar
+from array import array
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+CALENDAR_START = date(2000, 1, 1)
+CALENDAR_END = date(2099, 12, 31)
+
+PERIODS = ("day", "week", "month", "quarter", "year")
+
+# Recurrence choices used by budgets and expenses, mapped to periods
+RECURRENCE_PERIODS = {
+    "DAILY": "day",
+    "WEEKLY": "week",
+    "MONTHLY": "month",
+    "QUARTERLY": "quarter",
+    "YEARLY": "year",
+}
+
+_BASE = CALENDAR_START.toordinal()
+_MONDAY_BASE = _BASE - CALENDAR_START.weekday()
+
+
+class _CalendarTable:
+    """Column arrays describing every day in the calendar range."""
+
+    def __init__(self, start: date, end: date):
+        size = end.toordinal() - start.toordinal() + 1
+        self.size = size
+        self.year = array("H", bytes(2 * size))
+        self.month = array("B", bytes(size))
+        self.day = array("B", bytes(size))
+        self.weekday = array("B", bytes(size))
+        self.iso_year = array("H", bytes(2 * size))
+        self.iso_week = array("B", bytes(size))
+        self.days_in_month = array("B", bytes(size))
+        self.week_ordinal = array("l", bytes(array("l").itemsize * size))
+        self.month_ordinal = array("l", bytes(array("l").itemsize * size))
+
+        current = start
+        one_day = timedelta(days=1)
+        for index in range(size):
+            iso_year, iso_week, iso_weekday = current.isocalendar()
+            self.year[index] = current.year
+            self.month[index] = current.month
+            self.day[index] = current.day
+            self.weekday[index] = iso_weekday - 1
+            self.iso_year[index] = iso_year
+            self.iso_week[index] = iso_week
+            self.week_ordinal[index] = (current.toordinal() - _MONDAY_BASE) // 7
+            self.month_ordinal[index] = current.year * 12 + current.month - 1
+            current += one_day
+
+        # Month lengths follow from the last day seen in each month
+        month_length: Dict[int, int] = {}
+        for index in range(size):
+            month_length[self.month_ordinal[index]] = self.day[index]
+        for index in range(size):
+            self.days_in_month[index] = month_length[self.month_ordinal[index]]
+
+
+@lru_cache(maxsize=1)
+def get_calendar() -> _CalendarTable:
+    """Build (once) and return the precomputed calendar table."""
+    return _CalendarTable(CALENDAR_START, CALENDAR_END)
+
+
+def day_index(value: date) -> int:
+    """
+    Get the position of a date in the calendar table.
+
+    Raises:
+        ValueError: If the date is outside the precomputed range
+    """
+    index = value.toordinal() - _BASE
+    if not 0 <= index < get_calendar().size:
+        raise ValueError(
+            f"{value} is outside the calendar range {CALENDAR_START}..{CALENDAR_END}"
+        )
+    return index
+
+
+def _index_date(index: int) -> date:
+    """Convert a calendar table position back to a date."""
+    return date.fromordinal(index + _BASE)
+
+
+def _period_for(name: str) -> str:
+    """Normalize a period or recurrence name."""
+    period = RECURRENCE_PERIODS.get(name, name)
+    if period not in PERIODS:
+        raise ValueError(f"Unsupported period '{name}'")
+    return period
+
+
+def period_ordinal(value: date, period: str) -> int:
+    """
+    Get a sortable ordinal of the period containing a date.
+
+    Consecutive periods have consecutive ordinals, so ordinals can be used
+    as bucket keys or array offsets.
+
+    Args:
+        value: Date to bucket
+        period: Period or recurrence name
+
+    Returns:
+        int: Period ordinal
+    """
+    period = _period_for(period)
+    table = get_calendar()
+    index = value.toordinal() - _BASE
+    if not 0 <= index < table.size:
+        # Outside the precomputed range, fall back to date arithmetic
+        month_ordinal = value.year * 12 + value.month - 1
+        return {
+            "day": index,
+            "week": (value.toordinal() - _MONDAY_BASE) // 7,
+            "month": month_ordinal,
+            "quarter": month_ordinal // 3,
+            "year": value.year,
+        }[period]
+    if period == "day":
+        return index
+    if period == "week":
+        return table.week_ordinal[index]
+    if period == "month":
+        return table.month_ordinal[index]
+    if period == "quarter":
+        return table.month_ordinal[index] // 3
+    return table.year[index]
+
+
+def period_ordinals(values: Iterable[date], period: str) -> List[int]:
+    """Bucket many dates at once, see ``period_ordinal``."""
+    return [period_ordinal(value, period) for value in values]
+
+
+def ordinal_bounds(ordinal: int, period: str) -> Tuple[date, date]:
+    """
+    Get the first and last day of the period with the given ordinal.
+
+    Args:
+        ordinal: Period ordinal from ``period_ordinal``
+        period: Period or recurrence name
+
+    Returns:
+        Tuple[date, date]: Inclusive period bounds
+    """
+    period = _period_for(period)
+    if period == "day":
+        start = end = _index_date(ordinal)
+    elif period == "week":
+        start = date.fromordinal(_MONDAY_BASE + ordinal * 7)
+        end = start + timedelta(days=6)
+    elif period in ("month", "quarter"):
+        first_month = ordinal if period == "month" else ordinal * 3
+        last_month = first_month if period == "month" else first_month + 2
+        start = date(first_month // 12, first_month % 12 + 1, 1)
+        end = date(last_month // 12, last_month % 12 + 1, 1)
+        end = end.replace(day=days_in_month(end))
+    else:
+        start, end = date(ordinal, 1, 1), date(ordinal, 12, 31)
+    return start, end
+
+
+def period_bounds(value: date, period: str) -> Tuple[date, date]:
+    """Get the first and last day of the period containing a date."""
+    return ordinal_bounds(period_ordinal(value, period), period)
+
+
+def days_in_month(value: date) -> int:
+    """Get the number of days in the month containing a date."""
+    index = value.toordinal() - _BASE
+    if 0 <= index < get_calendar().size:
+        return get_calendar().days_in_month[index]
+    return calendar.monthrange(value.year, value.month)[1]
+
+
+def _month_date(month_ordinal: int, anchor_day: int) -> date:
+    """Build a date in a month, clamping the anchor day to the month end."""
+    first = date(month_ordinal // 12, month_ordinal % 12 + 1, 1)
+    return first.replace(day=min(anchor_day, days_in_month(first)))
+
+
+def add_periods(
+    value: date, count: int, period: str, anchor_day: Optional[int] = None
+) -> date:
+    """
+    Move a date by a number of periods.
+
+    Month-based steps keep the anchor day (by default the day of ``value``)
+    and clamp it to the month end, so Jan 31 + 1 month is Feb 28/29 and
+    Jan 31 + 2 months is Mar 31.
+
+    Args:
+        value: Starting date
+        count: Number of periods to add (may be negative)
+        period: Period or recurrence name
+        anchor_day: Day of month to keep for month-based steps
+
+    Returns:
+        date: Shifted date
+    """
+    period = _period_for(period)
+    if period == "day":
+        return value + timedelta(days=count)
+    if period == "week":
+        return value + timedelta(weeks=count)
+    months = {"month": 1, "quarter": 3, "year": 12}[period] * count
+    month_ordinal = value.year * 12 + value.month - 1 + months
+    return _month_date(month_ordinal, anchor_day or value.day)
+
+
+def next_period_end(start: date, period: str) -> date:
+    """
+    Get the last day of a recurring period beginning on ``start``.
+
+    Args:
+        start: First day of the period
+        period: Period or recurrence name
+
+    Returns:
+        date: Last day of the period
+    """
+    return add_periods(start, 1, period) - timedelta(days=1)
+
+
+def expand_recurrence(
+    start: date, end: date, period: str, anchor_day: Optional[int] = None
+) -> List[date]:
+    """
+    List every occurrence of a recurrence between two dates, inclusive.
+
+    Occurrences are computed directly from their ordinal offset, so month
+    ends never drift (Jan 31, Feb 29, Mar 31, ...).
+
+    Args:
+        start: First occurrence
+        end: Last allowed date
+        period: Period or recurrence name
+        anchor_day: Day of month to keep for month-based steps
+
+    Returns:
+        List[date]: Occurrence dates
+    """
+    if end < start:
+        return []
+    period = _period_for(period)
+    if period in ("day", "week"):
+        step = 1 if period == "day" else 7
+        first, last = start.toordinal(), end.toordinal()
+        return [date.fromordinal(ordinal) for ordinal in range(first, last + 1, step)]
+
+    step = {"month": 1, "quarter": 3, "year": 12}[period]
+    anchor_day = anchor_day or start.day
+    first = start.year * 12 + start.month - 1
+    last = end.year * 12 + end.month - 1
+    occurrences = [
+        _month_date(month, anchor_day) for month in range(first, last + 1, step)
+    ]
+    return [occurrence for occurrence in occurrences if occurrence <= end]
+
+
+def iter_periods(start: date, end: date, period: str) -> Iterator[Tuple[date, date]]:
+    """
+    Iterate the periods overlapping a date range, clamped to the range.
+
+    Args:
+        start: Range start
+        end: Range end
+        period: Period or recurrence name
+
+    Yields:
+        Tuple[date, date]: Inclusive period bounds
+    """
+    if end < start:
+        return
+    for ordinal in range(
+        period_ordinal(start, period), period_ordinal(end, period) + 1
+    ):
+        period_start, period_end = ordinal_bounds(ordinal, period)
+        yield max(period_start, start), min(period_end, end)
+
+
+def bucket_daily_totals(
+    rows: Iterable[Dict], period: str, label: str = "period"
+) -> List[Dict]:
+    """
+    Roll daily totals up into periods by calendar lookup.
+
+    Args:
+        rows: Dicts with ``date``, ``total_amount`` and ``transaction_count``
+        period: Period or recurrence name
+        label: Key under which each bucket's first day is returned
+
+    Returns:
+        List[Dict]: One entry per non-empty period, oldest first, with
+        ``total_amount``, ``transaction_count`` and ``average_amount``
+    """
+    buckets: Dict[int, List] = {}
+    for row in rows:
+        bucket = buckets.setdefault(period_ordinal(row["date"], period), [0, 0])
+        bucket[0] += row["total_amount"]
+        bucket[1] += row["transaction_count"]
+
+    return [
+        {
+            label: ordinal_bounds(ordinal, period)[0],
+            "total_amount": total,
+            "transaction_count": count,
+            "average_amount": total / count if count else total,
+        }
+        for ordinal, (total, count) in sorted(buckets.items())
+    ]
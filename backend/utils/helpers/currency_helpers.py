@@ -4,15 +4,9 @@ Currency helper functions.
 
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Union, Dict
-import requests
-from django.core.cache import cache
 from ..constants import DEFAULT_CURRENCY, SUPPORTED_CURRENCIES
 from ..exceptions.custom_exceptions import InvalidCurrency
 
-# Cache key for exchange rates
-EXCHANGE_RATES_CACHE_KEY = "exchange_rates"
-EXCHANGE_RATES_CACHE_TIMEOUT = 3600  # 1 hour
-
 
 def format_currency(amount: Union[Decimal, float], currency: str = DEFAULT_CURRENCY) -> str:
     """
@@ -36,25 +30,18 @@ def format_currency(amount: Union[Decimal, float], currency: str = DEFAULT_CURRE
 
 def get_exchange_rates(base_currency: str = DEFAULT_CURRENCY) -> Dict[str, float]:
     """
-    Get current exchange rates from cache or API.
+    Get the current exchange rates against a base currency.
+
+    Rates come from the local rate table (see ``apps.currencies``), which
+    is loaded daily, so this never calls an external API.
     """
-    cache_key = f"{EXCHANGE_RATES_CACHE_KEY}_{base_currency}"
-    rates = cache.get(cache_key)
-    
-    if rates is None:
-        try:
-            # Using exchangerate-api.com as an example
-            response = requests.get(
-                f"https://v6.exchangerate-api.com/v6/YOUR_API_KEY/latest/{base_currency}"
-            )
-            response.raise_for_status()
-            rates = response.json().get("conversion_rates", {})
-            cache.set(cache_key, rates, EXCHANGE_RATES_CACHE_TIMEOUT)
-        except requests.RequestException:
-            # Fallback to some default rates if API call fails
-            rates = {currency[0]: 1.0 for currency in SUPPORTED_CURRENCIES}
-    
-    return rates
+    from apps.currencies.services import CurrencyService
+
+    rates = CurrencyService.get_rate_table()[1]
+    if base_currency not in rates:
+        raise InvalidCurrency(f"No exchange rate for {base_currency}")
+    base = rates[base_currency]
+    return {currency: rate / base for currency, rate in rates.items()}
 
 
 def convert_currency(
@@ -63,17 +50,11 @@ def convert_currency(
     to_currency: str
 ) -> Decimal:
     """
-    Convert amount between currencies.
+    Convert amount between currencies at today's rates.
     """
-    if from_currency == to_currency:
-        return Decimal(str(amount))
-    
-    rates = get_exchange_rates(from_currency)
-    if to_currency not in rates:
-        raise InvalidCurrency(f"Cannot convert to {to_currency}")
-    
-    converted = Decimal(str(amount)) * Decimal(str(rates[to_currency]))
-    return converted.quantize(Decimal(".01"), rounding=ROUND_HALF_UP)
+    from apps.currencies.services import CurrencyService
+
+    return CurrencyService.convert(Decimal(str(amount)), from_currency, to_currency)
 
 
 def validate_currency(currency: str) -> bool:
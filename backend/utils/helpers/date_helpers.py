@@ -7,6 +7,7 @@ from typing import Tuple, List
 from django.utils import timezone
 from dateutil.relativedelta import relativedelta
 from ..exceptions.custom_exceptions import InvalidDateRange
+from .calendar_helpers import iter_periods
 
 
 def get_date_range(
@@ -81,35 +82,10 @@ def get_date_periods(
 ) -> List[Tuple[date, date]]:
     """
     Get list of date periods between start and end date.
-    Period can be 'month', 'week', or 'day'.
+    Period can be 'year', 'quarter', 'month', 'week', or 'day'.
+    The first and last periods are clamped to the range.
     """
-    periods = []
-    current = start_date
-    
-    if period == "month":
-        while current <= end_date:
-            period_start = current.replace(day=1)
-            period_end = (period_start + relativedelta(months=1)) - timedelta(days=1)
-            if period_end > end_date:
-                period_end = end_date
-            periods.append((period_start, period_end))
-            current = period_end + timedelta(days=1)
-    
-    elif period == "week":
-        while current <= end_date:
-            period_start = current - timedelta(days=current.weekday())
-            period_end = period_start + timedelta(days=6)
-            if period_end > end_date:
-                period_end = end_date
-            periods.append((period_start, period_end))
-            current = period_end + timedelta(days=1)
-    
-    else:  # day
-        while current <= end_date:
-            periods.append((current, current))
-            current += timedelta(days=1)
-    
-    return periods
+    return list(iter_periods(start_date, end_date, period))
 
 
 def is_future_date(date_obj: date) -> bool:
@@ -0,0 +1,173 @@
+"""
+Integer minor unit helpers for monetary arithmetic.
+
+Amounts are stored as ``Decimal`` with two decimal places. Batch code that
+sums or compares many amounts (rollups, forecasts, imports) can read them
+as integer minor units straight from the database with ``minor_units`` and
+only build ``Decimal`` values for the results it returns. Rounding is half
+to even, exactly like ``Decimal.quantize`` under the default context.
+
+``basis_points_many`` uses NumPy int64 arrays, NumPy being a base
+requirement, and plain integers where it is missing; both give identical
+results. Building ``Decimal``
+values costs about as much as Decimal arithmetic itself, so batch code
+should compare integers and convert only what it returns or stores.
+"""
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import List, Sequence, Union
+from django.db.models import BigIntegerField, Expression, F
+from django.db.models.functions import Cast
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Decimal places of stored amounts, e.g. ``Expense.amount``
+AMOUNT_DECIMAL_PLACES = 2
+
+# Digits after the decimal point of each currency's minor unit
+MINOR_UNIT_EXPONENTS = {"JPY": 0}
+DEFAULT_MINOR_UNIT_EXPONENT = 2
+
+# Percentages are computed in basis points (hundredths of a percent),
+# matching ``quantize(Decimal("0.01"))``
+PERCENTAGE_DECIMAL_PLACES = 2
+BASIS_POINTS_PER_UNIT = 100 * 10**PERCENTAGE_DECIMAL_PLACES
+
+# Below this many rows NumPy's array setup costs more than it saves
+VECTORIZE_THRESHOLD = 256
+
+
+def minor_unit_exponent(currency: str) -> int:
+    """Number of minor unit digits of a currency."""
+    return MINOR_UNIT_EXPONENTS.get(currency, DEFAULT_MINOR_UNIT_EXPONENT)
+
+
+def divide_half_even(numerator: int, denominator: int) -> int:
+    """Integer division rounding half to even, for a positive denominator."""
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def to_minor(amount: Decimal, places: int = AMOUNT_DECIMAL_PLACES) -> int:
+    """
+    Convert an amount to integer minor units, rounding half to even.
+
+    Args:
+        amount: Amount in major units
+        places: Decimal places of the minor unit
+
+    Returns:
+        int: Amount in minor units
+    """
+    return int(Decimal(amount).scaleb(places).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_minor(units: int, places: int = AMOUNT_DECIMAL_PLACES) -> Decimal:
+    """
+    Convert integer minor units to a Decimal amount.
+
+    Args:
+        units: Amount in minor units
+        places: Decimal places of the minor unit
+
+    Returns:
+        Decimal: Amount in major units
+    """
+    return Decimal(units).scaleb(-places)
+
+
+def minor_units(
+    expression: Union[str, Expression], places: int = AMOUNT_DECIMAL_PLACES
+) -> Cast:
+    """
+    SQL expression reading an amount column or aggregate as minor units.
+
+    Use it in ``values_list`` or ``annotate`` so rows arrive as integers
+    instead of ``Decimal``. Stored amounts have ``places`` decimals, so the
+    cast is exact.
+
+    Args:
+        expression: Column name or expression, e.g. ``Sum("amount")``
+        places: Decimal places of the amount
+
+    Returns:
+        Cast: Amount as a bigint of minor units
+    """
+    if isinstance(expression, str):
+        expression = F(expression)
+    return Cast(expression * 10**places, output_field=BigIntegerField())
+
+
+def basis_points(part: int, whole: int) -> int:
+    """
+    Hundredths of a percent of ``whole`` that ``part`` represents.
+
+    Args:
+        part: Amount in minor units
+        whole: Reference amount in minor units
+
+    Returns:
+        int: Basis points, rounded half to even, 0 when ``whole`` is zero
+    """
+    if whole == 0:
+        return 0
+    if whole < 0:
+        part, whole = -part, -whole
+    return divide_half_even(part * BASIS_POINTS_PER_UNIT, whole)
+
+
+def basis_points_many(parts: Sequence[int], wholes: Sequence[int]) -> List[int]:
+    """
+    Basis points of many pairs, vectorized when NumPy is available.
+
+    Compare the results with thresholds converted by ``to_minor(threshold)``
+    and only build Decimals, with ``percentage_from_basis_points``, for the
+    values that are returned or stored.
+
+    Args:
+        parts: Amounts in minor units
+        wholes: Reference amounts in minor units, pairwise with ``parts``
+
+    Returns:
+        List[int]: Basis points as returned by ``basis_points``
+    """
+    if np is None or len(parts) < VECTORIZE_THRESHOLD:
+        return [basis_points(part, whole) for part, whole in zip(parts, wholes)]
+
+    wholes = np.asarray(wholes, dtype=np.int64)
+    signs = np.where(wholes < 0, -1, 1)
+    numerators = np.asarray(parts, dtype=np.int64) * signs * BASIS_POINTS_PER_UNIT
+    denominators = np.where(wholes == 0, 1, wholes * signs)
+    quotients, remainders = np.divmod(numerators, denominators)
+    quotients += (2 * remainders > denominators) | (
+        (2 * remainders == denominators) & (quotients % 2 == 1)
+    )
+    quotients[wholes == 0] = 0
+    return quotients.tolist()
+
+
+def percentage_from_basis_points(points: int) -> Decimal:
+    """Percentage with two decimal places from basis points."""
+    return from_minor(points, PERCENTAGE_DECIMAL_PLACES)
+
+
+def percentage(part: int, whole: int) -> Decimal:
+    """
+    Percentage of ``whole`` that ``part`` represents, to two decimal places.
+
+    Equal to ``(part / whole * 100).quantize(Decimal("0.01"))`` on the same
+    Decimal amounts. Both values must use the same minor unit.
+
+    Args:
+        part: Amount in minor units
+        whole: Reference amount in minor units
+
+    Returns:
+        Decimal: Percentage, ``0.00`` when ``whole`` is zero
+    """
+    return percentage_from_basis_points(basis_points(part, whole))
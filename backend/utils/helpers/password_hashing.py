@@ -0,0 +1,124 @@
+"""
+Password hashing in a bounded pool of worker processes.
+
+Hashing a password costs tens to hundreds of milliseconds of CPU by design.
+Done on the request thread it stalls the ASGI event loop, or the thread
+Django runs synchronous views on, for every other request. ``HashingPool``
+runs the hashers in separate processes so they use every core, and turns
+away work once ``max_queue`` hashes are waiting so a login storm gets fast
+rejections instead of unbounded latency.
+
+The functions run in the workers only need the configured hashers, so this
+module does not depend on Django apps being loaded. Workers are spawned
+rather than forked, which is safe in threaded servers.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    get_hasher,
+    identify_hasher,
+    make_password,
+    verify_password,
+)
+
+# When a verified password is rehashed with the preferred hasher
+UPGRADE_OUTDATED = "outdated"  # other hasher, or fewer iterations or rounds
+UPGRADE_HASHER = "hasher"  # other hasher only
+UPGRADE_NEVER = "never"
+UPGRADE_POLICIES = (UPGRADE_OUTDATED, UPGRADE_HASHER, UPGRADE_NEVER)
+
+
+class HashingQueueFull(Exception):
+    """Too many hashes are waiting for a worker."""
+
+
+def configure_worker(hashers: List[str]) -> None:
+    """Configure a spawned worker with the parent's hashers."""
+    if not settings.configured:
+        settings.configure(PASSWORD_HASHERS=hashers)
+
+
+def hash_password(password: str) -> str:
+    """Encode a password with the preferred hasher."""
+    return make_password(password)
+
+
+def check_password(
+    password: str, encoded: str, upgrade: str = UPGRADE_OUTDATED
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password, rehashing it when the upgrade policy asks for it.
+
+    Args:
+        password: Raw password
+        encoded: Stored hash
+        upgrade: One of ``UPGRADE_POLICIES``
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password is correct, and its
+        new hash if it should replace the stored one
+    """
+    is_correct, must_update = verify_password(password, encoded)
+    if not is_correct or not must_update or upgrade == UPGRADE_NEVER:
+        return is_correct, None
+    if (
+        upgrade == UPGRADE_HASHER
+        and identify_hasher(encoded).algorithm == get_hasher().algorithm
+    ):
+        return is_correct, None
+    return is_correct, make_password(password)
+
+
+class HashingPool:
+    """
+    Process pool running at most ``workers`` hashes and queueing at most
+    ``max_queue`` more.
+    """
+
+    def __init__(self, workers: int, max_queue: int, hashers: List[str]):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_worker,
+            initargs=(list(hashers),),
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Hashes running or waiting for a worker."""
+        return self._pending
+
+    def submit(self, function: Callable, *args) -> Future:
+        """
+        Run a function of this module in a worker.
+
+        Raises:
+            HashingQueueFull: If ``max_queue`` hashes are already waiting
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise HashingQueueFull()
+            self._pending += 1
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the workers once they finish their current hashes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+"""
+Read-only serializers for hot list endpoints.
+
+DRF serializers build a field tree per serializer and walk it for every
+row: attribute lookups, ``to_representation`` calls and method fields
+that may query the database. On large list pages that per-row work
+dominates. A ``ReadSerializer`` instead reads only the columns it needs
+with ``values()`` and maps each row to a dict in one plain function.
+Lookups that do not depend on the row, such as choice labels in the
+active language or today's date, are computed once per page.
+
+Output matches the DRF serializer of the same endpoint, which remains in
+use for writes and still describes the response in the API schema.
+"""
+
+from datetime import date, datetime, tzinfo
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+
+
+def format_decimal(value: Optional[Decimal]) -> Optional[str]:
+    """Format a decimal the way DRF's ``DecimalField`` does, for stored values."""
+    return None if value is None else f"{value:f}"
+
+
+def format_date(value: Optional[date]) -> Optional[str]:
+    """Format a date as ISO 8601, like DRF's ``DateField``."""
+    return None if value is None else value.isoformat()
+
+
+def format_datetime(value: Optional[datetime], zone: tzinfo) -> Optional[str]:
+    """
+    Format a datetime as ISO 8601 in a time zone, like DRF's ``DateTimeField``.
+
+    Args:
+        value: Aware datetime
+        zone: Time zone to show it in, usually the current one
+
+    Returns:
+        Optional[str]: ISO 8601 string with ``Z`` for UTC
+    """
+    if value is None:
+        return None
+    text = value.astimezone(zone).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def choice_labels(model: Type[Model], field: str) -> Dict[str, str]:
+    """Get the labels of a field's choices, in the active language."""
+    return {value: str(label) for value, label in model._meta.get_field(field).choices}
+
+
+class ReadSerializer:
+    """
+    Base class of read-only serializers of ``values()`` rows.
+
+    Subclasses set ``columns``, the fields read with ``values()``, and
+    implement ``to_representation`` for one row. ``get_context`` computes
+    what every row of a page shares.
+    """
+
+    columns: Sequence[str] = ()
+
+    def rows(self, queryset: QuerySet) -> QuerySet:
+        """
+        Select the columns to serialize.
+
+        Args:
+            queryset: Objects to list, possibly filtered and ordered
+
+        Returns:
+            QuerySet: The same rows as dicts of ``columns``
+        """
+        return queryset.values(*self.columns)
+
+    def get_context(self) -> Dict[str, Any]:
+        """Values shared by every row of a page."""
+        return {"now": timezone.now(), "zone": timezone.get_current_timezone()}
+
+    def to_representation(self, row: Dict[str, Any], context: Dict[str, Any]) -> Dict:
+        """Serialize one row."""
+        raise NotImplementedError
+
+    def serialize(self, rows: Iterable[Dict[str, Any]]) -> List[Dict]:
+        """
+        Serialize rows from ``rows``.
+
+        Args:
+            rows: Rows, a page of them or all
+
+        Returns:
+            List[Dict]: Serialized rows
+        """
+        context = self.get_context()
+        to_representation = self.to_representation
+        return [to_representation(row, context) for row in rows]
@@ -0,0 +1,140 @@
+"""
+In-memory change tracking for model instances.
+"""
+
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
+
+
+class ChangeTrackingMixin:
+    """
+    Model mixin that detects field changes without reading the row again.
+
+    The values of ``TRACKED_FIELDS`` (attribute names, all concrete fields
+    when ``None``) are remembered when an instance is loaded and after each
+    save. ``pre_save`` and ``post_save`` receivers therefore still compare
+    against the values from before the save. Fields that were deferred at
+    load time are reported as changed once they have been loaded and set.
+    """
+
+    TRACKED_FIELDS: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the tracked values as loaded.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_values()
+        return instance
+
+    @classmethod
+    def tracked_fields(cls) -> Tuple[str, ...]:
+        """Attribute names of the tracked fields."""
+        if cls.TRACKED_FIELDS is not None:
+            return cls.TRACKED_FIELDS
+        return tuple(
+            field.attname
+            for field in cls._meta.concrete_fields
+            if not field.primary_key
+        )
+
+    def _remember_tracked_values(self, fields=None) -> None:
+        """
+        Snapshot the current values of tracked fields.
+
+        Args:
+            fields: Only these fields, defaults to every tracked field
+        """
+        deferred = self.get_deferred_fields()
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for name in self.tracked_fields() if fields is None else fields:
+            if name not in deferred:
+                value = getattr(self, name)
+                # Copied so in-place edits of JSON values are detected
+                loaded[name] = (
+                    deepcopy(value) if isinstance(value, (dict, list)) else value
+                )
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """
+        Reload fields and remember the reloaded tracked values.
+        """
+        super().refresh_from_db(using, fields, **kwargs)
+        tracked = self.tracked_fields()
+        self._remember_tracked_values(
+            tracked if fields is None else [name for name in fields if name in tracked]
+        )
+
+    def set_loaded_values(self, values: Dict[str, Any]) -> None:
+        """
+        Set field values read by another query as if they were loaded.
+
+        Args:
+            values: Field values by attribute name
+        """
+        for name, value in values.items():
+            setattr(self, name, value)
+        tracked = self.tracked_fields()
+        self._remember_tracked_values([name for name in values if name in tracked])
+
+    def changed_fields(self) -> Dict[str, Any]:
+        """
+        Tracked fields whose value differs from the remembered one.
+
+        Unsaved instances report no changes.
+
+        Returns:
+            Dict[str, Any]: Previous value by attribute name, ``None`` for
+            fields that were deferred at load time
+        """
+        if self._state.adding:
+            return {}
+        loaded = self.__dict__.get("_loaded_values", {})
+        deferred = self.get_deferred_fields()
+        changes = {}
+        for name in self.tracked_fields():
+            if name in loaded:
+                if getattr(self, name) != loaded[name]:
+                    changes[name] = loaded[name]
+            elif name not in deferred:
+                changes[name] = None
+        return changes
+
+    def has_changed(self, *fields: str) -> bool:
+        """
+        Check whether any, or any of the given, tracked fields changed.
+
+        Args:
+            *fields: Attribute names to check, defaults to all tracked fields
+
+        Returns:
+            bool: True if a checked field changed since load or the last save
+        """
+        changes = self.changed_fields()
+        if not fields:
+            return bool(changes)
+        return any(name in changes for name in fields)
+
+    def save(self, *args, **kwargs):
+        """
+        Save and remember the saved values once ``post_save`` has run.
+
+        New instances remember their values before the insert, so receivers
+        see no changes for them.
+        """
+        if self._state.adding:
+            self._remember_tracked_values()
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self._remember_tracked_values()
+        else:
+            tracked = set(self.tracked_fields())
+            self._remember_tracked_values(
+                [
+                    self._meta.get_field(name).attname
+                    for name in update_fields
+                    if self._meta.get_field(name).attname in tracked
+                ]
+            )
@@ -0,0 +1,32 @@
+"""
+List views served by a read serializer.
+"""
+
+from typing import Any, Optional
+from rest_framework.request import Request
+from rest_framework.response import Response
+from utils.helpers.read_serializers import ReadSerializer
+
+
+class ReadSerializerListMixin:
+    """
+    ViewSet mixin that lists objects with ``read_serializer``.
+
+    The ``list`` action reads ``values()`` rows of the filtered queryset,
+    paginated when the view has a paginator, and serializes them with
+    ``read_serializer``. ``get_serializer_class`` is still used for every
+    other action and for the schema of ``list``.
+    """
+
+    read_serializer: Optional[ReadSerializer] = None
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """List objects with the read serializer."""
+        if self.read_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.read_serializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.read_serializer.serialize(page))
+        return Response(self.read_serializer.serialize(rows))